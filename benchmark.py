@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""
+XML Wizard benchmark suite.
+
+Runs every XSD in the bundled schema directories through the application's
+pipeline - schema load, schema analysis, generation in each mode, streamed
+serialization and validation - and records wall time, peak RSS and the
+tracemalloc allocation peak of every stage. Results are written as a JSON
+baseline and later runs are compared against it with relative thresholds,
+so performance regressions in the generator show up as numbers.
+
+Usage:
+    python benchmark.py --save                    # record benchmarks/baseline.json
+    python benchmark.py                           # compare against the baseline
+    python benchmark.py --schemas IATA_OrderViewRS.xsd --repeat 3
+"""
+
+import argparse
+import contextlib
+import datetime
+import gc
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+# Add the project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from services.schema_analyzer import SchemaAnalyzer
+from services.xml_validator import XMLValidator
+from utils.schema_cache import get_schema_cache
+from utils.schema_registry import get_schema_registry
+from utils.xml_generator import XMLGenerator
+
+
+BASELINE_VERSION = 1
+DEFAULT_SCHEMA_DIRS = ('resource/21_3_5_distribution_schemas', 'resource/orderCreate')
+DEFAULT_BASELINE_PATH = 'benchmarks/baseline.json'
+GENERATION_MODES = ('Minimalistic', 'Complete', 'Custom')
+
+# Compared metrics: allowed relative increase, and the absolute increase below which changes are noise
+DEFAULT_THRESHOLDS = {
+    'wall_seconds': 0.25,
+    'first_seconds': 0.25,
+    'peak_rss_mb': 0.15,
+    'tracemalloc_peak_mb': 0.15,
+}
+NOISE_FLOORS = {
+    'wall_seconds': 0.1,
+    'first_seconds': 0.1,
+    'peak_rss_mb': 5.0,
+    'tracemalloc_peak_mb': 1.0,
+}
+
+
+def discover_schemas(base_dir: str = str(project_root), schema_dirs=DEFAULT_SCHEMA_DIRS,
+                     names: Optional[List[str]] = None) -> List[str]:
+    """
+    Find the XSD files to benchmark.
+
+    Args:
+        base_dir: Directory the schema directories are relative to
+        schema_dirs: Directories searched recursively for *.xsd files
+        names: Optional file names (or relative paths) to restrict the run to
+
+    Returns:
+        Sorted XSD paths relative to base_dir
+    """
+    schemas = []
+    for schema_dir in schema_dirs:
+        for xsd_path in Path(base_dir, schema_dir).rglob('*.xsd'):
+            relative_path = xsd_path.relative_to(base_dir).as_posix()
+            if names and xsd_path.name not in names and relative_path not in names:
+                continue
+            schemas.append(relative_path)
+    return sorted(schemas)
+
+
+def get_peak_rss_mb() -> Optional[float]:
+    """Get the peak resident set size of this process in MB (None if unavailable)."""
+    if RESOURCE_AVAILABLE:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+        return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 2)
+    if PSUTIL_AVAILABLE:
+        memory = psutil.Process().memory_info()
+        return round(getattr(memory, 'peak_wset', memory.rss) / (1024 * 1024), 2)
+    return None
+
+
+def measure_stage(func: Callable[[], Any], repeat: int = 1, trace_memory: bool = True,
+                  setup: Optional[Callable[[], None]] = None) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Time a benchmark stage.
+
+    The stage runs repeat times untraced for timing, then once more under
+    tracemalloc for its allocation peak, so tracing overhead does not distort
+    the wall times.
+
+    Args:
+        func: Stage to run
+        repeat: Number of timed runs
+        trace_memory: Whether to record the tracemalloc peak
+        setup: Optional callable run before every run, outside the timing
+
+    Returns:
+        Tuple of (result of the last run, metrics dictionary)
+    """
+    timings = []
+    result = None
+    for _ in range(max(1, repeat)):
+        if setup:
+            setup()
+        gc.collect()
+        start_time = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start_time)
+
+    metrics = {
+        'wall_seconds': round(min(timings), 6),
+        'first_seconds': round(timings[0], 6),
+        'runs': len(timings),
+    }
+
+    if trace_memory:
+        if setup:
+            setup()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            result = func()
+            metrics['tracemalloc_peak_mb'] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 3)
+        finally:
+            tracemalloc.stop()
+
+    metrics['peak_rss_mb'] = get_peak_rss_mb()
+    return result, metrics
+
+
+def benchmark_schema(xsd_path: str, modes=GENERATION_MODES, repeat: int = 1,
+                     trace_memory: bool = True, seed: int = 0) -> Dict[str, Any]:
+    """
+    Run one schema through every benchmark stage.
+
+    A failing stage records its error and the remaining stages still run,
+    except that nothing runs without a loaded schema.
+
+    Args:
+        xsd_path: Path to the XSD file
+        modes: Generation modes to benchmark
+        repeat: Number of timed runs per stage
+        trace_memory: Whether to record tracemalloc peaks
+        seed: Seed of the generated documents
+
+    Returns:
+        Dictionary mapping stage names to their metrics (or an 'error' entry)
+    """
+    stages: Dict[str, Any] = {}
+
+    def run(stage: str, func: Callable[[], Any], **kwargs) -> Any:
+        try:
+            result, stages[stage] = measure_stage(func, repeat, trace_memory, **kwargs)
+            return result
+        except Exception as e:
+            stages[stage] = {'error': str(e)}
+            return None
+
+    generator = run('load', lambda: XMLGenerator(xsd_path), setup=get_schema_registry().clear)
+    if generator is None or generator.schema is None:
+        return stages
+
+    analysis = run('analysis', lambda: SchemaAnalyzer().analyze_xsd_schema(xsd_path))
+    if analysis is not None and not analysis.get('success'):
+        stages['analysis']['error'] = analysis.get('error')
+
+    documents = {}
+    for mode in modes:
+        stage = f'generate:{mode}'
+        xml_content = run(stage, lambda: generator.generate_dummy_xml_with_options(generation_mode=mode, seed=seed))
+        if xml_content is not None:
+            documents[mode] = xml_content
+            stages[stage]['output_bytes'] = len(xml_content.encode('utf-8'))
+
+    serialization_mode = 'Complete' if 'Complete' in modes else modes[0]
+    fd, output_path = tempfile.mkstemp(suffix='.xml')
+    os.close(fd)
+    try:
+        streamed = run('serialize', lambda: generator.stream_dummy_xml(
+            output_path, generation_mode=serialization_mode, seed=seed
+        ))
+        if streamed is not None and not streamed.get('success'):
+            stages['serialize']['error'] = streamed.get('error')
+    finally:
+        os.unlink(output_path)
+
+    validation_document = documents.get(serialization_mode)
+    if validation_document is not None:
+        validation = run('validate', lambda: XMLValidator().validate_xml_against_schema(validation_document, xsd_path))
+        if validation is not None:
+            if validation.get('success'):
+                stages['validate']['total_errors'] = validation['total_errors']
+            else:
+                stages['validate']['error'] = validation.get('error')
+
+    return stages
+
+
+def _benchmark_schema_quietly(xsd_path: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Benchmark a schema with the generator's progress output discarded."""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        return benchmark_schema(xsd_path, **options)
+
+
+def run_benchmarks(schema_paths: List[str], base_dir: str = str(project_root), modes=GENERATION_MODES,
+                   repeat: int = 1, trace_memory: bool = True, seed: int = 0,
+                   isolate: bool = True, schema_cache: bool = False) -> Dict[str, Any]:
+    """
+    Benchmark a list of schemas.
+
+    With isolate, every schema runs in its own forked process so its peak RSS
+    and caches are not affected by the schemas benchmarked before it. The
+    on-disk schema cache is bypassed unless schema_cache is set, so load times
+    do not depend on what earlier runs left in the cache.
+
+    Args:
+        schema_paths: XSD paths relative to base_dir
+        base_dir: Directory the schema paths are relative to
+        modes: Generation modes to benchmark
+        repeat: Number of timed runs per stage
+        trace_memory: Whether to record tracemalloc peaks
+        seed: Seed of the generated documents
+        isolate: Whether to run each schema in a separate process
+        schema_cache: Whether schema loads may use the on-disk schema cache
+
+    Returns:
+        Benchmark report with environment details and per-schema stage metrics
+    """
+    options = {'modes': tuple(modes), 'repeat': repeat, 'trace_memory': trace_memory, 'seed': seed}
+    if isolate and 'fork' not in multiprocessing.get_all_start_methods():
+        print("Warning: fork start method unavailable, benchmarking schemas in-process")
+        isolate = False
+
+    results = {}
+    disk_cache = get_schema_cache()
+    cache_enabled = disk_cache.enabled
+    disk_cache.enabled = cache_enabled and schema_cache
+    try:
+        for relative_path in schema_paths:
+            xsd_path = os.path.join(base_dir, relative_path)
+            print(f"Benchmarking {relative_path}...")
+            if isolate:
+                with multiprocessing.get_context('fork').Pool(processes=1) as pool:
+                    results[relative_path] = pool.apply(_benchmark_schema_quietly, (xsd_path, options))
+            else:
+                results[relative_path] = _benchmark_schema_quietly(xsd_path, options)
+    finally:
+        disk_cache.enabled = cache_enabled
+
+    return {
+        'version': BASELINE_VERSION,
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+        },
+        'options': {**options, 'modes': list(modes), 'isolate': isolate,
+                    'schema_cache': cache_enabled and schema_cache},
+        'results': results,
+    }
+
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any],
+                        thresholds: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """
+    Compare a benchmark report with a stored baseline.
+
+    A metric regresses when it grows by more than its relative threshold and
+    by more than its noise floor; shrinking the same way is an improvement.
+
+    Args:
+        report: Current benchmark report
+        baseline: Baseline benchmark report
+        thresholds: Relative thresholds per metric (defaults to DEFAULT_THRESHOLDS)
+
+    Returns:
+        Dictionary with 'success' (no regressions), 'regressions', 'improvements',
+        'new_errors' and 'missing' lists
+    """
+    thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+    regressions, improvements, new_errors, missing = [], [], [], []
+
+    for schema, baseline_stages in baseline.get('results', {}).items():
+        current_stages = report.get('results', {}).get(schema)
+        if current_stages is None:
+            missing.append(schema)
+            continue
+
+        for stage, baseline_metrics in baseline_stages.items():
+            current_metrics = current_stages.get(stage)
+            if current_metrics is None:
+                missing.append(f"{schema}:{stage}")
+                continue
+            if 'error' in current_metrics and 'error' not in baseline_metrics:
+                new_errors.append({'schema': schema, 'stage': stage, 'error': current_metrics['error']})
+                continue
+
+            for metric, threshold in thresholds.items():
+                before = baseline_metrics.get(metric)
+                after = current_metrics.get(metric)
+                if before is None or after is None:
+                    continue
+                change = {
+                    'schema': schema,
+                    'stage': stage,
+                    'metric': metric,
+                    'baseline': before,
+                    'current': after,
+                    'ratio': round(after / before, 3) if before else None,
+                }
+                floor = NOISE_FLOORS.get(metric, 0.0)
+                if after > before * (1 + threshold) and after - before > floor:
+                    regressions.append(change)
+                elif after < before * (1 - threshold) and before - after > floor:
+                    improvements.append(change)
+
+    return {
+        'success': not regressions and not new_errors,
+        'regressions': regressions,
+        'improvements': improvements,
+        'new_errors': new_errors,
+        'missing': missing,
+    }
+
+
+def save_report(report: Dict[str, Any], path: str) -> None:
+    """Write a benchmark report as indented JSON, creating parent directories."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+
+def load_report(path: str) -> Dict[str, Any]:
+    """Read a benchmark report written by save_report."""
+    with open(path, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+    if report.get('version') != BASELINE_VERSION:
+        raise ValueError(f"Unsupported baseline version {report.get('version')} in {path}")
+    return report
+
+
+def print_summary(report: Dict[str, Any]) -> None:
+    """Print the wall time and memory of every benchmarked stage."""
+    print(f"\n{'Schema / stage':<70} {'wall s':>9} {'first s':>9} {'rss MB':>9} {'alloc MB':>9}")
+    for schema, stages in report['results'].items():
+        print(schema)
+        for stage, metrics in stages.items():
+            if 'error' in metrics:
+                print(f"  {stage:<68} ERROR: {str(metrics['error'])[:60]}")
+                continue
+            columns = [metrics.get(name) for name in ('wall_seconds', 'first_seconds', 'peak_rss_mb', 'tracemalloc_peak_mb')]
+            print(f"  {stage:<68} " + ' '.join(f"{'-' if value is None else value:>9}" for value in columns))
+
+
+def print_comparison(comparison: Dict[str, Any]) -> None:
+    """Print the regressions, improvements and errors found by compare_to_baseline."""
+    for title, changes in (('Regressions', comparison['regressions']), ('Improvements', comparison['improvements'])):
+        if changes:
+            print(f"\n{title}:")
+            for change in changes:
+                print(f"  {change['schema']} {change['stage']} {change['metric']}: "
+                      f"{change['baseline']} -> {change['current']} (x{change['ratio']})")
+    for error in comparison['new_errors']:
+        print(f"\nNew error: {error['schema']} {error['stage']}: {error['error']}")
+    if comparison['missing']:
+        print(f"\nMissing from this run: {', '.join(comparison['missing'])}")
+    print(f"\n{'✅ No performance regressions' if comparison['success'] else '❌ Performance regressions found'}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark suite from the command line; returns the process exit code."""
+    parser = argparse.ArgumentParser(description="Benchmark XML Wizard against the bundled schemas")
+    parser.add_argument('--schemas', nargs='+', help="Schema file names or relative paths to benchmark")
+    parser.add_argument('--schema-dirs', nargs='+', default=list(DEFAULT_SCHEMA_DIRS),
+                        help="Directories searched for XSD files, relative to --base-dir")
+    parser.add_argument('--base-dir', default=str(project_root), help="Directory the schema paths are relative to")
+    parser.add_argument('--modes', nargs='+', choices=GENERATION_MODES, default=list(GENERATION_MODES),
+                        help="Generation modes to benchmark")
+    parser.add_argument('--repeat', type=int, default=1, help="Timed runs per stage (minimum is reported)")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the generated documents")
+    parser.add_argument('--no-tracemalloc', action='store_true', help="Skip the tracemalloc allocation run")
+    parser.add_argument('--no-isolate', action='store_true', help="Benchmark all schemas in this process")
+    parser.add_argument('--schema-cache', action='store_true', help="Allow schema loads from the on-disk cache")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE_PATH, help="Baseline JSON path")
+    parser.add_argument('--save', action='store_true', help="Write the results as the new baseline")
+    parser.add_argument('--output', help="Also write the results of this run to a JSON file")
+    parser.add_argument('--threshold', action='append', default=[], metavar='METRIC=RATIO',
+                        help="Override a relative threshold, e.g. wall_seconds=0.5")
+    args = parser.parse_args(argv)
+
+    thresholds = {}
+    for override in args.threshold:
+        metric, _, ratio = override.partition('=')
+        if metric not in DEFAULT_THRESHOLDS or not ratio:
+            parser.error(f"Invalid threshold '{override}'; metrics: {', '.join(DEFAULT_THRESHOLDS)}")
+        thresholds[metric] = float(ratio)
+
+    schema_paths = discover_schemas(args.base_dir, args.schema_dirs, names=args.schemas)
+    if not schema_paths:
+        print("No schemas found to benchmark")
+        return 1
+
+    report = run_benchmarks(
+        schema_paths, base_dir=args.base_dir, modes=args.modes, repeat=args.repeat, trace_memory=not args.no_tracemalloc,
+        seed=args.seed, isolate=not args.no_isolate, schema_cache=args.schema_cache
+    )
+    print_summary(report)
+
+    if args.output:
+        save_report(report, args.output)
+    if args.save:
+        save_report(report, args.baseline)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --save to create one")
+        return 0
+
+    baseline = load_report(args.baseline)
+    if baseline.get('options') != report['options']:
+        print(f"\nWarning: baseline was recorded with different options: {baseline.get('options')}")
+    comparison = compare_to_baseline(report, baseline, thresholds)
+    print_comparison(comparison)
+    return 0 if comparison['success'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
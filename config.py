@@ -4,6 +4,7 @@ Contains all configurable values that were previously hardcoded.
 """
 
 import os
+import tempfile
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 
@@ -20,9 +21,7 @@ class RecursionLimits:
 @dataclass 
 class IterativeProcessing:
     """Configuration for iterative XML generation (memory safe, no recursion)."""
-    enable_iterative_processing: bool = False  # Use recursive approach for correct sequence order
-    max_processing_depth: int = 50  # Maximum depth for iterative processing
-    max_elements_per_queue: int = 10000  # Maximum elements in processing queue
+    enable_iterative_processing: bool = True  # Explicit-stack walk with the same output as the recursive one
     enable_constraint_caching: bool = True  # Enable constraint extraction caching
     enable_element_tracking: bool = True  # Enable element processing tracking
 
@@ -155,9 +154,37 @@ class PerformanceSettings:
     """Configuration for performance-related settings."""
     enable_caching: bool = True
     max_cache_size: int = 100
-    enable_metrics: bool = False
+    enable_metrics: bool = False  # Profile generations per schema path and XSD type
     timeout_seconds: int = 30
     max_file_size_mb: int = 50
+    enable_schema_cache: bool = True  # Persist built schemas to disk between runs
+    schema_cache_dir: str = None  # Defaults to ~/.cache/xml_wizard/schema_cache
+    schema_registry_max_entries: int = 8  # Built schemas shared in memory across sessions
+    schema_registry_max_mb: int = 512  # Approximate memory budget for shared schemas
+    blob_store_dir: str = None  # Content-addressed XSD store; defaults to <tmp>/xml_wizard_store
+    workspace_max_age_hours: int = 24  # Upload workspaces and unused blobs older than this are removed
+    enable_generation_plans: bool = True  # Reuse compiled generation plans for repeat generations
+    generation_plan_cache_size: int = 32  # Compiled plans kept per process
+    generation_workers: int = 1  # Forked worker processes used for batch generation
+    enable_subtree_memoization: bool = False  # Walk repeated complex types once; clones re-sample only IDs, refs, enums and custom values
+    enable_incremental_generation: bool = False  # Keep the last document's subtrees; regenerate only those whose options changed
+    analysis_cache_max_entries: int = 16  # Schema analyses shared across UI sessions, keyed by bundle digest
+    analysis_cache_ttl_seconds: int = 3600  # Cached schema analyses older than this are rebuilt
+    generation_job_workers: int = 2  # Background generations running at the same time
+    generation_job_retention: int = 32  # Finished background generations whose results are kept
+    validation_max_errors: int = 0  # Validation stops after this many errors (0 collects every error)
+    enable_fast_validation: bool = True  # Validate with libxml2; run xmlschema only when detailed errors are requested
+    validation_category_limit: int = 100  # Errors kept per category when streaming large documents
+    validation_group_exemplars: int = 3  # Errors kept per (path, XSD component) group of a validation report
+    
+    def __post_init__(self):
+        if self.schema_cache_dir is None:
+            self.schema_cache_dir = os.path.join(
+                os.path.expanduser('~'), '.cache', 'xml_wizard', 'schema_cache'
+            )
+        if self.blob_store_dir is None:
+            # Same filesystem as mkdtemp() so workspaces can hardlink blobs
+            self.blob_store_dir = os.path.join(tempfile.gettempdir(), 'xml_wizard_store')
 
 
 @dataclass
@@ -166,6 +193,8 @@ class UISettings:
     default_page_title: str = "XML Wizard"
     max_file_upload_mb: int = 10
     default_tree_depth: int = 10  # Increased depth for Complete mode XML generation
+    tree_page_size: int = 50  # Schema tree children loaded per expansion or "show more"
+    job_poll_interval_seconds: float = 0.5  # Refresh interval of background generation progress
     show_debug_info: bool = False
     enable_download: bool = True
 
@@ -195,17 +224,42 @@ class Config:
         self.recursion.max_tree_depth = int(os.getenv('XML_MAX_TREE_DEPTH', self.recursion.max_tree_depth))
         self.recursion.max_element_depth = int(os.getenv('XML_MAX_ELEMENT_DEPTH', self.recursion.max_element_depth))
         
+        # Generation engine
+        self.iterative.enable_iterative_processing = os.getenv('XML_ENABLE_ITERATIVE', 'true').lower() == 'true'
+        
         # Element counts
         self.elements.default_element_count = int(os.getenv('XML_DEFAULT_ELEMENT_COUNT', self.elements.default_element_count))
         self.elements.max_unbounded_count = int(os.getenv('XML_MAX_UNBOUNDED_COUNT', self.elements.max_unbounded_count))
         
         # Performance
         self.performance.enable_caching = os.getenv('XML_ENABLE_CACHING', 'true').lower() == 'true'
+        self.performance.enable_metrics = os.getenv('XML_ENABLE_METRICS', 'false').lower() == 'true'
         self.performance.timeout_seconds = int(os.getenv('XML_TIMEOUT_SECONDS', self.performance.timeout_seconds))
+        self.performance.enable_schema_cache = os.getenv('XML_ENABLE_SCHEMA_CACHE', 'true').lower() == 'true'
+        self.performance.schema_cache_dir = os.getenv('XML_SCHEMA_CACHE_DIR', self.performance.schema_cache_dir)
+        self.performance.schema_registry_max_entries = int(os.getenv('XML_SCHEMA_REGISTRY_MAX_ENTRIES', self.performance.schema_registry_max_entries))
+        self.performance.schema_registry_max_mb = int(os.getenv('XML_SCHEMA_REGISTRY_MAX_MB', self.performance.schema_registry_max_mb))
+        self.performance.analysis_cache_max_entries = int(os.getenv('XML_ANALYSIS_CACHE_MAX_ENTRIES', self.performance.analysis_cache_max_entries))
+        self.performance.analysis_cache_ttl_seconds = int(os.getenv('XML_ANALYSIS_CACHE_TTL', self.performance.analysis_cache_ttl_seconds))
+        self.performance.generation_job_workers = int(os.getenv('XML_GENERATION_JOB_WORKERS', self.performance.generation_job_workers))
+        self.performance.generation_job_retention = int(os.getenv('XML_GENERATION_JOB_RETENTION', self.performance.generation_job_retention))
+        self.performance.validation_max_errors = int(os.getenv('XML_VALIDATION_MAX_ERRORS', self.performance.validation_max_errors))
+        self.performance.enable_fast_validation = os.getenv('XML_ENABLE_FAST_VALIDATION', 'true').lower() == 'true'
+        self.performance.validation_category_limit = int(os.getenv('XML_VALIDATION_CATEGORY_LIMIT', self.performance.validation_category_limit))
+        self.performance.validation_group_exemplars = int(os.getenv('XML_VALIDATION_GROUP_EXEMPLARS', self.performance.validation_group_exemplars))
+        self.performance.blob_store_dir = os.getenv('XML_BLOB_STORE_DIR', self.performance.blob_store_dir)
+        self.performance.workspace_max_age_hours = int(os.getenv('XML_WORKSPACE_MAX_AGE_HOURS', self.performance.workspace_max_age_hours))
+        self.performance.enable_generation_plans = os.getenv('XML_ENABLE_GENERATION_PLANS', 'true').lower() == 'true'
+        self.performance.generation_plan_cache_size = int(os.getenv('XML_GENERATION_PLAN_CACHE_SIZE', self.performance.generation_plan_cache_size))
+        self.performance.generation_workers = int(os.getenv('XML_GENERATION_WORKERS', self.performance.generation_workers))
+        self.performance.enable_subtree_memoization = os.getenv('XML_ENABLE_SUBTREE_MEMO', 'false').lower() == 'true'
+        self.performance.enable_incremental_generation = os.getenv('XML_ENABLE_INCREMENTAL', 'false').lower() == 'true'
         
         # UI settings
         self.ui.show_debug_info = os.getenv('XML_SHOW_DEBUG', 'false').lower() == 'true'
         self.ui.max_file_upload_mb = int(os.getenv('XML_MAX_UPLOAD_MB', self.ui.max_file_upload_mb))
+        self.ui.tree_page_size = int(os.getenv('XML_TREE_PAGE_SIZE', self.ui.tree_page_size))
+        self.ui.job_poll_interval_seconds = float(os.getenv('XML_JOB_POLL_INTERVAL_SECONDS', self.ui.job_poll_interval_seconds))
     
     def load_from_file(self, config_file: str):
         """Load configuration from a JSON or YAML file."""
@@ -337,14 +391,35 @@ class Config:
                 'max_cache_size': self.performance.max_cache_size,
                 'enable_metrics': self.performance.enable_metrics,
                 'timeout_seconds': self.performance.timeout_seconds,
-                'max_file_size_mb': self.performance.max_file_size_mb
+                'max_file_size_mb': self.performance.max_file_size_mb,
+                'enable_schema_cache': self.performance.enable_schema_cache,
+                'schema_cache_dir': self.performance.schema_cache_dir,
+                'schema_registry_max_entries': self.performance.schema_registry_max_entries,
+                'schema_registry_max_mb': self.performance.schema_registry_max_mb,
+                'blob_store_dir': self.performance.blob_store_dir,
+                'workspace_max_age_hours': self.performance.workspace_max_age_hours,
+                'enable_generation_plans': self.performance.enable_generation_plans,
+                'generation_plan_cache_size': self.performance.generation_plan_cache_size,
+                'generation_workers': self.performance.generation_workers,
+                'enable_subtree_memoization': self.performance.enable_subtree_memoization,
+                'enable_incremental_generation': self.performance.enable_incremental_generation,
+                'analysis_cache_max_entries': self.performance.analysis_cache_max_entries,
+                'analysis_cache_ttl_seconds': self.performance.analysis_cache_ttl_seconds,
+                'generation_job_workers': self.performance.generation_job_workers,
+                'generation_job_retention': self.performance.generation_job_retention,
+                'validation_max_errors': self.performance.validation_max_errors,
+                'enable_fast_validation': self.performance.enable_fast_validation,
+                'validation_category_limit': self.performance.validation_category_limit,
+                'validation_group_exemplars': self.performance.validation_group_exemplars
             },
             'ui': {
                 'default_page_title': self.ui.default_page_title,
                 'max_file_upload_mb': self.ui.max_file_upload_mb,
                 'default_tree_depth': self.ui.default_tree_depth,
                 'show_debug_info': self.ui.show_debug_info,
-                'enable_download': self.ui.enable_download
+                'enable_download': self.ui.enable_download,
+                'tree_page_size': self.ui.tree_page_size,
+                'job_poll_interval_seconds': self.ui.job_poll_interval_seconds
             }
         }
 
@@ -6,8 +6,11 @@ with clean separation of concerns:
 
 - file_manager.py: File operations and temporary directory management
 - xml_validator.py: XML validation against XSD schemas with error categorization  
+- validation_index.py: Single-pass classification of validation errors into records grouped by path template and XSD component
 - schema_analyzer.py: XSD schema analysis and structure extraction
+- schema_walker.py: Single-pass schema traversal with per-type memoized content summaries
 - xslt_processor.py: XSLT transformations and equivalence testing
+- generation_jobs.py: Bounded background runner for XML generations with progress, cancellation and result handles
 
 Each service is designed to be independently testable and follows the Single
 Responsibility Principle for maintainable, modular code.
@@ -2,14 +2,28 @@
 File Management Service for XML Wizard.
 
 This module handles file operations including temporary directory management,
-XSD dependency resolution, and file copying operations.
+XSD dependency resolution, and file copying operations. Dependencies are kept
+in a content-addressed blob store and linked into per-upload workspaces, so
+repeated uploads of the same schema bundle only cost metadata operations.
 """
 
 import os
+import json
+import time
+import hashlib
 import tempfile
 import shutil
-from typing import Optional
+import threading
+from typing import Dict, Any, Optional, Set
 from config import get_config
+from utils.xsd_dependency_resolver import get_dependency_resolver
+
+
+# Guards the on-disk index shared by all FileManager instances in the process
+_index_lock = threading.Lock()
+
+# Minimum seconds between opportunistic garbage collection runs
+GC_INTERVAL_SECONDS = 600
 
 
 class FileManager:
@@ -24,6 +38,26 @@ class FileManager:
         """
         self.config = config_instance or get_config()
     
+    @property
+    def store_dir(self) -> str:
+        """Root directory of the blob store, workspaces and file index."""
+        return self.config.performance.blob_store_dir
+    
+    @property
+    def blob_dir(self) -> str:
+        """Directory holding content-addressed blobs."""
+        return os.path.join(self.store_dir, 'blobs')
+    
+    @property
+    def workspace_dir(self) -> str:
+        """Directory holding per-upload workspaces."""
+        return os.path.join(self.store_dir, 'workspaces')
+    
+    @property
+    def index_path(self) -> str:
+        """Path of the persistent filename and hash index."""
+        return os.path.join(self.store_dir, 'index.json')
+    
     def setup_temp_directory_with_dependencies(self, xsd_file_path: str, xsd_file_name: str, source_xsd_path: str = None) -> None:
         """
         Set up temporary directory with XSD dependencies from the same directory as the source XSD.
@@ -35,6 +69,7 @@ class FileManager:
         """
         try:
             temp_dir = os.path.dirname(xsd_file_path)
+            self.touch_workspace(xsd_file_path)
             if not os.path.exists(temp_dir):
                 print(f"Warning: Temp directory not found: {temp_dir}")
                 return
@@ -44,33 +79,67 @@ class FileManager:
             
             if source_dir and os.path.exists(source_dir):
                 print(f"Looking for dependencies in: {source_dir}")
-                print(f"Copying to temp directory: {temp_dir}")
+                print(f"Linking into temp directory: {temp_dir}")
+                
+                # Link only the files the schema actually imports or includes
+                closure = get_dependency_resolver().resolve(xsd_file_path, search_dirs=[source_dir])
+                if closure.is_schema:
+                    dependency_paths = closure.dependencies
+                    for location in closure.unresolved:
+                        print(f"Warning: Could not resolve schema location: {location}")
+                else:
+                    # Header could not be read as an XSD; fall back to every sibling schema
+                    dependency_paths = [
+                        os.path.join(source_dir, filename)
+                        for filename in sorted(os.listdir(source_dir))
+                        if filename.endswith('.xsd') and filename != xsd_file_name
+                    ]
                 
-                # Copy all XSD files from source directory except the main file
-                for filename in os.listdir(source_dir):
-                    if filename.endswith('.xsd') and filename != xsd_file_name:
-                        try:
-                            src_path = os.path.join(source_dir, filename)
-                            dst_path = os.path.join(temp_dir, filename)
-                            
-                            # Skip copying if source and destination are the same
-                            if os.path.abspath(src_path) == os.path.abspath(dst_path):
-                                print(f"Skipping {filename}: source and destination are the same")
-                                continue
-                            
-                            if os.path.exists(src_path) and os.path.isfile(src_path):
-                                with open(src_path, 'rb') as src_file:
-                                    with open(dst_path, 'wb') as dst_file:
-                                        dst_file.write(src_file.read())
-                                print(f"Copied dependency: {filename}")
-                        except Exception as e:
-                            print(f"Warning: Could not copy {filename}: {e}")
+                # Read the index once and write the new hashes with a single update
+                known_hashes = self._load_index()['hashes']
+                new_hashes = {}
+                for src_path in dependency_paths:
+                    filename = os.path.basename(src_path)
+                    try:
+                        dst_path = self._dependency_destination(src_path, source_dir, temp_dir)
+                        
+                        # Skip copying if source and destination are the same
+                        if os.path.abspath(src_path) == os.path.abspath(dst_path):
+                            print(f"Skipping {filename}: source and destination are the same")
+                            continue
+                        
+                        if os.path.exists(src_path) and os.path.isfile(src_path):
+                            digest = self.store_blob(src_path, known_hashes, new_hashes)
+                            method = self.link_blob(digest, dst_path)
+                            print(f"Linked dependency ({method}): {filename}")
+                    except Exception as e:
+                        print(f"Warning: Could not link {filename}: {e}")
+                
+                if new_hashes:
+                    self._update_index(hashes=new_hashes)
             else:
                 print(f"Warning: Could not find source directory for {xsd_file_name}")
                         
         except Exception as e:
             print(f"Warning: Error setting up dependencies: {e}")
     
+    def _dependency_destination(self, src_path: str, source_dir: str, temp_dir: str) -> str:
+        """
+        Get the temp directory path for a dependency, preserving its layout relative to the source.
+        
+        Args:
+            src_path: Path of the dependency in the source location
+            source_dir: Directory of the original XSD file
+            temp_dir: Temporary directory holding the uploaded XSD
+            
+        Returns:
+            Destination path inside the temporary directory
+        """
+        relative_path = os.path.relpath(src_path, source_dir)
+        if relative_path.startswith(os.pardir):
+            relative_path = os.path.basename(src_path)
+        return os.path.join(temp_dir, relative_path)
+    
     def _find_source_directory(self, xsd_file_name: str, source_xsd_path: str = None) -> Optional[str]:
         """
         Find the source directory containing the XSD file and its dependencies.
@@ -84,15 +153,31 @@ class FileManager:
         """
         # If we have the source path, use its directory
         if source_xsd_path and os.path.exists(source_xsd_path):
-            return os.path.dirname(source_xsd_path)
+            source_dir = os.path.dirname(os.path.abspath(source_xsd_path))
+            self._update_index(directories={xsd_file_name: source_dir})
+            return source_dir
+        
+        # Then consult the persistent filename -> directory index
+        indexed_dir = self._load_index()['directories'].get(xsd_file_name)
+        if indexed_dir and os.path.isfile(os.path.join(indexed_dir, xsd_file_name)):
+            return indexed_dir
         
-        # Otherwise, search in current working directory and subdirectories
+        # Fall back to a single walk of the working directory, indexing every
+        # schema seen on the way so later lookups skip the walk entirely
         current_dir = os.getcwd()
+        found_dir = None
+        discovered = {}
         for root, dirs, files in os.walk(current_dir):
+            for filename in files:
+                if filename.endswith('.xsd'):
+                    discovered.setdefault(filename, root)
             if xsd_file_name in files:
-                return root
+                found_dir = root
+                break
         
-        return None
+        if discovered:
+            self._update_index(directories=discovered)
+        return found_dir
     
     def create_temp_file(self, content: str, suffix: str = '.xml', encoding: str = 'utf-8') -> str:
         """
@@ -173,4 +258,227 @@ class FileManager:
         # Set up dependencies
         self.setup_temp_directory_with_dependencies(temp_xsd_path, xsd_filename, source_xsd_path)
         
-        return temp_xsd_path, temp_dir
\ No newline at end of file
+        return temp_xsd_path, temp_dir
+    
+    def create_workspace(self) -> str:
+        """
+        Create a per-upload workspace directory inside the blob store.
+        
+        Workspaces share a filesystem with the blob store so dependencies can
+        be hardlinked. Stale workspaces are collected opportunistically.
+        
+        Returns:
+            Path to the created workspace directory
+        """
+        os.makedirs(self.workspace_dir, exist_ok=True)
+        if time.time() - self._load_index().get('last_gc', 0) > GC_INTERVAL_SECONDS:
+            self.collect_garbage()
+        return tempfile.mkdtemp(prefix='ws_', dir=self.workspace_dir)
+    
+    def touch_workspace(self, path: str) -> None:
+        """
+        Mark the workspace holding a path as in use, so garbage collection keeps it.
+        
+        Workspaces are collected by the age of their directory, which this
+        refreshes; paths outside the workspace directory are ignored.
+        
+        Args:
+            path: A workspace or a file inside one
+        """
+        workspace_dir = os.path.abspath(self.workspace_dir)
+        try:
+            relative = os.path.relpath(os.path.abspath(path), workspace_dir)
+            if relative in (os.curdir, os.pardir) or relative.startswith(os.pardir + os.sep):
+                return
+            os.utime(os.path.join(workspace_dir, relative.split(os.sep)[0]))
+        except (OSError, ValueError):
+            pass
+    
+    def store_blob(self, file_path: str, known_hashes: Optional[Dict[str, list]] = None,
+                   new_hashes: Optional[Dict[str, list]] = None) -> str:
+        """
+        Store a file in the content-addressed blob store.
+        
+        File hashes are remembered by (size, mtime), so storing an unchanged
+        file again only costs a stat call.
+        
+        Args:
+            file_path: Path of the file to store
+            known_hashes: Hash entries of an already loaded index (the index
+                is read when omitted)
+            new_hashes: Collects the file's new hash entry for the caller to
+                write (the index is updated immediately when omitted)
+            
+        Returns:
+            SHA-256 digest identifying the stored blob
+        """
+        file_path = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        signature = [stat.st_size, stat.st_mtime_ns]
+        
+        if known_hashes is None:
+            known_hashes = self._load_index()['hashes']
+        known = known_hashes.get(file_path)
+        if known and known[:2] == signature and os.path.exists(self._blob_path(known[2])):
+            return known[2]
+        
+        hasher = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                hasher.update(block)
+        digest = hasher.hexdigest()
+        
+        blob_path = self._blob_path(digest)
+        if not os.path.exists(blob_path):
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(blob_path), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as dst_file, open(file_path, 'rb') as src_file:
+                    shutil.copyfileobj(src_file, dst_file)
+                # Blobs are shared through hardlinks, so they must never be modified
+                os.chmod(temp_path, 0o444)
+                os.replace(temp_path, blob_path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.unlink(temp_path)
+        
+        if new_hashes is not None:
+            new_hashes[file_path] = signature + [digest]
+        else:
+            self._update_index(hashes={file_path: signature + [digest]})
+        return digest
+    
+    def link_blob(self, digest: str, destination: str) -> str:
+        """
+        Place a stored blob at a destination path without copying bytes where possible.
+        
+        Args:
+            digest: Digest of a stored blob
+            destination: Path where the blob should appear
+            
+        Returns:
+            The method used: 'hardlink', 'symlink' or 'copy'
+        """
+        blob_path = self._blob_path(digest)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        if os.path.lexists(destination):
+            os.unlink(destination)
+        
+        try:
+            os.link(blob_path, destination)
+            return 'hardlink'
+        except OSError:
+            pass
+        
+        try:
+            os.symlink(blob_path, destination)
+            # Symlinks do not show in the link count; refresh the blob's age instead
+            os.utime(blob_path)
+            return 'symlink'
+        except OSError:
+            pass
+        
+        shutil.copyfile(blob_path, destination)
+        return 'copy'
+    
+    def collect_garbage(self, max_age_hours: Optional[float] = None) -> Dict[str, int]:
+        """
+        Remove stale workspaces and blobs no workspace references any more.
+        
+        Workspaces are removed once they have not been used (see
+        touch_workspace) for longer than the age limit. Blobs are removed
+        when they are older than the age limit, their hardlink count shows no
+        remaining references and no remaining workspace symlinks to them.
+        
+        Args:
+            max_age_hours: Age limit (defaults to config workspace_max_age_hours)
+            
+        Returns:
+            Dictionary with the number of workspaces and blobs removed
+        """
+        if max_age_hours is None:
+            max_age_hours = self.config.performance.workspace_max_age_hours
+        cutoff = time.time() - max_age_hours * 3600
+        removed = {'workspaces': 0, 'blobs': 0}
+        
+        if os.path.isdir(self.workspace_dir):
+            for name in os.listdir(self.workspace_dir):
+                workspace = os.path.join(self.workspace_dir, name)
+                try:
+                    if os.path.isdir(workspace) and os.stat(workspace).st_mtime < cutoff:
+                        shutil.rmtree(workspace, ignore_errors=True)
+                        removed['workspaces'] += 1
+                except OSError as e:
+                    print(f"Warning: Could not collect workspace {workspace}: {e}")
+        
+        if os.path.isdir(self.blob_dir):
+            linked_blobs = self._symlinked_blobs()
+            for root, dirs, files in os.walk(self.blob_dir):
+                for filename in files:
+                    blob_path = os.path.join(root, filename)
+                    try:
+                        stat = os.stat(blob_path)
+                        if (stat.st_nlink <= 1 and stat.st_mtime < cutoff
+                                and os.path.realpath(blob_path) not in linked_blobs):
+                            os.unlink(blob_path)
+                            removed['blobs'] += 1
+                    except OSError as e:
+                        print(f"Warning: Could not collect blob {blob_path}: {e}")
+        
+        self._update_index(last_gc=time.time(), prune_missing=True)
+        return removed
+    
+    def _symlinked_blobs(self) -> Set[str]:
+        """Get the resolved targets of every symlink in the remaining workspaces."""
+        targets = set()
+        if not os.path.isdir(self.workspace_dir):
+            return targets
+        for root, dirs, files in os.walk(self.workspace_dir):
+            for filename in files:
+                path = os.path.join(root, filename)
+                if os.path.islink(path):
+                    targets.add(os.path.realpath(path))
+        return targets
+    
+    def _blob_path(self, digest: str) -> str:
+        """Get the storage path of a blob."""
+        return os.path.join(self.blob_dir, digest[:2], digest)
+    
+    def _load_index(self) -> Dict[str, Any]:
+        """Load the persistent store index, returning an empty one if unavailable."""
+        index = {'directories': {}, 'hashes': {}, 'last_gc': 0}
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+        return index
+    
+    def _update_index(self, directories: Optional[Dict[str, str]] = None,
+                      hashes: Optional[Dict[str, list]] = None, last_gc: Optional[float] = None,
+                      prune_missing: bool = False) -> None:
+        """Merge entries into the persistent index and write it atomically."""
+        with _index_lock:
+            index = self._load_index()
+            index['directories'].update(directories or {})
+            index['hashes'].update(hashes or {})
+            if last_gc is not None:
+                index['last_gc'] = last_gc
+            if prune_missing:
+                index['directories'] = {
+                    name: directory for name, directory in index['directories'].items()
+                    if os.path.isfile(os.path.join(directory, name))
+                }
+                index['hashes'] = {
+                    path: entry for path, entry in index['hashes'].items()
+                    if os.path.isfile(path)
+                }
+            
+            try:
+                os.makedirs(self.store_dir, exist_ok=True)
+                fd, temp_path = tempfile.mkstemp(dir=self.store_dir, suffix='.tmp')
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(index, f)
+                os.replace(temp_path, self.index_path)
+            except OSError as e:
+                print(f"Warning: Could not update file index: {e}")
@@ -0,0 +1,242 @@
+"""
+Generation Job Runner for XML Wizard.
+
+This module runs XML generations in the background so the Streamlit script
+thread is free while a long generation is in progress. Jobs run on a bounded
+thread pool. Each job has an id, a GenerationProgress the generator updates
+element by element, cooperative cancellation, and a result held by the runner
+rather than in session state; the UI keeps only the job id and polls. Jobs
+for the same generator run one after another, since a generator holds the
+state of the document it is generating.
+"""
+
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from config import get_config
+from utils.generation_progress import GenerationCancelled, GenerationProgress
+
+
+class GenerationJob:
+    """A background generation and its progress, result or error."""
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+    def __init__(self, description: str, progress: GenerationProgress):
+        """
+        Initialize a job.
+
+        Args:
+            description: Human readable description of the job
+            progress: Progress reporter updated while the job runs
+        """
+        self.id = uuid.uuid4().hex
+        self.description = description
+        self.progress = progress
+        self.status = self.QUEUED
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.submitted_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.future = None
+
+    @property
+    def done(self) -> bool:
+        """Whether the job has completed, failed or been cancelled."""
+        return self.status in (self.COMPLETED, self.FAILED, self.CANCELLED)
+
+    def cancel(self) -> None:
+        """Cancel the job; a running generation stops at its next element."""
+        self.progress.cancel()
+        if self.future is not None and self.future.cancel():
+            self._finish(self.CANCELLED)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the job state for display.
+
+        Returns:
+            Dictionary with id, description, status, error and the progress snapshot
+        """
+        return {
+            'id': self.id,
+            'description': self.description,
+            'status': self.status,
+            'error': self.error,
+            'progress': self.progress.snapshot()
+        }
+
+    def _finish(self, status: str, result: Any = None, error: Optional[str] = None) -> None:
+        self.result = result
+        self.error = error
+        self.finished_at = time.time()
+        self.progress.finish()
+        self.status = status
+
+
+class GenerationJobRunner:
+    """Bounded thread pool running generation jobs with progress and cancellation."""
+
+    def __init__(self, max_workers: Optional[int] = None, max_finished_jobs: Optional[int] = None,
+                 config_instance=None):
+        """
+        Initialize the job runner.
+
+        Args:
+            max_workers: Jobs running at the same time (defaults to config value)
+            max_finished_jobs: Finished jobs whose results are kept (defaults to config value)
+            config_instance: Configuration instance (uses global config if None)
+        """
+        self.config = config_instance or get_config()
+        performance = self.config.performance
+        self.max_workers = max_workers if max_workers is not None else performance.generation_job_workers
+        self.max_finished_jobs = (max_finished_jobs if max_finished_jobs is not None
+                                  else performance.generation_job_retention)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, self.max_workers),
+                                            thread_name_prefix='xml-generation')
+        self._jobs: "OrderedDict[str, GenerationJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Per generator: serializes its jobs and remembers its last element count for ETAs
+        self._generator_locks = weakref.WeakKeyDictionary()
+        self._element_counts = weakref.WeakKeyDictionary()
+
+    def submit(self, target: Callable[[GenerationProgress], Any], description: str = "",
+               expected_elements: Optional[int] = None) -> GenerationJob:
+        """
+        Run a callable in the background.
+
+        Args:
+            target: Callable receiving the job's progress reporter and returning the result
+            description: Human readable description of the job
+            expected_elements: Element count used to estimate the time remaining
+
+        Returns:
+            The queued job
+        """
+        job = GenerationJob(description, GenerationProgress(expected_elements))
+        with self._lock:
+            self._jobs[job.id] = job
+            self._evict_finished()
+        job.future = self._executor.submit(self._run, job, target)
+        return job
+
+    def submit_generation(self, generator, description: str = "", **options) -> GenerationJob:
+        """
+        Generate XML with a generator in the background.
+
+        The generator reports each element to the job's progress while it walks
+        the schema; the job result is the XML string.
+
+        Args:
+            generator: XMLGenerator to generate with
+            description: Human readable description of the job
+            **options: Keyword arguments of XMLGenerator.generate_dummy_xml_with_options
+
+        Returns:
+            The queued job
+        """
+        with self._lock:
+            generator_lock = self._generator_locks.setdefault(generator, threading.Lock())
+            expected_elements = self._element_counts.get(generator)
+
+        def generate(progress: GenerationProgress) -> str:
+            with generator_lock:
+                generator.progress = progress
+                try:
+                    xml_content = generator.generate_dummy_xml_with_options(**options)
+                finally:
+                    generator.progress = None
+            with self._lock:
+                self._element_counts[generator] = progress.elements
+            return xml_content
+
+        return self.submit(generate, description or "XML generation", expected_elements)
+
+    def get(self, job_id: Optional[str]) -> Optional[GenerationJob]:
+        """Get a job by id, or None if it is unknown or was evicted."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: Optional[str]) -> bool:
+        """
+        Cancel a job.
+
+        Args:
+            job_id: Id of the job
+
+        Returns:
+            True if the job was found and had not finished
+        """
+        job = self.get(job_id)
+        if job is None or job.done:
+            return False
+        job.cancel()
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get job counts by status.
+
+        Returns:
+            Dictionary with the worker count and the number of jobs per status
+        """
+        with self._lock:
+            stats = {'workers': self.max_workers, 'jobs': len(self._jobs)}
+            for job in self._jobs.values():
+                stats[job.status] = stats.get(job.status, 0) + 1
+            return stats
+
+    def shutdown(self, cancel_running: bool = True) -> None:
+        """Stop accepting jobs, optionally cancelling the queued and running ones."""
+        if cancel_running:
+            with self._lock:
+                jobs = list(self._jobs.values())
+            for job in jobs:
+                if not job.done:
+                    job.cancel()
+        self._executor.shutdown(wait=True)
+
+    def _run(self, job: GenerationJob, target: Callable[[GenerationProgress], Any]) -> None:
+        """Run a job on a worker thread and record its outcome."""
+        if job.progress.cancelled:
+            job._finish(GenerationJob.CANCELLED)
+            return
+        job.status = GenerationJob.RUNNING
+        job.progress.start()
+        try:
+            result = target(job.progress)
+        except GenerationCancelled:
+            job._finish(GenerationJob.CANCELLED)
+        except Exception as e:
+            job._finish(GenerationJob.FAILED, error=str(e))
+        else:
+            job._finish(GenerationJob.COMPLETED, result=result)
+
+    def _evict_finished(self) -> None:
+        """Drop the oldest finished jobs beyond the retention limit."""
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job_id]
+
+
+_job_runner: Optional[GenerationJobRunner] = None
+_job_runner_lock = threading.Lock()
+
+
+def get_job_runner() -> GenerationJobRunner:
+    """Get the process-wide generation job runner."""
+    global _job_runner
+    if _job_runner is None:
+        with _job_runner_lock:
+            if _job_runner is None:
+                _job_runner = GenerationJobRunner()
+    return _job_runner
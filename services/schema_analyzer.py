@@ -9,6 +9,7 @@ element tree structure extraction.
 from typing import Dict, Any, Optional, List, Tuple, Set
 from utils.xsd_parser import XSDParser
 from config import get_config
+from .schema_walker import LazyElementTree, SchemaWalker
 
 
 class SchemaAnalyzer:
@@ -23,15 +24,21 @@ class SchemaAnalyzer:
         """
         self.config = config_instance or get_config()
     
-    def analyze_xsd_schema(self, xsd_file_path: str) -> Dict[str, Any]:
+    def analyze_xsd_schema(self, xsd_file_path: str, lazy: bool = False,
+                           root_element: Optional[str] = None) -> Dict[str, Any]:
         """
         Analyze XSD schema to extract choice elements and structure.
         
         Args:
             xsd_file_path: Path to the XSD file
+            lazy: Analyze a single root element and build its tree on demand
+            root_element: Root element of a lazy analysis (default: the first complex
+                global element, which is the one XML generation starts from)
             
         Returns:
-            Dictionary containing schema analysis
+            Dictionary containing schema analysis; a lazy analysis also contains the
+            analyzed 'root_element', the 'complex_roots' it can be switched to and
+            the 'lazy_tree' whose root node is the only entry of 'element_tree'
         """
         try:
             parser = XSDParser(xsd_file_path)
@@ -43,29 +50,46 @@ class SchemaAnalyzer:
             unbounded_elements = []
             element_tree = {}
             
-            if parser.schema:
+            # One walk per global element builds the tree and both catalogs; types are inspected once
+            walker = SchemaWalker(self.config)
+            if parser.schema and lazy:
+                complex_roots = [name for name, info in root_elements.items() if info['is_complex']]
+                if root_element is None and complex_roots:
+                    root_element = complex_roots[0]
+                if root_element not in complex_roots:
+                    raise ValueError(f"Root element '{root_element}' is not a complex global element")
+                
+                # Only the root's catalogs are walked; its tree starts with the root node alone
+                element = parser.schema.elements[root_element]
+                walked = walker.walk(element, root_element, build_tree=False)
+                choices.extend(walked['choices'])
+                unbounded_elements.extend(walked['unbounded'])
+                lazy_tree = LazyElementTree(walker, element, root_element)
+                element_tree[root_element] = lazy_tree.root
+            elif parser.schema:
                 for element_name, element in parser.schema.elements.items():
                     if element.type and element.type.is_complex():
-                        tree_data = self.extract_element_tree(element, element_name)
-                        element_tree[element_name] = tree_data
-                        
-                        # Enhanced choice extraction - find ALL choices including nested ones
-                        element_choices = self.extract_all_choice_elements(element, element_name)
-                        if element_choices:
-                            choices.extend(element_choices)
-                        
-                        # Find unbounded elements
-                        unbounded = self.find_unbounded_elements(element)
-                        unbounded_elements.extend(unbounded)
+                        walked = walker.walk(element, element_name)
+                        element_tree[element_name] = walked['tree']
+                        choices.extend(walked['choices'])
+                        unbounded_elements.extend(walked['unbounded'])
             
-            return {
+            analysis = {
                 'schema_info': schema_info,
                 'root_elements': root_elements,
                 'choices': choices,
                 'unbounded_elements': unbounded_elements,
                 'element_tree': element_tree,
+                'type_statistics': walker.type_statistics,
                 'success': True
             }
+            if lazy and element_tree:
+                analysis.update({
+                    'root_element': root_element,
+                    'complex_roots': complex_roots,
+                    'lazy_tree': lazy_tree
+                })
+            return analysis
         except Exception as e:
             return {
                 'error': str(e),
@@ -0,0 +1,527 @@
+"""
+Schema Walker for XML Wizard.
+
+This module provides the single-pass traversal behind SchemaAnalyzer.analyze_xsd_schema.
+One walk over a global element produces its display tree, its choice catalog,
+its unbounded element catalog and per-type statistics together. The content
+model of each XSD type (choice groups, child elements, simple type labels) is
+inspected once and shared by every element of that type, across all global
+elements of the schema, so a type used in many places is not walked again.
+
+LazyElementTree is the on-demand alternative to the display tree: it holds
+the root node only, builds a node's children the first time they are
+requested, page by page, and reuses the walker's per-type summaries, so the
+cost of showing a schema depends on what is expanded rather than on its size.
+"""
+
+import threading
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+
+CHOICE_MAX_DEPTH = 6  # Choices deeper than this are not catalogued
+
+
+class TypeSummary:
+    """Content model of one XSD type, inspected once per walk."""
+
+    __slots__ = (
+        'xsd_type', 'label', 'type_info', 'has_tree_content', 'tree_is_choice', 'tree_choice_options',
+        'tree_children', 'tree_pattern_options', 'tree_error', 'has_choice_content', 'choice_groups',
+        'choice_children', 'pattern_choice', 'unbounded_children'
+    )
+
+    def __init__(self, xsd_type: Any):
+        self.xsd_type = xsd_type
+        self.label = str(xsd_type)
+        self.type_info: Optional[str] = None
+        self.has_tree_content = False
+        self.tree_is_choice = False
+        self.tree_choice_options: List[Dict[str, Any]] = []
+        self.tree_children: List[Any] = []
+        self.tree_pattern_options: Optional[List[Dict[str, Any]]] = None
+        self.tree_error: Optional[str] = None
+        self.has_choice_content = False
+        self.choice_groups: List[Dict[str, Any]] = []
+        self.choice_children: List[Any] = []
+        self.pattern_choice: Optional[Dict[str, Any]] = None
+        self.unbounded_children: List[Tuple[str, Any]] = []
+
+
+class SchemaWalker:
+    """Visitor producing tree, choice, unbounded and type catalogs in one traversal."""
+
+    def __init__(self, config):
+        """
+        Initialize the walker.
+
+        Args:
+            config: Configuration instance (tree depth and choice patterns)
+        """
+        self.config = config
+        self.choice_patterns = config.get_choice_patterns('iata')
+        self.type_statistics: Dict[str, Dict[str, Any]] = {}
+        self._summaries: Dict[int, TypeSummary] = {}
+        self._truthy: Dict[int, Tuple[Any, bool]] = {}
+
+    def walk(self, element, element_name: str, build_tree: bool = True) -> Dict[str, Any]:
+        """
+        Walk one global element.
+
+        Args:
+            element: Global XSD element with a complex type
+            element_name: Name of the element in the schema
+            build_tree: Whether to build the display tree (None in the result otherwise)
+
+        Returns:
+            Dictionary with the element's 'tree', 'choices' and 'unbounded' elements
+        """
+        self._tree_seen: Set[Tuple[str, str]] = set()
+        self._choice_seen: Set[Tuple[str, str, int]] = set()
+        self._choices: List[Dict[str, Any]] = []
+
+        tree = self._visit(element, element_name, element_name, 0, build_tree, True)
+        return {
+            'tree': tree,
+            'choices': self._unique_choices(self._choices),
+            'unbounded': self._find_unbounded(element)
+        }
+
+    def summary(self, xsd_type: Any) -> TypeSummary:
+        """Get the memoized content model summary of a type."""
+        summary = self._summaries.get(id(xsd_type))
+        if summary is None:
+            summary = self._summaries[id(xsd_type)] = self._summarize(xsd_type)
+        return summary
+
+    def _visit(self, element, element_name: str, path: str, level: int,
+               in_tree: bool, in_choices: bool) -> Optional[Dict[str, Any]]:
+        """Visit one element position; returns its tree node when in_tree is set."""
+        xsd_type = getattr(element, 'type', None)
+        summary = self.summary(xsd_type) if xsd_type is not None else None
+        # Elements without children are falsy; like types, they are not tracked for repeats
+        tracked = self._is_truthy(element) and bool(xsd_type)
+
+        # Choice catalog: positions deeper than CHOICE_MAX_DEPTH or seen before are skipped
+        if in_choices:
+            if level > CHOICE_MAX_DEPTH:
+                in_choices = False
+            elif tracked:
+                choice_key = (path, summary.label, level)
+                if choice_key in self._choice_seen:
+                    in_choices = False
+                else:
+                    self._choice_seen.add(choice_key)
+        choice_content = in_choices and summary is not None and summary.has_choice_content
+
+        tree_data = None
+        if in_tree:
+            tree_data = self._tree_node(element, element_name, level, summary, self._tree_seen if tracked else None)
+        expanded = tree_data is not None and tree_data.pop('_expand', False)
+        if tree_data is not None or choice_content:
+            self._record_statistics(element_name, summary, level)
+        if not expanded and not choice_content:
+            return tree_data
+
+        path_choices = 0
+        if choice_content:
+            for group in summary.choice_groups:
+                self._choices.append(self._choice_at(group, path))
+            path_choices = len(summary.choice_groups)
+
+        # Merge the tree's children into the choice walk's children, keeping both orders
+        pending = list(summary.tree_children) if expanded else []
+        pending.reverse()
+        tree_children = expanded
+        for child in (summary.choice_children if choice_content else []):
+            if pending and pending[-1] is child:
+                pending.pop()
+                tree_children = self._visit_tree_child(tree_data, child, path, level, True)
+            else:
+                self._visit(child, child.local_name, f"{path}.{child.local_name}", level + 1, False, True)
+        while pending and tree_children:
+            tree_children = self._visit_tree_child(tree_data, pending.pop(), path, level, False)
+
+        if expanded and '_error' not in tree_data and summary.tree_pattern_options is not None:
+            tree_data['is_choice'] = True
+            tree_data['choice_options'] = [dict(option) for option in summary.tree_pattern_options]
+        if choice_content and not path_choices and summary.pattern_choice is not None:
+            self._choices.append(self._choice_at(summary.pattern_choice, path))
+        return tree_data
+
+    def _visit_tree_child(self, tree_data: Dict[str, Any], child, path: str, level: int,
+                          in_choices: bool) -> bool:
+        """Visit a child of an expanded tree node; returns False once the node's tree has failed."""
+        if '_error' in tree_data:
+            # A failed tree node only keeps walking for the choice catalog
+            if in_choices:
+                self._visit(child, child.local_name, f"{path}.{child.local_name}", level + 1, False, True)
+            return False
+        try:
+            child_tree = self._visit(child, child.local_name, f"{path}.{child.local_name}", level + 1, True, in_choices)
+        except Exception as e:
+            tree_data['_error'] = f"Error extracting tree: {e}"
+            return False
+        if child_tree and child_tree.get('name'):
+            tree_data['children'].append(child_tree)
+        return True
+
+    def _tree_node(self, element, element_name: str, level: int, summary: Optional[TypeSummary],
+                   seen: Optional[Set[Tuple[str, str]]]) -> Dict[str, Any]:
+        """
+        Create the display tree node of an element; '_expand' marks nodes whose children follow.
+
+        Elements whose (name, type) is already in seen become circular reference
+        stubs; seen is None for elements that are not tracked.
+        """
+        # Prevent circular references
+        if seen is not None:
+            type_key = (element_name, summary.label)
+            if type_key in seen:
+                return self._stub_node(element_name, level, '_circular_ref', f'Circular reference: {element_name}')
+            seen.add(type_key)
+
+        default_depth = self.config.ui.default_tree_depth
+        if level > default_depth:
+            return self._stub_node(element_name, level, '_depth_limit', f'Maximum depth reached ({default_depth})')
+
+        # minOccurs=0 is valid and must be preserved
+        min_occurs = getattr(element, 'min_occurs', None)
+        if min_occurs is None:
+            min_occurs = 1
+        max_occurs = getattr(element, 'max_occurs', 1)
+        if max_occurs is None:
+            max_display, is_unbounded = "unbounded", True
+        elif max_occurs > 1:
+            max_display, is_unbounded = str(max_occurs), True
+        else:
+            max_display, is_unbounded = "1", False
+
+        tree_data = {
+            'name': element_name,
+            'level': level,
+            'children': [],
+            'is_choice': False,
+            'choice_options': [],
+            'is_unbounded': is_unbounded,
+            'occurs': {'min': min_occurs, 'max': max_display}
+        }
+        if summary is None:
+            return tree_data
+        if summary.has_tree_content and level < default_depth + 2:
+            tree_data['is_choice'] = summary.tree_is_choice
+            tree_data['choice_options'] = [dict(option) for option in summary.tree_choice_options]
+            if summary.tree_error is not None:
+                tree_data['_error'] = summary.tree_error
+            else:
+                tree_data['_expand'] = True
+        elif summary.type_info is not None:
+            tree_data['_type_info'] = summary.type_info
+        return tree_data
+
+    def _is_truthy(self, element) -> bool:
+        """Memoized truth value of an element (XSD elements count their children)."""
+        entry = self._truthy.get(id(element))
+        if entry is None:
+            entry = self._truthy[id(element)] = (element, bool(element))
+        return entry[1]
+
+    @staticmethod
+    def _stub_node(element_name: str, level: int, marker: str, message: str) -> Dict[str, Any]:
+        return {
+            'name': element_name,
+            'level': level,
+            'children': [],
+            'is_choice': False,
+            'choice_options': [],
+            'is_unbounded': False,
+            'occurs': {'min': 1, 'max': '1'},
+            marker: message
+        }
+
+    @staticmethod
+    def _choice_at(group: Dict[str, Any], path: str) -> Dict[str, Any]:
+        choice = dict(group)
+        choice['elements'] = [dict(option) for option in group['elements']]
+        choice['path'] = path
+        return choice
+
+    @staticmethod
+    def _unique_choices(choices: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Remove duplicate choices with the same path and element names."""
+        unique_choices = []
+        seen_choices = set()
+        for choice in choices:
+            choice_id = (choice['path'], tuple(sorted(elem['name'] for elem in choice['elements'])))
+            if choice_id not in seen_choices:
+                seen_choices.add(choice_id)
+                unique_choices.append(choice)
+        return unique_choices
+
+    def _find_unbounded(self, element) -> List[Dict[str, Any]]:
+        """Unbounded catalog of a global element: the element itself and its direct children."""
+        unbounded = []
+        current_path = element.local_name
+        try:
+            if hasattr(element, 'max_occurs') and (element.max_occurs is None or element.max_occurs > 1):
+                unbounded.append({
+                    'name': element.local_name,
+                    'path': current_path,
+                    'max_occurs': "unbounded" if element.max_occurs is None else element.max_occurs
+                })
+            for name, max_val in self.summary(element.type).unbounded_children:
+                unbounded.append({'name': name, 'path': f"{current_path}.{name}", 'max_occurs': max_val})
+        except Exception:
+            pass
+        return unbounded
+
+    def _record_statistics(self, element_name: str, summary: Optional[TypeSummary], level: int) -> None:
+        """Count an element position against its type."""
+        if summary is None:
+            return
+        type_name = getattr(summary.xsd_type, 'local_name', None)
+        if not isinstance(type_name, str) or not type_name:
+            type_name = f"{element_name} (anonymous)"
+        stats = self.type_statistics.get(type_name)
+        if stats is None:
+            stats = self.type_statistics[type_name] = {
+                'occurrences': 0,
+                'min_level': level,
+                'child_elements': len(summary.choice_children or summary.tree_children),
+                'choice_groups': len({tuple(sorted(option['name'] for option in group['elements']))
+                                      for group in summary.choice_groups})
+            }
+        stats['occurrences'] += 1
+        stats['min_level'] = min(stats['min_level'], level)
+
+    def _summarize(self, xsd_type: Any) -> TypeSummary:
+        """Inspect a type's content model once."""
+        summary = TypeSummary(xsd_type)
+        try:
+            is_complex = xsd_type.is_complex()
+        except Exception:
+            return summary
+        content = getattr(xsd_type, 'content', None) if is_complex else None
+
+        if is_complex and content:
+            self._summarize_tree(summary, content)
+            self._summarize_choices(summary, content)
+            self._summarize_unbounded(summary, content)
+        elif not is_complex:
+            try:
+                if xsd_type.is_simple():
+                    summary.type_info = f"Simple type: {xsd_type.local_name or summary.label}"
+            except Exception:
+                pass
+        return summary
+
+    def _summarize_tree(self, summary: TypeSummary, content: Any) -> None:
+        """Display tree part: choice options and children with a name and type."""
+        summary.has_tree_content = True
+        try:
+            try:
+                for item in content.iter_components():
+                    if hasattr(item, 'model') and item.model == 'choice':
+                        summary.tree_is_choice = True
+                        try:
+                            for choice_item in item.iter_elements():
+                                summary.tree_choice_options.append({
+                                    'name': choice_item.local_name or 'UnknownChoice',
+                                    'min_occurs': self._min_occurs(choice_item),
+                                    'max_occurs': self._max_occurs_display(choice_item)
+                                })
+                        except AttributeError:
+                            pass
+            except AttributeError:
+                pass
+
+            try:
+                summary.tree_children = [
+                    item for item in content.iter_elements()
+                    if hasattr(item, 'local_name') and item.local_name and hasattr(item, 'type') and item.type
+                ]
+            except AttributeError:
+                try:
+                    if hasattr(content, '_group'):
+                        summary.tree_children = [
+                            item for item in content._group if hasattr(item, 'local_name') and item.local_name
+                        ]
+                except Exception:
+                    pass
+        except Exception as e:
+            error_msg = str(e)
+            if "iter_elements" in error_msg:
+                summary.tree_error = "Simple type element (no children)"
+            elif "iter_components" in error_msg:
+                summary.tree_error = "Complex type without accessible components"
+            else:
+                summary.tree_error = f"Error extracting tree: {error_msg}"
+            return
+
+        # Schema-specific choice patterns (like IATA Error/Response)
+        if not summary.tree_is_choice:
+            child_names = [child.local_name for child in summary.tree_children]
+            if self.choice_patterns and all(pattern in child_names for pattern in self.choice_patterns):
+                summary.tree_pattern_options = [
+                    {'name': pattern, 'min_occurs': 1, 'max_occurs': 'unbounded' if pattern == 'Error' else '1'}
+                    for pattern in self.choice_patterns
+                ]
+
+    def _summarize_choices(self, summary: TypeSummary, content: Any) -> None:
+        """Choice catalog part: choice groups, named children and pattern choices."""
+        summary.has_choice_content = True
+        try:
+            for item in content.iter_components():
+                if hasattr(item, 'model') and item.model == 'choice':
+                    self._add_choice_group(summary, item)
+        except (AttributeError, TypeError):
+            pass
+        try:
+            if hasattr(content, '_group'):
+                for group_item in content._group:
+                    if hasattr(group_item, 'model') and str(group_item.model) == 'choice':
+                        self._add_choice_group(summary, group_item, require_iter=True)
+        except (AttributeError, TypeError):
+            pass
+        try:
+            summary.choice_children = [
+                item for item in content.iter_elements() if hasattr(item, 'local_name') and item.local_name
+            ]
+        except (AttributeError, TypeError):
+            pass
+
+        child_names = [item.local_name for item in summary.choice_children]
+        if self.choice_patterns and all(pattern in child_names for pattern in self.choice_patterns):
+            summary.pattern_choice = {
+                'type': 'choice',
+                'min_occurs': 1,
+                'max_occurs': 1,
+                'elements': [
+                    {'name': pattern, 'type': 'schema_pattern', 'min_occurs': 1,
+                     'max_occurs': 'unbounded' if pattern == 'Error' else '1'}
+                    for pattern in self.choice_patterns
+                ]
+            }
+
+    def _add_choice_group(self, summary: TypeSummary, group: Any, require_iter: bool = False) -> None:
+        group_min = getattr(group, 'min_occurs', None)
+        group_max = getattr(group, 'max_occurs', None)
+        choice_info = {
+            'type': 'choice',
+            'min_occurs': 1 if group_min is None else group_min,
+            'max_occurs': 1 if group_max is None else group_max,
+            'elements': []
+        }
+        try:
+            if not require_iter or hasattr(group, 'iter_elements'):
+                for choice_item in group.iter_elements():
+                    if hasattr(choice_item, 'local_name') and choice_item.local_name:
+                        choice_info['elements'].append({
+                            'name': choice_item.local_name,
+                            'type': str(choice_item.type) if choice_item.type else 'unknown',
+                            'min_occurs': self._min_occurs(choice_item),
+                            'max_occurs': self._max_occurs_display(choice_item)
+                        })
+        except (AttributeError, TypeError):
+            pass
+        if choice_info['elements']:
+            summary.choice_groups.append(choice_info)
+
+    def _summarize_unbounded(self, summary: TypeSummary, content: Any) -> None:
+        """Unbounded catalog part: direct children that may repeat."""
+        try:
+            for item in content.iter_elements():
+                if hasattr(item, 'max_occurs') and (item.max_occurs is None or item.max_occurs > 1):
+                    max_val = "unbounded" if item.max_occurs is None else item.max_occurs
+                    summary.unbounded_children.append((item.local_name, max_val))
+        except Exception:
+            summary.unbounded_children = []
+
+    @staticmethod
+    def _min_occurs(element) -> Any:
+        min_occurs = getattr(element, 'min_occurs', None)
+        return 1 if min_occurs is None else min_occurs
+
+    @staticmethod
+    def _max_occurs_display(element) -> str:
+        max_occurs = getattr(element, 'max_occurs', 1)
+        return "unbounded" if max_occurs is None else str(max_occurs)
+
+
+class LazyElementTree:
+    """Display tree of one global element whose children are built on first request."""
+
+    def __init__(self, walker: SchemaWalker, element, element_name: str):
+        """
+        Initialize the tree with its root node only.
+
+        Args:
+            walker: Walker providing the per-type summaries, shared with other trees of the schema
+            element: Global XSD element with a complex type
+            element_name: Name of the element in the schema
+        """
+        self.walker = walker
+        self._lock = threading.Lock()  # Trees are shared by UI sessions; nodes are built under the lock
+        self._nodes: Dict[int, Dict[str, Any]] = {}
+        # Node id -> (element, summary, (name, type) keys of the node and its ancestors)
+        self._sources: Dict[int, Tuple[Any, TypeSummary, FrozenSet[Tuple[str, str]]]] = {}
+        self.root = self._node(element, element_name, element_name, 0, frozenset())
+
+    def node(self, node_id: int) -> Dict[str, Any]:
+        """Get a node built so far by its id."""
+        with self._lock:
+            return self._nodes[node_id]
+
+    def children(self, node_id: int, offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get a page of a node's children, building the ones not requested before.
+
+        Built children are also kept in the node's 'children' list, in schema order.
+
+        Args:
+            node_id: Id of the parent node
+            offset: Index of the first child to return
+            limit: Maximum number of children to return (None for all)
+
+        Returns:
+            List of child nodes; their 'child_count' tells whether they have children of their own
+        """
+        with self._lock:
+            node = self._nodes[node_id]
+            total = node['child_count']
+            end = total if limit is None else min(total, offset + limit)
+            loaded = node['children']
+            if len(loaded) < end:
+                element, summary, ancestors = self._sources[node_id]
+                for child in summary.tree_children[len(loaded):end]:
+                    try:
+                        loaded.append(self._node(child, child.local_name, f"{node['path']}.{child.local_name}",
+                                                 node['level'] + 1, ancestors))
+                    except Exception as e:
+                        # Like the eager tree, a failing child ends the node's children
+                        node['_error'] = f"Error extracting tree: {e}"
+                        node['child_count'] = len(loaded)
+                        break
+            return loaded[offset:end]
+
+    def _node(self, element, element_name: str, path: str, level: int,
+              ancestors: FrozenSet[Tuple[str, str]]) -> Dict[str, Any]:
+        """Create a node without children; repeats are detected along the node's ancestors."""
+        walker = self.walker
+        xsd_type = getattr(element, 'type', None)
+        summary = walker.summary(xsd_type) if xsd_type is not None else None
+        tracked = walker._is_truthy(element) and bool(xsd_type)
+
+        seen = set(ancestors) if tracked else None
+        node = walker._tree_node(element, element_name, level, summary, seen)
+        node['id'] = len(self._nodes)
+        node['path'] = path
+        node['child_count'] = 0
+        self._nodes[node['id']] = node
+
+        if node.pop('_expand', False):
+            node['child_count'] = len(summary.tree_children)
+            self._sources[node['id']] = (element, summary, frozenset(seen) if tracked else ancestors)
+            if summary.tree_pattern_options is not None:
+                node['is_choice'] = True
+                node['choice_options'] = [dict(option) for option in summary.tree_pattern_options]
+        return node
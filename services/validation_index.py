@@ -0,0 +1,250 @@
+"""
+Validation Error Index for XML Wizard.
+
+This module turns xmlschema validation errors into structured records in a
+single pass and aggregates them. classify_error reads each error once and
+records its category, its path with positions and namespaces removed (the
+path template), the XSD component that rejected it and a reason code.
+ErrorIndex groups the records by path template and component, keeping a
+count and the first few errors of each group, so a document with tens of
+thousands of errors that come from a handful of schema locations is summarized
+by a handful of groups. Path templates are built from the element's
+ancestors when the document was parsed with lxml, which keeps classification
+linear in the number of errors. classify_log_entry does the same for the
+error log of libxml2 (lxml), whose entries carry a line, a message and a path.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from lxml import etree
+from xmlschema import XMLSchemaChildrenValidationError, XMLSchemaDecodeError
+
+
+ERROR_CATEGORIES = ('enumeration_errors', 'boolean_errors', 'pattern_errors', 'structural_errors')
+
+_POSITION_RE = re.compile(r'\[\d+\]')
+_NAMESPACE_RE = re.compile(r'\{[^}]*\}')
+_PREFIX_RE = re.compile(r'(?<=/)[\w.-]+:')
+
+# libxml2 error types of the value categories
+_LOG_CATEGORIES = {
+    'SCHEMAV_CVC_ENUMERATION_VALID': ('enumeration_errors', 'enumeration'),
+    'SCHEMAV_CVC_PATTERN_VALID': ('pattern_errors', 'pattern_mismatch'),
+}
+
+
+@dataclass
+class ErrorRecord:
+    """One validation error with the fields it is grouped by."""
+    category: str
+    path: str
+    component: str
+    reason: str
+    error: Any
+
+
+@dataclass
+class ErrorGroup:
+    """Errors sharing a path template and XSD component."""
+    category: str
+    path: str
+    component: str
+    reason: str
+    count: int = 0
+    exemplars: List[Any] = field(default_factory=list)
+
+
+def normalize_path(path: Any) -> str:
+    """
+    Get the path template of an error path.
+
+    Args:
+        path: Error path such as '/ns:Root/Item[3]/Flag'
+
+    Returns:
+        Path without positions, namespaces or prefixes (e.g. '/Root/Item/Flag'),
+        or an empty string for a missing path
+    """
+    if not isinstance(path, str):
+        return ''
+    path = _POSITION_RE.sub('', path)
+    path = _NAMESPACE_RE.sub('', path)
+    return _PREFIX_RE.sub('', path)
+
+
+def element_path(element: Any) -> Optional[str]:
+    """
+    Get the path template of an lxml element from its ancestors.
+
+    Unlike the path of an xmlschema error, which is found by searching the
+    document from its root, this costs one step per ancestor.
+
+    Args:
+        element: Element the error was reported on
+
+    Returns:
+        Path of local names (e.g. '/Root/Item/Flag'), or None if the element
+        does not know its parent (ElementTree elements)
+    """
+    if not etree.iselement(element):
+        return None
+    names = []
+    while element is not None:
+        tag = element.tag
+        if isinstance(tag, str):
+            names.append(tag.rsplit('}', 1)[-1])
+        element = element.getparent()
+    return '/' + '/'.join(reversed(names))
+
+
+def component_name(validator: Any) -> str:
+    """
+    Get a short name of the XSD component that reported an error.
+
+    Args:
+        validator: xmlschema component (e.g. XsdAtomicBuiltin, XsdGroup)
+
+    Returns:
+        Class name, with the component's name when it has one
+        (e.g. "XsdAtomicBuiltin(xs:boolean)")
+    """
+    if validator is None:
+        return ''
+    kind = type(validator).__name__
+    name = getattr(validator, 'prefixed_name', None) or getattr(validator, 'name', None)
+    return f"{kind}({name})" if isinstance(name, str) and name else kind
+
+
+def classify_error(error: Any) -> ErrorRecord:
+    """
+    Classify a validation error.
+
+    The category follows the message checks of the validation report, first
+    match wins: enumeration, boolean, pattern, otherwise structural.
+
+    Args:
+        error: xmlschema validation error
+
+    Returns:
+        ErrorRecord for the error
+    """
+    message = str(error.message)
+    if 'XsdEnumerationFacets' in message:
+        category, reason = 'enumeration_errors', 'enumeration'
+    elif "with XsdAtomicBuiltin(name='xs:boolean')" in message:
+        category, reason = 'boolean_errors', 'invalid_boolean'
+    elif 'pattern' in message.lower():
+        category, reason = 'pattern_errors', 'pattern_mismatch'
+    else:
+        category, reason = 'structural_errors', _structural_reason(error)
+
+    path = element_path(getattr(error, 'elem', None))
+    return ErrorRecord(
+        category=category,
+        path=path if path is not None else normalize_path(getattr(error, 'path', None)),
+        component=component_name(getattr(error, 'validator', None)),
+        reason=reason,
+        error=error
+    )
+
+
+def _structural_reason(error: Any) -> str:
+    """Reason code of an error outside the value categories."""
+    if isinstance(error, XMLSchemaChildrenValidationError):
+        return 'unexpected_element' if error.invalid_tag is not None else 'missing_element'
+    if isinstance(error, XMLSchemaDecodeError):
+        return 'invalid_value'
+    return 'other'
+
+
+def classify_log_entry(entry: Any, element: Any = None) -> ErrorRecord:
+    """
+    Classify an entry of the libxml2 validation error log.
+
+    The categories match classify_error; the error kept in the record is a
+    dictionary with the line, message and path of the entry.
+
+    Args:
+        entry: lxml error log entry
+        element: Element the entry points to, used for the path template
+
+    Returns:
+        ErrorRecord for the entry
+    """
+    message = entry.message
+    if entry.type_name in _LOG_CATEGORIES:
+        category, reason = _LOG_CATEGORIES[entry.type_name]
+    elif "atomic type 'xs:boolean'" in message:
+        category, reason = 'boolean_errors', 'invalid_boolean'
+    elif 'Missing child element' in message:
+        category, reason = 'structural_errors', 'missing_element'
+    elif 'This element is not expected' in message:
+        category, reason = 'structural_errors', 'unexpected_element'
+    elif entry.type_name.startswith('SCHEMAV_CVC_DATATYPE_VALID'):
+        category, reason = 'structural_errors', 'invalid_value'
+    else:
+        category, reason = 'structural_errors', 'other'
+
+    path = element_path(element)
+    return ErrorRecord(
+        category=category,
+        path=path if path is not None else normalize_path(entry.path),
+        component='',
+        reason=reason,
+        error={'line': entry.line, 'message': message, 'path': entry.path}
+    )
+
+
+class ErrorIndex:
+    """Counts of validation errors per category and per (path template, component) group."""
+
+    def __init__(self, max_exemplars: int = 3):
+        """
+        Initialize an empty index.
+
+        Args:
+            max_exemplars: Errors kept per group
+        """
+        self.max_exemplars = max_exemplars
+        self.category_counts: Dict[str, int] = dict.fromkeys(ERROR_CATEGORIES, 0)
+        self.groups: Dict[Tuple[str, str, str], ErrorGroup] = {}
+        self.total = 0
+
+    def add(self, record: ErrorRecord) -> None:
+        """Count a classified error in its category and group."""
+        self.total += 1
+        self.category_counts[record.category] += 1
+
+        key = (record.category, record.path, record.component)
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = ErrorGroup(record.category, record.path, record.component, record.reason)
+        group.count += 1
+        if len(group.exemplars) < self.max_exemplars:
+            group.exemplars.append(record.error)
+
+    def summary(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get the groups, most frequent first.
+
+        Args:
+            limit: Maximum number of groups returned (None for all)
+
+        Returns:
+            List of dictionaries with category, path, component, reason,
+            count and exemplars
+        """
+        groups = sorted(self.groups.values(), key=lambda group: group.count, reverse=True)
+        return [
+            {
+                'category': group.category,
+                'path': group.path,
+                'component': group.component,
+                'reason': group.reason,
+                'count': group.count,
+                'exemplars': group.exemplars
+            }
+            for group in groups[:limit]
+        ]
@@ -2,14 +2,32 @@
 XML Validation Service for XML Wizard.
 
 This module handles XML validation against XSD schemas, including
-error categorization and detailed validation reporting.
+error categorization and detailed validation reporting. Documents are first
+checked with the schema compiled by libxml2 (lxml), which settles most
+documents quickly and reports the errors of invalid ones from its error log;
+xmlschema is only run when detailed errors are requested, to collect its
+categorized errors.
+Very large documents can be validated from a file in streaming mode, which
+keeps memory bounded regardless of the document size.
 """
 
 import os
-import tempfile
-from typing import Dict, Any, Optional, List
+import re
+from itertools import islice
+from typing import Dict, Any, Optional, List, Iterator, Tuple, Union, IO
+
+import xmlschema
+from lxml import etree
+
+from config import get_config
+from utils.schema_registry import get_schema_registry
 from utils.xsd_parser import XSDParser
 from .file_manager import FileManager
+from .validation_index import ERROR_CATEGORIES, ErrorIndex, ErrorRecord, classify_error, classify_log_entry
+
+
+# Element named at the start of a libxml2 message, e.g. "Element '{urn:x}Flag': ..."
+_LOG_ELEMENT_RE = re.compile(r"Element '(?:\{[^}]*\})?([^']+)'")
 
 
 class XMLValidator:
@@ -22,84 +40,357 @@ class XMLValidator:
         Args:
             config_instance: Configuration instance (uses global config if None)
         """
-        self.file_manager = FileManager(config_instance)
+        self.config = config_instance or get_config()
+        self.file_manager = FileManager(self.config)
     
     def validate_xml_against_schema(
         self, 
         xml_content: str, 
         xsd_file_path: str, 
         uploaded_file_name: Optional[str] = None, 
-        uploaded_file_content: Optional[str] = None
+        uploaded_file_content: Optional[str] = None,
+        max_errors: Optional[int] = None,
+        detailed: bool = False
     ) -> Dict[str, Any]:
         """
         Validate generated XML against the XSD schema.
         
+        Unless detailed errors are requested, the document is validated with
+        libxml2 and the errors come from its error log (line, message and
+        path), without loading the xmlschema schema. With detailed errors, or
+        when libxml2 cannot check the document, it is walked once by
+        xmlschema, and the validity comes from the same error stream as the
+        reported errors. Both schemas are taken from the shared schema
+        registry.
+        
         Args:
             xml_content: XML content to validate
             xsd_file_path: Path to the XSD schema file (may not exist)
             uploaded_file_name: Original uploaded file name
             uploaded_file_content: Original uploaded file content
+            max_errors: Stop validating after this many errors (defaults to
+                config value; 0 collects every error)
+            detailed: Collect the errors with xmlschema, which reports
+                the XSD component of each error
             
         Returns:
             Dictionary containing validation results
         """
+        if max_errors is None:
+            max_errors = self.config.performance.validation_max_errors
+        temp_dir = None
+        
         try:
-            # Create a temporary XML file for validation
-            temp_xml_path = self.file_manager.create_temp_file(xml_content, '.xml')
-            
-            # Create temporary XSD file if the original path doesn't exist
-            temp_xsd_path = xsd_file_path
-            temp_xsd_cleanup = False
-            
+            xsd_path = xsd_file_path
+            self.file_manager.touch_workspace(xsd_file_path)
             if not os.path.exists(xsd_file_path) and uploaded_file_content and uploaded_file_name:
                 # Recreate the temp XSD file and dependencies
-                temp_xsd_path, temp_dir = self.file_manager.write_temp_xsd_with_dependencies(
+                xsd_path, temp_dir = self.file_manager.write_temp_xsd_with_dependencies(
                     uploaded_file_content, uploaded_file_name
                 )
-                temp_xsd_cleanup = True
-            
-            try:
-                # Load the schema and validate
-                parser = XSDParser(temp_xsd_path)
-                
-                # Get detailed validation results using xmlschema
-                import xmlschema
-                errors = list(parser.schema.iter_errors(temp_xml_path))
-                
-                # Categorize validation errors for better reporting
-                categorized_errors = self._categorize_errors(errors)
-                
-                # Basic validation result
-                is_valid = parser.validate_xml(temp_xml_path)
-                
-                return {
-                    'is_valid': is_valid,
-                    'total_errors': len(errors),
-                    'error_breakdown': {
-                        'enumeration_errors': len(categorized_errors['enumeration_errors']),
-                        'boolean_errors': len(categorized_errors['boolean_errors']),
-                        'pattern_errors': len(categorized_errors['pattern_errors']),
-                        'structural_errors': len(categorized_errors['structural_errors'])
-                    },
-                    'categorized_errors': categorized_errors,
-                    'detailed_errors': errors[:10],  # First 10 errors for display
-                    'success': True
-                }
-                
-            finally:
-                # Cleanup temporary XML file
-                self.file_manager.cleanup_temp_file(temp_xml_path)
-                
-                # Cleanup temporary XSD directory if we created it
-                if temp_xsd_cleanup and 'temp_dir' in locals():
-                    self.file_manager.cleanup_temp_directory(temp_dir)
-                    
+            
+            # Parsed once with lxml for both engines; None leaves parse errors to xmlschema
+            document = self._parse_document(xml_content)
+            if not detailed and self.config.performance.enable_fast_validation and document is not None:
+                error_log = self._validate_fast(xsd_path, document)
+                if error_log is not None:
+                    return self._build_log_result(error_log, document, max_errors)
+            
+            # Load the schema (shared through the registry) and validate
+            parser = XSDParser(xsd_path)
+            xml_source = document if document is not None else xml_content
+            errors, truncated = self._collect_errors(parser.schema, xml_source, max_errors)
+            return self._build_result(errors, truncated, 'xmlschema')
+            
         except Exception as e:
             return {
                 'is_valid': False,
                 'error': str(e),
                 'success': False
             }
+        finally:
+            # Cleanup temporary XSD directory if we created it
+            if temp_dir:
+                self.file_manager.cleanup_temp_directory(temp_dir)
+    
+    def iter_validation_errors(
+        self,
+        xml_source: Union[str, IO[bytes]],
+        xsd_file_path: str
+    ) -> Iterator[ErrorRecord]:
+        """
+        Validate an XML file lazily, yielding errors as they are found.
+        
+        The document is read with a lazy xmlschema resource that drops each
+        subtree once it has been validated, so memory use does not grow with
+        the document size.
+        
+        Args:
+            xml_source: Path to the XML file or a binary file object
+            xsd_file_path: Path to the XSD schema file
+            
+        Yields:
+            ErrorRecord of each error, classified as it is found
+        """
+        schema = XSDParser(xsd_file_path).schema
+        resource = xmlschema.XMLResource(xml_source, lazy=True, thin_lazy=True)
+        for error in schema.iter_errors(resource):
+            yield classify_error(error)
+    
+    def validate_large_xml(
+        self,
+        xml_source: Union[str, IO[bytes]],
+        xsd_file_path: str,
+        category_limits: Optional[Dict[str, int]] = None,
+        max_errors: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Validate a very large XML file with bounded memory.
+        
+        The file is first streamed through libxml2 with each element cleared
+        once parsed; a document it accepts is reported valid. Otherwise the
+        errors come from iter_validation_errors. Every error is counted in
+        error_breakdown and error_groups, but categorized_errors keeps at most
+        the category's limit of errors and each group its first errors, so the
+        result stays small for any number of errors.
+        
+        Args:
+            xml_source: Path to the XML file or a binary file object
+            xsd_file_path: Path to the XSD schema file
+            category_limits: Errors kept per category, keyed by the names in
+                ERROR_CATEGORIES (categories not given use the config value)
+            max_errors: Stop validating after this many errors (defaults to
+                config value; 0 reads the whole document)
+            
+        Returns:
+            Dictionary containing validation results, with the same keys as
+            validate_xml_against_schema
+            
+        Raises:
+            ValueError: If category_limits names an unknown category
+        """
+        unknown = set(category_limits or {}) - set(ERROR_CATEGORIES)
+        if unknown:
+            raise ValueError(f"Unknown error categories: {', '.join(sorted(unknown))}; "
+                             f"expected one of {', '.join(ERROR_CATEGORIES)}")
+        
+        performance = self.config.performance
+        if max_errors is None:
+            max_errors = performance.validation_max_errors
+        limits = {category: performance.validation_category_limit for category in ERROR_CATEGORIES}
+        limits.update(category_limits or {})
+        
+        try:
+            if performance.enable_fast_validation and self._is_valid_streaming(xsd_file_path, xml_source):
+                return self._build_result([], False, 'lxml')
+            if hasattr(xml_source, 'seek'):
+                xml_source.seek(0)
+            
+            index = ErrorIndex(performance.validation_group_exemplars)
+            categorized_errors = {category: [] for category in ERROR_CATEGORIES}
+            detailed_errors = []
+            truncated = False
+            
+            for record in self.iter_validation_errors(xml_source, xsd_file_path):
+                if max_errors and index.total >= max_errors:
+                    truncated = True
+                    break
+                index.add(record)
+                if len(categorized_errors[record.category]) < limits[record.category]:
+                    categorized_errors[record.category].append(record.error)
+                if len(detailed_errors) < 10:
+                    detailed_errors.append(record.error)
+            
+            return {
+                'is_valid': index.total == 0,
+                'total_errors': index.total,
+                'errors_truncated': truncated,
+                'error_breakdown': index.category_counts,
+                'categorized_errors': categorized_errors,
+                'error_groups': index.summary(),
+                'detailed_errors': detailed_errors,
+                'validator': 'xmlschema',
+                'success': True
+            }
+            
+        except Exception as e:
+            return {
+                'is_valid': False,
+                'error': str(e),
+                'success': False
+            }
+    
+    def _build_result(self, errors: List, truncated: bool, validator: str) -> Dict[str, Any]:
+        """
+        Build the validation result for a list of errors.
+        
+        Args:
+            errors: Validation errors found
+            truncated: Whether validation stopped before the end of the document
+            validator: Engine that produced the result ('lxml' or 'xmlschema')
+            
+        Returns:
+            Dictionary containing validation results
+        """
+        # Categorize validation errors for better reporting
+        categorized_errors, index = self._index_errors(errors)
+        
+        return {
+            'is_valid': not errors,
+            'total_errors': len(errors),
+            'errors_truncated': truncated,
+            'error_breakdown': index.category_counts,
+            'categorized_errors': categorized_errors,
+            'error_groups': index.summary(),
+            'detailed_errors': errors[:10],  # First 10 errors for display
+            'validator': validator,
+            'success': True
+        }
+    
+    def _build_log_result(self, error_log, document, max_errors: int) -> Dict[str, Any]:
+        """
+        Build the validation result for a libxml2 error log.
+        
+        Args:
+            error_log: Entries of the libxml2 error log
+            document: Root lxml element the log was reported on
+            max_errors: Maximum number of errors reported (0 for all)
+            
+        Returns:
+            Dictionary containing validation results, with the same keys as
+            _build_result; errors are dictionaries of line, message and path
+        """
+        entries = list(error_log)
+        truncated = bool(max_errors) and len(entries) > max_errors
+        if truncated:
+            entries = entries[:max_errors]
+        
+        tree = document.getroottree()
+        index = ErrorIndex(self.config.performance.validation_group_exemplars)
+        categorized_errors = {category: [] for category in ERROR_CATEGORIES}
+        errors = []
+        for entry in entries:
+            record = classify_log_entry(entry, self._find_log_element(tree, entry.path))
+            index.add(record)
+            categorized_errors[record.category].append(record.error)
+            errors.append(record.error)
+        
+        return {
+            'is_valid': not errors,
+            'total_errors': len(errors),
+            'errors_truncated': truncated,
+            'error_breakdown': index.category_counts,
+            'categorized_errors': categorized_errors,
+            'error_groups': index.summary(),
+            'detailed_errors': errors[:10],
+            'validator': 'lxml',
+            'success': True
+        }
+    
+    def _find_log_element(self, tree, path: Optional[str]):
+        """
+        Find the element a libxml2 error log path points to.
+        
+        Args:
+            tree: lxml element tree of the document
+            path: Path of the log entry (e.g. '/*/*[2]/ns:Flag')
+            
+        Returns:
+            The element, or None if the path cannot be evaluated (prefixes
+            are declared below the root) or matches nothing
+        """
+        if not path:
+            return None
+        root = tree.getroot()
+        namespaces = {prefix: uri for prefix, uri in root.nsmap.items() if prefix}
+        try:
+            elements = tree.xpath(path, namespaces=namespaces)
+        except etree.XPathError:
+            return None
+        return elements[0] if elements and etree.iselement(elements[0]) else None
+    
+    def _parse_document(self, xml_content: str):
+        """
+        Parse an in-memory document with lxml.
+        
+        Args:
+            xml_content: XML content to parse
+            
+        Returns:
+            Root lxml element, or None if the content is not well-formed
+        """
+        xml_bytes = xml_content.encode('utf-8') if isinstance(xml_content, str) else xml_content
+        try:
+            return etree.fromstring(xml_bytes, etree.XMLParser(resolve_entities=False, huge_tree=True))
+        except (etree.XMLSyntaxError, ValueError):
+            return None
+    
+    def _validate_fast(self, xsd_path: str, document):
+        """
+        Validate a parsed document with the libxml2 compiled schema.
+        
+        Args:
+            xsd_path: Path to the XSD schema file
+            document: Root lxml element of the document
+            
+        Returns:
+            A copy of the libxml2 error log (empty if the document is valid),
+            or None if libxml2 cannot compile the schema
+        """
+        try:
+            return get_schema_registry().validate_lxml(xsd_path, document)
+        except Exception:
+            return None
+    
+    def _is_valid_streaming(self, xsd_path: str, xml_source: Union[str, IO[bytes]]) -> bool:
+        """
+        Check a document with libxml2 while parsing it incrementally.
+        
+        Args:
+            xsd_path: Path to the XSD schema file
+            xml_source: Path to the XML file or a binary file object
+            
+        Returns:
+            True only if libxml2 accepts the document
+        """
+        try:
+            lxml_schema = get_schema_registry().get_lxml_schema(xsd_path)
+        except Exception:
+            return False
+        if lxml_schema is None:
+            return False
+        
+        try:
+            for _, element in etree.iterparse(xml_source, schema=lxml_schema, huge_tree=True,
+                                              resolve_entities=False):
+                # Drop the element and the siblings already parsed before it
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+        except etree.XMLSyntaxError:
+            return False
+        return True
+    
+    def _collect_errors(self, schema, xml_source, max_errors: int):
+        """
+        Validate an in-memory document in a single pass.
+        
+        Args:
+            schema: Built xmlschema schema
+            xml_source: Parsed lxml document, or XML content
+            max_errors: Maximum number of errors to collect (0 for all)
+            
+        Returns:
+            Tuple of (errors, truncated) where truncated tells whether
+            validation stopped before the end of the document
+        """
+        error_stream = schema.iter_errors(xmlschema.XMLResource(xml_source))
+        if not max_errors:
+            return list(error_stream), False
+        
+        # Take one error past the limit to know whether the document has more
+        errors = list(islice(error_stream, max_errors + 1))
+        return errors[:max_errors], len(errors) > max_errors
     
     def _categorize_errors(self, errors: List) -> Dict[str, List]:
         """
@@ -111,28 +402,47 @@ class XMLValidator:
         Returns:
             Dictionary with categorized errors
         """
-        enumeration_errors = [e for e in errors if 'XsdEnumerationFacets' in str(e.message)]
-        boolean_errors = [e for e in errors if "with XsdAtomicBuiltin(name='xs:boolean')" in str(e.message)]
-        pattern_errors = [e for e in errors if 'pattern' in str(e.message).lower()]
-        structural_errors = [e for e in errors if e not in enumeration_errors + boolean_errors + pattern_errors]
+        return self._index_errors(errors)[0]
+    
+    def _index_errors(self, errors: List) -> Tuple[Dict[str, List], ErrorIndex]:
+        """
+        Classify validation errors in a single pass.
         
-        return {
-            'enumeration_errors': enumeration_errors,
-            'boolean_errors': boolean_errors,
-            'pattern_errors': pattern_errors,
-            'structural_errors': structural_errors
-        }
+        Args:
+            errors: List of validation errors
+            
+        Returns:
+            Tuple of (errors by category, ErrorIndex of the errors)
+        """
+        index = ErrorIndex(self.config.performance.validation_group_exemplars)
+        categorized_errors = {category: [] for category in ERROR_CATEGORIES}
+        for error in errors:
+            record = classify_error(error)
+            index.add(record)
+            categorized_errors[record.category].append(error)
+        return categorized_errors, index
     
     def format_validation_error(self, error) -> Dict[str, Any]:
         """
         Format a validation error for display.
         
         Args:
-            error: xmlschema validation error object
+            error: xmlschema validation error object, or libxml2 error
+                dictionary of line, message and path
             
         Returns:
             Dictionary with formatted error information
         """
+        if isinstance(error, dict):
+            # libxml2 paths use wildcards, so the element is named by the message
+            match = _LOG_ELEMENT_RE.match(error.get('message') or '')
+            return {
+                'message': error.get('message'),
+                'path': error.get('path'),
+                'element_name': match.group(1) if match else 'Unknown',
+                'line': error.get('line')
+            }
+        
         try:
             # Extract path information
             path = getattr(error, 'path', 'Unknown path')
@@ -0,0 +1,158 @@
+"""
+Unit tests for XMLGenerator batch generation.
+
+Tests per-document deterministic seeding, position independence of
+documents, throughput statistics, forked parallel generation and writing
+batches to a directory or a zip archive.
+"""
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import zipfile
+from unittest.mock import patch
+
+import pytest
+
+from utils import xml_generator
+from utils.xml_generator import XMLGenerator, derive_document_seed
+
+
+BATCH_XSD = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+  <xs:element name="Booking">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="CityName" type="xs:string"/>
+        <xs:element name="Segment" maxOccurs="unbounded">
+          <xs:complexType>
+            <xs:sequence>
+              <xs:element name="Status" type="xs:string"/>
+            </xs:sequence>
+            <xs:attribute name="SegmentID" type="xs:ID"/>
+          </xs:complexType>
+        </xs:element>
+      </xs:sequence>
+    </xs:complexType>
+  </xs:element>
+</xs:schema>'''
+
+CITY_CONFIG = {
+    'element_configs': {
+        'CityName': {'custom_values': [f'City{i}' for i in range(50)], 'selection_strategy': 'random'}
+    }
+}
+
+
+class TestBatchGeneration:
+    """Test XMLGenerator.generate_batch and write_batch."""
+
+    def setup_method(self):
+        """Set up a schema file and an output directory."""
+        self.schema_dir = tempfile.mkdtemp()
+        self.output_dir = tempfile.mkdtemp()
+        self.xsd_path = os.path.join(self.schema_dir, 'Booking.xsd')
+        with open(self.xsd_path, 'w') as f:
+            f.write(BATCH_XSD)
+        self.generator = XMLGenerator(self.xsd_path, config_data=CITY_CONFIG)
+
+    def teardown_method(self):
+        """Clean up temporary directories."""
+        shutil.rmtree(self.schema_dir, ignore_errors=True)
+        shutil.rmtree(self.output_dir, ignore_errors=True)
+
+    def test_same_seed_reproduces_batch(self):
+        """Test that a batch is reproducible from its seed."""
+        first = list(self.generator.generate_batch(5, seed=7))
+        second = list(self.generator.generate_batch(5, seed=7))
+        other = list(self.generator.generate_batch(5, seed=8))
+
+        assert len(first) == 5
+        assert first == second
+        assert first != other
+        assert len(set(first)) > 1  # documents get distinct seeds
+
+    def test_document_independent_of_position(self):
+        """Test that a document only depends on the batch seed and its index."""
+        batch = list(self.generator.generate_batch(4, seed=3))
+        assert self.generator.generate_document(2, seed=3) == batch[2]
+        assert derive_document_seed(3, 2) != derive_document_seed(3, 1)
+
+    def test_batch_statistics(self):
+        """Test that throughput is recorded once the batch is exhausted."""
+        documents = list(self.generator.generate_batch(3, options={'unbounded_counts': {'Segment': 2}}))
+
+        stats = self.generator.last_batch_stats
+        assert stats['success']
+        assert stats['documents'] == 3
+        assert stats['failed'] == 0
+        assert stats['docs_per_second'] > 0
+        assert all(doc.count('<Segment ') == 2 for doc in documents)
+
+    def test_write_batch_to_directory(self):
+        """Test writing one file per document into a directory."""
+        target = os.path.join(self.output_dir, 'batch')
+        result = self.generator.write_batch(3, target, seed=1)
+
+        assert result['success']
+        assert result['output_path'] == target
+        assert sorted(os.listdir(target)) == [f'Booking_{i:06d}.xml' for i in range(3)]
+
+    def test_write_batch_to_archive(self):
+        """Test writing documents into a zip archive."""
+        archive_path = os.path.join(self.output_dir, 'batch.zip')
+        result = self.generator.write_batch(2, archive_path, seed=1)
+
+        assert result['documents'] == 2
+        with zipfile.ZipFile(archive_path) as archive:
+            names = archive.namelist()
+            assert names == ['Booking_000000.xml', 'Booking_000001.xml']
+            content = archive.read(names[1]).decode('utf-8')
+        assert content == self.generator.generate_document(1, seed=1)
+
+    @pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(),
+                        reason="fork start method not available")
+    def test_parallel_batch_matches_serial(self):
+        """Test that forked workers produce byte-identical documents in order."""
+        options = {'unbounded_counts': {'Segment': 3}}
+        serial = list(self.generator.generate_batch(9, seed=11, options=options, workers=1))
+        parallel = list(self.generator.generate_batch(9, seed=11, options=options, workers=3))
+
+        assert parallel == serial
+        assert self.generator.last_batch_stats['workers'] == 3
+
+    @pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(),
+                        reason="fork start method not available")
+    def test_partially_read_batch_does_not_block_others(self):
+        """Test that a batch left unread does not hold state other batches need."""
+        if threading.active_count() > 1:
+            pytest.skip("other threads are running")
+        documents = self.generator.generate_batch(6, seed=3, workers=2)
+        first = [next(documents), next(documents)]
+
+        assert xml_generator._fork_batch is None
+        other = list(self.generator.generate_batch(4, seed=4, workers=2))
+        assert other == list(self.generator.generate_batch(4, seed=4, workers=1))
+        assert first + list(documents) == list(self.generator.generate_batch(6, seed=3, workers=1))
+
+    def test_parallel_batch_serial_with_live_threads(self):
+        """Test that batches are not forked while other threads run."""
+        release = threading.Event()
+        thread = threading.Thread(target=release.wait)
+        thread.start()
+        try:
+            with patch('utils.xml_generator.multiprocessing.get_context') as mock_context:
+                documents = list(self.generator.generate_batch(3, seed=5, workers=2))
+                mock_context.assert_not_called()
+        finally:
+            release.set()
+            thread.join()
+
+        assert documents == list(self.generator.generate_batch(3, seed=5, workers=1))
+
+    def test_unknown_option_rejected(self):
+        """Test that misspelled generation options raise ValueError."""
+        with pytest.raises(ValueError, match="Unknown generation options"):
+            list(self.generator.generate_batch(1, options={'generation_mod': 'Complete'}))
@@ -0,0 +1,112 @@
+"""
+Unit tests for the benchmark suite in benchmark.py.
+
+Tests schema discovery, per-stage measurement of a small schema, baseline
+round trips and threshold comparison.
+"""
+
+import os
+import shutil
+import tempfile
+
+import benchmark
+
+
+BENCHMARK_XSD = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+  <xs:element name="Ticket">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="Number" type="xs:string"/>
+        <xs:element name="Coupon" type="xs:int" maxOccurs="4"/>
+        <xs:element name="Remark" type="xs:string" minOccurs="0"/>
+      </xs:sequence>
+    </xs:complexType>
+  </xs:element>
+</xs:schema>'''
+
+
+def _report(**stage_metrics):
+    return {
+        'version': benchmark.BASELINE_VERSION,
+        'results': {'schemas/Ticket.xsd': stage_metrics}
+    }
+
+
+class TestBenchmark:
+    """Test the benchmark harness on a small schema."""
+
+    def setup_method(self):
+        """Set up a schema directory with one XSD file."""
+        self.base_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.base_dir, 'schemas', 'nested'))
+        self.xsd_path = os.path.join(self.base_dir, 'schemas', 'Ticket.xsd')
+        with open(self.xsd_path, 'w') as f:
+            f.write(BENCHMARK_XSD)
+        with open(os.path.join(self.base_dir, 'schemas', 'nested', 'Types.xsd'), 'w') as f:
+            f.write(BENCHMARK_XSD)
+
+    def teardown_method(self):
+        """Clean up temporary directories."""
+        shutil.rmtree(self.base_dir, ignore_errors=True)
+
+    def test_discover_schemas(self):
+        """Test recursive discovery and filtering by file name."""
+        assert benchmark.discover_schemas(self.base_dir, ['schemas']) == [
+            'schemas/Ticket.xsd', 'schemas/nested/Types.xsd'
+        ]
+        assert benchmark.discover_schemas(self.base_dir, ['schemas'], names=['Types.xsd']) == [
+            'schemas/nested/Types.xsd'
+        ]
+
+    def test_benchmark_records_every_stage(self):
+        """Test that each stage records wall time, peak RSS and tracemalloc peak."""
+        report = benchmark.run_benchmarks(['schemas/Ticket.xsd'], base_dir=self.base_dir, isolate=False)
+        stages = report['results']['schemas/Ticket.xsd']
+
+        expected = ['load', 'analysis'] + [f'generate:{mode}' for mode in benchmark.GENERATION_MODES]
+        assert list(stages) == expected + ['serialize', 'validate']
+        for metrics in stages.values():
+            assert 'error' not in metrics
+            assert metrics['wall_seconds'] >= 0
+            assert metrics['tracemalloc_peak_mb'] >= 0
+            assert metrics['peak_rss_mb'] > 0
+        assert stages['generate:Complete']['output_bytes'] > 0
+        assert stages['validate']['total_errors'] == 0
+
+    def test_compare_flags_regressions_above_threshold_and_noise(self):
+        """Test that only changes beyond both the ratio and the noise floor count."""
+        baseline = _report(load={'wall_seconds': 1.0, 'peak_rss_mb': 100.0},
+                           validate={'wall_seconds': 0.01})
+        current = _report(load={'wall_seconds': 1.5, 'peak_rss_mb': 60.0},
+                          validate={'wall_seconds': 0.03})
+        comparison = benchmark.compare_to_baseline(current, baseline)
+
+        assert not comparison['success']
+        assert [(c['stage'], c['metric']) for c in comparison['regressions']] == [('load', 'wall_seconds')]
+        assert [(c['stage'], c['metric']) for c in comparison['improvements']] == [('load', 'peak_rss_mb')]
+        assert benchmark.compare_to_baseline(current, baseline, {'wall_seconds': 0.6})['success']
+
+    def test_compare_reports_new_errors_and_missing(self):
+        """Test that stages that start failing or disappear are reported."""
+        baseline = _report(load={'wall_seconds': 1.0}, serialize={'wall_seconds': 0.2})
+        current = _report(load={'error': 'Invalid XSD schema'})
+        comparison = benchmark.compare_to_baseline(current, baseline)
+
+        assert not comparison['success']
+        assert comparison['new_errors'][0]['stage'] == 'load'
+        assert comparison['missing'] == ['schemas/Ticket.xsd:serialize']
+
+    def test_cli_saves_and_compares_baseline(self):
+        """Test that main writes a baseline and passes when compared with itself."""
+        baseline_path = os.path.join(self.base_dir, 'bench', 'baseline.json')
+        output_path = os.path.join(self.base_dir, 'run.json')
+        args = ['--base-dir', self.base_dir, '--schema-dirs', 'schemas', '--schemas', 'Ticket.xsd',
+                '--no-isolate', '--no-tracemalloc', '--baseline', baseline_path]
+
+        assert benchmark.main(args + ['--save']) == 0
+        assert benchmark.main(args + ['--output', output_path, '--threshold', 'wall_seconds=100']) == 0
+
+        saved = benchmark.load_report(baseline_path)
+        assert list(saved['results']) == ['schemas/Ticket.xsd']
+        assert benchmark.load_report(output_path)['options']['trace_memory'] is False
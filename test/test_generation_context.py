@@ -0,0 +1,118 @@
+"""
+Unit tests for per-document generation contexts.
+
+Tests that generations keep their IDs, enumeration rotation, random values and
+recursion limits in their own GenerationContext, so repeated and concurrent
+generations are reproducible and leave the shared configuration untouched.
+"""
+
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from config import get_config
+from utils.generation_context import GenerationContext
+from utils.type_generators import EnumerationTypeGenerator, IDREFTypeGenerator, IDTypeGenerator
+from utils.xml_generator import XMLGenerator
+
+
+CONTEXT_XSD = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+  <xs:simpleType name="StatusCodeType">
+    <xs:restriction base="xs:string">
+      <xs:enumeration value="HK"/>
+      <xs:enumeration value="UC"/>
+      <xs:enumeration value="XX"/>
+    </xs:restriction>
+  </xs:simpleType>
+  <xs:element name="Booking">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="CityName" type="xs:string"/>
+        <xs:element name="Segment" maxOccurs="unbounded">
+          <xs:complexType>
+            <xs:sequence>
+              <xs:element name="StatusCode" type="StatusCodeType"/>
+              <xs:element name="CityName" type="xs:string"/>
+            </xs:sequence>
+            <xs:attribute name="SegmentID" type="xs:ID"/>
+          </xs:complexType>
+        </xs:element>
+      </xs:sequence>
+    </xs:complexType>
+  </xs:element>
+</xs:schema>'''
+
+CITY_CONFIG = {
+    'element_configs': {
+        'CityName': {'custom_values': [f'City{i}' for i in range(50)], 'selection_strategy': 'random'}
+    }
+}
+
+
+class TestGenerationContext:
+    """Test GenerationContext isolation of per-document state."""
+
+    def setup_method(self):
+        """Set up a schema file."""
+        self.schema_dir = tempfile.mkdtemp()
+        self.xsd_path = os.path.join(self.schema_dir, 'Booking.xsd')
+        with open(self.xsd_path, 'w') as f:
+            f.write(CONTEXT_XSD)
+
+    def teardown_method(self):
+        """Clean up temporary directories."""
+        shutil.rmtree(self.schema_dir, ignore_errors=True)
+
+    def _generate(self, seed, mode='Minimalistic'):
+        generator = XMLGenerator(self.xsd_path, config_data=CITY_CONFIG)
+        return generator.generate_dummy_xml_with_options(
+            unbounded_counts={'Segment': 3}, generation_mode=mode, seed=seed
+        )
+
+    def test_repeated_generations_are_identical(self):
+        """Test that enumeration rotation and IDs restart for every document."""
+        generator = XMLGenerator(self.xsd_path, config_data=CITY_CONFIG)
+        first = generator.generate_dummy_xml_with_options(unbounded_counts={'Segment': 3}, seed=5)
+        second = generator.generate_dummy_xml_with_options(unbounded_counts={'Segment': 3}, seed=5)
+
+        assert first == second
+        assert first.count('<StatusCode>HK</StatusCode>') == 1  # rotation within the document
+        assert generator.generate_dummy_xml_with_options(unbounded_counts={'Segment': 3}, seed=6) != first
+
+    def test_concurrent_generations_match_serial(self):
+        """Test that generations running in threads do not interfere."""
+        seeds = list(range(8))
+        serial = [self._generate(seed) for seed in seeds]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            concurrent = list(pool.map(self._generate, seeds))
+
+        assert concurrent == serial
+        assert len(set(serial)) == len(seeds)
+
+    def test_generation_mode_does_not_mutate_config(self):
+        """Test that Complete/Custom mode raise limits only in the document's context."""
+        recursion = get_config().recursion
+        before = (recursion.max_tree_depth, recursion.max_element_depth)
+        generator = XMLGenerator(self.xsd_path)
+        generator.generate_dummy_xml_with_options(generation_mode='Custom')
+
+        assert (recursion.max_tree_depth, recursion.max_element_depth) == before
+        assert generator.context.recursion.max_tree_depth >= 10
+        assert generator.context.recursion.max_element_depth >= 12
+
+    def test_type_generators_use_passed_context(self):
+        """Test that ID, IDREF and enumeration state live in the passed context."""
+        IDTypeGenerator.reset_id_counter()
+        EnumerationTypeGenerator.reset_usage_tracker()
+        context = GenerationContext(seed=1)
+
+        issued = IDTypeGenerator().generate('PaxID', context=context)
+        assert context.get_existing_ids() == [issued]
+        assert IDREFTypeGenerator().generate('PaxRefID', context=context) == issued
+        assert IDTypeGenerator.get_existing_ids() == []
+
+        enum_generator = EnumerationTypeGenerator(enum_values=['A', 'B'])
+        assert [enum_generator.generate('Code', context=context) for _ in range(2)] == ['A', 'B']
+        assert EnumerationTypeGenerator.get_usage_stats() == {}
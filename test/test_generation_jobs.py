@@ -0,0 +1,146 @@
+"""
+Unit tests for services.generation_jobs module.
+
+Tests that background generations produce the same document as a direct
+generation, report progress from the generation engine, can be cancelled
+while queued or running, record failures, and that finished jobs beyond the
+retention limit are evicted.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import pytest
+
+from config import Config
+from services.generation_jobs import GenerationJob, GenerationJobRunner
+from utils.generation_progress import GenerationCancelled, GenerationProgress
+from utils.xml_generator import XMLGenerator
+
+
+JOBS_XSD = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+  <xs:complexType name="SegmentType">
+    <xs:sequence>
+      <xs:element name="Origin" type="xs:string"/>
+      <xs:element name="Destination" type="xs:string"/>
+    </xs:sequence>
+  </xs:complexType>
+  <xs:element name="Order">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="Segment" type="SegmentType" maxOccurs="unbounded"/>
+      </xs:sequence>
+    </xs:complexType>
+  </xs:element>
+</xs:schema>'''
+
+
+def wait_for(job, timeout=30):
+    """Wait until a job has finished."""
+    deadline = time.time() + timeout
+    while not job.done and time.time() < deadline:
+        time.sleep(0.01)
+    assert job.done
+
+
+class TestGenerationJobs:
+    """Test the background generation job runner."""
+
+    def setup_method(self):
+        """Set up a schema file and a runner."""
+        self.schema_dir = tempfile.mkdtemp()
+        self.xsd_path = os.path.join(self.schema_dir, 'Order.xsd')
+        with open(self.xsd_path, 'w') as f:
+            f.write(JOBS_XSD)
+        self.config = Config()
+        self.runner = GenerationJobRunner(max_workers=1, max_finished_jobs=2, config_instance=self.config)
+
+    def teardown_method(self):
+        """Stop the runner and clean up temporary directories."""
+        self.runner.shutdown()
+        shutil.rmtree(self.schema_dir, ignore_errors=True)
+
+    def test_generation_job_matches_direct_generation(self):
+        """Test that a job returns the document and reports its elements."""
+        # Compiled plan replays report only their root, so walk the schema
+        self.config.performance.enable_generation_plans = False
+        options = {'unbounded_counts': {'Segment': 3}, 'seed': 5}
+        expected = XMLGenerator(self.xsd_path, config_instance=self.config).generate_dummy_xml_with_options(**options)
+        generator = XMLGenerator(self.xsd_path, config_instance=self.config)
+
+        job = self.runner.submit_generation(generator, **options)
+        wait_for(job)
+
+        assert job.status == GenerationJob.COMPLETED
+        assert job.result == expected
+        assert generator.progress is None
+        progress = job.snapshot()['progress']
+        assert progress['elements'] >= 4
+        assert progress['current_path'].startswith('Order')
+
+        # The next job of the same generator knows how many elements to expect
+        second = self.runner.submit_generation(generator, **options)
+        wait_for(second)
+        assert second.progress.expected_elements == progress['elements']
+        assert second.snapshot()['progress']['fraction'] == 1.0
+
+    def test_cancelled_progress_stops_generation(self):
+        """Test that a cancelled reporter unwinds the walk and leaves the generator usable."""
+        config = Config()
+        config.performance.enable_incremental_generation = True
+        generator = XMLGenerator(self.xsd_path, config_instance=config)
+        progress = GenerationProgress()
+        progress.cancel()
+        generator.progress = progress
+
+        with pytest.raises(GenerationCancelled):
+            generator.generate_dummy_xml_with_options(unbounded_counts={'Segment': 2})
+
+        generator.progress = None
+        assert generator.incremental_cache.document is None
+        assert '<Segment>' in generator.generate_dummy_xml_with_options(unbounded_counts={'Segment': 2})
+
+    def test_cancel_running_and_queued_jobs(self):
+        """Test cooperative cancellation of a running job and cancellation of a queued one."""
+        started = threading.Event()
+
+        def run_until_cancelled(progress):
+            started.set()
+            while True:
+                progress.element('Order.Segment')
+                time.sleep(0.001)
+
+        running = self.runner.submit(run_until_cancelled, "endless")
+        queued = self.runner.submit(lambda progress: 'never', "queued")
+        assert started.wait(10)
+
+        assert self.runner.cancel(queued.id)
+        assert queued.status == GenerationJob.CANCELLED
+        assert self.runner.cancel(running.id)
+        wait_for(running)
+        assert running.status == GenerationJob.CANCELLED
+        assert running.progress.elements > 0
+        assert not self.runner.cancel(running.id)
+
+    def test_failures_and_retention(self):
+        """Test that errors are recorded and only the newest finished jobs are kept."""
+        def fail(progress):
+            raise ValueError("broken schema")
+
+        failed = self.runner.submit(fail)
+        wait_for(failed)
+        assert failed.status == GenerationJob.FAILED
+        assert failed.error == "broken schema"
+
+        later = [self.runner.submit(lambda progress: 'done') for _ in range(3)]
+        for job in later:
+            wait_for(job)
+        self.runner.submit(lambda progress: 'done')
+
+        assert self.runner.get(failed.id) is None
+        assert self.runner.get(later[-1].id) is later[-1]
+        assert self.runner.get_stats()['jobs'] <= 3
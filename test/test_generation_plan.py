@@ -0,0 +1,146 @@
+"""
+Unit tests for utils.generation_plan module.
+
+Tests that compiled plans reproduce the recursive generator output, are
+cached per schema and options, fold repeated items and keep per-document
+values such as IDs and custom values live.
+"""
+
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from config import Config
+from utils.generation_plan import OP_REPEAT, get_plan_cache
+from utils.type_generators import EnumerationTypeGenerator
+from utils.xml_generator import XMLGenerator
+
+
+PLAN_XSD = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+           xmlns="urn:plan" targetNamespace="urn:plan" elementFormDefault="qualified">
+  <xs:simpleType name="StatusCode">
+    <xs:restriction base="xs:string">
+      <xs:enumeration value="OK"/>
+      <xs:enumeration value="HOLD"/>
+    </xs:restriction>
+  </xs:simpleType>
+  <xs:complexType name="AmountType">
+    <xs:simpleContent>
+      <xs:extension base="xs:decimal">
+        <xs:attribute name="CurCode" type="xs:string"/>
+      </xs:extension>
+    </xs:simpleContent>
+  </xs:complexType>
+  <xs:complexType name="SegmentType">
+    <xs:sequence>
+      <xs:element name="Status" type="StatusCode"/>
+      <xs:element name="Amount" type="AmountType"/>
+    </xs:sequence>
+    <xs:attribute name="SegmentID" type="xs:ID"/>
+  </xs:complexType>
+  <xs:element name="Order">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="OrderName" type="xs:string"/>
+        <xs:choice>
+          <xs:element name="Cash" type="xs:string"/>
+          <xs:element name="Card" type="xs:string"/>
+        </xs:choice>
+        <xs:element name="Segment" type="SegmentType" maxOccurs="unbounded"/>
+        <xs:element name="Remark" type="xs:string" minOccurs="0"/>
+      </xs:sequence>
+    </xs:complexType>
+  </xs:element>
+</xs:schema>'''
+
+
+class TestGenerationPlan:
+    """Test compiled generation plans against the recursive generator."""
+
+    def setup_method(self):
+        """Set up a schema file and an empty plan cache."""
+        self.schema_dir = tempfile.mkdtemp()
+        self.xsd_path = os.path.join(self.schema_dir, 'Order.xsd')
+        with open(self.xsd_path, 'w') as f:
+            f.write(PLAN_XSD)
+        get_plan_cache().clear()
+
+    def teardown_method(self):
+        """Clean up temporary directories and cached plans."""
+        shutil.rmtree(self.schema_dir, ignore_errors=True)
+        get_plan_cache().clear()
+
+    def _generator(self, enable_plans=True, config_data=None):
+        config = Config()
+        config.performance.enable_generation_plans = enable_plans
+        return XMLGenerator(self.xsd_path, config_instance=config, config_data=config_data)
+
+    def _generate(self, generator, **options):
+        EnumerationTypeGenerator.reset_usage_tracker()
+        return generator.generate_dummy_xml_with_options(**options)
+
+    def test_plan_matches_recursive_output(self):
+        """Test that plan execution produces the same XML as the recursive walk."""
+        options = {
+            'generation_mode': 'Complete',
+            'unbounded_counts': {'Segment': 3},
+            'selected_choices': {'choice_0': {'path': 'Order', 'selected_element': 'Card'}}
+        }
+        expected = self._generate(self._generator(enable_plans=False), **options)
+        actual = self._generate(self._generator(), **options)
+
+        assert actual == expected
+        assert actual.count('<Segment ') == 3
+        assert '<Status>HOLD</Status>' in actual
+
+    def test_repeat_generation_reuses_plan(self):
+        """Test that a second generation skips the schema walk."""
+        generator = self._generator()
+        first = self._generate(generator)
+
+        with patch.object(generator, '_create_element_dict', wraps=generator._create_element_dict) as walk:
+            second = self._generate(generator)
+
+        walk.assert_not_called()
+        assert second == first
+        stats = get_plan_cache().get_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert len(generator.processed_types) == 0
+
+    def test_options_select_separate_plans(self):
+        """Test that different generation options compile different plans."""
+        generator = self._generator()
+        minimal = self._generate(generator, generation_mode='Minimalistic')
+        custom = self._generate(generator, generation_mode='Custom', optional_selections=[])
+
+        assert get_plan_cache().get_stats()['entries'] == 2
+        assert '<Remark>' in minimal
+        assert '<Remark>' not in custom
+
+    def test_repeated_items_are_folded(self):
+        """Test that identical list items share one repeated instruction body."""
+        generator = self._generator()
+        xml = self._generate(generator, unbounded_counts={'Segment': 5})
+
+        plan = next(iter(get_plan_cache()._plans.values()))
+        stats = plan.get_stats()
+        assert OP_REPEAT in plan.ops
+        assert stats['distinct_samplers'] < stats['value_slots']
+
+        # IDs are still sampled per item
+        segment_ids = [part.split('"')[1] for part in xml.split('SegmentID=')[1:]]
+        assert len(segment_ids) == 5
+        assert len(set(segment_ids)) == 5
+
+    def test_custom_values_applied_at_execution(self):
+        """Test that a shared plan still applies each generator's custom values."""
+        self._generate(self._generator())
+
+        config_data = {'element_configs': {'OrderName': {'custom_values': ['Custom Order']}}}
+        xml = self._generate(self._generator(config_data=config_data))
+
+        assert get_plan_cache().get_stats()['hits'] == 1
+        assert '<OrderName>Custom Order</OrderName>' in xml
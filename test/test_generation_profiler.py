@@ -0,0 +1,124 @@
+"""
+Unit tests for utils.generation_profiler module.
+
+Tests that profiled generations record per schema path, XSD type and phase
+timings without changing the generated XML, and that the profile exports as
+collapsed stacks and JSON.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+from config import Config
+from utils.generation_plan import get_plan_cache
+from utils.generation_profiler import PROFILED_METHODS
+from utils.xml_generator import XMLGenerator
+
+
+PROFILE_XSD = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+  <xs:complexType name="SegmentType">
+    <xs:sequence>
+      <xs:element name="Origin" type="xs:string"/>
+      <xs:element name="Destination" type="xs:string"/>
+    </xs:sequence>
+    <xs:attribute name="SegmentID" type="xs:ID"/>
+  </xs:complexType>
+  <xs:element name="Journey">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="Segment" type="SegmentType" maxOccurs="unbounded"/>
+        <xs:element name="Remark" type="xs:string"/>
+      </xs:sequence>
+    </xs:complexType>
+  </xs:element>
+</xs:schema>'''
+
+
+class TestGenerationProfiler:
+    """Test GenerationProfiler integration with XMLGenerator."""
+
+    def setup_method(self):
+        """Set up a schema file and an empty plan cache."""
+        self.schema_dir = tempfile.mkdtemp()
+        self.xsd_path = os.path.join(self.schema_dir, 'Journey.xsd')
+        with open(self.xsd_path, 'w') as f:
+            f.write(PROFILE_XSD)
+        get_plan_cache().clear()
+
+    def teardown_method(self):
+        """Clean up temporary directories and cached plans."""
+        shutil.rmtree(self.schema_dir, ignore_errors=True)
+        get_plan_cache().clear()
+
+    def _generator(self, enable_metrics=True):
+        config = Config()
+        config.performance.enable_metrics = enable_metrics
+        return XMLGenerator(self.xsd_path, config_instance=config)
+
+    def _generate(self, generator):
+        return generator.generate_dummy_xml_with_options(unbounded_counts={'Segment': 3}, seed=7)
+
+    def test_profile_records_paths_types_and_phases(self):
+        """Test that element, value and build time is attributed per path and type."""
+        generator = self._generator()
+        xml = self._generate(generator)
+        profiler = generator.profiler
+
+        assert xml == self._generate(self._generator(enable_metrics=False))
+        assert {'element', 'value', 'build'} <= set(profiler.phases)
+        segment = profiler.types['SegmentType']
+        assert segment.calls == 3
+        assert segment.values == 3  # SegmentID; child element values count towards their own type
+        assert profiler.types['string'].values == 7
+        assert segment.total_time >= segment.self_time >= 0
+        assert profiler.paths['Journey'].total_time <= profiler.total_time
+
+    def test_collapsed_stacks_format(self):
+        """Test that stacks are semicolon-joined frames followed by microseconds."""
+        generator = self._generator()
+        self._generate(generator)
+        lines = generator.profiler.to_collapsed_stacks().splitlines()
+
+        assert lines
+        for line in lines:
+            stack, micros = line.rsplit(' ', 1)
+            assert int(micros) > 0
+            assert ' ' not in stack
+        assert any(line.startswith('Journey;Segment;Origin;value:Origin ') for line in lines)
+
+    def test_json_report_sorted_and_written(self):
+        """Test that report tables are sorted by cumulative time and written to disk."""
+        generator = self._generator()
+        self._generate(generator)
+        json_path = os.path.join(self.schema_dir, 'profile.json')
+        stacks_path = os.path.join(self.schema_dir, 'profile.folded')
+        generator.profiler.write(json_path, stacks_path)
+
+        with open(json_path) as f:
+            report = json.load(f)
+        totals = [row['total_seconds'] for row in report['paths']]
+        assert totals == sorted(totals, reverse=True)
+        assert {row['name'] for row in report['types']} >= {'SegmentType'}
+        assert len(generator.profiler.get_report(limit=1)['paths']) == 1
+        with open(stacks_path) as f:
+            assert f.read() == generator.profiler.to_collapsed_stacks()
+
+    def test_wrappers_removed_after_generation(self):
+        """Test that the generator's methods are restored once generation finishes."""
+        generator = self._generator()
+        self._generate(generator)
+
+        for method_name in PROFILED_METHODS:
+            assert method_name not in generator.__dict__
+
+    def test_disabled_by_default(self):
+        """Test that generators without enable_metrics neither profile nor skip plans."""
+        generator = self._generator(enable_metrics=False)
+        self._generate(generator)
+        self._generate(generator)
+
+        assert generator.profiler is None
+        assert get_plan_cache().get_stats()['hits'] >= 1
@@ -0,0 +1,142 @@
+"""
+Unit tests for incremental generation with utils.incremental_cache.
+
+Tests that a generator with incremental generation enabled reuses the previous
+document's subtrees, walks only the subtrees whose choice, count or optional
+selection changed, and keeps the spliced documents valid with unique IDs.
+"""
+
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+import xmlschema
+
+from config import Config
+from utils.xml_generator import XMLGenerator
+
+
+INCREMENTAL_XSD = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+           xmlns="urn:incremental" targetNamespace="urn:incremental" elementFormDefault="qualified">
+  <xs:complexType name="SegmentType">
+    <xs:sequence>
+      <xs:element name="Origin" type="xs:string"/>
+      <xs:element name="Note" type="xs:string" minOccurs="0"/>
+    </xs:sequence>
+    <xs:attribute name="SegmentID" type="xs:ID" use="required"/>
+  </xs:complexType>
+  <xs:complexType name="MethodType">
+    <xs:sequence>
+      <xs:element name="Reference" type="xs:string"/>
+    </xs:sequence>
+  </xs:complexType>
+  <xs:complexType name="PaymentType">
+    <xs:sequence>
+      <xs:element name="Amount" type="xs:decimal"/>
+      <xs:choice>
+        <xs:element name="Cash" type="MethodType"/>
+        <xs:element name="Card" type="MethodType"/>
+      </xs:choice>
+    </xs:sequence>
+  </xs:complexType>
+  <xs:element name="Order">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="Segments">
+          <xs:complexType>
+            <xs:sequence>
+              <xs:element name="Segment" type="SegmentType" maxOccurs="unbounded"/>
+            </xs:sequence>
+          </xs:complexType>
+        </xs:element>
+        <xs:element name="Payment" type="PaymentType"/>
+      </xs:sequence>
+    </xs:complexType>
+  </xs:element>
+</xs:schema>'''
+
+
+class TestIncrementalGeneration:
+    """Test XMLGenerator generations that reuse the previous document."""
+
+    def setup_method(self):
+        """Set up a schema file."""
+        self.schema_dir = tempfile.mkdtemp()
+        self.xsd_path = os.path.join(self.schema_dir, 'Order.xsd')
+        with open(self.xsd_path, 'w') as f:
+            f.write(INCREMENTAL_XSD)
+        self.schema = xmlschema.XMLSchema(self.xsd_path)
+
+    def teardown_method(self):
+        """Clean up temporary directories."""
+        shutil.rmtree(self.schema_dir, ignore_errors=True)
+
+    def _generator(self, incremental=True):
+        config = Config()
+        config.performance.enable_incremental_generation = incremental
+        return XMLGenerator(self.xsd_path, config_instance=config)
+
+    def _generate(self, generator, **options):
+        options.setdefault('unbounded_counts', {'Segment': 2})
+        options.setdefault('selected_choices', {'Cash': True})
+        options.setdefault('seed', 7)
+        with patch.object(generator, '_walk_element', wraps=generator._walk_element) as walk:
+            xml = generator.generate_dummy_xml_with_options(**options)
+        walked = {call.args[0].local_name for call in walk.call_args_list}
+        return xml, walked
+
+    def test_unchanged_options_reuse_whole_document(self):
+        """Test that repeating a generation walks nothing and returns the same document."""
+        generator = self._generator()
+        first, _ = self._generate(generator)
+        second, walked = self._generate(generator)
+
+        assert second == first
+        assert walked == set()
+        assert generator.incremental_cache.get_stats()['reused'] == 1
+
+    def test_changed_choice_regenerates_only_its_subtree(self):
+        """Test that a new choice walks the choice's parent and keeps the other subtrees."""
+        generator = self._generator()
+        first, _ = self._generate(generator, selected_choices={'Cash': True})
+        second, walked = self._generate(generator, selected_choices={'Card': True})
+
+        assert '<Cash>' in first and '<Card>' in second and '<Cash>' not in second
+        assert 'Payment' in walked and 'Segments' not in walked and 'Segment' not in walked
+        assert second.split('<Payment>')[0] == first.split('<Payment>')[0]
+        assert list(self.schema.iter_errors(second)) == []
+
+    def test_changed_count_keeps_existing_occurrences(self):
+        """Test that raising a count adds occurrences with new unique IDs."""
+        generator = self._generator()
+        first, _ = self._generate(generator)
+        second, walked = self._generate(generator, unbounded_counts={'Segment': 4})
+
+        decoded = self.schema.to_dict(second)
+        ids = [segment['@SegmentID'] for segment in decoded['Segments']['Segment']]
+        assert len(ids) == 4 and len(set(ids)) == 4
+        assert all(value in first for value in ids[:2])
+        assert 'Payment' not in walked
+        assert list(self.schema.iter_errors(second)) == []
+
+    def test_changed_optional_selection_and_mode(self):
+        """Test that optional selections are tracked and a new mode regenerates everything."""
+        generator = self._generator()
+        options = {'generation_mode': 'Custom', 'selected_choices': {'Cash': True}}
+        first, _ = self._generate(generator, **options)
+        second, walked = self._generate(generator, optional_selections=['Segment_Note'], **options)
+
+        assert '<Note>' not in first and second.count('<Note>') == 2
+        assert 'Payment' not in walked
+        _, walked = self._generate(generator, generation_mode='Complete', selected_choices={'Cash': True})
+        assert {'Order', 'Segments', 'Payment'} <= walked
+
+    def test_incremental_disabled_by_default(self):
+        """Test that generators without the setting keep no cache and use compiled plans."""
+        assert Config().performance.enable_incremental_generation is False
+        generator = self._generator(incremental=False)
+        assert generator.incremental_cache is None
+        assert generator._use_generation_plan()
+        assert not self._generator()._use_generation_plan()
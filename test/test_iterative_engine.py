@@ -0,0 +1,162 @@
+"""
+Unit tests for the explicit-stack (iterative) generation engine.
+
+Tests that the iterative walk reproduces the recursive walk exactly - element
+order, choices, occurrence counts and values - and that it generates element
+nesting deeper than the Python recursion limit.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from unittest.mock import patch
+
+from lxml import etree
+
+from config import Config
+from utils.xml_generator import XMLGenerator
+
+
+ENGINE_XSD = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+           xmlns="urn:engine" targetNamespace="urn:engine" elementFormDefault="qualified">
+  <xs:complexType name="AmountType">
+    <xs:simpleContent>
+      <xs:extension base="xs:decimal">
+        <xs:attribute name="CurCode" type="xs:string"/>
+      </xs:extension>
+    </xs:simpleContent>
+  </xs:complexType>
+  <xs:complexType name="SegmentType">
+    <xs:sequence>
+      <xs:element name="Origin" type="xs:string"/>
+      <xs:element name="Amount" type="AmountType"/>
+      <xs:element name="Note" type="xs:string" minOccurs="0"/>
+    </xs:sequence>
+    <xs:attribute name="SegmentID" type="xs:ID"/>
+  </xs:complexType>
+  <xs:element name="Order">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="OrderName" type="xs:string"/>
+        <xs:choice>
+          <xs:element name="Cash" type="xs:string"/>
+          <xs:element name="Card" type="SegmentType"/>
+        </xs:choice>
+        <xs:element name="Segment" type="SegmentType" maxOccurs="unbounded"/>
+        <xs:any namespace="##other" processContents="lax" minOccurs="0"/>
+        <xs:element name="AugmentationPoint" minOccurs="0">
+          <xs:complexType>
+            <xs:sequence>
+              <xs:any namespace="##other" processContents="lax" maxOccurs="unbounded"/>
+            </xs:sequence>
+          </xs:complexType>
+        </xs:element>
+        <xs:element name="Remark" type="xs:string" minOccurs="0"/>
+      </xs:sequence>
+    </xs:complexType>
+  </xs:element>
+</xs:schema>'''
+
+NESTED_XSD = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+  <xs:complexType name="NodeType">
+    <xs:sequence>
+      <xs:element name="Label" type="xs:string"/>
+      <xs:element name="Node" type="NodeType"/>
+    </xs:sequence>
+  </xs:complexType>
+  <xs:element name="Node" type="NodeType"/>
+</xs:schema>'''
+
+
+class TestIterativeEngine:
+    """Test the iterative engine against the recursive one."""
+
+    def setup_method(self):
+        """Set up schema files."""
+        self.schema_dir = tempfile.mkdtemp()
+        self.xsd_path = os.path.join(self.schema_dir, 'Order.xsd')
+        with open(self.xsd_path, 'w') as f:
+            f.write(ENGINE_XSD)
+        self.nested_path = os.path.join(self.schema_dir, 'Node.xsd')
+        with open(self.nested_path, 'w') as f:
+            f.write(NESTED_XSD)
+
+    def teardown_method(self):
+        """Clean up temporary directories."""
+        shutil.rmtree(self.schema_dir, ignore_errors=True)
+
+    def _generator(self, xsd_path, iterative):
+        config = Config()
+        config.iterative.enable_iterative_processing = iterative
+        config.performance.enable_generation_plans = False
+        return XMLGenerator(xsd_path, config_instance=config)
+
+    def test_iterative_is_default(self):
+        """Test that the iterative engine is enabled by default."""
+        assert Config().iterative.enable_iterative_processing is True
+
+    def test_matches_recursive_output(self):
+        """Test that both engines generate identical XML for every mode."""
+        choices = {'choice_0': {'path': 'Order', 'selected_element': 'Card'}}
+        for mode in ('Minimalistic', 'Complete', 'Custom'):
+            options = {
+                'generation_mode': mode,
+                'selected_choices': choices,
+                'unbounded_counts': {'Segment': 3},
+                'optional_selections': ['Order.Segment_Note'],
+                'seed': 11
+            }
+            recursive = self._generator(self.xsd_path, False).generate_dummy_xml_with_options(**options)
+            iterative = self._generator(self.xsd_path, True).generate_dummy_xml_with_options(**options)
+
+            assert iterative == recursive
+            assert iterative.count('<Segment ') == 3
+            assert '<Card ' in iterative and '<Cash>' not in iterative
+
+    def test_sequence_order_without_post_pass(self):
+        """Test that elements are emitted in XSD sequence order with attributes set."""
+        generator = self._generator(self.xsd_path, True)
+        xml = generator.generate_dummy_xml_with_options(
+            generation_mode='Complete', selected_choices={'Card': True}, seed=3
+        )
+
+        root = etree.fromstring(xml.encode('utf-8'))
+        names = [etree.QName(child).localname for child in root]
+        assert names == ['OrderName', 'Card', 'Segment', 'Segment', 'Remark']
+        segment = root.find('{urn:engine}Segment')
+        assert [etree.QName(child).localname for child in segment] == ['Origin', 'Amount', 'Note']
+        assert segment.get('SegmentID')
+
+    def test_walk_does_not_recurse(self):
+        """Test that the iterative walk builds children without nested calls."""
+        generator = self._generator(self.xsd_path, True)
+        with patch.object(generator, '_create_element_dict', wraps=generator._create_element_dict) as walk:
+            xml = generator.generate_dummy_xml_with_options(seed=1)
+
+        walk.assert_not_called()
+        assert '<OrderName>' in xml
+        assert len(generator.processed_types) == 0
+
+    def test_nesting_deeper_than_recursion_limit(self):
+        """Test that nesting beyond the interpreter recursion limit is generated."""
+        depth = sys.getrecursionlimit() + 200
+        generator = self._generator(self.nested_path, True)
+        generator._apply_generation_options(seed=1)
+        generator.context.ensure_recursion_limits(max_tree_depth=5, max_element_depth=depth)
+
+        result = generator._create_element_dict_iterative(generator.schema.elements['Node'], 'Node')
+
+        levels = 0
+        node = result
+        while isinstance(node, dict) and 'Node' in node:
+            node = node['Node']
+            levels += 1
+        assert levels == depth + 1
+        assert node == {"_recursion_limit": "Maximum depth reached"}
+
+        root = etree.Element('Node')
+        generator._build_xml_tree_iterative(root, result)
+        assert len(list(root.iter('Node'))) == depth + 2
@@ -0,0 +1,108 @@
+"""
+Unit tests for ui.resource_cache module.
+
+Tests that schema analyses and session generators are keyed by the schema
+bundle digest, so the same upload copied into a new workspace on every rerun
+is not analyzed or loaded again, while changed content is.
+"""
+
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+import streamlit as st
+
+from config import Config
+from services.schema_analyzer import SchemaAnalyzer
+from ui.resource_cache import (
+    clear_resource_cache,
+    get_bundle_digest,
+    get_cached_schema_analysis,
+    get_session_xml_generator
+)
+
+
+ORDER_XSD = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+  <xs:element name="{name}">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="Item" type="xs:string" maxOccurs="unbounded"/>
+      </xs:sequence>
+    </xs:complexType>
+  </xs:element>
+</xs:schema>'''
+
+
+class TestResourceCache:
+    """Test bundle-digest keyed caching of UI resources."""
+
+    def setup_method(self):
+        """Set up an empty cache and session."""
+        self.workspaces = []
+        self.config = Config()
+        clear_resource_cache()
+        for key in ('xml_generator', 'xml_generator_key'):
+            st.session_state.pop(key, None)
+
+    def teardown_method(self):
+        """Clean up temporary directories."""
+        clear_resource_cache()
+        for workspace in self.workspaces:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+    def _upload(self, name='Order'):
+        """Write the schema into a new workspace, as every rerun does."""
+        workspace = tempfile.mkdtemp()
+        self.workspaces.append(workspace)
+        xsd_path = os.path.join(workspace, 'Order.xsd')
+        with open(xsd_path, 'w') as f:
+            f.write(ORDER_XSD.format(name=name))
+        return xsd_path
+
+    def test_rerun_reuses_shared_analysis(self):
+        """Test that the same bundle in a new workspace is not analyzed again."""
+        analyzer = SchemaAnalyzer(self.config)
+        first_path, second_path = self._upload(), self._upload()
+        assert get_bundle_digest(first_path) == get_bundle_digest(second_path)
+
+        with patch.object(analyzer, 'analyze_xsd_schema', wraps=analyzer.analyze_xsd_schema) as analyze:
+            first = get_cached_schema_analysis(first_path, analyzer)
+            second = get_cached_schema_analysis(second_path, analyzer)
+
+        assert analyze.call_count == 1
+        assert second is first
+        assert first['success'] is True and first['root_element'] == 'Order'
+
+    def test_changed_content_or_root_is_analyzed_again(self):
+        """Test that a different bundle or root gets its own analysis."""
+        analyzer = SchemaAnalyzer(self.config)
+        original = get_cached_schema_analysis(self._upload(), analyzer)
+        renamed = get_cached_schema_analysis(self._upload(name='Invoice'), analyzer)
+        missing_root = get_cached_schema_analysis(self._upload(), analyzer, root_element='Missing')
+
+        assert renamed is not original
+        assert list(renamed['element_tree']) == ['Invoice']
+        assert missing_root['success'] is False
+
+    def test_session_generator_survives_new_workspace(self):
+        """Test that the session's generator is kept until the bundle or configuration changes."""
+        generator = get_session_xml_generator(self._upload(), config=self.config)
+
+        assert get_session_xml_generator(self._upload(), config=self.config) is generator
+        assert generator.incremental_cache is None
+        assert generator._use_generation_plan()
+        renamed = get_session_xml_generator(self._upload(name='Invoice'), config=self.config)
+        assert renamed is not generator
+        configured = get_session_xml_generator(self._upload(name='Invoice'), {'metadata': {'name': 'x'}}, self.config)
+        assert configured is not renamed
+        assert st.session_state['xml_generator'] is configured
+
+    def test_session_generator_follows_incremental_flag(self):
+        """Test that incremental generation is only used when the configuration enables it."""
+        self.config.performance.enable_incremental_generation = True
+        generator = get_session_xml_generator(self._upload(), config=self.config)
+
+        assert generator.incremental_cache is not None
+        assert generator.config is self.config
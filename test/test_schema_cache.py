@@ -0,0 +1,128 @@
+"""
+Unit tests for utils.schema_cache module.
+
+Tests digest computation over import closures, cache hits and misses,
+automatic invalidation when a dependency changes, and recovery from
+corrupted cache entries.
+"""
+
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+import xmlschema
+
+from utils.schema_cache import SchemaCache
+
+
+MAIN_XSD = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+           xmlns:c="urn:common" targetNamespace="urn:main" xmlns="urn:main"
+           elementFormDefault="qualified">
+  <xs:import namespace="urn:common" schemaLocation="Common.xsd"/>
+  <xs:element name="Root" type="c:CodeType"/>
+</xs:schema>'''
+
+COMMON_XSD = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" targetNamespace="urn:common">
+  <xs:simpleType name="CodeType">
+    <xs:restriction base="xs:string"><xs:maxLength value="{length}"/></xs:restriction>
+  </xs:simpleType>
+</xs:schema>'''
+
+
+class TestSchemaCache:
+    """Test SchemaCache behaviour on a small two-file schema bundle."""
+
+    def setup_method(self):
+        """Set up a schema bundle and an isolated cache directory."""
+        self.schema_dir = tempfile.mkdtemp()
+        self.cache_dir = tempfile.mkdtemp()
+        self.main_path = os.path.join(self.schema_dir, 'Main.xsd')
+        self.common_path = os.path.join(self.schema_dir, 'Common.xsd')
+        with open(self.main_path, 'w') as f:
+            f.write(MAIN_XSD)
+        with open(self.common_path, 'w') as f:
+            f.write(COMMON_XSD.format(length=3))
+        self.cache = SchemaCache(cache_dir=self.cache_dir)
+
+    def teardown_method(self):
+        """Clean up temporary directories."""
+        shutil.rmtree(self.schema_dir, ignore_errors=True)
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def _entries(self):
+        return [name for name in os.listdir(self.cache_dir) if name.endswith('.pickle')]
+
+    def test_collect_dependencies_follows_imports(self):
+        """Test that the import closure includes imported files."""
+        closure = self.cache.collect_dependencies(self.main_path)
+        assert closure == [os.path.abspath(self.main_path), os.path.abspath(self.common_path)]
+
+    def test_second_load_is_served_from_disk(self):
+        """Test that a second load does not rebuild the schema."""
+        first = self.cache.load_schema(self.main_path)
+        assert len(self._entries()) == 1
+
+        with patch('utils.schema_cache.xmlschema.XMLSchema') as mock_schema_class:
+            second = self.cache.load_schema(self.main_path)
+            mock_schema_class.assert_not_called()
+
+        assert second.is_valid('<Root xmlns="urn:main">ABC</Root>')
+        assert first.target_namespace == second.target_namespace
+
+    def test_dependency_change_invalidates_entry(self):
+        """Test that editing an imported file changes the cache key."""
+        digest_before = self.cache.compute_digest(self.main_path)
+        schema = self.cache.load_schema(self.main_path)
+        assert not schema.is_valid('<Root xmlns="urn:main">ABCDE</Root>')
+
+        with open(self.common_path, 'w') as f:
+            f.write(COMMON_XSD.format(length=5))
+
+        assert self.cache.compute_digest(self.main_path) != digest_before
+        schema = self.cache.load_schema(self.main_path)
+        assert schema.is_valid('<Root xmlns="urn:main">ABCDE</Root>')
+        assert len(self._entries()) == 2
+
+    def test_unchanged_files_are_hashed_once(self):
+        """Test that repeated digests reuse file hashes and resolve the closure once."""
+        digest = self.cache.compute_digest(self.main_path)
+
+        with patch('utils.schema_cache.open', side_effect=AssertionError("file re-read")):
+            with patch.object(self.cache, 'collect_dependencies', side_effect=AssertionError("resolved twice")):
+                assert self.cache.compute_digest(self.main_path) == digest
+
+    def test_identical_bundle_in_other_directory_shares_entry(self):
+        """Test that the key does not depend on where the bundle lives."""
+        other_dir = tempfile.mkdtemp()
+        try:
+            shutil.copy(self.main_path, other_dir)
+            shutil.copy(self.common_path, other_dir)
+            assert (self.cache.compute_digest(self.main_path) ==
+                    self.cache.compute_digest(os.path.join(other_dir, 'Main.xsd')))
+        finally:
+            shutil.rmtree(other_dir, ignore_errors=True)
+
+    def test_corrupted_entry_is_rebuilt(self):
+        """Test that an unreadable cache entry is discarded and rebuilt."""
+        digest = self.cache.compute_digest(self.main_path)
+        with open(os.path.join(self.cache_dir, f"{digest}.pickle"), 'wb') as f:
+            f.write(b'not a pickle')
+
+        schema = self.cache.load_schema(self.main_path)
+        assert isinstance(schema, xmlschema.XMLSchema)
+        assert self.cache.load_schema(self.main_path).is_valid('<Root xmlns="urn:main">AB</Root>')
+
+    def test_disabled_cache_writes_nothing(self):
+        """Test that a disabled cache always builds directly."""
+        self.cache.enabled = False
+        self.cache.load_schema(self.main_path)
+        assert self._entries() == []
+
+    def test_clear_removes_entries(self):
+        """Test clearing the cache directory."""
+        self.cache.load_schema(self.main_path)
+        assert self.cache.clear() == 1
+        assert self._entries() == []
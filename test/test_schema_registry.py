@@ -0,0 +1,187 @@
+"""
+Unit tests for utils.schema_registry module.
+
+Tests schema sharing across callers, LRU eviction by entry count and byte
+budget, content-hash based invalidation and the usage counters.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+
+from utils.schema_cache import SchemaCache
+from utils.schema_registry import SchemaRegistry
+
+
+SIMPLE_XSD = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+  <xs:element name="{name}" type="xs:string"/>
+</xs:schema>'''
+
+FLAGS_XSD = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+  <xs:element name="Flags">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="Flag" type="xs:boolean" maxOccurs="unbounded"/>
+      </xs:sequence>
+    </xs:complexType>
+  </xs:element>
+</xs:schema>'''
+
+
+class TestSchemaRegistry:
+    """Test SchemaRegistry sharing, eviction and statistics."""
+
+    def setup_method(self):
+        """Set up schema files and a registry backed by an isolated cache."""
+        self.schema_dir = tempfile.mkdtemp()
+        self.cache_dir = tempfile.mkdtemp()
+        self.paths = []
+        for name in ('Alpha', 'Beta', 'Gamma'):
+            path = os.path.join(self.schema_dir, f'{name}.xsd')
+            with open(path, 'w') as f:
+                f.write(SIMPLE_XSD.format(name=name))
+            self.paths.append(path)
+        self.schema_cache = SchemaCache(cache_dir=self.cache_dir)
+
+    def teardown_method(self):
+        """Clean up temporary directories."""
+        shutil.rmtree(self.schema_dir, ignore_errors=True)
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def _registry(self, **kwargs):
+        kwargs.setdefault('max_entries', 8)
+        kwargs.setdefault('max_bytes', 64 * 1024 * 1024)
+        return SchemaRegistry(schema_cache=self.schema_cache, **kwargs)
+
+    def test_same_schema_object_is_shared(self):
+        """Test that repeated lookups return the same built schema."""
+        registry = self._registry()
+        first = registry.get_schema(self.paths[0])
+        second = registry.get_schema(self.paths[0])
+
+        assert first is second
+        stats = registry.get_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['entries'] == 1
+        assert stats['hit_rate'] == 0.5
+
+    def test_content_change_creates_new_entry(self):
+        """Test that editing the file yields a freshly built schema."""
+        registry = self._registry()
+        first = registry.get_schema(self.paths[0])
+
+        with open(self.paths[0], 'w') as f:
+            f.write(SIMPLE_XSD.format(name='Renamed'))
+
+        second = registry.get_schema(self.paths[0])
+        assert second is not first
+        assert 'Renamed' in second.elements
+
+    def test_identical_bundle_in_other_directory_is_shared(self):
+        """Test that a copy of the schema in another directory reuses the entry."""
+        registry = self._registry()
+        first = registry.get_schema(self.paths[0])
+
+        copy_dir = tempfile.mkdtemp()
+        try:
+            copy_path = os.path.join(copy_dir, 'Alpha.xsd')
+            shutil.copy(self.paths[0], copy_path)
+            assert registry.get_schema(copy_path) is first
+        finally:
+            shutil.rmtree(copy_dir, ignore_errors=True)
+        assert registry.get_stats()['entries'] == 1
+
+    def test_lru_eviction_by_entry_limit(self):
+        """Test that the least recently used schema is evicted first."""
+        registry = self._registry(max_entries=2)
+        alpha = registry.get_schema(self.paths[0])
+        registry.get_schema(self.paths[1])
+        registry.get_schema(self.paths[0])  # Alpha becomes most recently used
+        registry.get_schema(self.paths[2])  # Beta is evicted
+
+        stats = registry.get_stats()
+        assert stats['entries'] == 2
+        assert stats['evictions'] == 1
+        assert registry.get_schema(self.paths[0]) is alpha
+        assert registry.get_stats()['misses'] == 3
+
+    def test_byte_budget_keeps_newest_entry(self):
+        """Test that a tiny byte budget still keeps the most recent schema."""
+        registry = self._registry(max_bytes=1)
+        registry.get_schema(self.paths[0])
+        registry.get_schema(self.paths[1])
+
+        stats = registry.get_stats()
+        assert stats['entries'] == 1
+        assert stats['evictions'] == 1
+        assert stats['total_bytes'] > 0
+
+    def test_concurrent_loads_build_once(self):
+        """Test that concurrent callers share a single load of the same schema."""
+        registry = self._registry()
+        results = []
+
+        def load():
+            results.append(registry.get_schema(self.paths[0]))
+
+        threads = [threading.Thread(target=load) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len({id(schema) for schema in results}) == 1
+        assert registry.get_stats()['misses'] == 1
+
+    def test_clear_resets_registry(self):
+        """Test clearing entries and counters."""
+        registry = self._registry()
+        registry.get_schema(self.paths[0])
+        registry.clear()
+
+        stats = registry.get_stats()
+        assert stats['entries'] == 0
+        assert stats['total_bytes'] == 0
+        assert stats['misses'] == 0
+
+    def test_lxml_schema_compiled_once_per_digest(self):
+        """Test that the libxml2 schema is shared per digest and bounded by the entry limit."""
+        registry = self._registry(max_entries=2)
+        first = registry.get_lxml_schema(self.paths[0])
+
+        assert first is not None
+        assert registry.get_lxml_schema(self.paths[0]) is first
+
+        registry.get_lxml_schema(self.paths[1])
+        registry.get_lxml_schema(self.paths[2])
+        assert registry.get_stats()['lxml_entries'] == 2
+
+    def test_concurrent_lxml_validations_keep_their_error_logs(self):
+        """Test that each caller gets the error log of its own document."""
+        from lxml import etree
+
+        path = os.path.join(self.schema_dir, 'Flags.xsd')
+        with open(path, 'w') as f:
+            f.write(FLAGS_XSD)
+        registry = self._registry()
+        valid = etree.fromstring(b'<Flags>' + b'<Flag>true</Flag>' * 20000 + b'</Flags>')
+        invalid = etree.fromstring(b'<Flags>' + b'<Flag>maybe</Flag>' * 3 + b'<Flag>true</Flag>' * 20000 + b'</Flags>')
+        barrier = threading.Barrier(8)
+        results = []
+
+        def validate(document, expected_errors):
+            barrier.wait()
+            for _ in range(20):
+                results.append(len(registry.validate_lxml(path, document)) == expected_errors)
+
+        threads = [threading.Thread(target=validate, args=(invalid, 3) if i % 2 else (valid, 0)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(results) == 160 and all(results)
@@ -9,9 +9,10 @@ import os
 import pytest
 import tempfile
 import shutil
+import time
 from unittest.mock import Mock, patch, mock_open
 from services.file_manager import FileManager
-from config import get_config
+from config import Config, get_config
 
 
 class TestFileManagerInit:
@@ -214,6 +215,21 @@ class TestFileManagerXSDDependencies:
         # Should handle copy error gracefully
         file_manager.setup_temp_directory_with_dependencies(target_path, 'test.xsd', source_target_path)
 
+    def test_setup_temp_directory_copies_only_import_closure(self, resource_dir):
+        """Test that only schemas reachable through imports are copied."""
+        file_manager = FileManager()
+        source_path = os.path.join(resource_dir, 'IATA_OrderViewRS.xsd')
+        temp_path = os.path.join(self.test_dir, 'IATA_OrderViewRS.xsd')
+        shutil.copy(source_path, temp_path)
+
+        file_manager.setup_temp_directory_with_dependencies(temp_path, 'IATA_OrderViewRS.xsd', source_path)
+
+        assert sorted(os.listdir(self.test_dir)) == [
+            'IATA_OffersAndOrdersCommonTypes.xsd',
+            'IATA_OrderViewRS.xsd',
+            'xmldsig-core-schema.xsd',
+        ]
+
 
 class TestFileManagerXSDWithDependencies:
     """Test write_temp_xsd_with_dependencies functionality."""
@@ -291,6 +307,141 @@ class TestFileManagerErrorHandling:
         self.file_manager.cleanup_temp_directory('/some/directory')
 
 
+class TestFileManagerBlobStore:
+    """Test the content-addressed blob store, workspaces and source index."""
+
+    def setup_method(self):
+        """Set up a file manager with an isolated blob store."""
+        self.store_dir = tempfile.mkdtemp()
+        self.source_dir = tempfile.mkdtemp()
+        config = Config()
+        config.performance.blob_store_dir = self.store_dir
+        self.file_manager = FileManager(config)
+
+        self.source_path = os.path.join(self.source_dir, 'Common.xsd')
+        with open(self.source_path, 'w') as f:
+            f.write('<schema>common</schema>')
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.store_dir, ignore_errors=True)
+        shutil.rmtree(self.source_dir, ignore_errors=True)
+
+    def _blobs(self):
+        return [name for _, _, files in os.walk(self.file_manager.blob_dir) for name in files]
+
+    def test_store_blob_deduplicates_content(self):
+        """Test that identical content is stored once."""
+        copy_path = os.path.join(self.source_dir, 'Copy.xsd')
+        shutil.copy(self.source_path, copy_path)
+
+        digest = self.file_manager.store_blob(self.source_path)
+        assert self.file_manager.store_blob(copy_path) == digest
+        assert self._blobs() == [digest]
+
+    def test_store_blob_skips_hashing_unchanged_files(self):
+        """Test that storing an unchanged file reuses the remembered digest."""
+        digest = self.file_manager.store_blob(self.source_path)
+
+        with patch('services.file_manager.hashlib.sha256') as mock_sha:
+            assert self.file_manager.store_blob(self.source_path) == digest
+            mock_sha.assert_not_called()
+
+    def test_workspace_links_share_blob(self):
+        """Test that workspaces reference blobs through hardlinks."""
+        digest = self.file_manager.store_blob(self.source_path)
+        workspace = self.file_manager.create_workspace()
+        destination = os.path.join(workspace, 'Common.xsd')
+
+        method = self.file_manager.link_blob(digest, destination)
+
+        assert method in ('hardlink', 'symlink', 'copy')
+        with open(destination) as f:
+            assert f.read() == '<schema>common</schema>'
+        if method == 'hardlink':
+            assert os.stat(destination).st_ino == os.stat(self.file_manager._blob_path(digest)).st_ino
+
+    def test_source_directory_index_avoids_walk(self):
+        """Test that a known filename is found without walking the working directory."""
+        self.file_manager._find_source_directory('Common.xsd', self.source_path)
+
+        with patch('services.file_manager.os.walk') as mock_walk:
+            assert self.file_manager._find_source_directory('Common.xsd') == self.source_dir
+            mock_walk.assert_not_called()
+
+    def test_collect_garbage_removes_stale_entries(self):
+        """Test that old workspaces and unreferenced blobs are collected."""
+        digest = self.file_manager.store_blob(self.source_path)
+        workspace = self.file_manager.create_workspace()
+        self.file_manager.link_blob(digest, os.path.join(workspace, 'Common.xsd'))
+
+        # Recent entries survive
+        assert self.file_manager.collect_garbage() == {'workspaces': 0, 'blobs': 0}
+
+        # Everything is stale with a negative age limit
+        removed = self.file_manager.collect_garbage(max_age_hours=-1)
+        assert removed['workspaces'] == 1
+        assert not os.path.exists(workspace)
+        assert self.file_manager.collect_garbage(max_age_hours=-1)['blobs'] + removed['blobs'] == 1
+        assert self._blobs() == []
+
+
+    def test_collect_garbage_keeps_symlinked_blobs_of_live_workspaces(self):
+        """Test that an old blob symlinked into a recent workspace is kept."""
+        workspace = self.file_manager.create_workspace()
+        digest = self.file_manager.store_blob(self.source_path)
+        destination = os.path.join(workspace, 'Common.xsd')
+        with patch('services.file_manager.os.link', side_effect=OSError("cross-device")):
+            assert self.file_manager.link_blob(digest, destination) == 'symlink'
+
+        old = time.time() - 48 * 3600
+        os.utime(self.file_manager._blob_path(digest), (old, old))
+
+        assert self.file_manager.collect_garbage(max_age_hours=24)['blobs'] == 0
+        with open(destination) as f:
+            assert f.read() == '<schema>common</schema>'
+
+    def test_collect_garbage_keeps_workspaces_in_use(self):
+        """Test that an old workspace that is still used survives collection."""
+        in_use = self.file_manager.create_workspace()
+        unused = self.file_manager.create_workspace()
+        xsd_path = os.path.join(in_use, 'Main.xsd')
+        shutil.copy(self.source_path, xsd_path)
+
+        old = time.time() - 48 * 3600
+        for workspace in (in_use, unused):
+            os.utime(workspace, (old, old))
+
+        # A session keeps working on its upload, e.g. setting up dependencies again
+        self.file_manager.setup_temp_directory_with_dependencies(xsd_path, 'Main.xsd')
+        self.file_manager.touch_workspace(self.source_path)  # Outside the store: ignored
+
+        assert self.file_manager.collect_garbage(max_age_hours=24)['workspaces'] == 1
+        assert os.path.exists(xsd_path)
+        assert not os.path.exists(unused)
+
+    def test_dependencies_update_index_once(self):
+        """Test that linking a bundle reads and writes the index once."""
+        main_path = os.path.join(self.source_dir, 'Main.xsd')
+        with open(main_path, 'w') as f:
+            f.write('<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">'
+                    '<xs:include schemaLocation="Common.xsd"/><xs:include schemaLocation="Other.xsd"/>'
+                    '</xs:schema>')
+        with open(os.path.join(self.source_dir, 'Other.xsd'), 'w') as f:
+            f.write('<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"/>')
+        workspace = self.file_manager.create_workspace()
+        shutil.copy(main_path, workspace)
+
+        with patch.object(self.file_manager, '_update_index', wraps=self.file_manager._update_index) as mock_update:
+            self.file_manager.setup_temp_directory_with_dependencies(
+                os.path.join(workspace, 'Main.xsd'), 'Main.xsd', main_path
+            )
+
+        hash_updates = [call for call in mock_update.call_args_list if call.kwargs.get('hashes')]
+        assert len(hash_updates) == 1
+        assert len(hash_updates[0].kwargs['hashes']) == 2
+        assert os.path.exists(os.path.join(workspace, 'Other.xsd'))
+
 class TestFileManagerIntegration:
     """Integration tests for FileManager."""
     
@@ -56,23 +56,27 @@ class TestSchemaAnalyzerAnalyzeXSDSchema:
         mock_element.type.is_complex.return_value = True
         mock_schema.elements = {'root': mock_element}
         
-        # Mock analyzer methods
-        with patch.object(self.analyzer, 'extract_element_tree', return_value={'name': 'root'}):
-            with patch.object(self.analyzer, 'extract_all_choice_elements', return_value=[{'type': 'choice'}]):
-                with patch.object(self.analyzer, 'find_unbounded_elements', return_value=[{'name': 'unbounded'}]):
-                    
-                    result = self.analyzer.analyze_xsd_schema('/path/to/schema.xsd')
-                    
-                    assert result['success'] is True
-                    assert 'schema_info' in result
-                    assert 'root_elements' in result
-                    assert 'choices' in result
-                    assert 'unbounded_elements' in result
-                    assert 'element_tree' in result
-                    
-                    assert len(result['choices']) == 1
-                    assert len(result['unbounded_elements']) == 1
-                    assert 'root' in result['element_tree']
+        # Mock the single-pass schema walk
+        walked = {
+            'tree': {'name': 'root'},
+            'choices': [{'type': 'choice'}],
+            'unbounded': [{'name': 'unbounded'}]
+        }
+        with patch('services.schema_analyzer.SchemaWalker.walk', return_value=walked):
+            
+            result = self.analyzer.analyze_xsd_schema('/path/to/schema.xsd')
+            
+            assert result['success'] is True
+            assert 'schema_info' in result
+            assert 'root_elements' in result
+            assert 'choices' in result
+            assert 'unbounded_elements' in result
+            assert 'element_tree' in result
+            assert 'type_statistics' in result
+            
+            assert len(result['choices']) == 1
+            assert len(result['unbounded_elements']) == 1
+            assert 'root' in result['element_tree']
     
     @patch('services.schema_analyzer.XSDParser')
     def test_analyze_xsd_schema_no_complex_elements(self, mock_parser_class):
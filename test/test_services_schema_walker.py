@@ -0,0 +1,229 @@
+"""
+Unit tests for services.schema_walker module.
+
+Tests that the single-pass SchemaWalker produces the same tree, choice catalog
+and unbounded catalog as the individual SchemaAnalyzer extraction methods,
+inspects each XSD type once, and records per-type statistics. Also tests the
+LazyElementTree built on demand and root-scoped lazy schema analysis.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+from unittest.mock import patch
+
+import xmlschema
+
+from config import Config
+from services.schema_analyzer import SchemaAnalyzer
+from services.schema_walker import LazyElementTree, SchemaWalker
+
+
+WALKER_XSD = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+           xmlns="urn:walker" targetNamespace="urn:walker" elementFormDefault="qualified">
+  <xs:complexType name="AddressType">
+    <xs:sequence>
+      <xs:element name="Street" type="xs:string" maxOccurs="3"/>
+      <xs:choice>
+        <xs:element name="PostalCode" type="xs:string"/>
+        <xs:element name="POBox" type="xs:string"/>
+      </xs:choice>
+    </xs:sequence>
+  </xs:complexType>
+  <xs:complexType name="PartyType">
+    <xs:sequence>
+      <xs:element name="Name" type="xs:string"/>
+      <xs:element name="Address" type="AddressType" maxOccurs="unbounded"/>
+      <xs:element name="Party" type="PartyType" minOccurs="0"/>
+    </xs:sequence>
+  </xs:complexType>
+  <xs:element name="Order">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="Buyer" type="PartyType"/>
+        <xs:element name="Seller" type="PartyType"/>
+        <xs:element name="Item" maxOccurs="unbounded">
+          <xs:complexType>
+            <xs:choice>
+              <xs:element name="Product" type="xs:string"/>
+              <xs:element name="Service" type="AddressType"/>
+            </xs:choice>
+          </xs:complexType>
+        </xs:element>
+      </xs:sequence>
+    </xs:complexType>
+  </xs:element>
+  <xs:element name="Invoice" type="PartyType"/>
+</xs:schema>'''
+
+
+class TestSchemaWalker:
+    """Test the single-pass schema walk."""
+
+    def setup_method(self):
+        """Set up a schema file."""
+        self.schema_dir = tempfile.mkdtemp()
+        self.xsd_path = os.path.join(self.schema_dir, 'Order.xsd')
+        with open(self.xsd_path, 'w') as f:
+            f.write(WALKER_XSD)
+        self.schema = xmlschema.XMLSchema(self.xsd_path)
+        self.config = Config()
+
+    def teardown_method(self):
+        """Clean up temporary directories."""
+        shutil.rmtree(self.schema_dir, ignore_errors=True)
+
+    def test_matches_individual_extraction_methods(self):
+        """Test that one walk reproduces the tree, choices and unbounded elements."""
+        analyzer = SchemaAnalyzer(self.config)
+        walker = SchemaWalker(self.config)
+        for name, element in self.schema.elements.items():
+            walked = walker.walk(element, name)
+
+            assert walked['tree'] == analyzer.extract_element_tree(element, name)
+            assert walked['choices'] == analyzer.extract_all_choice_elements(element, name)
+            assert walked['unbounded'] == analyzer.find_unbounded_elements(element)
+
+    def test_types_are_inspected_once(self):
+        """Test that shared types are summarized once across all global elements."""
+        walker = SchemaWalker(self.config)
+        with patch.object(walker, '_summarize', wraps=walker._summarize) as summarize:
+            for name, element in self.schema.elements.items():
+                walker.walk(element, name)
+
+        summarized = [call.args[0] for call in summarize.call_args_list]
+        assert len(summarized) == len({id(xsd_type) for xsd_type in summarized})
+        assert sum(1 for xsd_type in summarized if xsd_type.local_name == 'PartyType') == 1
+
+    def test_type_statistics(self):
+        """Test that element positions are counted per type."""
+        walker = SchemaWalker(self.config)
+        for name, element in self.schema.elements.items():
+            walker.walk(element, name)
+
+        party = walker.type_statistics['PartyType']
+        assert party['min_level'] == 0
+        assert party['occurrences'] >= 3
+        assert party['child_elements'] == 3
+        assert walker.type_statistics['AddressType']['choice_groups'] == 1
+        assert walker.type_statistics['Item (anonymous)']['choice_groups'] == 1
+
+    def test_analyze_xsd_schema_uses_single_walk(self):
+        """Test that schema analysis no longer runs the separate traversals."""
+        analyzer = SchemaAnalyzer(self.config)
+        with patch.object(analyzer, 'extract_element_tree') as tree, \
+                patch.object(analyzer, 'extract_all_choice_elements') as choices:
+            result = analyzer.analyze_xsd_schema(self.xsd_path)
+
+        tree.assert_not_called()
+        choices.assert_not_called()
+        assert result['success'] is True
+        assert set(result['element_tree']) == {'Order', 'Invoice'}
+        assert {choice['path'] for choice in result['choices']} >= {'Order.Item', 'Order.Buyer.Address'}
+        assert 'PartyType' in result['type_statistics']
+
+
+class TestLazyElementTree:
+    """Test display trees built on first request."""
+
+    def setup_method(self):
+        """Set up a schema file."""
+        self.schema_dir = tempfile.mkdtemp()
+        self.xsd_path = os.path.join(self.schema_dir, 'Order.xsd')
+        with open(self.xsd_path, 'w') as f:
+            f.write(WALKER_XSD)
+        self.schema = xmlschema.XMLSchema(self.xsd_path)
+        self.config = Config()
+
+    def teardown_method(self):
+        """Clean up temporary directories."""
+        shutil.rmtree(self.schema_dir, ignore_errors=True)
+
+    def test_children_are_built_page_by_page(self):
+        """Test that only the root exists at first and children are built as pages are requested."""
+        tree = LazyElementTree(SchemaWalker(self.config), self.schema.elements['Order'], 'Order')
+        root = tree.root
+
+        assert root['children'] == [] and root['child_count'] == 3
+        first_page = tree.children(root['id'], 0, 2)
+        assert [child['name'] for child in first_page] == ['Buyer', 'Seller']
+        assert len(root['children']) == 2
+        assert [child['name'] for child in tree.children(root['id'], 2, 2)] == ['Item']
+        assert tree.children(root['id']) == root['children']
+        assert tree.node(first_page[0]['id'])['path'] == 'Order.Buyer'
+
+    def test_nodes_match_eager_tree(self):
+        """Test that expanded nodes carry the eager tree's occurrence and choice information."""
+        eager = SchemaWalker(self.config).walk(self.schema.elements['Order'], 'Order')['tree']
+        tree = LazyElementTree(SchemaWalker(self.config), self.schema.elements['Order'], 'Order')
+
+        item = tree.children(tree.root['id'])[2]
+        eager_item = eager['children'][2]
+        for field in ('name', 'level', 'is_choice', 'choice_options', 'is_unbounded', 'occurs'):
+            assert item[field] == eager_item[field]
+        address = tree.children(tree.children(tree.root['id'], 0, 1)[0]['id'])[1]
+        street = tree.children(address['id'])[0]
+        assert address['path'] == 'Order.Buyer.Address' and address['is_unbounded']
+        assert street['child_count'] == 0 and street['_type_info'] == eager['children'][0]['children'][1]['children'][0]['_type_info']
+
+    def test_repeats_are_detected_along_ancestors(self):
+        """Test that a recursive type stops at its first repeat on the path, not elsewhere in the tree."""
+        walker = SchemaWalker(self.config)
+        tree = LazyElementTree(walker, self.schema.elements['Order'], 'Order')
+        buyer, seller, _ = tree.children(tree.root['id'])
+        party = tree.children(buyer['id'])[2]
+        nested_party = tree.children(party['id'])[2]
+
+        assert '_circular_ref' not in seller and seller['child_count'] == 3
+        assert '_circular_ref' not in party
+        assert nested_party['_circular_ref'] == 'Circular reference: Party'
+        assert nested_party['child_count'] == 0
+
+    def test_concurrent_expansion_builds_each_node_once(self):
+        """Test that sessions expanding a shared tree at the same time see the same nodes."""
+        tree = LazyElementTree(SchemaWalker(self.config), self.schema.elements['Order'], 'Order')
+        barrier = threading.Barrier(8)
+        paths = []
+
+        def expand():
+            barrier.wait()
+            seen = []
+            pending = [tree.root]
+            while pending and len(seen) < 60:
+                node = pending.pop()
+                seen.append(node['path'])
+                pending.extend(tree.children(node['id']))
+            paths.append(seen)
+
+        threads = [threading.Thread(target=expand) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert all(seen == paths[0] for seen in paths)
+        buyer = tree.root['children'][0]
+        assert [child['name'] for child in buyer['children']] == ['Name', 'Address', 'Party']
+        assert len({node['path'] for node in tree._nodes.values()}) == len(tree._nodes)
+
+    def test_lazy_analysis_is_scoped_to_root(self):
+        """Test that a lazy analysis catalogs one root and returns its lazy tree."""
+        analyzer = SchemaAnalyzer(self.config)
+        full = analyzer.analyze_xsd_schema(self.xsd_path)
+        result = analyzer.analyze_xsd_schema(self.xsd_path, lazy=True)
+
+        assert result['success'] is True
+        assert result['root_element'] == 'Order'
+        assert result['complex_roots'] == ['Order', 'Invoice']
+        assert result['element_tree'] == {'Order': result['lazy_tree'].root}
+        assert result['choices'] == [choice for choice in full['choices'] if choice['path'].startswith('Order')]
+
+        invoice = analyzer.analyze_xsd_schema(self.xsd_path, lazy=True, root_element='Invoice')
+        assert list(invoice['element_tree']) == ['Invoice']
+        assert all(choice['path'].startswith('Invoice') for choice in invoice['choices'])
+
+        missing = analyzer.analyze_xsd_schema(self.xsd_path, lazy=True, root_element='Missing')
+        assert missing['success'] is False
+        assert 'Missing' in missing['error']
@@ -0,0 +1,128 @@
+"""
+Unit tests for services.validation_index module.
+
+Tests error classification into records, path templates, component names
+and the grouped error index.
+"""
+
+import time
+
+import xmlschema
+from lxml import etree
+
+from services.validation_index import (
+    ErrorIndex, classify_error, component_name, normalize_path
+)
+
+
+ITEMS_XSD = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+           xmlns="urn:items" targetNamespace="urn:items" elementFormDefault="qualified">
+    <xs:element name="Root">
+        <xs:complexType>
+            <xs:sequence>
+                <xs:element name="Item" maxOccurs="unbounded">
+                    <xs:complexType>
+                        <xs:sequence>
+                            <xs:element name="Flag" type="xs:boolean"/>
+                            <xs:element name="Code">
+                                <xs:simpleType>
+                                    <xs:restriction base="xs:string">
+                                        <xs:enumeration value="A"/>
+                                    </xs:restriction>
+                                </xs:simpleType>
+                            </xs:element>
+                        </xs:sequence>
+                    </xs:complexType>
+                </xs:element>
+            </xs:sequence>
+        </xs:complexType>
+    </xs:element>
+</xs:schema>'''
+
+
+class TestClassifyError:
+    """Test classification of xmlschema errors into records."""
+
+    def setup_method(self):
+        """Build the test schema."""
+        self.schema = xmlschema.XMLSchema(ITEMS_XSD)
+
+    def _errors(self, items):
+        xml = '<Root xmlns="urn:items">' + ''.join(f'<Item>{item}</Item>' for item in items) + '</Root>'
+        return list(self.schema.iter_errors(xml))
+
+    def test_element_path_matches_error_path(self):
+        """Test that lxml documents get the same template from element ancestors."""
+        xml = '<Root xmlns="urn:items"><Item><Flag>maybe</Flag><Code>A</Code></Item></Root>'
+        document = etree.fromstring(xml.encode())
+        error = next(self.schema.iter_errors(xmlschema.XMLResource(document)))
+
+        assert classify_error(error).path == normalize_path(error.path) == '/Root/Item/Flag'
+
+    def test_records_of_each_category(self):
+        """Test category, path template, component and reason of real errors."""
+        records = [classify_error(error) for error in self._errors([
+            '<Flag>maybe</Flag><Code>A</Code>',
+            '<Flag>true</Flag><Code>B</Code>',
+            '<Flag>true</Flag>'
+        ])]
+
+        assert [(record.category, record.reason) for record in records] == [
+            ('boolean_errors', 'invalid_boolean'),
+            ('enumeration_errors', 'enumeration'),
+            ('structural_errors', 'missing_element')
+        ]
+        assert records[0].path == '/Root/Item/Flag'
+        assert records[0].component == 'XsdAtomicBuiltin(xs:boolean)'
+        assert records[1].component == 'XsdEnumerationFacets'
+        assert records[2].path == '/Root/Item'
+
+    def test_normalize_path(self):
+        """Test removal of positions, namespaces and prefixes."""
+        assert normalize_path('/ns0:Root/Item[3]/{urn:items}Flag') == '/Root/Item/Flag'
+        assert normalize_path(None) == ''
+
+    def test_component_name_without_validator(self):
+        """Test component name of errors without a validator."""
+        assert component_name(None) == ''
+
+
+class TestErrorIndex:
+    """Test grouping of error records."""
+
+    def setup_method(self):
+        """Build the test schema."""
+        self.schema = xmlschema.XMLSchema(ITEMS_XSD)
+
+    def test_groups_by_path_and_component(self):
+        """Test counts and exemplars per group, most frequent first."""
+        xml = '<Root xmlns="urn:items">' + '<Item><Flag>x</Flag><Code>A</Code></Item>' * 5 + \
+              '<Item><Flag>true</Flag><Code>B</Code></Item>' * 2 + '</Root>'
+        index = ErrorIndex(max_exemplars=2)
+        for error in self.schema.iter_errors(xml):
+            index.add(classify_error(error))
+
+        summary = index.summary()
+        assert index.total == 7
+        assert index.category_counts['boolean_errors'] == 5
+        assert [(group['path'], group['count']) for group in summary] == [
+            ('/Root/Item/Flag', 5), ('/Root/Item/Code', 2)
+        ]
+        assert len(summary[0]['exemplars']) == 2
+        assert len(index.summary(limit=1)) == 1
+
+    def test_many_errors_summarized_quickly(self):
+        """Test that indexing 20k errors of an lxml document stays linear."""
+        xml = '<Root xmlns="urn:items">' + '<Item><Flag>x</Flag><Code>A</Code></Item>' * 20000 + '</Root>'
+        errors = list(self.schema.iter_errors(xmlschema.XMLResource(etree.fromstring(xml.encode()))))
+
+        start = time.time()
+        index = ErrorIndex()
+        for error in errors:
+            index.add(classify_error(error))
+        elapsed = time.time() - start
+
+        assert index.total == 20000
+        assert len(index.groups) == 1
+        assert elapsed < 5
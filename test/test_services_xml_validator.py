@@ -5,7 +5,9 @@ Tests XMLValidator functionality including XML validation against XSD schemas,
 error categorization, detailed validation reporting, and error handling scenarios.
 """
 
+import io
 import os
+import shutil
 import pytest
 import tempfile
 from unittest.mock import Mock, patch, MagicMock, PropertyMock
@@ -194,7 +196,6 @@ class TestXMLValidatorValidateXMLAgainstSchema:
         mock_parser = Mock()
         mock_schema = Mock()
         mock_parser.schema = mock_schema
-        mock_parser.validate_xml.return_value = True
         mock_parser_class.return_value = mock_parser
         
         # Mock schema validation
@@ -204,26 +205,51 @@ class TestXMLValidatorValidateXMLAgainstSchema:
         ]
         mock_schema.iter_errors.return_value = iter(mock_errors)
         
-        # Mock file manager
         with patch.object(self.validator.file_manager, 'create_temp_file') as mock_create:
-            with patch.object(self.validator.file_manager, 'cleanup_temp_file') as mock_cleanup:
-                mock_create.return_value = '/tmp/test.xml'
-                
-                xml_content = '<?xml version="1.0"?><test>content</test>'
-                xsd_path = '/path/to/schema.xsd'
-                
-                result = self.validator.validate_xml_against_schema(xml_content, xsd_path)
-                
-                assert result['success'] is True
-                assert result['is_valid'] is True
-                assert result['total_errors'] == 2
-                assert 'error_breakdown' in result
-                assert 'categorized_errors' in result
-                assert 'detailed_errors' in result
-                
-                # Verify file operations
-                mock_create.assert_called_once_with(xml_content, '.xml')
-                mock_cleanup.assert_called_once_with('/tmp/test.xml')
+            xml_content = '<?xml version="1.0"?><test>content</test>'
+            xsd_path = '/path/to/schema.xsd'
+            
+            result = self.validator.validate_xml_against_schema(xml_content, xsd_path)
+            
+            assert result['success'] is True
+            assert result['is_valid'] is False
+            assert result['total_errors'] == 2
+            assert result['errors_truncated'] is False
+            assert 'error_breakdown' in result
+            assert 'categorized_errors' in result
+            assert 'detailed_errors' in result
+            
+            # Validated from memory in a single pass
+            mock_create.assert_not_called()
+            mock_schema.iter_errors.assert_called_once()
+            mock_parser.validate_xml.assert_not_called()
+    
+    @patch('services.xml_validator.XSDParser')
+    def test_validate_xml_max_errors(self, mock_parser_class):
+        """Test that validation stops after max_errors errors."""
+        mock_parser = Mock()
+        mock_schema = Mock()
+        mock_parser.schema = mock_schema
+        mock_parser_class.return_value = mock_parser
+        
+        consumed = []
+        
+        def error_stream(resource):
+            for index in range(100):
+                consumed.append(index)
+                yield Mock(message=f"error {index}")
+        
+        mock_schema.iter_errors.side_effect = error_stream
+        
+        result = self.validator.validate_xml_against_schema(
+            '<test>content</test>', '/path/to/schema.xsd', max_errors=5
+        )
+        
+        assert result['success'] is True
+        assert result['is_valid'] is False
+        assert result['total_errors'] == 5
+        assert result['errors_truncated'] is True
+        assert len(consumed) == 6
     
     @patch('services.xml_validator.XSDParser')
     def test_validate_xml_with_uploaded_content(self, mock_parser_class):
@@ -232,36 +258,32 @@ class TestXMLValidatorValidateXMLAgainstSchema:
         mock_parser = Mock()
         mock_schema = Mock()
         mock_parser.schema = mock_schema
-        mock_parser.validate_xml.return_value = False
         mock_parser_class.return_value = mock_parser
         
-        mock_schema.iter_errors.return_value = iter([])
+        mock_schema.iter_errors.return_value = iter([Mock(message="structural error")])
         
         # Mock file manager for XSD recreation
-        with patch.object(self.validator.file_manager, 'create_temp_file') as mock_create_xml:
-            with patch.object(self.validator.file_manager, 'write_temp_xsd_with_dependencies') as mock_write_xsd:
-                with patch.object(self.validator.file_manager, 'cleanup_temp_file') as mock_cleanup_file:
-                    with patch.object(self.validator.file_manager, 'cleanup_temp_directory') as mock_cleanup_dir:
-                        with patch('os.path.exists', return_value=False):
-                            
-                            mock_create_xml.return_value = '/tmp/test.xml'
-                            mock_write_xsd.return_value = ('/tmp/schema.xsd', '/tmp/temp_dir')
-                            
-                            xml_content = '<?xml version="1.0"?><test>content</test>'
-                            xsd_path = '/nonexistent/schema.xsd'
-                            uploaded_name = 'schema.xsd'
-                            uploaded_content = '<?xml version="1.0"?><schema>content</schema>'
-                            
-                            result = self.validator.validate_xml_against_schema(
-                                xml_content, xsd_path, uploaded_name, uploaded_content
-                            )
-                            
-                            assert result['success'] is True
-                            assert result['is_valid'] is False
-                            
-                            # Verify XSD was recreated
-                            mock_write_xsd.assert_called_once_with(uploaded_content, uploaded_name)
-                            mock_cleanup_dir.assert_called_once_with('/tmp/temp_dir')
+        with patch.object(self.validator.file_manager, 'write_temp_xsd_with_dependencies') as mock_write_xsd:
+            with patch.object(self.validator.file_manager, 'cleanup_temp_directory') as mock_cleanup_dir:
+                with patch('os.path.exists', return_value=False):
+                    
+                    mock_write_xsd.return_value = ('/tmp/schema.xsd', '/tmp/temp_dir')
+                    
+                    xml_content = '<?xml version="1.0"?><test>content</test>'
+                    xsd_path = '/nonexistent/schema.xsd'
+                    uploaded_name = 'schema.xsd'
+                    uploaded_content = '<?xml version="1.0"?><schema>content</schema>'
+                    
+                    result = self.validator.validate_xml_against_schema(
+                        xml_content, xsd_path, uploaded_name, uploaded_content
+                    )
+                    
+                    assert result['success'] is True
+                    assert result['is_valid'] is False
+                    
+                    # Verify XSD was recreated
+                    mock_write_xsd.assert_called_once_with(uploaded_content, uploaded_name)
+                    mock_cleanup_dir.assert_called_once_with('/tmp/temp_dir')
     
     @patch('services.xml_validator.XSDParser')
     def test_validate_xml_with_existing_xsd(self, mock_parser_class):
@@ -291,8 +313,8 @@ class TestXMLValidatorValidateXMLAgainstSchema:
     
     def test_validate_xml_exception_handling(self):
         """Test validation with exception handling."""
-        with patch.object(self.validator.file_manager, 'create_temp_file') as mock_create:
-            mock_create.side_effect = Exception("File creation failed")
+        with patch('services.xml_validator.XSDParser') as mock_parser_class:
+            mock_parser_class.side_effect = Exception("Schema load failed")
             
             xml_content = '<?xml version="1.0"?><test>content</test>'
             xsd_path = '/path/to/schema.xsd'
@@ -302,7 +324,7 @@ class TestXMLValidatorValidateXMLAgainstSchema:
             assert result['success'] is False
             assert result['is_valid'] is False
             assert 'error' in result
-            assert "File creation failed" in result['error']
+            assert "Schema load failed" in result['error']
 
 
 class TestXMLValidatorIntegration:
@@ -401,6 +423,183 @@ class TestXMLValidatorIntegration:
         assert result['total_errors'] == 0
 
 
+class TestXMLValidatorFastPath:
+    """Test the libxml2 fast path and the xmlschema fallback."""
+    
+    XSD_CONTENT = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+    <xs:element name="root">
+        <xs:complexType>
+            <xs:sequence>
+                <xs:element name="flag" type="xs:boolean"/>
+            </xs:sequence>
+        </xs:complexType>
+    </xs:element>
+</xs:schema>'''
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.validator = XMLValidator()
+        self.temp_dir = tempfile.mkdtemp()
+        self.xsd_path = os.path.join(self.temp_dir, 'fast.xsd')
+        with open(self.xsd_path, 'w') as f:
+            f.write(self.XSD_CONTENT)
+    
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_valid_document_skips_xmlschema(self):
+        """Test that a document accepted by libxml2 never loads the xmlschema schema."""
+        with patch('services.xml_validator.XSDParser') as mock_parser_class:
+            result = self.validator.validate_xml_against_schema(
+                '<?xml version="1.0" encoding="UTF-8"?><root><flag>true</flag></root>', self.xsd_path
+            )
+        
+        assert result['success'] is True
+        assert result['is_valid'] is True
+        assert result['validator'] == 'lxml'
+        mock_parser_class.assert_not_called()
+    
+    def test_invalid_document_reports_error_log(self):
+        """Test that rejected documents report the libxml2 errors without xmlschema."""
+        with patch('services.xml_validator.XSDParser') as mock_parser_class:
+            result = self.validator.validate_xml_against_schema(
+                '<root>\n<flag>maybe</flag></root>', self.xsd_path
+            )
+        
+        assert result['success'] is True
+        assert result['is_valid'] is False
+        assert result['validator'] == 'lxml'
+        assert result['total_errors'] == 1
+        assert result['error_breakdown']['boolean_errors'] == 1
+        error = result['detailed_errors'][0]
+        assert error['line'] == 2
+        assert error['path'] == '/root/flag'
+        assert "'maybe'" in error['message']
+        assert result['error_groups'][0]['path'] == '/root/flag'
+        assert self.validator.format_validation_error(error)['element_name'] == 'flag'
+        mock_parser_class.assert_not_called()
+    
+    def test_invalid_document_detailed_uses_xmlschema(self):
+        """Test that detailed validation of rejected documents gets xmlschema errors."""
+        result = self.validator.validate_xml_against_schema(
+            '<root><flag>maybe</flag></root>', self.xsd_path, detailed=True
+        )
+        
+        assert result['success'] is True
+        assert result['is_valid'] is False
+        assert result['validator'] == 'xmlschema'
+        assert result['error_breakdown']['boolean_errors'] == 1
+    
+    def test_detailed_bypasses_fast_path(self):
+        """Test that detailed validation always runs xmlschema."""
+        result = self.validator.validate_xml_against_schema(
+            '<root><flag>true</flag></root>', self.xsd_path, detailed=True
+        )
+        
+        assert result['is_valid'] is True
+        assert result['validator'] == 'xmlschema'
+
+
+class TestXMLValidatorStreaming:
+    """Test streaming validation of large XML files."""
+    
+    XSD_CONTENT = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+    <xs:element name="root">
+        <xs:complexType>
+            <xs:sequence>
+                <xs:element name="item" maxOccurs="unbounded">
+                    <xs:complexType>
+                        <xs:sequence>
+                            <xs:element name="flag" type="xs:boolean"/>
+                        </xs:sequence>
+                    </xs:complexType>
+                </xs:element>
+            </xs:sequence>
+        </xs:complexType>
+    </xs:element>
+</xs:schema>'''
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.validator = XMLValidator()
+        self.temp_dir = tempfile.mkdtemp()
+        self.xsd_path = os.path.join(self.temp_dir, 'items.xsd')
+        with open(self.xsd_path, 'w') as f:
+            f.write(self.XSD_CONTENT)
+    
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _write_items(self, flags):
+        xml_path = os.path.join(self.temp_dir, 'items.xml')
+        with open(xml_path, 'w') as f:
+            f.write('<root>')
+            for flag in flags:
+                f.write(f'<item><flag>{flag}</flag></item>')
+            f.write('</root>')
+        return xml_path
+    
+    def test_valid_file_streams_through_lxml(self):
+        """Test that a valid file is accepted by the streaming libxml2 check."""
+        xml_path = self._write_items(['true'] * 500)
+        
+        result = self.validator.validate_large_xml(xml_path, self.xsd_path)
+        
+        assert result['success'] is True
+        assert result['is_valid'] is True
+        assert result['validator'] == 'lxml'
+    
+    def test_category_limits_keep_counts(self):
+        """Test that category limits bound the kept errors but not the counts."""
+        xml_path = self._write_items(['maybe'] * 20 + ['true'] * 20)
+        
+        result = self.validator.validate_large_xml(
+            xml_path, self.xsd_path, category_limits={'boolean_errors': 3}
+        )
+        
+        assert result['is_valid'] is False
+        assert result['total_errors'] == 20
+        assert result['error_breakdown']['boolean_errors'] == 20
+        assert len(result['categorized_errors']['boolean_errors']) == 3
+        assert len(result['detailed_errors']) == 10
+        assert [(group['path'], group['count']) for group in result['error_groups']] == [('/root/item/flag', 20)]
+    
+    def test_unknown_category_limit_rejected(self):
+        """Test that category limits must use the error category names."""
+        xml_path = self._write_items(['maybe'])
+        
+        with pytest.raises(ValueError, match="Unknown error categories: structural"):
+            self.validator.validate_large_xml(xml_path, self.xsd_path, category_limits={'structural': 3})
+    
+    def test_uploaded_file_object(self):
+        """Test validating an in-memory upload, as the UI passes it."""
+        with open(self._write_items(['maybe', 'true']), 'rb') as f:
+            upload = io.BytesIO(f.read())
+        
+        result = self.validator.validate_large_xml(upload, self.xsd_path)
+        
+        assert result['success'] is True
+        assert result['total_errors'] == 1
+        assert result['error_breakdown']['boolean_errors'] == 1
+    
+    def test_iter_validation_errors_from_file_object(self):
+        """Test that errors are yielded incrementally from a file object."""
+        xml_path = self._write_items(['maybe', 'true', 'maybe'])
+        
+        with open(xml_path, 'rb') as xml_file:
+            records = self.validator.iter_validation_errors(xml_file, self.xsd_path)
+            record = next(records)
+            
+            assert record.category == 'boolean_errors'
+            assert record.path == '/root/item/flag'
+            assert 'maybe' in str(record.error)
+            assert len(list(records)) == 1
+
+
 class TestXMLValidatorErrorHandling:
     """Test error handling in various scenarios."""
     
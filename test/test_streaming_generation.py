@@ -0,0 +1,136 @@
+"""
+Unit tests for streamed XML generation.
+
+Tests that XMLGenerator.stream_dummy_xml writes the same document as the
+in-memory generator, honours large requested counts without capping them,
+and that StreamingXMLWriter pretty-prints incrementally written elements.
+"""
+
+import io
+import os
+import shutil
+import tempfile
+
+from lxml import etree
+
+from utils.generation_plan import get_plan_cache
+from utils.type_generators import EnumerationTypeGenerator
+from utils.xml_generator import XMLGenerator
+from utils.xml_stream_writer import StreamingXMLWriter
+
+
+STREAM_XSD = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+           xmlns="urn:stream" targetNamespace="urn:stream" elementFormDefault="qualified">
+  <xs:complexType name="AmountType">
+    <xs:simpleContent>
+      <xs:extension base="xs:decimal">
+        <xs:attribute name="CurCode" type="xs:string"/>
+      </xs:extension>
+    </xs:simpleContent>
+  </xs:complexType>
+  <xs:element name="Itinerary">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="Name" type="xs:string"/>
+        <xs:element name="PaxSegment" maxOccurs="unbounded">
+          <xs:complexType>
+            <xs:sequence>
+              <xs:element name="Status" type="xs:string"/>
+              <xs:element name="Fare" type="AmountType"/>
+            </xs:sequence>
+            <xs:attribute name="SegmentID" type="xs:ID"/>
+          </xs:complexType>
+        </xs:element>
+      </xs:sequence>
+    </xs:complexType>
+  </xs:element>
+</xs:schema>'''
+
+
+def _canonical(xml_bytes):
+    return etree.tostring(etree.fromstring(xml_bytes), method='c14n')
+
+
+class TestStreamingGeneration:
+    """Test XMLGenerator.stream_dummy_xml and StreamingXMLWriter."""
+
+    def setup_method(self):
+        """Set up a schema file and an empty plan cache."""
+        self.schema_dir = tempfile.mkdtemp()
+        self.xsd_path = os.path.join(self.schema_dir, 'Itinerary.xsd')
+        with open(self.xsd_path, 'w') as f:
+            f.write(STREAM_XSD)
+        self.generator = XMLGenerator(self.xsd_path)
+        get_plan_cache().clear()
+
+    def teardown_method(self):
+        """Clean up temporary directories and cached plans."""
+        shutil.rmtree(self.schema_dir, ignore_errors=True)
+        get_plan_cache().clear()
+
+    def test_stream_matches_in_memory_output(self):
+        """Test that streaming writes the same document as generate_dummy_xml_with_options."""
+        options = {'unbounded_counts': {'PaxSegment': 3}}
+        EnumerationTypeGenerator.reset_usage_tracker()
+        expected = self.generator.generate_dummy_xml_with_options(**options)
+
+        EnumerationTypeGenerator.reset_usage_tracker()
+        output = io.BytesIO()
+        result = self.generator.stream_dummy_xml(output, **options)
+
+        assert result['success']
+        assert output.getvalue().startswith(b'<?xml version="1.0" encoding="UTF-8"?>\n<Itinerary')
+        assert _canonical(output.getvalue()) == _canonical(expected.encode('utf-8'))
+
+    def test_large_counts_are_not_capped(self):
+        """Test that requested counts are streamed in full from a constant-size plan."""
+        output = io.BytesIO()
+        result = self.generator.stream_dummy_xml(output, unbounded_counts={'PaxSegment': 2000})
+
+        root = etree.fromstring(output.getvalue())
+        segments = root.findall('{urn:stream}PaxSegment')
+        assert len(segments) == 2000
+        assert len({segment.get('SegmentID') for segment in segments}) == 2000
+        assert segments[-1].find('{urn:stream}Fare').get('CurCode')
+
+        plan = next(iter(get_plan_cache()._plans.values()))
+        assert result['value_slots'] == plan.get_stats()['value_slots']
+        assert plan.get_stats()['distinct_samplers'] < 10
+
+        # The in-memory generator keeps its depth cap
+        xml = self.generator.generate_dummy_xml_with_options(unbounded_counts={'PaxSegment': 2000})
+        assert xml.count('<PaxSegment ') == 5
+
+    def test_stream_to_path(self):
+        """Test streaming into a file given by path."""
+        output_path = os.path.join(self.schema_dir, 'out.xml')
+        result = self.generator.stream_dummy_xml(output_path)
+
+        assert result['success']
+        assert result['output_path'] == output_path
+        assert etree.parse(output_path).getroot().tag == '{urn:stream}Itinerary'
+
+    def test_writer_pretty_prints_incrementally(self):
+        """Test attribute, text, leaf and empty element output of the writer."""
+        output = io.BytesIO()
+        with etree.xmlfile(output, encoding='utf-8') as xml_file:
+            writer = StreamingXMLWriter(xml_file, nsmap={None: 'urn:w'})
+            writer.start(etree.QName('urn:w', 'Root'))
+            writer.start(etree.QName('urn:w', 'Amount'))
+            writer.attribute('CurCode', 'EUR')
+            writer.text('9.50')
+            writer.end()
+            writer.leaf(etree.QName('urn:w', 'Note'), 'a < b')
+            writer.start(etree.QName('urn:w', 'Empty'))
+            writer.end()
+            writer.end()
+
+        assert output.getvalue().decode('utf-8') == (
+            '<Root xmlns="urn:w">\n'
+            '  <Amount CurCode="EUR">9.50</Amount>\n'
+            '  <Note>a &lt; b</Note>\n'
+            '  <Empty></Empty>\n'
+            '</Root>'
+        )
+        assert writer.elements_written == 4
@@ -0,0 +1,148 @@
+"""
+Unit tests for utils.subtree_memo module.
+
+Tests that repeated complex types are walked once per depth, that clones
+re-sample IDs while sharing other values and untouched subtrees, and that
+memoized documents stay valid and reproducible.
+"""
+
+import os
+import shutil
+import tempfile
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import xmlschema
+
+from config import Config
+from utils.generation_plan import ValueSampler
+from utils.subtree_memo import SubtreeMemo
+from utils.xml_generator import XMLGenerator
+
+
+MEMO_XSD = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+           xmlns="urn:memo" targetNamespace="urn:memo" elementFormDefault="qualified">
+  <xs:complexType name="PriceType">
+    <xs:sequence>
+      <xs:element name="TotalAmount" type="xs:decimal"/>
+      <xs:element name="Label" type="xs:string"/>
+    </xs:sequence>
+  </xs:complexType>
+  <xs:complexType name="SegmentType">
+    <xs:sequence>
+      <xs:element name="Origin" type="xs:string"/>
+      <xs:element name="Price" type="PriceType"/>
+    </xs:sequence>
+    <xs:attribute name="SegmentID" type="xs:ID" use="required"/>
+  </xs:complexType>
+  <xs:element name="Order">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="Segment" type="SegmentType" maxOccurs="unbounded"/>
+        <xs:element name="OtherSegment" type="SegmentType" maxOccurs="unbounded"/>
+      </xs:sequence>
+    </xs:complexType>
+  </xs:element>
+</xs:schema>'''
+
+
+class _Counter:
+    """Type generator stand-in returning increasing values."""
+
+    def __init__(self):
+        self.config = None
+        self.calls = 0
+
+    def generate(self, element_name, constraints, context):
+        self.calls += 1
+        return f"{element_name}{self.calls}"
+
+
+class TestSubtreeMemo:
+    """Test template instantiation in SubtreeMemo."""
+
+    def _sampler(self, name, prototype):
+        return ValueSampler(name, name, prototype, use_custom=False)
+
+    def test_instantiate_resamples_volatile_leaves_only(self):
+        """Test that clones get new volatile values and share stable subtrees."""
+        ids, texts = _Counter(), _Counter()
+        id_sampler = self._sampler('SegmentID', ids)
+        price = {'Label': self._sampler('Label', texts)}
+        template = {'@SegmentID': id_sampler, 'Price': price}
+        owner = SimpleNamespace(config=None, context=None)
+        memo = SubtreeMemo(lambda sampler: sampler is id_sampler)
+
+        first = memo.instantiate(template, owner)
+        second = memo.instantiate(template, owner)
+
+        assert first['@SegmentID'] == 'SegmentID1'
+        assert second['@SegmentID'] == 'SegmentID2'
+        assert first['Price'] == {'Label': 'Label1'}
+        assert second['Price'] is first['Price']
+        assert first is not second
+        assert texts.calls == 1
+
+    def test_key_includes_path_only_when_path_sensitive(self):
+        """Test that parent paths split keys only for path-matched options."""
+        element = SimpleNamespace(type=object(), local_name='Segment')
+        shared = SubtreeMemo(lambda sampler: False)
+        by_path = SubtreeMemo(lambda sampler: False, path_sensitive=True)
+
+        assert shared.key(element, 'Order.A', 2) == shared.key(element, 'Order.B', 2)
+        assert shared.key(element, 'Order.A', 2) != shared.key(element, 'Order.A', 3)
+        assert by_path.key(element, 'Order.A', 2) != by_path.key(element, 'Order.B', 2)
+
+
+class TestMemoizedGeneration:
+    """Test XMLGenerator generation with subtree memoization enabled."""
+
+    def setup_method(self):
+        """Set up a schema file."""
+        self.schema_dir = tempfile.mkdtemp()
+        self.xsd_path = os.path.join(self.schema_dir, 'Order.xsd')
+        with open(self.xsd_path, 'w') as f:
+            f.write(MEMO_XSD)
+
+    def teardown_method(self):
+        """Clean up temporary directories."""
+        shutil.rmtree(self.schema_dir, ignore_errors=True)
+
+    def _generator(self, memoize):
+        config = Config()
+        config.performance.enable_subtree_memoization = memoize
+        return XMLGenerator(self.xsd_path, config_instance=config)
+
+    def test_repeated_types_walked_once_per_depth(self):
+        """Test that repeated occurrences skip the schema walk."""
+        counts = {'Segment': 4, 'OtherSegment': 3}
+        walks = {}
+        for memoize in (False, True):
+            generator = self._generator(memoize)
+            generator.config.performance.enable_generation_plans = False
+            with patch.object(generator, '_walk_element', wraps=generator._walk_element) as walk:
+                generator.generate_dummy_xml_with_options(unbounded_counts=counts, seed=5)
+            walks[memoize] = walk.call_count
+
+        assert walks[True] < walks[False]
+
+    def test_memoized_document_is_valid_and_reproducible(self):
+        """Test that clones keep unique IDs, validate and repeat for the same seed."""
+        generator = self._generator(True)
+        options = {'unbounded_counts': {'Segment': 4, 'OtherSegment': 3}, 'seed': 5}
+        xml = generator.generate_dummy_xml_with_options(**options)
+
+        schema = xmlschema.XMLSchema(self.xsd_path)
+        assert list(schema.iter_errors(xml)) == []
+        decoded = schema.to_dict(xml)
+        segments = decoded['Segment'] + decoded['OtherSegment']
+        assert len({segment['@SegmentID'] for segment in segments}) == len(segments)
+        assert len({segment['Price']['Label'] for segment in decoded['Segment']}) == 1
+        assert generator.generate_dummy_xml_with_options(**options) == xml
+
+    def test_memoization_disabled_by_default(self):
+        """Test that generations use compiled plans unless memoization is enabled."""
+        assert Config().performance.enable_subtree_memoization is False
+        assert self._generator(False)._use_generation_plan()
+        assert not self._generator(True)._use_generation_plan()
@@ -280,6 +280,38 @@ class TestTypeGeneratorFactory:
         assert isinstance(generator, NumericTypeGenerator)
         assert generator.is_decimal is True
 
+    def test_factory_memoizes_generator_selection(self):
+        """Test that identical requests reuse the selected generator."""
+        factory = TypeGeneratorFactory()
+        mock_type = Mock()
+        mock_type.primitive_type = None
+        mock_type.base_type = None
+        mock_type.name = None
+
+        first = factory.create_generator(mock_type, {}, "Description")
+        assert factory.create_generator(mock_type, {}, "OtherName") is first
+        assert factory.create_generator(mock_type, {}, "PaxRefIDs") is not first
+
+        enum_generator = factory.create_generator(mock_type, {'enum_values': ['A', 'B']})
+        assert isinstance(enum_generator, EnumerationTypeGenerator)
+        assert factory.create_generator(mock_type, {'enum_values': ['A', 'B']}) is enum_generator
+        assert factory.create_generator(mock_type, {'enum_values': ['C']}) is not enum_generator
+
+        stats = factory.get_cache_stats()
+        assert stats['hits'] == 2
+        assert stats['misses'] == 4
+        assert stats['entries'] == 4
+
+    def test_shared_numeric_generator_is_not_mutated(self):
+        """Test that an ordinal element does not switch a shared decimal generator to integers."""
+        factory = TypeGeneratorFactory()
+        generator = factory.create_primitive_generator('xs:decimal')
+
+        assert generator.generate("SequenceNumber") == 1
+        assert generator.is_decimal is True
+        assert isinstance(generator.generate("Weight"), float)
+        assert factory.create_primitive_generator('xs:decimal') is generator
+
 
 class TestXSDParserErrorHandling:
     """Test XSDParser error handling."""
@@ -0,0 +1,121 @@
+"""
+Unit tests for utils.xsd_dependency_resolver module.
+
+Tests header-only dependency reading, transitive closure computation on the
+bundled IATA schemas, search directory fallback and header caching.
+"""
+
+import os
+import shutil
+import tempfile
+
+from utils.xsd_dependency_resolver import XSDDependencyResolver
+
+
+ROOT_XSD = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" targetNamespace="urn:root">
+  <!-- dependency declarations -->
+  <xs:annotation><xs:documentation>Root</xs:documentation></xs:annotation>
+  <xs:import namespace="urn:common" schemaLocation="common/Common.xsd"/>
+  <xs:include schemaLocation="Part.xsd"/>
+  <xs:element name="Root" type="xs:string"/>
+  <xs:import namespace="urn:late" schemaLocation="Late.xsd"/>
+</xs:schema>'''
+
+COMMON_XSD = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" targetNamespace="urn:common">
+  <xs:import namespace="urn:leaf" schemaLocation="../Leaf.xsd"/>
+</xs:schema>'''
+
+LEAF_XSD = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" targetNamespace="urn:leaf"/>'''
+
+
+class TestXSDDependencyResolver:
+    """Test XSDDependencyResolver on synthetic and bundled schemas."""
+
+    def setup_method(self):
+        """Set up a small schema tree with nested and unrelated files."""
+        self.resolver = XSDDependencyResolver()
+        self.schema_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.schema_dir, 'common'))
+        files = {
+            'Root.xsd': ROOT_XSD,
+            'Part.xsd': LEAF_XSD.replace('urn:leaf', 'urn:root'),
+            'common/Common.xsd': COMMON_XSD,
+            'Leaf.xsd': LEAF_XSD,
+            'Late.xsd': LEAF_XSD,
+            'Unrelated.xsd': LEAF_XSD,
+        }
+        for relative_path, content in files.items():
+            with open(os.path.join(self.schema_dir, relative_path), 'w') as f:
+                f.write(content)
+        self.root_path = os.path.join(self.schema_dir, 'Root.xsd')
+
+    def teardown_method(self):
+        """Clean up temporary directories."""
+        shutil.rmtree(self.schema_dir, ignore_errors=True)
+
+    def _relative(self, paths):
+        return [os.path.relpath(path, self.schema_dir) for path in paths]
+
+    def test_header_stops_at_first_component(self):
+        """Test that declarations after the first component are not read."""
+        header = self.resolver.read_header(self.root_path)
+        assert header.is_schema
+        assert header.target_namespace == 'urn:root'
+        assert [kind for kind, _, _ in header.dependencies] == ['import', 'include']
+
+    def test_transitive_closure(self):
+        """Test that the closure follows nested and relative locations."""
+        closure = self.resolver.resolve(self.root_path)
+
+        assert self._relative(closure.files) == [
+            'Root.xsd', 'common/Common.xsd', 'Part.xsd', 'Leaf.xsd'
+        ]
+        assert 'Unrelated.xsd' not in self._relative(closure.files)
+        assert closure.namespace_locations['urn:leaf'] == [os.path.join(self.schema_dir, 'Leaf.xsd')]
+        assert closure.unresolved == []
+
+    def test_search_dirs_resolve_uploaded_copy(self):
+        """Test resolving an uploaded copy against its original directory."""
+        upload_dir = tempfile.mkdtemp()
+        try:
+            upload_path = shutil.copy(self.root_path, upload_dir)
+            assert self.resolver.resolve(upload_path).unresolved == ['common/Common.xsd', 'Part.xsd']
+
+            closure = self.resolver.resolve(upload_path, search_dirs=[self.schema_dir])
+            assert closure.unresolved == []
+            assert self._relative(closure.dependencies) == ['common/Common.xsd', 'Part.xsd', 'Leaf.xsd']
+        finally:
+            shutil.rmtree(upload_dir, ignore_errors=True)
+
+    def test_non_schema_document(self):
+        """Test that non-XSD documents are reported as such."""
+        path = os.path.join(self.schema_dir, 'NotSchema.xsd')
+        with open(path, 'w') as f:
+            f.write('<schema>content</schema>')
+
+        closure = self.resolver.resolve(path)
+        assert not closure.is_schema
+        assert closure.dependencies == []
+
+    def test_header_cache_refreshes_on_change(self):
+        """Test that a modified file is re-read."""
+        leaf_path = os.path.join(self.schema_dir, 'Leaf.xsd')
+        assert self.resolver.read_header(leaf_path).dependencies == []
+
+        with open(leaf_path, 'w') as f:
+            f.write(COMMON_XSD.replace('../Leaf.xsd', 'Late.xsd'))
+        assert len(self.resolver.read_header(leaf_path).dependencies) == 1
+
+    def test_bundled_order_view_closure(self, resource_dir):
+        """Test the closure of a bundled IATA message schema."""
+        closure = self.resolver.resolve(os.path.join(resource_dir, 'IATA_OrderViewRS.xsd'))
+
+        assert [os.path.basename(path) for path in closure.files] == [
+            'IATA_OrderViewRS.xsd',
+            'IATA_OffersAndOrdersCommonTypes.xsd',
+            'xmldsig-core-schema.xsd',
+        ]
+        assert len(os.listdir(resource_dir)) > len(closure.files)
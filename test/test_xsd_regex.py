@@ -0,0 +1,82 @@
+"""
+Unit tests for utils.xsd_regex pattern sampling.
+
+Tests that sampled strings conform to XSD patterns (including XSD-only
+syntax such as \\i, \\c, \\p{...} and class subtraction), deterministic
+seeding, length steering, per-pattern caching and StringTypeGenerator
+integration.
+"""
+
+import re
+
+import pytest
+
+from utils.type_generators import StringTypeGenerator
+from utils.xsd_regex import XSDPattern, XSDPatternCache, XSDPatternError, get_pattern_cache
+
+
+class TestXSDPatternSampler:
+    """Test XSDPattern compilation, sampling and caching."""
+
+    def setup_method(self):
+        """Set up an empty shared pattern cache."""
+        get_pattern_cache().clear()
+
+    def teardown_method(self):
+        """Clear compiled patterns."""
+        get_pattern_cache().clear()
+
+    def test_samples_match_pattern(self):
+        """Test that samples of Python-compatible patterns fully match them."""
+        patterns = [
+            '(0[1-9]|1[0-2])[0-9][0-9]',
+            '([A-Z]{3}|[A-Z]{2})|([0-9][A-Z])|([A-Z][0-9])',
+            '(SWS|SWR|BIL)[A-Za-z0-9]{7}',
+            r'[\-+]?\d+(\.\d{1,2})?',
+            '[^0-9]{3}',
+            '(ab)*c?',
+        ]
+        for pattern in patterns:
+            compiled = XSDPattern(pattern)
+            for seed in range(20):
+                value = compiled.sample(seed)
+                assert re.fullmatch(pattern, value), (pattern, value)
+
+    def test_xsd_only_syntax(self):
+        """Test name character escapes, categories, blocks and class subtraction."""
+        assert re.fullmatch(r'[A-Za-z_:][-.\w:]*', XSDPattern(r'\i\c*').sample('name'))
+        assert re.fullmatch('[b-df-hj-np-tv-z]{4}', XSDPattern('[a-z-[aeiou]]{4}').sample(1))
+        assert re.fullmatch('[A-Z]{2}[0-9]{3}', XSDPattern(r'\p{Lu}{2}\d{3}').sample(2))
+        assert not XSDPattern(r'[\p{IsBasicLatin}-[a-zA-Z0-9]]').sample(3).isalnum()
+
+    def test_deterministic_and_length_steered(self):
+        """Test that seeds reproduce values and length preferences are honoured."""
+        compiled = XSDPattern('[A-Z]{2}[0-9]{1,8}')
+        assert compiled.sample('seed') == compiled.sample('seed')
+        assert len(compiled.sample('seed', min_length=9)) >= 9
+        assert len(compiled.sample('seed', min_length=4, max_length=4)) == 4
+        assert len(XSDPattern('[0-9]+').sample(5, min_length=12)) == 12
+
+    def test_invalid_patterns_raise_and_are_cached(self):
+        """Test that malformed patterns raise XSDPatternError and compile once."""
+        for pattern in ('[a-', '(a', 'a{3,1}', r'\q', r'\p{IsKlingon}', 'a)'):
+            with pytest.raises(XSDPatternError):
+                XSDPattern(pattern)
+
+        cache = XSDPatternCache(max_entries=2)
+        for _ in range(3):
+            cache.get_pattern('[A-Z]{3}')
+            with pytest.raises(XSDPatternError):
+                cache.get_pattern('[a-')
+        assert cache.get_stats() == {'entries': 2, 'hits': 4, 'misses': 2}
+
+    def test_string_generator_samples_unknown_patterns(self):
+        """Test that StringTypeGenerator returns conforming values in one pass."""
+        generator = StringTypeGenerator()
+        constraints = {'pattern': '[0-9a-zA-Z]{1,2}', 'max_length': 2}
+        value = generator.generate('PaymentBrandCode', constraints)
+
+        assert re.fullmatch('[0-9a-zA-Z]{1,2}', value)
+        assert value == generator.generate('PaymentBrandCode', constraints)
+        assert re.fullmatch('[0-9]{6}', generator.generate('First6DigitsText', {'pattern': '[0-9]{6}'}))
+        assert re.fullmatch(r'[A-Za-z_:][-.\w:]*', generator.generate('Code', {'pattern': r'\i\c*'}))
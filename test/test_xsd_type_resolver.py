@@ -0,0 +1,102 @@
+"""
+Unit tests for utils.xsd_type_resolver name lookups.
+
+Tests exact and partial element/type lookups through the per-schema
+component indexes, lookups across imported schemas and index reuse.
+"""
+
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+import xmlschema
+
+from utils.xsd_type_resolver import ComponentIndex, UniversalXSDTypeResolver
+
+
+MAIN_XSD = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+           xmlns="urn:main" xmlns:c="urn:common" targetNamespace="urn:main">
+  <xs:import namespace="urn:common" schemaLocation="Common.xsd"/>
+  <xs:simpleType name="WeightMeasureType">
+    <xs:restriction base="xs:decimal"/>
+  </xs:simpleType>
+  <xs:element name="ShipmentWeight" type="WeightMeasureType"/>
+  <xs:element name="ShipmentDetails">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="Carrier" type="xs:string"/>
+      </xs:sequence>
+    </xs:complexType>
+  </xs:element>
+</xs:schema>'''
+
+COMMON_XSD = '''<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" xmlns="urn:common" targetNamespace="urn:common">
+  <xs:simpleType name="CountType">
+    <xs:restriction base="xs:integer"/>
+  </xs:simpleType>
+  <xs:simpleType name="MeasureType">
+    <xs:restriction base="xs:decimal"/>
+  </xs:simpleType>
+  <xs:element name="PieceCount" type="CountType"/>
+  <xs:element name="PieceList">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="Piece" type="xs:string"/>
+      </xs:sequence>
+    </xs:complexType>
+  </xs:element>
+</xs:schema>'''
+
+
+class TestTypeResolverLookups:
+    """Test indexed name lookups of UniversalXSDTypeResolver."""
+
+    def setup_method(self):
+        """Set up a main schema importing a common types schema."""
+        self.schema_dir = tempfile.mkdtemp()
+        for filename, content in (('Main.xsd', MAIN_XSD), ('Common.xsd', COMMON_XSD)):
+            with open(os.path.join(self.schema_dir, filename), 'w') as f:
+                f.write(content)
+        self.schema = xmlschema.XMLSchema(os.path.join(self.schema_dir, 'Main.xsd'))
+        self.resolver = UniversalXSDTypeResolver(self.schema)
+
+    def teardown_method(self):
+        """Clean up temporary directories."""
+        shutil.rmtree(self.schema_dir, ignore_errors=True)
+
+    def test_exact_and_imported_element_lookup(self):
+        """Test that elements are found by name in the main and imported schemas."""
+        assert self.resolver._find_element_direct('ShipmentDetails').local_name == 'ShipmentDetails'
+        assert self.resolver._find_element_direct('PieceList').local_name == 'PieceList'
+        assert self.resolver._find_element_direct('Unknown') is None
+
+    def test_partial_lookup_keeps_declaration_order(self):
+        """Test that partial matches return the first matching component."""
+        assert self.resolver._find_element_direct('Details').local_name == 'ShipmentDetails'
+        assert self.resolver._find_type_by_name('Measure').local_name == 'WeightMeasureType'
+        assert self.resolver._find_type_by_name('Count').local_name == 'CountType'
+        assert self.resolver.get_type_primitive_type('CountType')[0] == 'xs:integer'
+        assert self.resolver.get_type_primitive_type('Unknown') == ('xs:string', {})
+
+    def test_index_built_once_per_schema(self):
+        """Test that repeated lookups reuse the component indexes."""
+        self.resolver._find_element_direct('PieceList')
+        self.resolver._find_type_by_name('CountType')
+
+        with patch('utils.xsd_type_resolver.ComponentIndex') as mock_index:
+            assert self.resolver._find_element_direct('List').local_name == 'PieceList'
+            assert self.resolver._find_type_by_name('MeasureType').local_name == 'WeightMeasureType'
+            mock_index.assert_not_called()
+
+    def test_component_index_short_and_missing_text(self):
+        """Test partial matching below the n-gram size and for absent n-grams."""
+        index = ComponentIndex({'{urn:a}AlphaType': 'alpha', '{urn:a}BetaType': 'beta'})
+
+        assert index.find_local_name('BetaType') == 'beta'
+        assert index.find_partial('Be', 'local') == 'beta'
+        assert index.find_partial('urn:a', 'name') == 'alpha'
+        assert index.find_partial('urn:a', 'local') is None
+        assert index.find_partial('Gamma', 'local') is None
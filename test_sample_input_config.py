@@ -6,6 +6,7 @@ Test the fixed sample_input_config.json to see if it generates the target XML.
 import json
 import sys
 import os
+import tempfile
 from pathlib import Path
 
 # Add the project root to Python path
@@ -61,7 +62,7 @@ def test_sample_input_config():
         print(f"✓ XML length: {len(xml_output)} characters")
         
         # Save generated XML
-        output_path = "test_generated_sample_input.xml"
+        output_path = os.path.join(tempfile.gettempdir(), "test_generated_sample_input.xml")
         with open(output_path, 'w') as f:
             f.write(xml_output)
         print(f"✓ Generated XML saved to {output_path}")
@@ -198,12 +198,14 @@ def render_file_upload_section(file_types: List[str], accept_multiple: bool = Fa
     return uploaded_file
 
 
-def setup_file_processing(uploaded_file, config=None):
+def setup_file_processing(uploaded_file, config=None, file_manager=None):
     """Process uploaded file and setup session state."""
     file_content = uploaded_file.getvalue().decode("utf-8")
     file_name = uploaded_file.name
     
-    temp_dir = tempfile.mkdtemp()
+    # Workspaces from the file manager live next to its blob store so
+    # dependencies can be hardlinked instead of copied
+    temp_dir = file_manager.create_workspace() if file_manager else tempfile.mkdtemp()
     temp_file_path = os.path.join(temp_dir, file_name)
     
     with open(temp_file_path, 'wb') as temp_file:
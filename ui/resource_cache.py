@@ -0,0 +1,111 @@
+"""
+Streamlit resource cache for XML Wizard.
+
+Streamlit reruns the app script on every widget interaction, and every rerun
+copies the upload into a fresh workspace. This module keys the objects built
+from an uploaded schema by its bundle digest, the SHA-256 over the uploaded
+XSD and every file in its import closure, so reruns and other sessions that
+upload the same bundle reuse them instead of parsing the schema again:
+
+- Schema analyses are held in st.cache_resource, shared by all sessions and
+  evicted by entry count and age. Their lazy trees are expanded by every
+  session's thread and build nodes under the tree's lock.
+- Built schemas are shared through the schema registry, which is keyed by the
+  same digest.
+- Each session keeps its own XMLGenerator, since generators carry per-document
+  state. Unless incremental generation is enabled, generators of the same
+  bundle share compiled generation plans through the process-wide plan cache.
+"""
+
+import json
+from typing import Any, Dict, Optional
+
+import streamlit as st
+
+from config import get_config
+from services.file_manager import FileManager
+from utils.schema_cache import get_schema_cache
+
+
+def get_bundle_digest(xsd_file_path: str) -> str:
+    """
+    Get the cache key of an uploaded schema bundle.
+
+    Args:
+        xsd_file_path: Path to the uploaded root XSD in its workspace
+
+    Returns:
+        Hex digest of the root XSD and its import closure
+    """
+    return get_schema_cache().compute_digest(xsd_file_path)
+
+
+@st.cache_resource(
+    max_entries=get_config().performance.analysis_cache_max_entries,
+    ttl=get_config().performance.analysis_cache_ttl_seconds,
+    show_spinner=False
+)
+def _analyze_bundle(bundle_digest: str, root_element: Optional[str], _xsd_file_path: str,
+                    _schema_analyzer) -> Dict[str, Any]:
+    """Analyze a schema bundle once per (digest, root); arguments with a leading underscore are not hashed."""
+    return _schema_analyzer.analyze_xsd_schema(_xsd_file_path, lazy=True, root_element=root_element)
+
+
+def get_cached_schema_analysis(xsd_file_path: str, schema_analyzer,
+                               root_element: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Get the lazy analysis of an uploaded schema, shared by every session.
+
+    The returned analysis and its lazy tree are shared objects and must not be
+    modified; the tree only grows as nodes are expanded through
+    LazyElementTree.children, which sessions may call concurrently.
+
+    Args:
+        xsd_file_path: Path to the uploaded root XSD in its workspace
+        schema_analyzer: SchemaAnalyzer used on a cache miss
+        root_element: Root element to analyze (None for the generation root)
+
+    Returns:
+        Schema analysis dictionary (see SchemaAnalyzer.analyze_xsd_schema)
+    """
+    return _analyze_bundle(get_bundle_digest(xsd_file_path), root_element, xsd_file_path, schema_analyzer)
+
+
+def get_session_xml_generator(xsd_file_path: str, enhanced_config: Optional[Dict[str, Any]] = None,
+                              config=None):
+    """
+    Get the session's XMLGenerator for a schema, creating it when the bundle or configuration changes.
+
+    The generator is kept across reruns, so with incremental generation
+    (performance.enable_incremental_generation) changing one choice, count or
+    optional selection regenerates only the affected subtrees of the previous
+    document. The generator reads the schema from the workspace of the upload
+    it was created for, which is marked as in use on every call so garbage
+    collection keeps it for as long as the session does.
+
+    Args:
+        xsd_file_path: Path to the uploaded root XSD in its workspace
+        enhanced_config: Generation configuration data loaded from a config file
+        config: Configuration instance (uses global config if None)
+
+    Returns:
+        XMLGenerator owned by the current session
+    """
+    from utils.xml_generator import XMLGenerator
+
+    generator_key = (
+        get_bundle_digest(xsd_file_path),
+        json.dumps(enhanced_config, sort_keys=True, default=str) if enhanced_config else None
+    )
+    generator = st.session_state.get('xml_generator')
+    if generator is None or st.session_state.get('xml_generator_key') != generator_key:
+        generator = XMLGenerator(xsd_file_path, config_instance=config or get_config(), config_data=enhanced_config)
+        st.session_state['xml_generator'] = generator
+        st.session_state['xml_generator_key'] = generator_key
+    FileManager(config).touch_workspace(generator.xsd_path)
+    return generator
+
+
+def clear_resource_cache() -> None:
+    """Drop the cached schema analyses of every session."""
+    _analyze_bundle.clear()
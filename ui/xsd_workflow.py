@@ -14,6 +14,8 @@ import re
 from streamlit_tree_select import tree_select
 from typing import Dict, Any, List, Optional
 
+from services.generation_jobs import get_job_runner
+from ui.resource_cache import get_cached_schema_analysis, get_session_xml_generator
 from ui.common_components import (
     render_file_upload_section,
     setup_file_processing,
@@ -38,7 +40,7 @@ def render_xsd_to_xml_workflow(config, file_manager, xml_validator, schema_analy
     )
     
     if uploaded_file is not None:
-        file_content, file_name, temp_file_path = setup_file_processing(uploaded_file)
+        file_content, file_name, temp_file_path = setup_file_processing(uploaded_file, file_manager=file_manager)
         
         # Setup dependencies for schema analysis
         file_manager.setup_temp_directory_with_dependencies(temp_file_path, file_name)
@@ -68,11 +70,126 @@ def render_xsd_to_xml_workflow(config, file_manager, xml_validator, schema_analy
         st.info("📁 Please upload an XSD file to begin analyzing and generating XML.")
 
 
+# Value suffixes of the placeholder nodes that load a lazy tree node's children
+TREE_LOAD_SUFFIX = ".__load"
+TREE_MORE_SUFFIX = ".__more_"
+
+
 def analyze_xsd_schema(xsd_file_path, schema_analyzer):
     """Analyze XSD schema to extract choice elements and structure."""
     return schema_analyzer.analyze_xsd_schema(xsd_file_path)
 
 
+def get_session_schema_analysis(xsd_file_path, schema_analyzer, root_element=None):
+    """Get the shared analysis of the uploaded schema, falling back to the generation root."""
+    analysis = get_cached_schema_analysis(xsd_file_path, schema_analyzer, root_element)
+    if not analysis['success'] and root_element is not None:
+        # The root selected for a previously uploaded schema may not exist in this one
+        analysis = get_cached_schema_analysis(xsd_file_path, schema_analyzer)
+    return analysis
+
+
+def _clean_tree_name(name):
+    return str(name).replace(' ', '_').replace(':', '_').replace('[', '_').replace(']', '_')
+
+
+def lazy_tree_node_value(node):
+    """Get the stable streamlit_tree_select value of a lazy tree node."""
+    base_value = '.'.join(_clean_tree_name(part) for part in node['path'].split('.'))
+    return f"{base_value}_{node['id']}"
+
+
+def tree_node_label(node):
+    """Get the display label of a tree node, with its icon and occurrence info."""
+    is_repeating = node.get('is_unbounded', False) or (node['occurs']['max'] not in ['1', 1])
+    if '_type_info' in node:
+        type_info = "[Simple]"
+    elif node['is_choice']:
+        type_info = "CHOICE"
+    elif is_repeating:
+        max_display = "∞" if node['occurs']['max'] == 'unbounded' else node['occurs']['max']
+        type_info = f"[{node['occurs']['min']}-{max_display}]"
+    else:
+        type_info = f"[{node['occurs']['min']}:{node['occurs']['max']}]"
+    
+    if node['is_choice']:
+        return f"🔀 {node['name']} {type_info}"
+    if is_repeating:
+        return f"🔄 {node['name']} {type_info}"
+    if '_type_info' in node:
+        return f"📄 {node['name']} {type_info}"
+    return f"📝 {node['name']} {type_info}"
+
+
+def convert_lazy_tree_to_streamlit_format(lazy_tree, node, expanded, pages, page_size, placeholders):
+    """
+    Convert a lazy tree node to streamlit_tree_select format.
+    
+    Children are requested from the lazy tree only for expanded nodes, one page
+    per "show more" expansion; collapsed nodes get a placeholder child so they
+    can be expanded. Values of placeholder nodes are added to placeholders.
+    """
+    node_value = lazy_tree_node_value(node)
+    tree_node = {
+        "label": tree_node_label(node),
+        "value": node_value
+    }
+    children = []
+    
+    # Add choice options as special children
+    if node['is_choice'] and node.get('choice_options', []):
+        for option in node['choice_options']:
+            max_display = "∞" if option['max_occurs'] == 'unbounded' or option['max_occurs'] is None else option['max_occurs']
+            children.append({
+                "label": f"⚬ {option['name']} ({option['min_occurs']}-{max_display})",
+                "value": f"{node_value}.choice.{option['name']}"
+            })
+    
+    # Add the loaded pages of children, or a placeholder until the node is expanded
+    total = node.get('child_count', 0)
+    if total and node_value in expanded:
+        page_count = pages.get(node['id'], 1)
+        for child in lazy_tree.children(node['id'], 0, page_count * page_size):
+            children.append(convert_lazy_tree_to_streamlit_format(
+                lazy_tree, child, expanded, pages, page_size, placeholders))
+        remaining = node['child_count'] - page_count * page_size
+        if remaining > 0:
+            more_value = f"{node_value}{TREE_MORE_SUFFIX}{page_count}"
+            placeholders.add(more_value)
+            children.append({
+                "label": f"➕ Show {min(page_size, remaining)} more ({remaining} not shown)",
+                "value": more_value,
+                "showCheckbox": False,
+                "children": [{"label": "⏳ Loading...", "value": f"{more_value}{TREE_LOAD_SUFFIX}", "showCheckbox": False}]
+            })
+    elif total:
+        placeholders.add(node_value)
+        children.append({
+            "label": f"⏳ {total} child elements - expand to load",
+            "value": f"{node_value}{TREE_LOAD_SUFFIX}",
+            "showCheckbox": False
+        })
+    
+    # Add error/type info as children if present
+    if '_type_info' in node:
+        children.append({
+            "label": f"ℹ️ {node['_type_info']}",
+            "value": f"{node_value}.info"
+        })
+    
+    if '_error' in node:
+        error_icon = "📄" if "Simple type element" in node['_error'] else "⚠️"
+        children.append({
+            "label": f"{error_icon} {node['_error']}",
+            "value": f"{node_value}.error"
+        })
+    
+    if children:
+        tree_node["children"] = children
+    
+    return tree_node
+
+
 def convert_tree_to_streamlit_format(node, parent_path="", node_counter=None):
     """Convert our tree node format to streamlit_tree_select format."""
     # Initialize counter if not provided
@@ -80,43 +197,14 @@ def convert_tree_to_streamlit_format(node, parent_path="", node_counter=None):
         node_counter = {'count': 0}
     
     # Create unique value for this node with counter to prevent duplicates
-    clean_name = str(node.get('name', 'Unknown')).replace(' ', '_').replace(':', '_').replace('[', '_').replace(']', '_')
+    clean_name = _clean_tree_name(node.get('name', 'Unknown'))
     base_value = f"{parent_path}.{clean_name}" if parent_path else clean_name
     node_value = f"{base_value}_{node_counter['count']}"
     node_counter['count'] += 1
     
-    # Determine icon and type info based on node type
-    if node['is_choice']:
-        icon = "🔀"
-        type_info = "CHOICE"
-    elif node.get('is_unbounded', False) or (node['occurs']['max'] not in ['1', 1]):
-        icon = "🔄"
-        max_display = "∞" if node['occurs']['max'] == 'unbounded' else node['occurs']['max']
-        type_info = f"[{node['occurs']['min']}-{max_display}]"
-    else:
-        icon = "📝"
-        min_val = node['occurs']['min']
-        max_val = node['occurs']['max']
-        type_info = f"[{min_val}:{max_val}]"
-    
-    # Show type info for simple types
-    if '_type_info' in node:
-        icon = "📄"
-        type_info = "[Simple]"
-    
-    # Create label with icon and type info
-    if node['is_choice']:
-        label = f"🔀 {node['name']} {type_info}"
-    elif node.get('is_unbounded', False) or (node['occurs']['max'] not in ['1', 1]):
-        label = f"🔄 {node['name']} {type_info}"
-    elif '_type_info' in node:
-        label = f"📄 {node['name']} {type_info}"
-    else:
-        label = f"📝 {node['name']} {type_info}"
-    
     # Create the tree select node
     tree_node = {
-        "label": label,
+        "label": tree_node_label(node),
         "value": node_value
     }
     
@@ -184,8 +272,14 @@ def clean_selection_display_name(selection):
         return cleaned
 
 
-def render_schema_tree(element_tree, file_content, key="schema_tree_analysis"):
-    """Render the schema tree component with legend and selection handling."""
+def render_schema_tree(element_tree, file_content, key="schema_tree_analysis", lazy_tree=None, page_size=50):
+    """
+    Render the schema tree component with legend and selection handling.
+    
+    With a lazy tree, only the root and the auto-expanded nodes are converted at
+    first; expanding a node or a "show more" entry requests the next page of
+    children from the lazy tree and renders the tree again.
+    """
     if not element_tree:
         st.info("No schema structure could be extracted from this XSD file.")
         return None
@@ -194,10 +288,27 @@ def render_schema_tree(element_tree, file_content, key="schema_tree_analysis"):
     
     # Convert our tree format to streamlit_tree_select format
     tree_nodes = []
-    global_counter = {'count': 0}  # Single counter for all nodes to ensure uniqueness
-    for root_name, tree in element_tree.items():
-        tree_node = convert_tree_to_streamlit_format(tree, "", global_counter)
-        tree_nodes.append(tree_node)
+    lazy_state = None
+    if lazy_tree is not None:
+        lazy_state = st.session_state.get(f"{key}_lazy_state")
+        if lazy_state is None or lazy_state['tree'] is not lazy_tree:
+            # Expand the root and the first 3 children of the first 2 levels
+            auto_expanded = {lazy_tree_node_value(lazy_tree.root)}
+            level_nodes = [lazy_tree.root]
+            for _ in range(2):
+                level_nodes = [child for node in level_nodes
+                               for child in lazy_tree.children(node['id'], 0, 3) if child['child_count']]
+                auto_expanded.update(lazy_tree_node_value(node) for node in level_nodes)
+            lazy_state = {'tree': lazy_tree, 'expanded': auto_expanded, 'pages': {}}
+            st.session_state[f"{key}_lazy_state"] = lazy_state
+        placeholders = set()
+        tree_nodes.append(convert_lazy_tree_to_streamlit_format(
+            lazy_tree, lazy_tree.root, lazy_state['expanded'], lazy_state['pages'], page_size, placeholders))
+    else:
+        global_counter = {'count': 0}  # Single counter for all nodes to ensure uniqueness
+        for root_name, tree in element_tree.items():
+            tree_node = convert_tree_to_streamlit_format(tree, "", global_counter)
+            tree_nodes.append(tree_node)
     
     # Display the tree with streamlit_tree_select
     if tree_nodes:
@@ -218,9 +329,11 @@ def render_schema_tree(element_tree, file_content, key="schema_tree_analysis"):
 
 *Explore the tree structure to understand your schema*""")
         
-        # Auto-expand more levels to show tree structure better
-        auto_expanded = []
-        if tree_nodes:
+        if lazy_state is not None:
+            auto_expanded = sorted(lazy_state['expanded'])
+        else:
+            # Auto-expand more levels to show tree structure better
+            auto_expanded = []
             # Expand root
             auto_expanded.append(tree_nodes[0]['value'])
             # Expand first few levels automatically
@@ -242,6 +355,20 @@ def render_schema_tree(element_tree, file_content, key="schema_tree_analysis"):
             disabled=False
         )
         
+        # Expanding a placeholder loads its page of children on the next run
+        if lazy_state is not None and selected and selected.get('expanded') is not None:
+            expanded = set(selected['expanded'])
+            requested = expanded & placeholders
+            for value in requested:
+                if TREE_MORE_SUFFIX in value:
+                    owner_value, page_count = value.rsplit(TREE_MORE_SUFFIX, 1)
+                    owner_id = int(owner_value.rsplit('_', 1)[1])
+                    lazy_state['pages'][owner_id] = int(page_count) + 1
+                    expanded.discard(value)
+            lazy_state['expanded'] = expanded
+            if requested:
+                st.rerun()
+        
         # Show selected information for exploration
         if selected and selected.get('checked'):
             st.markdown("---")
@@ -260,7 +387,8 @@ def render_tab1_schema_analysis(temp_file_path, file_content, schema_analyzer):
     st.markdown("### 📊 Schema Analysis")
     
     with st.spinner("Analyzing XSD schema..."):
-        analysis = analyze_xsd_schema(temp_file_path, schema_analyzer)
+        analysis = get_session_schema_analysis(
+            temp_file_path, schema_analyzer, st.session_state.get('analysis_root_element'))
         
         if analysis['success']:
             schema_info = analysis['schema_info']
@@ -296,7 +424,19 @@ def render_tab1_schema_analysis(temp_file_path, file_content, schema_analyzer):
             
             # Schema Structure - Full width display
             st.markdown("### 🌳 Schema Structure")
-            render_schema_tree(element_tree, file_content)
+            complex_roots = analysis.get('complex_roots', [])
+            if len(complex_roots) > 1:
+                root_element = st.selectbox(
+                    "Root element:",
+                    complex_roots,
+                    index=complex_roots.index(analysis['root_element']),
+                    help="Only the selected global element is analyzed. XML is generated from the first one."
+                )
+                if root_element != analysis['root_element']:
+                    st.session_state['analysis_root_element'] = root_element
+                    st.rerun()
+            render_schema_tree(element_tree, file_content, lazy_tree=analysis.get('lazy_tree'),
+                               page_size=schema_analyzer.config.ui.tree_page_size)
             
         else:
             show_error_message(f"Error analyzing schema: {analysis['error']}")
@@ -551,7 +691,8 @@ def render_tab2_configure_generation(config, config_manager):
             st.warning("**Custom Mode**: ☑️ Check optional elements (📄 [0:1]) you want to include. Required elements (📝 [1:1]) are always included.")
             
             # Use the schema tree renderer with a different key for custom selection
-            selected = render_schema_tree(element_tree, "", key="custom_element_selection")
+            selected = render_schema_tree(element_tree, "", key="custom_element_selection",
+                                          lazy_tree=analysis.get('lazy_tree'), page_size=config.ui.tree_page_size)
             
             # Store selections
             if selected and selected.get('checked'):
@@ -743,8 +884,7 @@ def generate_xml_from_xsd(xsd_file_path, xsd_file_name, selected_choices=None, u
             import time
             time.sleep(0.1)
         
-        from utils.xml_generator import XMLGenerator
-        generator = XMLGenerator(xsd_file_path, config_data=enhanced_config)
+        generator = get_session_xml_generator(xsd_file_path, enhanced_config, config)
         
         # Pass user selections and generation mode to generator
         return generator.generate_dummy_xml_with_options(
@@ -763,9 +903,95 @@ def generate_xml_from_xsd(xsd_file_path, xsd_file_name, selected_choices=None, u
 </error>"""
 
 
+def start_generation_job(xsd_file_path, xsd_file_name, selected_choices=None, unbounded_counts=None,
+                         generation_mode="Minimalistic", optional_selections=None, custom_values=None,
+                         file_manager=None, config=None):
+    """
+    Start generating XML in the background with the session's generator.
+    
+    Only the job id is kept in the session; the job and its result are held
+    by the process-wide job runner.
+    """
+    file_manager.setup_temp_directory_with_dependencies(xsd_file_path, xsd_file_name)
+    enhanced_config = st.session_state.get('enhanced_config_data')
+    generator = get_session_xml_generator(xsd_file_path, enhanced_config, config)
+    
+    job = get_job_runner().submit_generation(
+        generator,
+        description=f"{generation_mode} generation of {xsd_file_name}",
+        selected_choices=selected_choices,
+        unbounded_counts=unbounded_counts,
+        generation_mode=generation_mode,
+        optional_selections=optional_selections,
+        custom_values=custom_values
+    )
+    st.session_state['generation_job_id'] = job.id
+    return job
+
+
+def collect_generation_job(job):
+    """Move a finished background generation's result into the session."""
+    st.session_state.pop('generation_job_id', None)
+    if job.status == job.COMPLETED:
+        st.session_state['generated_xml'] = job.result
+    elif job.status == job.CANCELLED:
+        show_warning_message("⏹️ XML generation was cancelled.")
+    else:
+        error_msg = f"Error generating XML: {job.error}"
+        print(f"XMLGenerator Error: {error_msg}")  # Log for debugging
+        st.session_state['generated_xml'] = f"""<?xml version="1.0" encoding="UTF-8"?>
+<error>
+  <message>{error_msg}</message>
+</error>"""
+
+
+def render_generation_job_progress(job_id, config):
+    """
+    Render the progress of a running background generation with a cancel button.
+    
+    The panel refreshes itself as a fragment where Streamlit supports them and
+    reruns the app once the job has finished; older versions get a refresh button.
+    """
+    def render_panel():
+        job = get_job_runner().get(job_id)
+        if job is None or job.done:
+            st.rerun()
+        
+        progress = job.progress.snapshot()
+        status = f"🔄 **{job.description}**: {progress['elements']:,} elements"
+        if progress['eta_seconds'] is not None:
+            status += f", about {progress['eta_seconds']:.0f}s remaining"
+        if progress['fraction'] is not None:
+            st.progress(progress['fraction'], text=status)
+        else:
+            st.markdown(status)
+        if progress['current_path']:
+            st.caption(f"Current element: `{clean_selection_display_name(progress['current_path'])}`")
+        
+        col_refresh, col_cancel = st.columns(2)
+        with col_cancel:
+            if st.button("⏹️ Cancel generation", key="cancel_generation_btn", use_container_width=True):
+                get_job_runner().cancel(job_id)
+        if not hasattr(st, 'fragment'):
+            with col_refresh:
+                st.button("🔄 Refresh progress", key="refresh_generation_btn", use_container_width=True)
+    
+    if hasattr(st, 'fragment'):
+        st.fragment(run_every=config.ui.job_poll_interval_seconds)(render_panel)()
+    else:
+        render_panel()
+
+
 def validate_xml_against_schema(xml_content, xsd_file_path, uploaded_file_name=None, uploaded_file_content=None, xml_validator=None):
-    """Validate generated XML against the XSD schema."""
-    return xml_validator.validate_xml_against_schema(xml_content, xsd_file_path, uploaded_file_name, uploaded_file_content)
+    """Validate generated XML against the XSD schema, with categorized errors for the report."""
+    return xml_validator.validate_xml_against_schema(
+        xml_content, xsd_file_path, uploaded_file_name, uploaded_file_content, detailed=True
+    )
+
+
+def validate_xml_file_against_schema(xml_file, xsd_file_path, xml_validator=None):
+    """Validate an uploaded XML file against the XSD schema with bounded memory."""
+    return xml_validator.validate_large_xml(xml_file, xsd_file_path)
 
 
 def format_validation_error(error, xml_validator):
@@ -802,7 +1028,18 @@ def render_validation_results(validation_result, xml_validator):
             "Structural": error_breakdown['structural_errors']
         }
         render_metrics_row(metrics, 4)
-        
+
+        # Errors grouped by path and schema component, most frequent first
+        error_groups = validation_result.get('error_groups') or []
+        if error_groups:
+            with st.expander(f"📊 Error Groups ({len(error_groups)})", expanded=False):
+                st.caption("Errors grouped by element path and the schema component that rejected them.")
+                for group in error_groups[:10]:
+                    component = f" — {group['component']}" if group['component'] else ""
+                    st.text(f"{group['count']}× {group['path'] or 'Unknown path'}{component} ({group['reason']})")
+                if len(error_groups) > 10:
+                    st.info(f"... and {len(error_groups) - 10} more error groups")
+
         # Show detailed errors in expandable sections
         if validation_result.get('categorized_errors'):
             st.markdown("**Detailed Error Analysis:**")
@@ -880,6 +1117,8 @@ def render_tab3_generate_validate(config, file_manager, xml_validator):
     # XML Generation Section
     st.markdown("#### 🎯 Generate XML")
     
+    job = get_job_runner().get(st.session_state.get('generation_job_id'))
+    
     col_gen1, col_gen2, col_gen3 = st.columns([1, 1, 1])
     
     with col_gen2:
@@ -888,39 +1127,31 @@ def render_tab3_generate_validate(config, file_manager, xml_validator):
             key="generate_xml_btn", 
             help="Generate XML based on your configuration",
             type="primary",
-            use_container_width=True
+            use_container_width=True,
+            disabled=job is not None and not job.done
         )
     
     # Check if we should auto-generate XML after config load
     auto_generate = st.session_state.get('config_loaded', False) and st.session_state.get('enhanced_config_data') and not st.session_state.get('auto_generated_completed', False)
     
     # Handle XML generation
-    if generate_clicked or auto_generate:
-        enhanced_config = st.session_state.get('enhanced_config_data')
-        if enhanced_config:
-            if auto_generate:
-                spinner_msg = "🚀 Auto-generating XML with enhanced configuration..."
-            else:
-                spinner_msg = "🚀 Generating XML with enhanced configuration (loading schema & applying data contexts)..."
-        else:
-            spinner_msg = "🔄 Generating XML (loading schema & processing structure)..."
-            
-        with st.spinner(spinner_msg):
-            # Get user selections from session state
-            selected_choices = st.session_state.get('selected_choices', {})
-            unbounded_counts = st.session_state.get('unbounded_counts', {})
-            generation_mode = st.session_state.get('current_generation_mode', 'Minimalistic')
-            optional_selections = st.session_state.get('optional_element_selections', [])
-            
-            temp_file_path = st.session_state.get('temp_file_path')
-            file_name = st.session_state.get('uploaded_file_name')
-            
-            custom_values = st.session_state.get('custom_values', {})
-            
-            xml_content = generate_xml_from_xsd(
-                temp_file_path, 
-                file_name, 
-                selected_choices, 
+    if (generate_clicked or auto_generate) and (job is None or job.done):
+        # Get user selections from session state
+        selected_choices = st.session_state.get('selected_choices', {})
+        unbounded_counts = st.session_state.get('unbounded_counts', {})
+        generation_mode = st.session_state.get('current_generation_mode', 'Minimalistic')
+        optional_selections = st.session_state.get('optional_element_selections', [])
+        
+        temp_file_path = st.session_state.get('temp_file_path')
+        file_name = st.session_state.get('uploaded_file_name')
+        
+        custom_values = st.session_state.get('custom_values', {})
+        
+        try:
+            job = start_generation_job(
+                temp_file_path,
+                file_name,
+                selected_choices,
                 unbounded_counts,
                 generation_mode,
                 optional_selections,
@@ -928,14 +1159,20 @@ def render_tab3_generate_validate(config, file_manager, xml_validator):
                 file_manager,
                 config
             )
-            
-            # Store XML content for validation and download
-            st.session_state['generated_xml'] = xml_content
-            
-            # Mark auto-generation as completed if it was triggered
-            if auto_generate:
-                st.session_state['auto_generated_completed'] = True
-                st.session_state['config_loaded'] = False  # Reset flag
+        except Exception as e:
+            show_error_message(f"❌ Error generating XML: {str(e)}")
+            job = None
+        
+        # Mark auto-generation as completed if it was triggered
+        if auto_generate:
+            st.session_state['auto_generated_completed'] = True
+            st.session_state['config_loaded'] = False  # Reset flag
+    
+    # Follow the background generation until its result is available
+    if job is not None and job.done:
+        collect_generation_job(job)
+    elif job is not None:
+        render_generation_job_progress(job.id, config)
     
     # Display generated XML if available
     if 'generated_xml' in st.session_state and st.session_state['generated_xml']:
@@ -984,4 +1221,33 @@ def render_tab3_generate_validate(config, file_manager, xml_validator):
                 
                 render_validation_results(validation_result, xml_validator)
     else:
-        st.info("👆 Click **Generate XML** above to create your XML file.")
\ No newline at end of file
+        st.info("👆 Click **Generate XML** above to create your XML file.")
+    
+    render_existing_xml_validation(xml_validator)
+
+
+def render_existing_xml_validation(xml_validator):
+    """Render validation of an existing XML file, such as a production dump, against the schema."""
+    st.markdown("---")
+    st.markdown("#### 📂 Validate an Existing XML File")
+    st.caption("The file is validated in streaming mode, so large documents are not loaded into memory at once.")
+    
+    uploaded_xml = st.file_uploader(
+        "Upload XML file",
+        type=["xml"],
+        key="existing_xml_upload",
+        help="Upload an XML document to validate against the uploaded XSD schema"
+    )
+    if uploaded_xml is None:
+        return
+    
+    if st.button("✅ **Validate File**", key="validate_existing_xml_btn"):
+        with st.spinner(f"🔄 Validating {uploaded_xml.name} against schema..."):
+            validation_result = validate_xml_file_against_schema(
+                uploaded_xml,
+                st.session_state.get('temp_file_path'),
+                xml_validator
+            )
+        if validation_result.get('errors_truncated'):
+            st.info("Validation stopped at the configured error limit (XML_VALIDATION_MAX_ERRORS).")
+        render_validation_results(validation_result, xml_validator)
\ No newline at end of file
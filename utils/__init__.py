@@ -6,6 +6,17 @@ This package contains core utility modules that provide fundamental functionalit
 - xml_generator.py: Universal XML generation engine with deep recursive parsing
 - xsd_parser.py: XSD schema parsing utilities and basic validation
 - type_generators.py: Modular type-specific value generators for validation compliance
+- schema_cache.py: Persistent on-disk cache of built schemas keyed by import closure digest
+- schema_registry.py: Process-wide LRU registry sharing one built schema per schema bundle digest
+- xsd_dependency_resolver.py: Header-only import/include graph resolution for exact dependency closures
+- generation_context.py: Per-document generation state (RNG, ID registry, enum rotation, recursion limits)
+- generation_plan.py: Compiled, cached instruction programs that replay XML generation without schema introspection
+- xml_stream_writer.py: Incremental pretty-printing XML writer used to stream generated documents
+- xsd_regex.py: Cached XSD regular expression automata that sample pattern-conforming strings
+- generation_profiler.py: Opt-in per schema path / XSD type generation profiler with collapsed-stack and JSON export
+- subtree_memo.py: Per-document templates of repeated complex-type subtrees with copy-on-write instantiation
+- incremental_cache.py: Path-indexed subtrees of the previous document, regenerated only where option lookups changed
+- generation_progress.py: Thread-safe per-element progress reporting and cooperative cancellation of a generation
 
 These utilities form the foundation layer of the application, providing reusable
 components that can work with any XSD schema while maintaining high performance
@@ -0,0 +1,119 @@
+"""
+Generation context module for XML Wizard.
+
+This module holds the mutable state of one document generation: its random
+number generator, the effective recursion limits, the document's ID registry,
+enumeration rotation, per-element instance counters and smart relationship
+groups. XMLGenerator creates a fresh context for every document and passes it
+to the type generators and the smart relationships engine, so generations in
+different threads or sessions never share state and a seeded generation is
+reproducible regardless of what ran before it.
+"""
+
+import copy
+import random
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set
+
+from config import RecursionLimits
+
+
+class GenerationContext:
+    """Per-document generation state with its own random number generator."""
+
+    def __init__(self, seed: Optional[int] = None, recursion: Optional[RecursionLimits] = None):
+        """
+        Initialize a generation context.
+
+        Args:
+            seed: Seed of the context's random number generator (None for a random seed)
+            recursion: Recursion limits to start from; the context works on a copy
+        """
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.recursion = copy.copy(recursion) if recursion is not None else RecursionLimits()
+
+        # xs:ID values issued so far, in order, for IDREF/IDREFS references
+        self.id_counter = 0
+        self.generated_ids: Set[str] = set()
+        self.all_generated_ids: List[str] = []
+
+        # Enumeration value usage per tracking key, for value rotation
+        self.enum_usage: Dict[str, Dict[str, int]] = {}
+
+        # Occurrences seen per element, for sequential/seeded custom values
+        self.element_instance_counters: Dict[str, int] = {}
+
+        # Smart relationship state
+        self.relationship_values = defaultdict(list)
+        self.relationship_groups: Dict[str, Dict[str, Any]] = {}
+        self.constraint_violations: List[Any] = []
+
+    def next_id_number(self) -> int:
+        """Advance and return the document's ID counter."""
+        self.id_counter += 1
+        return self.id_counter
+
+    def register_id(self, value: str) -> bool:
+        """
+        Record an issued ID.
+
+        Args:
+            value: ID value
+
+        Returns:
+            True if the ID was new, False if it was already issued
+        """
+        if value in self.generated_ids:
+            return False
+        self.generated_ids.add(value)
+        self.all_generated_ids.append(value)
+        return True
+
+    def retain_ids(self, values: List[str]) -> None:
+        """
+        Replace the issued IDs with those still present in the document.
+
+        The ID counter is kept, so IDs issued afterwards stay unique.
+
+        Args:
+            values: IDs to keep, in issue order
+        """
+        self.generated_ids = set(values)
+        self.all_generated_ids = list(values)
+
+    def get_existing_ids(self) -> List[str]:
+        """Get the IDs issued so far, in issue order."""
+        return self.all_generated_ids.copy()
+
+    def next_instance_index(self, element_name: str) -> int:
+        """
+        Get the occurrence index of an element and advance its counter.
+
+        Args:
+            element_name: Element name without namespace prefix
+
+        Returns:
+            Zero-based index of this occurrence within the document
+        """
+        index = self.element_instance_counters.get(element_name, 0)
+        self.element_instance_counters[element_name] = index + 1
+        return index
+
+    def ensure_recursion_limits(self, max_tree_depth: int, max_element_depth: int) -> None:
+        """Raise this context's tree and element depth limits to at least the given values."""
+        self.recursion.max_tree_depth = max(self.recursion.max_tree_depth, max_tree_depth)
+        self.recursion.max_element_depth = max(self.recursion.max_element_depth, max_element_depth)
+
+    def reset(self) -> None:
+        """Clear the value state and reseed the random number generator."""
+        recursion = self.recursion
+        self.__init__(self.seed, recursion)
+
+
+_default_context = GenerationContext()
+
+
+def get_default_context() -> GenerationContext:
+    """Get the context used by type generators called outside a document generation."""
+    return _default_context
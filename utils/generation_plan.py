@@ -0,0 +1,648 @@
+"""
+Generation plan module for XML Wizard.
+
+This module compiles a root element plus generation options into a flat,
+array-backed instruction program. Compilation walks the xmlschema objects
+once with XMLGenerator's own element logic while every value site is recorded
+as a ValueSampler slot instead of being evaluated. Executing a plan samples
+the slots in their original generation order and assembles the same
+OrderedDict tree the recursive walk returns, without touching the schema.
+Repeated siblings are compiled once and replayed, so plan size does not grow
+with occurrence counts. A second program streams the document straight to an
+incremental XML writer, sampling values lazily as elements are written.
+Plans are cached per (schema hash, root element, generation options).
+"""
+
+import copy
+import json
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterator, List, Any, Optional, Tuple
+
+from config import get_config
+
+
+# Plan opcodes
+OP_DICT = 0     # push a new mapping (arg: mapping type)
+OP_LIST = 1     # push a new list
+OP_VALUE = 2    # push a sampled value (arg: slot index)
+OP_CONST = 3    # push a constant (arg: value)
+OP_SET = 4      # pop a value into the mapping below it (arg: key)
+OP_APPEND = 5   # pop a value onto the list below it
+OP_REPEAT = 6   # start a repeated list item body (arg: (count, slot stride))
+OP_NEXT = 7     # end of a repeated body
+
+# Streaming opcodes (values are pushed with OP_VALUE / OP_CONST)
+OP_START = 8    # open an element (arg: qualified name)
+OP_ATTR = 9     # pop a value into an attribute of the open element (arg: name)
+OP_TEXT = 10    # pop a value into the text of the open element
+OP_LEAF = 11    # pop a value and write it as a text-only element (arg: (key, qualified name))
+OP_END = 12     # close the open element
+
+_NO_VALUE = object()
+
+
+class ValueSampler:
+    """Precomputed value generator for one value site of a generation plan."""
+
+    __slots__ = ('element_name', 'current_path', 'prototype', 'constraints',
+                 'use_custom', 'fallback', 'as_text', 'error_value', 'slot')
+
+    def __init__(self, element_name: str, current_path: str, prototype, constraints: Optional[Dict[str, Any]] = None,
+                 use_custom: bool = True, fallback: Any = _NO_VALUE, as_text: bool = False,
+                 error_value: Any = _NO_VALUE):
+        """
+        Initialize a value sampler.
+
+        Args:
+            element_name: Element or attribute name passed to the type generator
+            current_path: Path of the value site in the XML hierarchy
+            prototype: Type generator resolved for the site
+            constraints: Resolved constraints, or None for a fresh empty dict per sample
+            use_custom: Whether configured custom values take priority
+            fallback: Replacement for None or empty generated values
+            as_text: Whether the value is converted to a string
+            error_value: Value used when the type generator raises
+        """
+        self.element_name = element_name
+        self.current_path = current_path
+        self.prototype = prototype
+        self.constraints = constraints
+        self.use_custom = use_custom
+        self.fallback = fallback
+        self.as_text = as_text
+        self.error_value = error_value
+        self.slot = -1
+
+    def sample(self, owner) -> Any:
+        """
+        Generate a value for this site.
+
+        Args:
+            owner: XMLGenerator providing custom values, configuration and the generation context
+
+        Returns:
+            Generated value
+        """
+        value = None
+        if self.use_custom:
+            value = owner._get_custom_value(self.element_name, self.current_path)
+
+        if value is None:
+            # Plans are shared between generators, so rebind the prototype to
+            # the owner's configuration when it differs
+            generator = self.prototype
+            if generator.config is not owner.config:
+                generator = copy.copy(generator)
+                generator.config = owner.config
+            constraints = {} if self.constraints is None else self.constraints
+            try:
+                value = generator.generate(self.element_name, constraints, owner.context)
+            except Exception:
+                if self.error_value is _NO_VALUE:
+                    raise
+                value = self.error_value
+
+        if self.fallback is not _NO_VALUE and (value is None or value == ""):
+            value = self.fallback
+        if self.as_text:
+            value = str(value)
+        return value
+
+
+class SlotRepeat:
+    """Run of value slots sampled once per repetition of a repeated element."""
+
+    __slots__ = ('count', 'stride', 'entries')
+
+    def __init__(self, count: int, stride: int, entries: List[Any]):
+        """
+        Initialize a repeated slot run.
+
+        Args:
+            count: Number of repetitions
+            stride: Number of slots used by one repetition
+            entries: Samplers and nested runs of one repetition, in generation order
+        """
+        self.count = count
+        self.stride = stride
+        self.entries = entries
+
+
+def iter_slot_samplers(entries: List[Any]) -> Iterator[ValueSampler]:
+    """Yield the sampler of every value slot, expanding repeated runs in order."""
+    for entry in entries:
+        if isinstance(entry, ValueSampler):
+            yield entry
+        else:
+            for _ in range(entry.count):
+                yield from iter_slot_samplers(entry.entries)
+
+
+class SlotRecorder:
+    """Collects value samplers in generation order while a plan is compiled."""
+
+    def __init__(self):
+        """Initialize an empty recorder."""
+        self.entries: List[Any] = []
+        self.slot_count = 0
+        self._open_repeats: List[Tuple[List[Any], int]] = []
+
+    def record(self, sampler: ValueSampler) -> ValueSampler:
+        """Assign the next slot to a sampler and return it as a placeholder."""
+        sampler.slot = self.slot_count
+        self.slot_count += 1
+        self.entries.append(sampler)
+        return sampler
+
+    def begin_repeat(self) -> None:
+        """Start recording the template item of a repeated element."""
+        self._open_repeats.append((self.entries, self.slot_count))
+        self.entries = []
+
+    def end_repeat(self, count: int) -> None:
+        """
+        Finish a template item and reserve its slots for every repetition.
+
+        Args:
+            count: Number of times the item occurs
+        """
+        entries, start = self._open_repeats.pop()
+        stride = self.slot_count - start
+        if stride:
+            entries.append(SlotRepeat(count, stride, self.entries))
+        self.entries = entries
+        self.slot_count = start + stride * count
+
+
+class _SampleCursor:
+    """Samples plan slots lazily in generation order for streamed output."""
+
+    def __init__(self, entries: List[Any], owner):
+        self._samplers = iter_slot_samplers(entries)
+        self._owner = owner
+        self._next_slot = 0
+        self._pending: Dict[int, Any] = {}
+
+    def take(self, slot: int) -> Any:
+        """Return the value of a slot, sampling every earlier slot first."""
+        if slot in self._pending:
+            return self._pending.pop(slot)
+        # Values written later than they were generated wait in the pending buffer
+        while self._next_slot < slot:
+            self._pending[self._next_slot] = next(self._samplers).sample(self._owner)
+            self._next_slot += 1
+        self._next_slot += 1
+        return next(self._samplers).sample(self._owner)
+
+    def drain(self) -> None:
+        """Sample the remaining slots so generator state matches a full execution."""
+        for sampler in self._samplers:
+            sampler.sample(self._owner)
+
+
+@dataclass
+class GenerationPlan:
+    """Flat instruction program that rebuilds a root element's dictionary."""
+    root_name: str
+    ops: array
+    args: List[Any]
+    slots: List[Any]
+    slot_count: int
+    stream_ops: array = field(default_factory=lambda: array('B'))
+    stream_args: List[Any] = field(default_factory=list)
+    qnames: Dict[str, Any] = field(default_factory=dict)
+    compile_seconds: float = 0.0
+
+    def iter_samplers(self) -> Iterator[ValueSampler]:
+        """Yield the sampler of every value slot in generation order."""
+        return iter_slot_samplers(self.slots)
+
+    def execute(self, generator) -> Any:
+        """
+        Run the plan for one document.
+
+        Args:
+            generator: XMLGenerator whose custom values and configuration are used
+
+        Returns:
+            Element dictionary (or simple value) equal to what
+            XMLGenerator._create_element_dict returns for the same options
+        """
+        # Value sites are sampled in generation order, before the tree is
+        # assembled in its final sequence order
+        values = [sampler.sample(generator) for sampler in self.iter_samplers()]
+
+        ops = self.ops
+        args = self.args
+        stack = []
+        loops = []
+        base = 0
+        pc = 0
+        end = len(ops)
+        while pc < end:
+            op = ops[pc]
+            if op == OP_VALUE:
+                stack.append(values[args[pc] + base])
+            elif op == OP_SET:
+                value = stack.pop()
+                stack[-1][args[pc]] = value
+            elif op == OP_DICT:
+                stack.append(args[pc]())
+            elif op == OP_APPEND:
+                value = stack.pop()
+                stack[-1].append(value)
+            elif op == OP_LIST:
+                stack.append([])
+            elif op == OP_CONST:
+                stack.append(args[pc])
+            elif op == OP_REPEAT:
+                count, stride = args[pc]
+                loops.append([pc + 1, count - 1, stride, base])
+            elif op == OP_NEXT:
+                loop = loops[-1]
+                if loop[1] > 0:
+                    loop[1] -= 1
+                    base += loop[2]
+                    pc = loop[0]
+                    continue
+                loops.pop()
+                base = loop[3]
+            pc += 1
+
+        return stack[-1] if stack else None
+
+    def stream(self, generator, writer) -> None:
+        """
+        Write one document to an incremental XML writer.
+
+        Values are sampled in generation order as the elements that use them
+        are written, so memory stays bounded by the plan size rather than the
+        document size.
+
+        Args:
+            generator: XMLGenerator whose custom values and configuration are used
+            writer: StreamingXMLWriter receiving the element events
+        """
+        cursor = _SampleCursor(self.slots, generator)
+        ops = self.stream_ops
+        args = self.stream_args
+        value = None
+        loops = []
+        base = 0
+        pc = 0
+        end = len(ops)
+        while pc < end:
+            op = ops[pc]
+            if op == OP_VALUE:
+                value = cursor.take(args[pc] + base)
+            elif op == OP_CONST:
+                value = args[pc]
+            elif op == OP_LEAF:
+                key, qname = args[pc]
+                if value is not None and generator._is_valid_content(value):
+                    writer.leaf(qname, str(value))
+                else:
+                    writer.leaf(qname, generator._generate_fallback_for_empty_element(key, qname))
+            elif op == OP_START:
+                writer.start(args[pc])
+            elif op == OP_END:
+                writer.end()
+            elif op == OP_ATTR:
+                if value is not None:
+                    writer.attribute(args[pc], str(value))
+            elif op == OP_TEXT:
+                if value is not None:
+                    writer.text(str(value))
+            elif op == OP_REPEAT:
+                count, stride = args[pc]
+                loops.append([pc + 1, count - 1, stride, base])
+            elif op == OP_NEXT:
+                loop = loops[-1]
+                if loop[1] > 0:
+                    loop[1] -= 1
+                    base += loop[2]
+                    pc = loop[0]
+                    continue
+                loops.pop()
+                base = loop[3]
+            pc += 1
+
+        cursor.drain()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get plan size statistics.
+
+        Returns:
+            Dictionary with instruction, value slot and distinct sampler counts
+        """
+        return {
+            'root_name': self.root_name,
+            'instructions': len(self.ops),
+            'stream_instructions': len(self.stream_ops),
+            'value_slots': self.slot_count,
+            'distinct_samplers': len({id(sampler) for sampler in _iter_entry_samplers(self.slots)}),
+            'compile_seconds': self.compile_seconds
+        }
+
+
+def _iter_entry_samplers(entries: List[Any]) -> Iterator[ValueSampler]:
+    """Yield each recorded sampler once, without expanding repetitions."""
+    for entry in entries:
+        if isinstance(entry, ValueSampler):
+            yield entry
+        else:
+            yield from _iter_entry_samplers(entry.entries)
+
+
+class _PlanBuilder:
+    """Lowers a compiled element template into plan instructions."""
+
+    def __init__(self, generator):
+        self.generator = generator
+        self.qnames: Dict[str, Any] = {}
+
+    def lower(self, node: Any) -> Tuple[List[int], List[Any]]:
+        """Lower a template node into parallel opcode and argument lists."""
+        ops: List[int] = []
+        args: List[Any] = []
+        self._lower_node(node, ops, args)
+        return ops, args
+
+    def lower_stream(self, root_qname: Any, node: Any) -> Tuple[List[int], List[Any]]:
+        """Lower a template node into the element event program used for streaming."""
+        ops: List[int] = []
+        args: List[Any] = []
+        if isinstance(node, dict):
+            self._lower_element(None, root_qname, node, ops, args)
+        else:
+            # A simple root only carries text
+            ops.append(OP_START)
+            args.append(root_qname)
+            self._lower_value(node, ops, args)
+            ops.append(OP_TEXT)
+            args.append(None)
+            ops.append(OP_END)
+            args.append(None)
+        return ops, args
+
+    def _qname(self, key: str) -> Any:
+        if key not in self.qnames:
+            self.qnames[key] = self.generator._determine_qname(key)
+        return self.qnames[key]
+
+    def _lower_node(self, node: Any, ops: List[int], args: List[Any]) -> None:
+        if isinstance(node, ValueSampler):
+            ops.append(OP_VALUE)
+            args.append(node.slot)
+        elif isinstance(node, dict):
+            ops.append(OP_DICT)
+            args.append(type(node))
+            for key, value in node.items():
+                self._lower_node(value, ops, args)
+                ops.append(OP_SET)
+                args.append(key)
+                if _is_element_key(key):
+                    self._qname(key)
+        elif isinstance(node, list):
+            ops.append(OP_LIST)
+            args.append(None)
+            self._lower_items(node, ops, args, self._lower_list_item)
+        else:
+            ops.append(OP_CONST)
+            args.append(node)
+
+    def _lower_list_item(self, item: Any, ops: List[int], args: List[Any]) -> None:
+        self._lower_node(item, ops, args)
+        ops.append(OP_APPEND)
+        args.append(None)
+
+    def _lower_items(self, items: List[Any], ops: List[int], args: List[Any], lower_item) -> None:
+        """Lower list items, replaying a repeated template item instead of unrolling it."""
+        if len(items) > 1 and all(item is items[0] for item in items):
+            ops.append(OP_REPEAT)
+            args.append((len(items), _slot_count(items[0])))
+            lower_item(items[0], ops, args)
+            ops.append(OP_NEXT)
+            args.append(None)
+        else:
+            for item in items:
+                lower_item(item, ops, args)
+
+    def _lower_value(self, node: Any, ops: List[int], args: List[Any]) -> None:
+        if isinstance(node, ValueSampler):
+            ops.append(OP_VALUE)
+            args.append(node.slot)
+        else:
+            ops.append(OP_CONST)
+            args.append(node)
+
+    def _lower_element(self, key: Optional[str], qname: Any, node: Any, ops: List[int], args: List[Any]) -> None:
+        """Lower one element with the same rules as XMLGenerator._build_xml_tree."""
+        if not isinstance(node, dict):
+            self._lower_value(node, ops, args)
+            ops.append(OP_LEAF)
+            args.append((key, qname))
+            return
+
+        ops.append(OP_START)
+        args.append(qname)
+        for child_key, value in node.items():
+            if isinstance(child_key, str) and child_key.startswith('@'):
+                self._lower_value(value, ops, args)
+                ops.append(OP_ATTR)
+                args.append(child_key[1:])
+        if '_text' in node:
+            self._lower_value(node['_text'], ops, args)
+            ops.append(OP_TEXT)
+            args.append(None)
+        for child_key, value in node.items():
+            if not _is_element_key(child_key):
+                continue
+            child_qname = self._qname(child_key)
+            if isinstance(value, list):
+                self._lower_items(
+                    value, ops, args,
+                    lambda item, item_ops, item_args: self._lower_element(child_key, child_qname, item, item_ops, item_args)
+                )
+            else:
+                self._lower_element(child_key, child_qname, value, ops, args)
+        ops.append(OP_END)
+        args.append(None)
+
+
+def _is_element_key(key: Any) -> bool:
+    return isinstance(key, str) and not key.startswith('@') and not key.startswith('_')
+
+
+def _slot_count(node: Any) -> int:
+    """Return the number of value slots one instance of a template node uses."""
+    if isinstance(node, ValueSampler):
+        return 1
+    if isinstance(node, dict):
+        return sum(_slot_count(value) for value in node.values())
+    if isinstance(node, list):
+        if node and all(item is node[0] for item in node):
+            return len(node) * _slot_count(node[0])
+        return sum(_slot_count(item) for item in node)
+    return 0
+
+
+def compile_generation_plan(generator, root_element, root_name: str) -> GenerationPlan:
+    """
+    Compile a root element into a generation plan.
+
+    Args:
+        generator: XMLGenerator holding the schema and generation options
+        root_element: Root XSD element
+        root_name: Name of the root element
+
+    Returns:
+        GenerationPlan that reproduces generator._create_root_element_dict(root_element, root_name)
+    """
+    start_time = time.time()
+    recorder = SlotRecorder()
+    generator._plan_recorder = recorder
+    try:
+        template = generator._create_root_element_dict(root_element, root_name)
+    finally:
+        generator._plan_recorder = None
+
+    if _slot_count(template) != recorder.slot_count:
+        raise RuntimeError(f"Generation plan for '{root_name}' dropped recorded value slots")
+
+    builder = _PlanBuilder(generator)
+    ops, args = builder.lower(template)
+    stream_ops, stream_args = builder.lower_stream(generator._root_qname(root_name), template)
+    return GenerationPlan(
+        root_name=root_name,
+        ops=array('B', ops),
+        args=args,
+        slots=recorder.entries,
+        slot_count=recorder.slot_count,
+        stream_ops=array('B', stream_ops),
+        stream_args=stream_args,
+        qnames=builder.qnames,
+        compile_seconds=time.time() - start_time
+    )
+
+
+def plan_cache_key(generator, root_name: str) -> Optional[Tuple[str, str, str]]:
+    """
+    Build the plan cache key for a generator's current options.
+
+    Args:
+        generator: XMLGenerator holding the schema and generation options
+        root_name: Name of the root element
+
+    Returns:
+        (schema digest, root name, options JSON), or None if the schema has no digest
+    """
+    digest = getattr(generator, 'schema_digest', None)
+    if not digest:
+        return None
+
+    optional_selections = getattr(generator, 'optional_selections', None)
+    options = {
+        'generation_mode': getattr(generator, 'generation_mode', None),
+        'optional_depth_limit': getattr(generator, 'optional_depth_limit', None),
+        'optional_selections': sorted(optional_selections) if optional_selections is not None else None,
+        'user_choices': getattr(generator, 'user_choices', None) or {},
+        'user_unbounded_counts': getattr(generator, 'user_unbounded_counts', None) or {},
+        'streaming': getattr(generator, '_streaming', False),
+        'recursion': asdict(generator.context.recursion),
+        'default_element_count': generator.config.elements.default_element_count
+    }
+    return digest, root_name, json.dumps(options, sort_keys=True, default=str)
+
+
+class GenerationPlanCache:
+    """Thread-safe LRU cache of compiled generation plans."""
+
+    def __init__(self, max_entries: Optional[int] = None, config_instance=None):
+        """
+        Initialize the plan cache.
+
+        Args:
+            max_entries: Maximum number of plans kept in memory
+            config_instance: Configuration instance (uses global config if None)
+        """
+        self.config = config_instance or get_config()
+        self.max_entries = max_entries if max_entries is not None else self.config.performance.generation_plan_cache_size
+        self._plans: "OrderedDict[Tuple[str, str, str], GenerationPlan]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_plan(self, generator, root_element, root_name: str) -> GenerationPlan:
+        """
+        Get the plan for a generator's current options, compiling it on a miss.
+
+        Args:
+            generator: XMLGenerator holding the schema and generation options
+            root_element: Root XSD element
+            root_name: Name of the root element
+
+        Returns:
+            Cached or freshly compiled GenerationPlan
+        """
+        key = plan_cache_key(generator, root_name)
+        if key is not None:
+            with self._lock:
+                plan = self._plans.get(key)
+                if plan is not None:
+                    self._plans.move_to_end(key)
+                    self.hits += 1
+                    return plan
+
+        plan = compile_generation_plan(generator, root_element, root_name)
+
+        with self._lock:
+            self.misses += 1
+            if key is not None:
+                self._plans[key] = plan
+                while len(self._plans) > max(1, self.max_entries):
+                    self._plans.popitem(last=False)
+        return plan
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get plan cache usage statistics.
+
+        Returns:
+            Dictionary with entry count and hit/miss counters
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._plans),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def clear(self) -> None:
+        """Drop all cached plans and reset the counters."""
+        with self._lock:
+            self._plans.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_plan_cache: Optional[GenerationPlanCache] = None
+_plan_cache_lock = threading.Lock()
+
+
+def get_plan_cache() -> GenerationPlanCache:
+    """Get the process-wide generation plan cache."""
+    global _plan_cache
+    if _plan_cache is None:
+        with _plan_cache_lock:
+            if _plan_cache is None:
+                _plan_cache = GenerationPlanCache()
+    return _plan_cache
@@ -0,0 +1,242 @@
+"""
+Generation profiler module for XML Wizard.
+
+This module provides an opt-in profiler for XMLGenerator. While attached it
+wraps the generator's element walk, value generation, type resolution and XML
+tree building, and records per schema path and per XSD type the call counts,
+cumulative and self time, and the number of values generated. Results export
+as collapsed stacks (one "frame;frame;frame microseconds" line per stack, the
+input format of flamegraph.pl, speedscope and similar tools) and as a JSON
+table sorted by cumulative time.
+"""
+
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+# Generator methods wrapped while profiling, and the phase they are recorded under
+PROFILED_METHODS = {
+    '_create_element_dict': 'element',
+    '_generate_value_for_type': 'value',
+    '_sample_value': 'value',
+    '_resolve_value_generator': 'resolve',
+    '_build_xml_tree': 'build',
+}
+
+
+class ProfileEntry:
+    """Aggregated timings of one schema path, XSD type or phase."""
+
+    __slots__ = ('calls', 'total_time', 'self_time', 'values')
+
+    def __init__(self):
+        self.calls = 0
+        self.total_time = 0.0
+        self.self_time = 0.0
+        self.values = 0
+
+    def to_dict(self, name: str) -> Dict[str, Any]:
+        return {
+            'name': name,
+            'calls': self.calls,
+            'total_seconds': round(self.total_time, 6),
+            'self_seconds': round(self.self_time, 6),
+            'values': self.values
+        }
+
+
+class _Frame:
+    __slots__ = ('stack_key', 'entries', 'start', 'child_time')
+
+    def __init__(self, stack_key: str, entries: List[ProfileEntry], start: float):
+        self.stack_key = stack_key
+        self.entries = entries
+        self.start = start
+        self.child_time = 0.0
+
+
+def _type_label(xsd_type: Any) -> str:
+    """Readable name of an XSD type object."""
+    if xsd_type is None:
+        return '(none)'
+    name = getattr(xsd_type, 'local_name', None) or getattr(xsd_type, 'name', None)
+    if name:
+        return str(name).split('}')[-1]
+    return '(anonymous)'
+
+
+def _local_tag(element: Any) -> str:
+    tag = getattr(element, 'tag', None)
+    return str(tag).split('}')[-1] if isinstance(tag, str) else '(element)'
+
+
+class GenerationProfiler:
+    """Records where XML generation spends its time, per schema path and XSD type."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        """
+        Initialize an empty profiler.
+
+        Args:
+            clock: Monotonic clock returning seconds
+        """
+        self.clock = clock
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard all recorded timings."""
+        self.paths: Dict[str, ProfileEntry] = {}
+        self.types: Dict[str, ProfileEntry] = {}
+        self.phases: Dict[str, ProfileEntry] = {}
+        self.stacks: Dict[str, float] = {}
+        self.total_time = 0.0
+        self._stack: List[_Frame] = []
+        self._active: Dict[int, int] = {}
+        self._started: Optional[float] = None
+
+    def start(self, generator) -> None:
+        """
+        Reset the profiler and wrap the generator's profiled methods.
+
+        Args:
+            generator: XMLGenerator to profile
+        """
+        self.reset()
+        for method_name, phase in PROFILED_METHODS.items():
+            original = getattr(generator, method_name)
+            setattr(generator, method_name, self._wrap(original, method_name, phase))
+        self._started = self.clock()
+
+    def stop(self, generator) -> None:
+        """
+        Remove the method wrappers from the generator.
+
+        Args:
+            generator: XMLGenerator passed to start()
+        """
+        for method_name in PROFILED_METHODS:
+            generator.__dict__.pop(method_name, None)
+        if self._started is not None:
+            self.total_time += self.clock() - self._started
+            self._started = None
+
+    def _wrap(self, method: Callable, method_name: str, phase: str) -> Callable:
+        def profiled(*args, **kwargs):
+            self._enter(method_name, phase, args, kwargs)
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self._exit()
+        profiled.__wrapped__ = method
+        return profiled
+
+    def _enter(self, method_name: str, phase: str, args: tuple, kwargs: Dict[str, Any]) -> None:
+        entries = [self._entry(self.phases, phase)]
+        parent_key = self._stack[-1].stack_key if self._stack else ''
+
+        if phase == 'element':
+            element = args[0] if args else kwargs.get('element')
+            path = args[1] if len(args) > 1 else kwargs.get('path', '')
+            frame_name = getattr(element, 'local_name', None) or path.split('.')[-1] or '(element)'
+            entries.append(self._entry(self.paths, path or frame_name))
+            entries.append(self._entry(self.types, _type_label(getattr(element, 'type', None))))
+        elif phase == 'value':
+            if method_name == '_sample_value':
+                element_name = getattr(args[0] if args else kwargs.get('sampler'), 'element_name', '')
+            else:
+                element_name = args[1] if len(args) > 1 else kwargs.get('element_name', '')
+            frame_name = f"value:{element_name}"
+            # Values are credited to the path and type of the element being built
+            for frame in reversed(self._stack):
+                if len(frame.entries) > 1:
+                    for entry in frame.entries[1:]:
+                        entry.values += 1
+                    break
+            entries[0].values += 1
+        elif phase == 'resolve':
+            frame_name = 'resolve'
+        else:
+            frame_name = f"build:{_local_tag(args[0] if args else kwargs.get('parent_element'))}"
+
+        stack_key = f"{parent_key};{frame_name}" if parent_key else frame_name
+        for entry in entries:
+            entry.calls += 1
+            self._active[id(entry)] = self._active.get(id(entry), 0) + 1
+        self._stack.append(_Frame(stack_key, entries, self.clock()))
+
+    def _exit(self) -> None:
+        frame = self._stack.pop()
+        elapsed = self.clock() - frame.start
+        self_time = elapsed - frame.child_time
+        if self._stack:
+            self._stack[-1].child_time += elapsed
+        self.stacks[frame.stack_key] = self.stacks.get(frame.stack_key, 0.0) + self_time
+
+        for entry in frame.entries:
+            entry.self_time += self_time
+            # Nested frames of the same path/type only count towards the outermost one
+            active = self._active[id(entry)] - 1
+            self._active[id(entry)] = active
+            if active == 0:
+                entry.total_time += elapsed
+
+    def _entry(self, table: Dict[str, ProfileEntry], name: str) -> ProfileEntry:
+        entry = table.get(name)
+        if entry is None:
+            entry = table[name] = ProfileEntry()
+        return entry
+
+    def get_report(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Build the profile as tables sorted by cumulative time.
+
+        Args:
+            limit: Maximum rows per table (all rows if None)
+
+        Returns:
+            Dictionary with total seconds and 'phases', 'paths' and 'types' tables
+        """
+        def table(entries: Dict[str, ProfileEntry]) -> List[Dict[str, Any]]:
+            rows = sorted(entries.items(), key=lambda item: (-item[1].total_time, item[0]))
+            return [entry.to_dict(name) for name, entry in rows[:limit]]
+
+        return {
+            'total_seconds': round(self.total_time, 6),
+            'phases': table(self.phases),
+            'paths': table(self.paths),
+            'types': table(self.types)
+        }
+
+    def to_json(self, limit: Optional[int] = None) -> str:
+        """Serialize the profile report as indented JSON."""
+        return json.dumps(self.get_report(limit), indent=2)
+
+    def to_collapsed_stacks(self) -> str:
+        """
+        Export self time per call stack in collapsed-stack format.
+
+        Returns:
+            One "frame;frame;frame microseconds" line per stack, sorted by stack
+        """
+        lines = []
+        for stack_key in sorted(self.stacks):
+            microseconds = int(round(self.stacks[stack_key] * 1_000_000))
+            if microseconds > 0:
+                lines.append(f"{stack_key.replace(' ', '_')} {microseconds}")
+        return '\n'.join(lines) + ('\n' if lines else '')
+
+    def write(self, json_path: Optional[str] = None, stacks_path: Optional[str] = None) -> None:
+        """
+        Write the JSON report and/or collapsed stacks to files.
+
+        Args:
+            json_path: Destination of the JSON report
+            stacks_path: Destination of the collapsed stacks
+        """
+        if json_path:
+            with open(json_path, 'w', encoding='utf-8') as f:
+                f.write(self.to_json())
+        if stacks_path:
+            with open(stacks_path, 'w', encoding='utf-8') as f:
+                f.write(self.to_collapsed_stacks())
@@ -0,0 +1,109 @@
+"""
+Generation progress module for XML Wizard.
+
+This module provides the progress reporter XMLGenerator updates while it
+walks the schema. When a reporter is attached to a generator, every element
+frame records the element and its path. The reporter is read from another
+thread to show elements emitted, the current path and an estimated time
+remaining. It is also the cancellation point: once cancel() is called, the
+next element raises GenerationCancelled, which unwinds the walk. Replays of
+compiled generation plans visit no element frames and report their root only.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class GenerationCancelled(BaseException):
+    """
+    Raised inside a generation whose progress reporter was cancelled.
+
+    Derives from BaseException so the walk's per-element error handling,
+    which turns ordinary exceptions into placeholder content, lets it through.
+    """
+
+
+class GenerationProgress:
+    """Elements emitted by one generation, readable from other threads."""
+
+    def __init__(self, expected_elements: Optional[int] = None):
+        """
+        Initialize a progress reporter.
+
+        Args:
+            expected_elements: Element count expected for the document (e.g. the
+                previous generation's), used to estimate the time remaining
+        """
+        self.expected_elements = expected_elements
+        self.elements = 0
+        self.current_path = ""
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._cancelled = threading.Event()
+
+    def start(self) -> None:
+        """Mark the start of the generation."""
+        self.started_at = time.time()
+
+    def finish(self) -> None:
+        """Mark the end of the generation."""
+        self.finished_at = time.time()
+
+    def element(self, path: str) -> None:
+        """
+        Record an element the generator is about to walk.
+
+        Args:
+            path: Schema path of the element
+
+        Raises:
+            GenerationCancelled: If the generation has been cancelled
+        """
+        if self._cancelled.is_set():
+            raise GenerationCancelled()
+        self.elements += 1
+        self.current_path = path
+
+    def cancel(self) -> None:
+        """Request cooperative cancellation at the next element."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation has been requested."""
+        return self._cancelled.is_set()
+
+    def elapsed_seconds(self) -> float:
+        """Seconds since start(), up to finish() once finished."""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def eta_seconds(self) -> Optional[float]:
+        """Estimated seconds remaining, or None without an expected element count."""
+        if not self.expected_elements or not self.elements or self.finished_at is not None:
+            return None
+        remaining = max(self.expected_elements - self.elements, 0)
+        return self.elapsed_seconds() * remaining / self.elements
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get a consistent view of the progress for display.
+
+        Returns:
+            Dictionary with elements, expected_elements, fraction (None when
+            unknown), current_path, elapsed_seconds and eta_seconds
+        """
+        elements = self.elements
+        fraction = None
+        if self.expected_elements:
+            fraction = min(elements / self.expected_elements, 1.0)
+        return {
+            'elements': elements,
+            'expected_elements': self.expected_elements,
+            'fraction': fraction,
+            'current_path': self.current_path,
+            'elapsed_seconds': self.elapsed_seconds(),
+            'eta_seconds': self.eta_seconds()
+        }
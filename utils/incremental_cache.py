@@ -0,0 +1,228 @@
+"""
+Incremental generation cache module for XML Wizard.
+
+This module provides the cache XMLGenerator keeps between generations when
+performance.enable_incremental_generation is set. Every complex element of the
+last document is stored in a tree indexed by element path and occurrence,
+together with the option lookups (choice selection, occurrence count, optional
+inclusion) its walk consulted. On the next generation the recorded lookups are
+evaluated against the new options; subtrees whose lookups all give the same
+answer are spliced into the new document as they are, and only subtrees that
+depend on a changed answer are walked again. Changing the generation mode,
+custom values, seed or root element regenerates the whole document.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# Generator methods whose answers depend on the user's generation options
+TRACKED_LOOKUPS = ('_select_choice_element', '_get_user_count', '_should_include_optional_element')
+
+# Position of a subtree within its parent: (element path, occurrence among same-path siblings)
+NodeKey = Tuple[str, int]
+
+
+class IncrementalNode:
+    """Cached subtree of one complex element occurrence."""
+
+    __slots__ = ('value', 'deps', 'ids', 'children', 'dirty')
+
+    def __init__(self):
+        self.value = None
+        self.deps = set()  # Lookup keys consulted directly by this element's walk
+        self.ids: List[str] = []  # xs:ID values issued directly by this element's walk
+        self.children: Dict[NodeKey, 'IncrementalNode'] = {}
+        self.dirty = False
+
+
+class _Record:
+    """Element walk in progress: the node being built and its previous version."""
+
+    __slots__ = ('key', 'node', 'previous', 'seen', 'mark')
+
+    def __init__(self, key: Optional[NodeKey], previous: Optional[IncrementalNode], mark: int):
+        self.key = key
+        self.node = IncrementalNode()
+        self.previous = previous
+        self.seen: Dict[str, int] = {}
+        self.mark = mark
+
+    def child_key(self, path: str) -> NodeKey:
+        ordinal = self.seen.get(path, 0)
+        self.seen[path] = ordinal + 1
+        return path, ordinal
+
+
+def _lookup_key(method_name: str, args: tuple) -> Tuple[Any, ...]:
+    """Hashable key of a lookup call; element lists are keyed by identity."""
+    return (method_name,) + tuple(
+        tuple(id(item) for item in arg) if isinstance(arg, list) else arg for arg in args
+    )
+
+
+class IncrementalCache:
+    """Subtrees of the previous generation and the option lookups they depend on."""
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self.document: Optional[IncrementalNode] = None
+        self.signature: Optional[Tuple[Any, ...]] = None
+        self.context = None
+        self.lookups: Dict[Tuple[Any, ...], Tuple[str, tuple, Any]] = {}
+        self.reused = 0
+        self.regenerated = 0
+        self._stack: List[_Record] = []
+        self._generator = None
+
+    def clear(self) -> None:
+        """Forget the cached document so the next generation walks everything."""
+        self.document = None
+        self.signature = None
+        self.context = None
+        self.lookups = {}
+
+    def begin(self, generator, signature: Tuple[Any, ...]) -> bool:
+        """
+        Start tracking a generation and wrap the generator's lookup methods.
+
+        The generator's options must already be applied. If the previous document
+        was generated with the same signature, the generator continues from that
+        document's context, keeping the IDs of the subtrees that stay valid.
+
+        Args:
+            generator: XMLGenerator about to walk the schema
+            signature: Options that invalidate the whole document when changed
+
+        Returns:
+            True if cached subtrees can be reused, False for a full generation
+        """
+        self.reused = 0
+        self.regenerated = 0
+        incremental = self.document is not None and signature == self.signature
+        if incremental:
+            self._mark_dirty(self._changed_lookups(generator))
+            self.context.retain_ids(self._valid_ids())
+            generator.context = self.context
+        else:
+            self.clear()
+        self.signature = signature
+
+        self._generator = generator
+        self._stack = [_Record(None, self.document if incremental else None, len(generator.context.all_generated_ids))]
+        for method_name in TRACKED_LOOKUPS:
+            original = getattr(generator, method_name)
+            setattr(generator, method_name, self._wrap(original, method_name))
+        return incremental
+
+    def end(self, generator, completed: bool) -> None:
+        """
+        Stop tracking and remove the lookup wrappers.
+
+        Args:
+            generator: XMLGenerator passed to begin()
+            completed: Whether the document was generated; otherwise the cache is cleared
+        """
+        for method_name in TRACKED_LOOKUPS:
+            generator.__dict__.pop(method_name, None)
+        document = self._stack[0] if self._stack else None
+        if completed and document is not None:
+            self._flush_ids(document)
+            self.document = document.node
+            self.context = generator.context
+        else:
+            self.clear()
+        self._stack = []
+        self._generator = None
+
+    def enter(self, path: str) -> Optional[IncrementalNode]:
+        """
+        Enter a complex element occurrence.
+
+        Args:
+            path: Path of the element
+
+        Returns:
+            The cached node to splice in if its subtree is still valid; otherwise
+            None, and the element's walk is tracked until exit() or abort()
+        """
+        parent = self._stack[-1]
+        key = parent.child_key(path)
+        previous = parent.previous.children.get(key) if parent.previous is not None else None
+        if previous is not None and not previous.dirty:
+            parent.node.children[key] = previous
+            self.reused += 1
+            return previous
+
+        self._flush_ids(parent)
+        self._stack.append(_Record(key, previous, parent.mark))
+        return None
+
+    def exit(self, value: Any) -> None:
+        """Finish the walk started by enter() and store its subtree."""
+        record = self._stack.pop()
+        self._flush_ids(record)
+        record.node.value = value
+        parent = self._stack[-1]
+        parent.node.children[record.key] = record.node
+        parent.mark = record.mark
+        self.regenerated += 1
+
+    def abort(self) -> None:
+        """Discard the walk started by enter() after it raised; it is walked again next time."""
+        record = self._stack.pop()
+        self._flush_ids(record)
+        self._stack[-1].mark = record.mark
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get statistics of the most recent generation.
+
+        Returns:
+            Dictionary with reused and regenerated subtree counts and tracked lookups
+        """
+        return {'reused': self.reused, 'regenerated': self.regenerated, 'lookups': len(self.lookups)}
+
+    def _wrap(self, method: Callable, method_name: str) -> Callable:
+        def tracked(*args):
+            result = method(*args)
+            key = _lookup_key(method_name, args)
+            self.lookups[key] = (method_name, args, result)
+            self._stack[-1].node.deps.add(key)
+            return result
+        tracked.__wrapped__ = method
+        return tracked
+
+    def _flush_ids(self, record: _Record) -> None:
+        """Attribute the IDs issued since the record's mark to its node."""
+        issued = self._generator.context.all_generated_ids
+        if len(issued) > record.mark:
+            record.node.ids.extend(issued[record.mark:])
+            record.mark = len(issued)
+
+    def _changed_lookups(self, generator) -> set:
+        """Evaluate the recorded lookups with the generator's current options."""
+        changed = set()
+        for key, (method_name, args, result) in self.lookups.items():
+            if getattr(generator, method_name)(*args) != result:
+                changed.add(key)
+        return changed
+
+    def _nodes(self) -> List[IncrementalNode]:
+        """Nodes of the cached document in pre-order."""
+        nodes = []
+        stack = [self.document]
+        while stack:
+            node = stack.pop()
+            nodes.append(node)
+            stack.extend(reversed(list(node.children.values())))
+        return nodes
+
+    def _mark_dirty(self, changed: set) -> None:
+        """Flag every node whose subtree consulted a changed lookup."""
+        for node in reversed(self._nodes()):
+            node.dirty = (not node.deps.isdisjoint(changed) or
+                          any(child.dirty for child in node.children.values()))
+
+    def _valid_ids(self) -> List[str]:
+        """IDs issued by subtrees that can be reused, in document order."""
+        return [value for node in self._nodes() if not node.dirty for value in node.ids]
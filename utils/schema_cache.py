@@ -0,0 +1,268 @@
+"""
+Persistent schema cache module for XML Wizard.
+
+This module stores built xmlschema.XMLSchema objects on disk so that loading
+the same schema bundle again skips parsing and component building entirely.
+Cache entries are keyed by a digest over the root XSD and every file it
+transitively imports or includes, so editing any file in the bundle
+invalidates the entry automatically.
+"""
+
+import os
+import hashlib
+import pickle
+import tempfile
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+import xmlschema
+
+from config import get_config
+from .xsd_dependency_resolver import get_dependency_resolver
+
+
+class SchemaCache:
+    """On-disk cache of built XSD schemas keyed by their import closure digest."""
+
+    # Bump when the key derivation or the stored payload changes
+    CACHE_FORMAT_VERSION = 1
+
+    def __init__(self, cache_dir: Optional[str] = None, config_instance=None):
+        """
+        Initialize the schema cache.
+
+        Args:
+            cache_dir: Directory holding cached schemas (defaults to config value)
+            config_instance: Configuration instance (uses global config if None)
+        """
+        self.config = config_instance or get_config()
+        self.cache_dir = cache_dir or self.config.performance.schema_cache_dir
+        self.enabled = self.config.performance.enable_schema_cache
+        # Path -> ((size, mtime_ns), content hash), so unchanged files are not re-read
+        self._file_hashes: Dict[str, Tuple[Tuple[int, int], str]] = {}
+        self._hash_lock = threading.Lock()
+
+    def load_schema(self, xsd_path: str, digest: Optional[str] = None, **build_kwargs) -> xmlschema.XMLSchema:
+        """
+        Load a built schema, reusing the on-disk copy when the bundle is unchanged.
+
+        Args:
+            xsd_path: Path to the root XSD file
+            digest: Precomputed bundle digest (computed when omitted)
+            **build_kwargs: Keyword arguments passed through to xmlschema.XMLSchema
+
+        Returns:
+            Built XMLSchema instance
+        """
+        xsd_path = os.path.abspath(xsd_path)
+        if not self.enabled:
+            return xmlschema.XMLSchema(xsd_path, **build_kwargs)
+
+        if digest is None:
+            digest = self.compute_digest(xsd_path, build_kwargs.get('locations'), build_kwargs)
+        cached = self._read_entry(digest)
+        if cached is not None:
+            return cached
+
+        schema = xmlschema.XMLSchema(xsd_path, **build_kwargs)
+        self._write_entry(digest, schema)
+        return schema
+
+    def compute_digest(self, xsd_path: str, locations: Optional[Dict[str, Any]] = None,
+                       build_kwargs: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Compute the cache key for a schema bundle.
+
+        The key covers the content of every file in the import closure together
+        with its path relative to the root schema, so identical bundles uploaded
+        into different temporary directories share one cache entry. File
+        contents are hashed once per size and modification time.
+
+        Args:
+            xsd_path: Path to the root XSD file
+            locations: Optional namespace to schema location mapping
+            build_kwargs: Remaining build options that affect the built schema
+
+        Returns:
+            Hex digest identifying the schema bundle
+        """
+        xsd_path = os.path.abspath(xsd_path)
+        root_dir = os.path.dirname(xsd_path)
+        hasher = hashlib.sha256()
+        hasher.update(f"v{self.CACHE_FORMAT_VERSION}|xmlschema-{xmlschema.__version__}".encode())
+
+        for option, value in sorted((build_kwargs or {}).items()):
+            # Locations are covered by the closure itself; build/base_url do not
+            # change the resulting components for a fully built schema.
+            if option in ('locations', 'base_url', 'build'):
+                continue
+            hasher.update(f"|{option}={value!r}".encode())
+
+        dependencies, unresolved = self._resolve_closure(xsd_path, locations)
+        relative_paths = sorted(
+            (os.path.relpath(dependency, root_dir), dependency) for dependency in dependencies
+        )
+        for relative, dependency in relative_paths:
+            hasher.update(f"|{relative}:".encode())
+            hasher.update(self._hash_file(dependency).encode())
+
+        # Locations that do not resolve yet change the key once they appear
+        for location in unresolved:
+            hasher.update(f"|unresolved:{location}".encode())
+
+        return hasher.hexdigest()
+
+    def collect_dependencies(self, xsd_path: str, locations: Optional[Dict[str, Any]] = None) -> List[str]:
+        """
+        Collect the root XSD and every file it transitively imports or includes.
+
+        Args:
+            xsd_path: Path to the root XSD file
+            locations: Optional namespace to schema location mapping
+
+        Returns:
+            Ordered list of schema file paths, root first
+        """
+        return self._resolve_closure(xsd_path, locations)[0]
+
+    def _resolve_closure(self, xsd_path: str,
+                         locations: Optional[Dict[str, Any]] = None) -> Tuple[List[str], List[str]]:
+        """
+        Resolve the import closure of a schema once.
+
+        Args:
+            xsd_path: Path to the root XSD file
+            locations: Optional namespace to schema location mapping
+
+        Returns:
+            Tuple of (schema file paths, root first; locations the root closure
+            could not resolve)
+        """
+        resolver = get_dependency_resolver()
+        closure = resolver.resolve(xsd_path)
+        files = list(closure.files)
+
+        for location_list in (locations or {}).values():
+            if isinstance(location_list, str):
+                location_list = [location_list]
+            for location in location_list:
+                location = os.path.abspath(location)
+                if location in files:
+                    continue
+                for path in resolver.resolve(location).files:
+                    if path not in files:
+                        files.append(path)
+
+        return files, closure.unresolved
+
+    def clear(self) -> int:
+        """
+        Remove every cached schema.
+
+        Returns:
+            Number of cache entries removed
+        """
+        removed = 0
+        if not os.path.isdir(self.cache_dir):
+            return removed
+
+        for filename in os.listdir(self.cache_dir):
+            if filename.endswith('.pickle'):
+                try:
+                    os.unlink(os.path.join(self.cache_dir, filename))
+                    removed += 1
+                except OSError as e:
+                    print(f"Warning: Could not remove cached schema {filename}: {e}")
+        return removed
+
+    def entry_size(self, digest: str) -> Optional[int]:
+        """
+        Get the serialized size of a cache entry.
+
+        Args:
+            digest: Bundle digest of the entry
+
+        Returns:
+            Size in bytes, or None when the entry is not on disk
+        """
+        try:
+            return os.path.getsize(self._entry_path(digest))
+        except OSError:
+            return None
+
+    def _hash_file(self, file_path: str) -> str:
+        """Hash a file's content, returning a marker for unreadable files."""
+        try:
+            stat = os.stat(file_path)
+            signature = (stat.st_size, stat.st_mtime_ns)
+            with self._hash_lock:
+                cached = self._file_hashes.get(file_path)
+            if cached and cached[0] == signature:
+                return cached[1]
+
+            hasher = hashlib.sha256()
+            with open(file_path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    hasher.update(block)
+            digest = hasher.hexdigest()
+        except OSError:
+            return 'missing'
+
+        with self._hash_lock:
+            self._file_hashes[file_path] = (signature, digest)
+        return digest
+
+    def _entry_path(self, digest: str) -> str:
+        """Get the file path of a cache entry."""
+        return os.path.join(self.cache_dir, f"{digest}.pickle")
+
+    def _read_entry(self, digest: str) -> Optional[xmlschema.XMLSchema]:
+        """Load a cached schema, discarding entries that cannot be unpickled."""
+        entry_path = self._entry_path(digest)
+        if not os.path.exists(entry_path):
+            return None
+
+        try:
+            with open(entry_path, 'rb') as f:
+                schema = pickle.load(f)
+            if isinstance(schema, xmlschema.XMLSchemaBase):
+                return schema
+            print(f"Warning: Ignoring unexpected object in schema cache entry {entry_path}")
+        except Exception as e:
+            print(f"Warning: Discarding unreadable schema cache entry {entry_path}: {e}")
+
+        try:
+            os.unlink(entry_path)
+        except OSError:
+            pass
+        return None
+
+    def _write_entry(self, digest: str, schema: xmlschema.XMLSchema) -> None:
+        """Store a built schema atomically so concurrent readers never see partial files."""
+        temp_path = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(schema, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self._entry_path(digest))
+            temp_path = None
+        except Exception as e:
+            print(f"Warning: Could not write schema cache entry: {e}")
+        finally:
+            if temp_path and os.path.exists(temp_path):
+                try:
+                    os.unlink(temp_path)
+                except OSError:
+                    pass
+
+
+_schema_cache: Optional[SchemaCache] = None
+
+
+def get_schema_cache() -> SchemaCache:
+    """Get the process-wide schema cache instance."""
+    global _schema_cache
+    if _schema_cache is None:
+        _schema_cache = SchemaCache()
+    return _schema_cache
@@ -0,0 +1,277 @@
+"""
+Schema registry module for XML Wizard.
+
+This module provides a process-wide, in-memory registry of built schemas so
+that XMLGenerator, SchemaAnalyzer and XMLValidator share a single schema
+object per schema bundle instead of each building their own copy. Entries are
+keyed by the bundle digest, which covers the content of the root XSD and its
+import closure but not its directory, so the same upload copied into a new
+workspace on every Streamlit rerun or by another session reuses the entry.
+The registry is bounded by an entry limit and a byte budget and evicts the
+least recently used schemas first. It also holds, per digest and within the
+same entry limit, the schema compiled by libxml2 (lxml.etree.XMLSchema) that
+XMLValidator uses as its fast validity check. A compiled schema keeps the
+error log of its last validation, so validate_lxml validates under a lock per
+schema and returns a copy of the log.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple
+
+import xmlschema
+from lxml import etree
+
+from config import get_config
+from .schema_cache import SchemaCache, get_schema_cache
+
+
+@dataclass
+class SchemaEntry:
+    """A built schema held by the registry."""
+    schema: xmlschema.XMLSchema
+    xsd_path: str
+    digest: str
+    size_bytes: int
+    hits: int = 0
+
+
+class SchemaRegistry:
+    """Thread-safe LRU registry of built schemas keyed by schema bundle digest."""
+
+    def __init__(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None,
+                 schema_cache: Optional[SchemaCache] = None, config_instance=None):
+        """
+        Initialize the schema registry.
+
+        Args:
+            max_entries: Maximum number of schemas kept in memory
+            max_bytes: Approximate memory budget in bytes for all entries
+            schema_cache: Persistent cache used to load missing schemas
+            config_instance: Configuration instance (uses global config if None)
+        """
+        self.config = config_instance or get_config()
+        performance = self.config.performance
+        self.max_entries = max_entries if max_entries is not None else performance.schema_registry_max_entries
+        self.max_bytes = max_bytes if max_bytes is not None else performance.schema_registry_max_mb * 1024 * 1024
+        self.schema_cache = schema_cache or get_schema_cache()
+
+        self._entries: "OrderedDict[str, SchemaEntry]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.RLock()
+        self._loading_locks: Dict[str, threading.Lock] = {}
+        # Digest -> (compiled libxml2 schema, or None when libxml2 rejects the bundle; its validation lock)
+        self._lxml_schemas: "OrderedDict[str, Tuple[Optional[etree.XMLSchema], threading.Lock]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_schema(self, xsd_path: str, **build_kwargs) -> xmlschema.XMLSchema:
+        """
+        Get the shared built schema for an XSD file.
+
+        Args:
+            xsd_path: Path to the root XSD file
+            **build_kwargs: Keyword arguments passed through to xmlschema.XMLSchema
+
+        Returns:
+            Built XMLSchema instance shared with other callers
+        """
+        return self.get_entry(xsd_path, **build_kwargs).schema
+
+    def get_entry(self, xsd_path: str, **build_kwargs) -> SchemaEntry:
+        """
+        Get the registry entry for an XSD file, loading it on a miss.
+
+        Args:
+            xsd_path: Path to the root XSD file
+            **build_kwargs: Keyword arguments passed through to xmlschema.XMLSchema
+
+        Returns:
+            SchemaEntry holding the shared schema and its content digest
+        """
+        xsd_path = os.path.abspath(xsd_path)
+        key = digest = self.schema_cache.compute_digest(xsd_path, build_kwargs.get('locations'), build_kwargs)
+
+        entry = self._lookup(key)
+        if entry is not None:
+            return entry
+
+        # Serialize loads of the same key so concurrent sessions build it once
+        with self._lock:
+            loading_lock = self._loading_locks.setdefault(key, threading.Lock())
+
+        with loading_lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                return entry
+
+            with self._lock:
+                self.misses += 1
+
+            try:
+                schema = self.schema_cache.load_schema(xsd_path, digest=digest, **build_kwargs)
+                entry = SchemaEntry(
+                    schema=schema,
+                    xsd_path=xsd_path,
+                    digest=digest,
+                    size_bytes=self._estimate_size(xsd_path, digest, build_kwargs.get('locations'))
+                )
+                self._insert(key, entry)
+            finally:
+                with self._lock:
+                    self._loading_locks.pop(key, None)
+
+        return entry
+
+    def get_lxml_schema(self, xsd_path: str) -> Optional[etree.XMLSchema]:
+        """
+        Get the shared libxml2 compiled schema for an XSD file.
+
+        Bundles libxml2 cannot compile (e.g. unsupported pattern syntax) are
+        remembered as such, so callers fall back to the xmlschema schema
+        without compiling them again.
+
+        Args:
+            xsd_path: Path to the root XSD file
+
+        Returns:
+            Compiled lxml.etree.XMLSchema, or None if libxml2 rejects the schema
+        """
+        return self._lxml_entry(xsd_path)[0]
+
+    def validate_lxml(self, xsd_path: str, document) -> Optional[etree._ListErrorLog]:
+        """
+        Validate a parsed document with the shared libxml2 compiled schema.
+
+        Validations against the same schema are serialized, so the error log
+        returned is the one of this document.
+
+        Args:
+            xsd_path: Path to the root XSD file
+            document: lxml element or element tree to validate
+
+        Returns:
+            Copy of the libxml2 error log (empty if the document is valid), or
+            None if libxml2 rejects the schema
+        """
+        lxml_schema, lock = self._lxml_entry(xsd_path)
+        if lxml_schema is None:
+            return None
+        with lock:
+            lxml_schema.validate(document)
+            return lxml_schema.error_log.copy()
+
+    def _lxml_entry(self, xsd_path: str) -> Tuple[Optional[etree.XMLSchema], threading.Lock]:
+        """Get the compiled libxml2 schema of an XSD file and its validation lock, compiling it on a miss."""
+        xsd_path = os.path.abspath(xsd_path)
+        digest = self.schema_cache.compute_digest(xsd_path)
+
+        with self._lock:
+            if digest in self._lxml_schemas:
+                self._lxml_schemas.move_to_end(digest)
+                return self._lxml_schemas[digest]
+
+        try:
+            lxml_schema = etree.XMLSchema(etree.parse(xsd_path))
+        except (etree.XMLSchemaParseError, etree.XMLSyntaxError):
+            lxml_schema = None
+
+        with self._lock:
+            entry = self._lxml_schemas.setdefault(digest, (lxml_schema, threading.Lock()))
+            self._lxml_schemas.move_to_end(digest)
+            while len(self._lxml_schemas) > max(1, self.max_entries):
+                self._lxml_schemas.popitem(last=False)
+        return entry
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get registry usage statistics.
+
+        Returns:
+            Dictionary with entry count, memory usage and hit/miss/eviction counters
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'lxml_entries': len(self._lxml_schemas),
+                'max_entries': self.max_entries,
+                'total_bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def clear(self) -> None:
+        """Drop every schema held by the registry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._lxml_schemas.clear()
+            self._total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def _lookup(self, key: str) -> Optional[SchemaEntry]:
+        """Return a cached entry and mark it as most recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            entry.hits += 1
+            self.hits += 1
+            return entry
+
+    def _insert(self, key: str, entry: SchemaEntry) -> None:
+        """Insert an entry and evict least recently used entries over the limits."""
+        with self._lock:
+            self._entries[key] = entry
+            self._total_bytes += entry.size_bytes
+
+            # Always keep the entry just inserted, even if it alone exceeds the budget
+            while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= evicted.size_bytes
+                self.evictions += 1
+
+    def _estimate_size(self, xsd_path: str, digest: str, locations: Optional[Dict[str, Any]]) -> int:
+        """
+        Estimate the memory footprint of a built schema.
+
+        The pickled size from the persistent cache is used when available;
+        otherwise the size of the XSD sources in the import closure stands in.
+        """
+        serialized_size = self.schema_cache.entry_size(digest)
+        if serialized_size is not None:
+            return serialized_size
+
+        source_size = 0
+        for dependency in self.schema_cache.collect_dependencies(xsd_path, locations):
+            try:
+                source_size += os.path.getsize(dependency)
+            except OSError:
+                continue
+        return source_size
+
+
+_schema_registry: Optional[SchemaRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_schema_registry() -> SchemaRegistry:
+    """Get the process-wide schema registry instance."""
+    global _schema_registry
+    if _schema_registry is None:
+        with _registry_lock:
+            if _schema_registry is None:
+                _schema_registry = SchemaRegistry()
+    return _schema_registry
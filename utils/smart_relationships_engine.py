@@ -6,10 +6,9 @@ ensuring consistency, uniqueness, and applying business logic constraints.
 """
 
 from typing import Dict, Any, List, Optional, Set, Tuple
-import random
 import re
-from collections import defaultdict
 from .data_context_manager import DataContextManager
+from .generation_context import GenerationContext
 
 
 class SmartRelationshipsEngine:
@@ -25,12 +24,27 @@ class SmartRelationshipsEngine:
         """
         self.relationships = relationships or {}
         self.data_context_manager = data_context_manager or DataContextManager()
-        self.generated_values = defaultdict(list)  # Track generated values per element
-        self.relationship_groups = {}  # Track related element groups
-        self.constraint_violations = []
+        # State used when no per-document context is passed
+        self._context = GenerationContext()
+    
+    @property
+    def generated_values(self):
+        """Generated values per element in the engine's own context."""
+        return self._context.relationship_values
+    
+    @property
+    def relationship_groups(self) -> Dict[str, Dict[str, Any]]:
+        """Related element groups in the engine's own context."""
+        return self._context.relationship_groups
+    
+    @property
+    def constraint_violations(self) -> List[Any]:
+        """Constraint violations recorded in the engine's own context."""
+        return self._context.constraint_violations
         
     def apply_relationship(self, element_name: str, instance_index: int = 0, 
-                          context_values: Dict[str, Any] = None) -> Optional[Any]:
+                          context_values: Dict[str, Any] = None,
+                          context: Optional[GenerationContext] = None) -> Optional[Any]:
         """
         Apply relationship logic to generate value for an element.
         
@@ -38,37 +52,41 @@ class SmartRelationshipsEngine:
             element_name: Name of the element
             instance_index: Index of the current instance
             context_values: Current context values from related elements
+            context: Per-document state and random number generator (engine's own if None)
             
         Returns:
             Generated value following relationship rules
         """
         context_values = context_values or {}
+        context = context or self._context
         
         # Find relationship that applies to this element
         for relationship_name, relationship_config in self.relationships.items():
             if element_name in relationship_config.get('fields', []):
                 return self._apply_relationship_strategy(
-                    relationship_name, element_name, instance_index, context_values
+                    relationship_name, element_name, instance_index, context_values, context
                 )
         
         return None
     
     def _apply_relationship_strategy(self, relationship_name: str, element_name: str, 
-                                   instance_index: int, context_values: Dict[str, Any]) -> Any:
+                                   instance_index: int, context_values: Dict[str, Any],
+                                   context: GenerationContext) -> Any:
         """Apply specific relationship strategy."""
         relationship = self.relationships[relationship_name]
         strategy = relationship.get('strategy', 'consistent_persona')
         
         if strategy == 'consistent_persona':
-            return self._apply_consistent_persona(relationship_name, element_name, instance_index)
+            return self._apply_consistent_persona(relationship_name, element_name, instance_index, context)
         elif strategy == 'dependent_values':
-            return self._apply_dependent_values(relationship_name, element_name, context_values)
+            return self._apply_dependent_values(relationship_name, element_name, context_values, context)
         elif strategy == 'constraint_based':
-            return self._apply_constraint_based(relationship_name, element_name, context_values)
+            return self._apply_constraint_based(relationship_name, element_name, context_values, context)
         
         return None
     
-    def _apply_consistent_persona(self, relationship_name: str, element_name: str, instance_index: int) -> Any:
+    def _apply_consistent_persona(self, relationship_name: str, element_name: str, instance_index: int,
+                                  context: GenerationContext) -> Any:
         """
         Apply consistent persona strategy - keeps related fields consistent.
         
@@ -80,11 +98,11 @@ class SmartRelationshipsEngine:
         # Check if we have a persona template for this instance
         group_key = f"{relationship_name}_{instance_index}"
         
-        if group_key not in self.relationship_groups:
+        if group_key not in context.relationship_groups:
             # Create new persona group
-            self.relationship_groups[group_key] = self._create_persona_group(relationship, instance_index)
+            context.relationship_groups[group_key] = self._create_persona_group(relationship, instance_index)
         
-        persona_data = self.relationship_groups[group_key]
+        persona_data = context.relationship_groups[group_key]
         return persona_data.get(element_name)
     
     def _create_persona_group(self, relationship: Dict[str, Any], instance_index: int) -> Dict[str, Any]:
@@ -147,7 +165,8 @@ class SmartRelationshipsEngine:
         
         return None
     
-    def _apply_dependent_values(self, relationship_name: str, element_name: str, context_values: Dict[str, Any]) -> Any:
+    def _apply_dependent_values(self, relationship_name: str, element_name: str, context_values: Dict[str, Any],
+                                context: GenerationContext) -> Any:
         """
         Apply dependent values strategy - element value depends on other elements.
         """
@@ -166,11 +185,12 @@ class SmartRelationshipsEngine:
             available_cities = self.data_context_manager.resolve_data_reference('global.airports') or []
             available_cities = [city for city in available_cities if city != departure]
             if available_cities:
-                return random.choice(available_cities)
+                return context.random.choice(available_cities)
         
         return None
     
-    def _apply_constraint_based(self, relationship_name: str, element_name: str, context_values: Dict[str, Any]) -> Any:
+    def _apply_constraint_based(self, relationship_name: str, element_name: str, context_values: Dict[str, Any],
+                                context: GenerationContext) -> Any:
         """
         Apply constraint-based strategy - enforce business rules and constraints.
         """
@@ -180,7 +200,7 @@ class SmartRelationshipsEngine:
         for constraint in constraints:
             if not self._evaluate_constraint(constraint, element_name, context_values):
                 # Constraint violation - need to find valid value
-                return self._find_constraint_compliant_value(constraint, element_name, context_values)
+                return self._find_constraint_compliant_value(constraint, element_name, context_values, context)
         
         return None
     
@@ -216,7 +236,8 @@ class SmartRelationshipsEngine:
         
         return True
     
-    def _find_constraint_compliant_value(self, constraint: str, element_name: str, context_values: Dict[str, Any]) -> Any:
+    def _find_constraint_compliant_value(self, constraint: str, element_name: str, context_values: Dict[str, Any],
+                                         context: GenerationContext) -> Any:
         """Find a value that satisfies the given constraint."""
         # This is a simplified implementation - can be enhanced for complex constraints
         if element_name in constraint and '!=' in constraint:
@@ -230,7 +251,7 @@ class SmartRelationshipsEngine:
             valid_values = [v for v in possible_values if v != avoid_value]
             
             if valid_values:
-                return random.choice(valid_values)
+                return context.random.choice(valid_values)
         
         return None
     
@@ -261,7 +282,8 @@ class SmartRelationshipsEngine:
         
         return []
     
-    def ensure_uniqueness(self, element_name: str, proposed_value: Any, instance_index: int) -> Any:
+    def ensure_uniqueness(self, element_name: str, proposed_value: Any, instance_index: int,
+                          context: Optional[GenerationContext] = None) -> Any:
         """
         Ensure uniqueness for elements that require unique values.
         
@@ -269,44 +291,50 @@ class SmartRelationshipsEngine:
             element_name: Name of the element
             proposed_value: Proposed value to check
             instance_index: Current instance index
+            context: Per-document state and random number generator (engine's own if None)
             
         Returns:
             Unique value (modified if necessary)
         """
-        if proposed_value in self.generated_values[element_name]:
+        context = context or self._context
+        generated_values = context.relationship_values[element_name]
+        if proposed_value in generated_values:
             # Value already used, need to find alternative
             possible_values = self._get_possible_values_for_element(element_name)
-            unused_values = [v for v in possible_values if v not in self.generated_values[element_name]]
+            unused_values = [v for v in possible_values if v not in generated_values]
             
             if unused_values:
-                unique_value = random.choice(unused_values)
+                unique_value = context.random.choice(unused_values)
             else:
                 # All values used, append instance index to make unique
                 unique_value = f"{proposed_value}_{instance_index}"
             
-            self.generated_values[element_name].append(unique_value)
+            generated_values.append(unique_value)
             return unique_value
         
-        self.generated_values[element_name].append(proposed_value)
+        generated_values.append(proposed_value)
         return proposed_value
     
-    def finalize_persona_group(self, relationship_name: str, instance_index: int) -> Dict[str, Any]:
+    def finalize_persona_group(self, relationship_name: str, instance_index: int,
+                               context: Optional[GenerationContext] = None) -> Dict[str, Any]:
         """
         Finalize persona group by computing dependent fields.
         
         Args:
             relationship_name: Name of the relationship
             instance_index: Instance index
+            context: Per-document state (engine's own if None)
             
         Returns:
             Complete persona data with all computed fields
         """
+        context = context or self._context
         group_key = f"{relationship_name}_{instance_index}"
         
-        if group_key not in self.relationship_groups:
+        if group_key not in context.relationship_groups:
             return {}
         
-        persona_data = self.relationship_groups[group_key]
+        persona_data = context.relationship_groups[group_key]
         
         # Compute dependent fields like email
         if 'first_name' in persona_data and 'last_name' in persona_data and 'email' not in persona_data:
@@ -327,7 +355,5 @@ class SmartRelationshipsEngine:
         return summary
     
     def reset_state(self) -> None:
-        """Reset the engine state for new generation cycle."""
-        self.generated_values.clear()
-        self.relationship_groups.clear()
-        self.constraint_violations.clear()
\ No newline at end of file
+        """Reset the engine's own state for new generation cycle."""
+        self._context = GenerationContext()
\ No newline at end of file
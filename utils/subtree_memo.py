@@ -0,0 +1,161 @@
+"""
+Subtree memoization module for XML Wizard.
+
+This module provides the per-document subtree memo used by XMLGenerator when
+performance.enable_subtree_memoization is set. The first occurrence of a
+complex element at a given depth is walked once into a template whose leaves
+are value samplers; later occurrences of the same type reuse the template
+instead of walking the schema again. Templates are instantiated copy-on-write:
+leaves whose values must differ per occurrence (IDs, references, rotating
+enumerations, configured custom values) are sampled again, every other leaf
+keeps the value sampled for its first occurrence, and subtrees without such
+leaves are shared between occurrences rather than copied.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .generation_plan import ValueSampler
+
+
+_BUILD = object()
+
+
+class _OpenNode:
+    """Template container being instantiated."""
+
+    __slots__ = ('template', 'items', 'built', 'key', 'volatile')
+
+    def __init__(self, template: Any):
+        self.template = template
+        if isinstance(template, dict):
+            self.items = iter(template.items())
+            self.built = type(template)()
+        else:
+            self.items = iter(enumerate(template))
+            self.built = []
+        self.key = None
+        self.volatile = False
+
+    def add(self, key: Any, value: Any) -> None:
+        if isinstance(self.built, dict):
+            self.built[key] = value
+        else:
+            self.built.append(value)
+
+
+class SubtreeMemo:
+    """Templates of generated complex-type subtrees for one document."""
+
+    def __init__(self, is_volatile: Callable[[ValueSampler], bool], path_sensitive: bool = False):
+        """
+        Initialize an empty memo.
+
+        Args:
+            is_volatile: Returns True for samplers that are sampled again in every occurrence
+            path_sensitive: Whether choices or optional selections are matched on
+                element paths, so subtrees may only be shared at the same path
+        """
+        self.is_volatile = is_volatile
+        self.path_sensitive = path_sensitive
+        self.templates: Dict[Tuple[Any, ...], Any] = {}
+        self.hits = 0
+        self.misses = 0
+        self._values: Dict[int, Any] = {}
+        self._shared: Dict[int, Any] = {}
+        self._volatile: Dict[int, bool] = {}
+
+    def key(self, element, path: str, depth: int) -> Tuple[Any, ...]:
+        """
+        Build the memo key of an element occurrence.
+
+        Every depth threshold (occurrence caps, optional inclusion, recursion
+        limits) reads the exact depth, so the depth is part of the key as is.
+
+        Args:
+            element: XSD element with a complex type
+            path: Path of the element's parent
+            depth: Depth of the element
+
+        Returns:
+            (type identity, element name, depth, parent path or None)
+        """
+        return id(element.type), element.local_name, depth, path if self.path_sensitive else None
+
+    def get(self, key: Tuple[Any, ...]) -> Optional[Any]:
+        """Get a stored template, counting the lookup as a hit or a miss."""
+        template = self.templates.get(key)
+        if template is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return template
+
+    def put(self, key: Tuple[Any, ...], template: Any) -> None:
+        """Store the template walked for a key."""
+        self.templates[key] = template
+
+    def instantiate(self, template: Any, owner) -> Any:
+        """
+        Create one occurrence of a template.
+
+        Args:
+            template: Template built by the element walk
+            owner: XMLGenerator whose generation context samples the values
+
+        Returns:
+            Element dictionary or value; subtrees without volatile leaves are
+            the same objects in every occurrence
+        """
+        value, _ = self._reuse(template, owner)
+        if value is not _BUILD:
+            return value
+
+        # Depth-first with an explicit stack so values are sampled in generation order
+        stack: List[_OpenNode] = [_OpenNode(template)]
+        while True:
+            top = stack[-1]
+            entry = next(top.items, None)
+            if entry is None:
+                stack.pop()
+                if not top.volatile:
+                    self._shared[id(top.template)] = top.built
+                if not stack:
+                    return top.built
+                parent = stack[-1]
+                parent.add(parent.key, top.built)
+                parent.volatile = parent.volatile or top.volatile
+                continue
+
+            key, child = entry
+            value, volatile = self._reuse(child, owner)
+            if value is _BUILD:
+                top.key = key
+                stack.append(_OpenNode(child))
+            else:
+                top.add(key, value)
+                top.volatile = top.volatile or volatile
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get memo statistics.
+
+        Returns:
+            Dictionary with template count, hits and misses
+        """
+        return {'templates': len(self.templates), 'hits': self.hits, 'misses': self.misses}
+
+    def _reuse(self, node: Any, owner) -> Tuple[Any, bool]:
+        """Return (value, volatile) for a node, or (_BUILD, True) if a container must be built."""
+        if isinstance(node, ValueSampler):
+            volatile = self._volatile.get(id(node))
+            if volatile is None:
+                volatile = self._volatile[id(node)] = self.is_volatile(node)
+            if volatile:
+                return node.sample(owner), True
+            if id(node) not in self._values:
+                self._values[id(node)] = node.sample(owner)
+            return self._values[id(node)], False
+        if isinstance(node, (dict, list)):
+            shared = self._shared.get(id(node), _BUILD)
+            return shared, shared is _BUILD
+        return node, False
@@ -6,7 +6,6 @@ deterministic, structured entities like passengers, bookings, etc.
 """
 
 from typing import Dict, Any, List, Optional, Union
-import random
 from datetime import datetime, timedelta
 from .data_context_manager import DataContextManager
 
@@ -20,14 +19,13 @@ class TemplateProcessor:
         
         Args:
             data_context_manager: DataContextManager instance for data resolution
-            seed: Random seed for deterministic generation
+            seed: Random seed for deterministic generation; seeds each generation's
+                context instead of the process-wide random module
         """
         self.data_context_manager = data_context_manager or DataContextManager()
         self.template_cache = {}
         self.generated_entities = {}
-        
-        if seed is not None:
-            random.seed(seed)
+        self.seed = seed
     
     def process_template(self, template_source: str, instance_index: int = 0, 
                         element_name: str = None) -> Any:
@@ -12,6 +12,10 @@ import re
 import base64
 import uuid
 import hashlib
+from functools import lru_cache
+
+from .generation_context import GenerationContext, get_default_context
+from .xsd_regex import XSDPatternError, get_pattern_cache, sample_pattern
 
 
 class BaseTypeGenerator(ABC):
@@ -22,8 +26,16 @@ class BaseTypeGenerator(ABC):
         self.config = config_instance
     
     @abstractmethod
-    def generate(self, element_name: str = "", constraints: Optional[Dict] = None) -> Any:
-        """Generate a value for the specific type with optional constraints."""
+    def generate(self, element_name: str = "", constraints: Optional[Dict] = None,
+                 context: Optional[GenerationContext] = None) -> Any:
+        """
+        Generate a value for the specific type with optional constraints.
+        
+        Args:
+            element_name: Element or attribute name the value is generated for
+            constraints: Resolved XSD facets
+            context: Per-document state (default context if None)
+        """
         pass
     
     def _get_default_value(self, element_name: str) -> Any:
@@ -55,7 +67,8 @@ class NumericTypeGenerator(BaseTypeGenerator):
         self.is_decimal = is_decimal
         self.is_integer = is_integer
     
-    def generate(self, element_name: str = "", constraints: Optional[Dict] = None) -> Any:
+    def generate(self, element_name: str = "", constraints: Optional[Dict] = None,
+                 context: Optional[GenerationContext] = None) -> Any:
         """Generate numeric value ensuring no empty strings and proper integer format."""
         # Get base value from config or default
         if self.config and element_name:
@@ -76,9 +89,10 @@ class NumericTypeGenerator(BaseTypeGenerator):
         
         # Handle ordinal and count elements with integers
         if element_name and any(term in element_name.lower() for term in ['ordinal', 'count', 'number', 'sequence']):
+            if self.is_decimal or not self.is_integer:
+                # Generators are shared between value sites, so switch kind without mutating self
+                return NumericTypeGenerator(self.config, is_decimal=False, is_integer=True).generate(element_name, constraints, context)
             base_value = 1
-            self.is_integer = True
-            self.is_decimal = False
         
         # Apply constraints
         value = self.validate_constraints(base_value, constraints, element_name)
@@ -172,7 +186,8 @@ class NumericTypeGenerator(BaseTypeGenerator):
 class BooleanTypeGenerator(BaseTypeGenerator):
     """Generator for boolean types ensuring valid XML Schema boolean values."""
     
-    def generate(self, element_name: str = "", constraints: Optional[Dict] = None) -> str:
+    def generate(self, element_name: str = "", constraints: Optional[Dict] = None,
+                 context: Optional[GenerationContext] = None) -> str:
         """Generate valid boolean value - never empty string."""
         # Use config default or fallback
         if self.config and hasattr(self.config, 'data_generation'):
@@ -200,7 +215,8 @@ class DateTimeTypeGenerator(BaseTypeGenerator):
         super().__init__(config_instance)
         self.date_type = date_type  # 'datetime', 'date', 'time', 'duration'
     
-    def generate(self, element_name: str = "", constraints: Optional[Dict] = None) -> str:
+    def generate(self, element_name: str = "", constraints: Optional[Dict] = None,
+                 context: Optional[GenerationContext] = None) -> str:
         """Generate valid ISO format date/time - never empty string."""
         if self.config:
             pattern_value = self.config.get_data_pattern(element_name or self.date_type, self.date_type)
@@ -253,13 +269,10 @@ class DateTimeTypeGenerator(BaseTypeGenerator):
 class IDTypeGenerator(BaseTypeGenerator):
     """Generator for xs:ID type ensuring valid XML ID format."""
     
-    # Class-level counter to ensure document-wide ID uniqueness
-    _id_counter = 0
-    _generated_ids = set()
-    _all_generated_ids = []  # Keep track of order for IDREF references
-    
-    def generate(self, element_name: str = "", constraints: Optional[Dict] = None) -> str:
+    def generate(self, element_name: str = "", constraints: Optional[Dict] = None,
+                 context: Optional[GenerationContext] = None) -> str:
         """Generate valid XML ID - starts with letter/underscore, valid for XML."""
+        context = context or get_default_context()
         # XML IDs must follow strict rules:
         # 1. Start with letter (a-z, A-Z) or underscore (_)
         # 2. Followed by letters, digits, hyphens (-), dots (.), underscores (_), or colons (:)
@@ -284,23 +297,18 @@ class IDTypeGenerator(BaseTypeGenerator):
         if not clean_name:
             clean_name = 'id'
         
-        # Generate unique ID using both deterministic component and global counter
+        # Generate unique ID using both deterministic component and the document's counter
         while True:
-            # Increment counter for uniqueness
-            IDTypeGenerator._id_counter += 1
-            
             # Create unique suffix combining element hash and counter
             element_hash = hashlib.md5((element_name or "default").encode('utf-8')).hexdigest()
             base_suffix = int(element_hash[:4], 16) % 10000  # Smaller base from element
-            unique_suffix = base_suffix + IDTypeGenerator._id_counter
+            unique_suffix = base_suffix + context.next_id_number()
             
             # Construct final ID ensuring it starts with letter
             final_id = f"{clean_name}{unique_suffix}"
             
-            # Check if this ID is unique
-            if final_id not in IDTypeGenerator._generated_ids:
-                IDTypeGenerator._generated_ids.add(final_id)
-                IDTypeGenerator._all_generated_ids.append(final_id)
+            # Check if this ID is unique within the document
+            if context.register_id(final_id):
                 break
         
         # Final validation - ensure it starts with letter
@@ -317,23 +325,26 @@ class IDTypeGenerator(BaseTypeGenerator):
     
     @classmethod
     def reset_id_counter(cls):
-        """Reset the ID counter and generated IDs set for new document generation."""
-        cls._id_counter = 0
-        cls._generated_ids.clear()
-        cls._all_generated_ids.clear()
+        """Reset the ID counter and generated IDs of the default context."""
+        context = get_default_context()
+        context.id_counter = 0
+        context.generated_ids.clear()
+        context.all_generated_ids.clear()
     
     @classmethod
     def get_existing_ids(cls):
-        """Get list of all generated IDs for IDREF reference."""
-        return cls._all_generated_ids.copy()
+        """Get list of IDs generated in the default context for IDREF reference."""
+        return get_default_context().get_existing_ids()
 
 
 class IDREFTypeGenerator(BaseTypeGenerator):
     """Generator for xs:IDREF type that references existing IDs in the document."""
     
-    def generate(self, element_name: str = "", constraints: Optional[Dict] = None) -> str:
+    def generate(self, element_name: str = "", constraints: Optional[Dict] = None,
+                 context: Optional[GenerationContext] = None) -> str:
         """Generate valid IDREF that references an existing ID."""
-        existing_ids = IDTypeGenerator.get_existing_ids()
+        context = context or get_default_context()
+        existing_ids = context.get_existing_ids()
         
         # If we have existing IDs, reference one of them
         if existing_ids:
@@ -351,14 +362,11 @@ class IDREFTypeGenerator(BaseTypeGenerator):
             
             # Generate an ID similar to how IDTypeGenerator does it
             element_hash = hashlib.md5((element_name or "default").encode('utf-8')).hexdigest()
-            IDTypeGenerator._id_counter += 1
-            unique_suffix = IDTypeGenerator._id_counter + int(element_hash[:4], 16) % 10000
+            unique_suffix = context.next_id_number() + int(element_hash[:4], 16) % 10000
             generated_id = f"{clean_name}{unique_suffix}"
             
             # Add to ID tracker for future references
-            if generated_id not in IDTypeGenerator._generated_ids:
-                IDTypeGenerator._generated_ids.add(generated_id)
-                IDTypeGenerator._all_generated_ids.append(generated_id)
+            context.register_id(generated_id)
                 
             return generated_id
     
@@ -372,9 +380,11 @@ class IDREFTypeGenerator(BaseTypeGenerator):
 class IDREFSTypeGenerator(BaseTypeGenerator):
     """Generator for xs:IDREFS type that references multiple existing IDs."""
     
-    def generate(self, element_name: str = "", constraints: Optional[Dict] = None) -> str:
+    def generate(self, element_name: str = "", constraints: Optional[Dict] = None,
+                 context: Optional[GenerationContext] = None) -> str:
         """Generate space-separated list of IDREFs."""
-        existing_ids = IDTypeGenerator.get_existing_ids()
+        context = context or get_default_context()
+        existing_ids = context.get_existing_ids()
         
         # If we have existing IDs, reference some of them
         if existing_ids:
@@ -403,14 +413,11 @@ class IDREFSTypeGenerator(BaseTypeGenerator):
             
             generated_ids = []
             for i in range(count):
-                IDTypeGenerator._id_counter += 1
-                unique_suffix = IDTypeGenerator._id_counter + int(element_hash[i*2:(i+1)*2], 16) % 10000
+                unique_suffix = context.next_id_number() + int(element_hash[i*2:(i+1)*2], 16) % 10000
                 generated_id = f"{clean_name}{unique_suffix}"
                 
                 # Add to ID tracker for future references
-                if generated_id not in IDTypeGenerator._generated_ids:
-                    IDTypeGenerator._generated_ids.add(generated_id)
-                    IDTypeGenerator._all_generated_ids.append(generated_id)
+                if context.register_id(generated_id):
                     generated_ids.append(generated_id)
             
             return ' '.join(generated_ids) if generated_ids else f"{clean_name}Placeholder"
@@ -425,7 +432,8 @@ class IDREFSTypeGenerator(BaseTypeGenerator):
 class Base64BinaryTypeGenerator(BaseTypeGenerator):
     """Generator for xs:base64Binary type ensuring valid base64 encoding."""
     
-    def generate(self, element_name: str = "", constraints: Optional[Dict] = None) -> str:
+    def generate(self, element_name: str = "", constraints: Optional[Dict] = None,
+                 context: Optional[GenerationContext] = None) -> str:
         """Generate valid base64 encoded binary data."""
         # Generate sample binary data based on element name
         if element_name and 'exponent' in element_name.lower():
@@ -509,7 +517,8 @@ class StringTypeGenerator(BaseTypeGenerator):
             r'[0-9A-Z]+': f"{get_digit(0)}{get_letter(0)}{get_digit(1)}"
         }
     
-    def generate(self, element_name: str = "", constraints: Optional[Dict] = None) -> str:
+    def generate(self, element_name: str = "", constraints: Optional[Dict] = None,
+                 context: Optional[GenerationContext] = None) -> str:
         """Generate string value respecting length constraints."""
         # Get base value from config
         if self.config and element_name:
@@ -528,7 +537,8 @@ class StringTypeGenerator(BaseTypeGenerator):
         # Apply constraints
         return self.validate_constraints(base_value, constraints, element_name)
     
-    def generate_pattern_value(self, pattern_str: str, element_name: str = "") -> str:
+    def generate_pattern_value(self, pattern_str: str, element_name: str = "",
+                               constraints: Optional[Dict] = None) -> str:
         """Generate deterministic value for specific pattern."""
         # Get deterministic patterns based on element name
         deterministic_patterns = self._get_deterministic_patterns(element_name or "default")
@@ -536,88 +546,39 @@ class StringTypeGenerator(BaseTypeGenerator):
         if pattern_str in deterministic_patterns:
             return deterministic_patterns[pattern_str]
         
-        # Dynamic pattern generation for unhandled patterns
-        return self.generate_dynamic_pattern_value(pattern_str, element_name)
+        # Sample unhandled patterns from the compiled XSD pattern
+        return self.generate_dynamic_pattern_value(pattern_str, element_name, constraints)
     
-    def generate_dynamic_pattern_value(self, pattern_str: str, element_name: str = "") -> str:
-        """Generate deterministic value for unknown patterns using regex analysis."""
+    def generate_dynamic_pattern_value(self, pattern_str: str, element_name: str = "",
+                                       constraints: Optional[Dict] = None) -> str:
+        """Generate a deterministic value conforming to an arbitrary XSD pattern."""
+        # Seed from element name and pattern so values are stable between runs
+        seed_str = f"{element_name or 'default'}_{pattern_str}"
+        min_length, max_length = _length_bounds(constraints)
         try:
-            # Create deterministic seed from element name and pattern
-            seed_str = f"{element_name or 'default'}_{pattern_str}"
+            return sample_pattern(pattern_str, seed_str, min_length, max_length)
+        except XSDPatternError:
+            # Pattern syntax the sampler does not support - deterministic placeholder
             seed_hash = hashlib.md5(seed_str.encode('utf-8')).hexdigest()
-            
-            # Deterministic character generators
-            def get_digit(index: int) -> str:
-                return str(int(seed_hash[index % len(seed_hash)], 16) % 10)
-            
-            def get_letter(index: int) -> str:
-                letters = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
-                return letters[int(seed_hash[index % len(seed_hash)], 16) % len(letters)]
-            
-            def get_alphanumeric(index: int) -> str:
-                chars = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
-                return chars[int(seed_hash[index % len(seed_hash)], 16) % len(chars)]
-            
-            # Analyze pattern and generate appropriate value
-            if re.match(r'\[0-9\]\{(\d+),?(\d+)?\}', pattern_str):
-                # Numeric range patterns like [0-9]{1,3}
-                match = re.match(r'\[0-9\]\{(\d+),?(\d+)?\}', pattern_str)
-                min_len = int(match.group(1))
-                max_len = int(match.group(2)) if match.group(2) else min_len
-                # Use deterministic length selection
-                length_index = int(seed_hash[0], 16) % (max_len - min_len + 1)
-                length = min_len + length_index
-                result = ''.join([get_digit(i) for i in range(length)])
-                # Ensure no leading zeros for numeric patterns
-                return result.lstrip('0') or '1'
-            
-            elif re.match(r'\[A-Z\]\{(\d+),?(\d+)?\}', pattern_str):
-                # Alpha range patterns like [A-Z]{2,4}
-                match = re.match(r'\[A-Z\]\{(\d+),?(\d+)?\}', pattern_str)
-                min_len = int(match.group(1))
-                max_len = int(match.group(2)) if match.group(2) else min_len
-                # Use deterministic length selection
-                length_index = int(seed_hash[0], 16) % (max_len - min_len + 1)
-                length = min_len + length_index
-                return ''.join([get_letter(i) for i in range(length)])
-            
-            elif re.match(r'\[A-Za-z0-9\]\{(\d+),?(\d+)?\}', pattern_str):
-                # Mixed alphanumeric patterns
-                match = re.match(r'\[A-Za-z0-9\]\{(\d+),?(\d+)?\}', pattern_str)
-                min_len = int(match.group(1))
-                max_len = int(match.group(2)) if match.group(2) else min_len
-                # Use deterministic length selection
-                length_index = int(seed_hash[0], 16) % (max_len - min_len + 1)
-                length = min_len + length_index
-                return ''.join([get_alphanumeric(i) for i in range(length)])
-            
-            # Default fallback for complex patterns - deterministic based on element name
-            fallback_hash = int(seed_hash[:6], 16) % 1000
-            return f"VAL{fallback_hash:03d}"
-            
-        except Exception:
-            # If pattern analysis fails, return deterministic default based on element name
-            element_hash = hashlib.md5((element_name or "default").encode('utf-8')).hexdigest()
-            fallback_num = int(element_hash[:6], 16) % 1000
-            return f"DEF{fallback_num:03d}"
+            return f"VAL{int(seed_hash[:6], 16) % 1000:03d}"
     
     def test_pattern_compliance(self, value: str, pattern_str: str) -> bool:
         """Test if generated value matches pattern."""
-        try:
-            return bool(re.match(f"^{pattern_str}$", value))
-        except re.error:
-            return False
+        compiled = _compile_python_pattern(pattern_str)
+        return bool(compiled and compiled.fullmatch(value))
     
-    def validate_and_regenerate_pattern(self, value: str, pattern_str: str, element_name: str = "", max_attempts: int = 5) -> str:
-        """Validate pattern compliance and regenerate if needed."""
-        for attempt in range(max_attempts):
-            if self.test_pattern_compliance(value, pattern_str):
-                return value
-            
-            # Regenerate value using pattern-specific generator
-            value = self.generate_pattern_value(pattern_str, element_name)
+    def validate_and_regenerate_pattern(self, value: str, pattern_str: str, element_name: str = "",
+                                        max_attempts: int = 5, constraints: Optional[Dict] = None) -> str:
+        """Validate pattern compliance and regenerate once if needed."""
+        if self.test_pattern_compliance(value, pattern_str):
+            return value
         
-        # If all attempts fail, return a deterministic default based on element name
+        # Sampled values conform by construction, so no retry loop is needed
+        value = self.generate_pattern_value(pattern_str, element_name, constraints)
+        if self.test_pattern_compliance(value, pattern_str) or _is_sampled_pattern(pattern_str):
+            return value
+        
+        # Unsupported pattern syntax: return a deterministic default based on element name
         element_hash = hashlib.md5((element_name or "default").encode('utf-8')).hexdigest()
         fallback_num = int(element_hash[:3], 16) % 1000
         return f"{fallback_num}"
@@ -648,7 +609,8 @@ class StringTypeGenerator(BaseTypeGenerator):
                 pattern_str = str(pattern) if pattern is not None else ""
                 if pattern_str:
                     # Use enhanced pattern validation and regeneration
-                    value = self.validate_and_regenerate_pattern(value, pattern_str, element_name)
+                    value = self.validate_and_regenerate_pattern(value, pattern_str, element_name,
+                                                                 constraints=constraints)
             except re.error:
                 # Invalid regex pattern, skip pattern validation
                 pass
@@ -753,7 +715,8 @@ class StringTypeGenerator(BaseTypeGenerator):
 class Base64BinaryTypeGenerator(BaseTypeGenerator):
     """Generator for xs:base64Binary types ensuring valid base64 encoding."""
     
-    def generate(self, element_name: str = "", constraints: Optional[Dict] = None) -> str:
+    def generate(self, element_name: str = "", constraints: Optional[Dict] = None,
+                 context: Optional[GenerationContext] = None) -> str:
         """Generate valid base64Binary values."""
         import base64
         import random
@@ -858,14 +821,12 @@ class Base64BinaryTypeGenerator(BaseTypeGenerator):
 class EnumerationTypeGenerator(BaseTypeGenerator):
     """Generator for enumerated values with smart selection and value tracking."""
     
-    # Class-level tracking of used enum values for diversity
-    _used_values_tracker = {}
-    
     def __init__(self, config_instance=None, enum_values: Optional[List[str]] = None):
         super().__init__(config_instance)
         self.enum_values = enum_values or []
     
-    def generate(self, element_name: str = "", constraints: Optional[Dict] = None) -> str:
+    def generate(self, element_name: str = "", constraints: Optional[Dict] = None,
+                 context: Optional[GenerationContext] = None) -> str:
         """Enhanced enumeration generation with robust fallbacks and validation."""
         
         # Extract enum values with multiple strategies
@@ -886,15 +847,17 @@ class EnumerationTypeGenerator(BaseTypeGenerator):
                 return self.get_fallback_value()
             return fallback_value
         
-        # Smart selection with tracking for variety
-        selected_value = self._select_enum_value(element_name, valid_enums)
+        # Smart selection with per-document tracking for variety
+        usage_tracker = (context or get_default_context()).enum_usage
+        selected_value = self._select_enum_value(element_name, valid_enums, usage_tracker)
         
         # Track usage for future variety
-        self._track_enum_usage(element_name, selected_value, valid_enums)
+        self._track_enum_usage(element_name, selected_value, valid_enums, usage_tracker)
         
         return selected_value
     
-    def _select_enum_value(self, element_name: str, enum_list: List[str]) -> str:
+    def _select_enum_value(self, element_name: str, enum_list: List[str],
+                           usage_tracker: Dict[str, Dict[str, int]]) -> str:
         """Select an enumeration value with smart rotation for variety."""
         if len(enum_list) == 1:
             return enum_list[0]
@@ -903,8 +866,8 @@ class EnumerationTypeGenerator(BaseTypeGenerator):
         tracking_key = f"{element_name}_{len(enum_list)}"
         
         # If we've used this enum type before, try to use a different value
-        if tracking_key in self._used_values_tracker:
-            used_values = self._used_values_tracker[tracking_key]
+        if tracking_key in usage_tracker:
+            used_values = usage_tracker[tracking_key]
             
             # Find unused values first
             unused_values = [val for val in enum_list if val not in used_values]
@@ -919,16 +882,17 @@ class EnumerationTypeGenerator(BaseTypeGenerator):
         # First time encountering this enum type - use first value
         return enum_list[0]
     
-    def _track_enum_usage(self, element_name: str, selected_value: str, enum_list: List[str]) -> None:
+    def _track_enum_usage(self, element_name: str, selected_value: str, enum_list: List[str],
+                          usage_tracker: Dict[str, Dict[str, int]]) -> None:
         """Track enum value usage for future selections."""
         tracking_key = f"{element_name}_{len(enum_list)}"
         
-        if tracking_key not in self._used_values_tracker:
-            self._used_values_tracker[tracking_key] = {}
+        if tracking_key not in usage_tracker:
+            usage_tracker[tracking_key] = {}
         
         # Increment usage count
-        current_count = self._used_values_tracker[tracking_key].get(selected_value, 0)
-        self._used_values_tracker[tracking_key][selected_value] = current_count + 1
+        current_count = usage_tracker[tracking_key].get(selected_value, 0)
+        usage_tracker[tracking_key][selected_value] = current_count + 1
     
     def get_type_name(self) -> str:
         return 'enum'
@@ -1013,13 +977,66 @@ class EnumerationTypeGenerator(BaseTypeGenerator):
     
     @classmethod
     def get_usage_stats(cls) -> Dict[str, Dict[str, int]]:
-        """Get current enum value usage statistics."""
-        return cls._used_values_tracker.copy()
+        """Get enum value usage statistics of the default context."""
+        return get_default_context().enum_usage.copy()
     
     @classmethod
     def reset_usage_tracker(cls) -> None:
-        """Reset the enum value usage tracker."""
-        cls._used_values_tracker.clear()
+        """Reset the enum value usage tracker of the default context."""
+        get_default_context().enum_usage.clear()
+
+
+@lru_cache(maxsize=512)
+def _compile_python_pattern(pattern_str: str) -> Optional[re.Pattern]:
+    """Compile a pattern for compliance checks, or None if Python's re rejects it."""
+    try:
+        return re.compile(pattern_str)
+    except re.error:
+        return None
+
+
+def _is_sampled_pattern(pattern_str: str) -> bool:
+    """Check whether the XSD pattern sampler supports a pattern."""
+    try:
+        get_pattern_cache().get_pattern(pattern_str)
+        return True
+    except XSDPatternError:
+        return False
+
+
+def _length_bounds(constraints: Optional[Dict]) -> tuple:
+    """Get the (min, max) length requested by string facets."""
+    if not constraints:
+        return 0, None
+    for key in ('exact_length', 'length'):
+        if key in constraints:
+            return constraints[key], constraints[key]
+    return constraints.get('min_length', 0), constraints.get('max_length')
+
+
+def _freeze(value: Any) -> Any:
+    """Convert nested constraint values into a hashable form."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(_freeze(item) for item in value)
+    return value
+
+
+def _element_name_class(element_name: str) -> str:
+    """Classify an element name by the name patterns that influence generator selection."""
+    if not element_name:
+        return ''
+    element_lower = element_name.lower()
+    if 'reftids' in element_lower or 'refids' in element_lower:
+        return 'idrefs'
+    if 'idref' in element_lower:
+        return 'idref'
+    if element_lower == 'tid':
+        return 'tid'
+    return ''
 
 
 class TypeGeneratorFactory:
@@ -1027,8 +1044,126 @@ class TypeGeneratorFactory:
     
     def __init__(self, config_instance=None):
         self.config = config_instance
+        self._generator_cache: Dict[Any, BaseTypeGenerator] = {}
+        self.hits = 0
+        self.misses = 0
     
     def create_generator(self, xsd_type_name, constraints: Optional[Dict] = None, element_name: str = "") -> BaseTypeGenerator:
+        """
+        Get the generator for an XSD type, reusing the one selected for an identical request.
+        
+        Selection only depends on the type, its enumeration values and the class
+        of the element name, so the result is memoized on those. Generators keep
+        no per-call state and can be shared between value sites.
+        
+        Args:
+            xsd_type_name: xmlschema type object or type name
+            constraints: Resolved constraints for the value
+            element_name: Name of the element or attribute
+            
+        Returns:
+            Type generator bound to the factory configuration
+        """
+        key = self._cache_key('type', xsd_type_name, constraints, element_name)
+        return self._cached(key, lambda: self._select_generator(xsd_type_name, constraints, element_name))
+    
+    def create_primitive_generator(self, primitive_type: str, constraints: Optional[Dict] = None) -> BaseTypeGenerator:
+        """
+        Get the generator for a resolved primitive type name such as 'xs:decimal'.
+        
+        Args:
+            primitive_type: Primitive XSD type name
+            constraints: Resolved constraints for the value
+            
+        Returns:
+            Type generator bound to the factory configuration
+        """
+        key = self._cache_key('primitive', primitive_type, constraints, "")
+        return self._cached(key, lambda: self._select_primitive_generator(primitive_type, constraints or {}))
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get generator memoization statistics.
+        
+        Returns:
+            Dictionary with entry count and hit/miss counters
+        """
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._generator_cache),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+    
+    def clear_cache(self) -> None:
+        """Drop memoized generators and reset the counters."""
+        self._generator_cache.clear()
+        self.hits = 0
+        self.misses = 0
+    
+    def _cache_key(self, kind: str, xsd_type_name, constraints: Optional[Dict], element_name: str) -> Optional[tuple]:
+        """Build the memoization key, or None if the request cannot be cached."""
+        if self.config is not None and not self.config.performance.enable_caching:
+            return None
+        enum_values = constraints.get('enum_values') if constraints else None
+        key = (kind, xsd_type_name, _freeze(enum_values), _element_name_class(element_name))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+    
+    def _cached(self, key: Optional[tuple], select) -> BaseTypeGenerator:
+        if key is None:
+            return select()
+        generator = self._generator_cache.get(key)
+        if generator is not None:
+            self.hits += 1
+            return generator
+        self.misses += 1
+        generator = self._generator_cache[key] = select()
+        return generator
+    
+    def _select_primitive_generator(self, primitive_type: str, constraints: Dict) -> BaseTypeGenerator:
+        """Select a generator for a resolved primitive type name."""
+        # Handle enumerations first
+        if 'enum_values' in constraints:
+            return EnumerationTypeGenerator(self.config, constraints['enum_values'])
+        
+        # Map primitive types to generators
+        if primitive_type == 'xs:decimal' or primitive_type == 'xs:float' or primitive_type == 'xs:double':
+            return NumericTypeGenerator(self.config, is_decimal=True, is_integer=False)
+        elif (primitive_type == 'xs:integer' or primitive_type == 'xs:int' or primitive_type == 'xs:long' or
+              primitive_type == 'xs:nonNegativeInteger' or primitive_type == 'xs:positiveInteger' or 
+              primitive_type == 'xs:negativeInteger' or primitive_type == 'xs:nonPositiveInteger' or
+              primitive_type == 'xs:unsignedLong' or primitive_type == 'xs:unsignedInt' or 
+              primitive_type == 'xs:unsignedShort' or primitive_type == 'xs:unsignedByte' or
+              primitive_type == 'xs:short' or primitive_type == 'xs:byte'):
+            return NumericTypeGenerator(self.config, is_decimal=False, is_integer=True)
+        elif primitive_type == 'xs:boolean':
+            return BooleanTypeGenerator(self.config)
+        elif primitive_type == 'xs:dateTime':
+            return DateTimeTypeGenerator(self.config, 'datetime')
+        elif primitive_type == 'xs:date':
+            return DateTimeTypeGenerator(self.config, 'date')
+        elif primitive_type == 'xs:time':
+            return DateTimeTypeGenerator(self.config, 'time')
+        elif primitive_type == 'xs:duration':
+            return DateTimeTypeGenerator(self.config, 'duration')
+        elif primitive_type == 'xs:ID':
+            return IDTypeGenerator(self.config)
+        elif primitive_type == 'xs:IDREFS':
+            return IDREFSTypeGenerator(self.config)
+        elif primitive_type == 'xs:IDREF':
+            return IDREFTypeGenerator(self.config)
+        elif primitive_type == 'xs:base64Binary':
+            return Base64BinaryTypeGenerator(self.config)
+        else:
+            # Default to string for unknown types
+            return StringTypeGenerator(self.config)
+    
+    def _select_generator(self, xsd_type_name, constraints: Optional[Dict] = None, element_name: str = "") -> BaseTypeGenerator:
         """Create appropriate generator based on XSD type."""
         # Handle enumeration types first
         if constraints and 'enum_values' in constraints:
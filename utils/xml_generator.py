@@ -7,18 +7,77 @@ No hardcoding for specific schemas - works universally.
 """
 
 import os
+import time
+import random
+import hashlib
+import zipfile
+import threading
+import multiprocessing
 import xml.etree.ElementTree as ET
-from typing import Dict, Any, Optional, Union, List, Tuple, Set
+from typing import Dict, Any, Optional, Union, List, Tuple, Set, Iterator, Generator
 from datetime import datetime
 import xmlschema
 from lxml import etree
-from collections import deque
+from collections import OrderedDict
 from config import get_config
-from .type_generators import TypeGeneratorFactory
+from .type_generators import (
+    TypeGeneratorFactory, IDTypeGenerator, IDREFTypeGenerator, IDREFSTypeGenerator, EnumerationTypeGenerator
+)
 from .xsd_type_resolver import UniversalXSDTypeResolver
 from .data_context_manager import DataContextManager
 from .smart_relationships_engine import SmartRelationshipsEngine
 from .template_processor import TemplateProcessor
+from .schema_registry import get_schema_registry
+from .xsd_dependency_resolver import get_dependency_resolver
+from .generation_plan import ValueSampler, get_plan_cache
+from .generation_context import GenerationContext
+from .subtree_memo import SubtreeMemo
+from .incremental_cache import IncrementalCache
+from .generation_profiler import GenerationProfiler
+from .xml_stream_writer import StreamingXMLWriter
+
+
+BATCH_OPTION_NAMES = (
+    'selected_choices', 'unbounded_counts', 'generation_mode', 'optional_selections', 'custom_values'
+)
+BATCH_MAX_CHUNK = 64  # Upper bound on documents per worker task
+
+# Value generators whose values must differ between memoized subtree occurrences
+VOLATILE_GENERATOR_TYPES = (IDTypeGenerator, IDREFTypeGenerator, IDREFSTypeGenerator, EnumerationTypeGenerator)
+
+# Element walk step: yields (element, path, depth) child requests, receives the child's value
+ElementFrame = Generator[Tuple[Any, str, int], Any, Any]
+
+# Batch state of a forked worker, set by its pool initializer: (generator, seed, options)
+_fork_batch = None
+
+
+def derive_document_seed(seed: int, index: int) -> int:
+    """
+    Derive the deterministic seed of one document in a batch.
+    
+    Args:
+        seed: Batch seed
+        index: Zero-based document index within the batch
+        
+    Returns:
+        64-bit seed that depends only on the batch seed and the index
+    """
+    digest = hashlib.sha256(f"{seed}:{index}".encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+def _init_fork_batch(generator: 'XMLGenerator', seed: int, options: Optional[Dict[str, Any]]) -> None:
+    """Set the batch state of a forked worker; the arguments are inherited, not pickled."""
+    global _fork_batch
+    _fork_batch = (generator, seed, options)
+
+
+def _generate_document_range(index_range: Tuple[int, int]) -> List[str]:
+    """Generate a contiguous range of batch documents inside a forked worker."""
+    generator, seed, options = _fork_batch
+    start, stop = index_range
+    return [generator.generate_document(index, seed, options) for index in range(start, stop)]
 
 
 class IterativeConstraintExtractor:
@@ -193,6 +252,7 @@ class XMLGenerator:
         """
         self.xsd_path = xsd_path
         self.schema = None
+        self.schema_digest = None  # Content hash of the schema closure, keys compiled plans
         self.processed_types = set()  # Track processed types to prevent infinite recursion
         self.config = config_instance or get_config()
         self.type_factory = TypeGeneratorFactory(self.config)  # Initialize type generator factory
@@ -215,8 +275,30 @@ class XMLGenerator:
         self.element_configs = self.config_data.get('element_configs', {})
         self.generation_settings = self.config_data.get('generation_settings', {})
         
-        # Track instance counts for sequential selection strategy
-        self.element_instance_counters = {}
+        # Per-document value state (IDs, enum rotation, instance counters, RNG)
+        self.context = self._new_generation_context()
+        
+        # Throughput summary of the most recent generate_batch/write_batch run
+        self.last_batch_stats = None
+        
+        # Opt-in per schema path / XSD type profile of the most recent generation
+        self.profiler = GenerationProfiler() if self.config.performance.enable_metrics else None
+        
+        # Progress reporter of a background generation job (see services.generation_jobs)
+        self.progress = None
+        
+        # Set while a generation plan is compiled: value sites become plan slots
+        self._plan_recorder = None
+        self._streaming = False
+        self._qname_cache = {}
+        
+        # Per-document subtree templates (performance.enable_subtree_memoization)
+        self._subtree_memo = None
+        self._template_walks = 0
+        
+        # Subtrees of the previous document (performance.enable_incremental_generation)
+        self.incremental_cache = IncrementalCache() if self.config.performance.enable_incremental_generation else None
+        self._incremental_active = False
         
         self._load_schema()
     
@@ -236,38 +318,20 @@ class XMLGenerator:
             print(f"Loading XSD schema from: {self.xsd_path}")
             print(f"Base directory for schema: {base_dir}")
             
-            # Find all XSD files in the same directory for import resolution
-            xsd_files = []
-            try:
-                for filename in os.listdir(base_dir):
-                    if filename.endswith('.xsd'):
-                        file_path = os.path.join(base_dir, filename)
-                        if os.path.isfile(file_path):
-                            xsd_files.append(file_path)
-            except OSError as e:
-                print(f"Warning: Could not list directory {base_dir}: {e}")
-            
-            # Create locations mapping for schema-specific imports
-            locations = {}
-            namespace_mappings = self.config.get_namespace_mapping('iata')
-            
-            for xsd_file in xsd_files:
-                try:
-                    filename = os.path.basename(xsd_file)
-                    if "CommonTypes" in filename:
-                        # Map namespace patterns from config
-                        common_types_ns = namespace_mappings.get('common_types')
-                        if common_types_ns:
-                            locations[common_types_ns] = [xsd_file]
-                except Exception as e:
-                    print(f"Warning: Could not process XSD file {xsd_file}: {e}")
+            # Resolve the exact import/include closure from the schema headers
+            closure = get_dependency_resolver().resolve(self.xsd_path)
+            for location in closure.unresolved:
+                print(f"Warning: Could not resolve schema location: {location}")
+            locations = closure.namespace_locations
             
-            self.schema = xmlschema.XMLSchema(
-                os.path.abspath(self.xsd_path),
+            schema_entry = get_schema_registry().get_entry(
+                self.xsd_path,
                 base_url=base_dir,
                 build=True,
                 locations=locations
             )
+            self.schema = schema_entry.schema
+            self.schema_digest = schema_entry.digest
             
             if self.schema is None:
                 raise ValueError("Schema loaded but is None")
@@ -301,9 +365,26 @@ class XMLGenerator:
         if custom_value is not None:
             return custom_value
         
+        generator, constraints = self._resolve_value_generator(type_name, element_name)
+        return generator.generate(element_name, constraints, self.context)
+    
+    def _resolve_value_generator(self, type_name, element_name: str = "") -> Tuple[Any, Dict[str, Any]]:
+        """
+        Resolve the type generator and constraints for a value site.
+        
+        This is the schema-introspection half of value generation. It does not
+        touch per-document state, so compiled plans run it once per site.
+        
+        Args:
+            type_name: XSD type object (or None to resolve from the element name)
+            element_name: Name of the element or attribute
+            
+        Returns:
+            Tuple of (type generator, constraints passed to its generate method)
+        """
         if not self.type_resolver:
             # Fallback to original method if type resolver not available
-            return self._generate_value_for_type_fallback(type_name, element_name)
+            return self._resolve_fallback_generator(type_name, element_name)
         
         # If type_name is None but we have element_name, try to resolve from element
         if type_name is None and element_name:
@@ -330,8 +411,60 @@ class XMLGenerator:
                     primitive_type = 'xs:ID'
         
         # Create appropriate type generator based on resolved primitive type
-        generator = self._create_generator_from_primitive_type(primitive_type, constraints)
-        return generator.generate(element_name, constraints)
+        return self._create_generator_from_primitive_type(primitive_type, constraints), constraints
+    
+    def _value_sampler(self, type_name, element_name: str = "", current_path: str = "", **options) -> ValueSampler:
+        """Create the sampler for a typed value site (custom values take priority)."""
+        generator, constraints = self._resolve_value_generator(type_name, element_name)
+        return ValueSampler(element_name, current_path, generator, constraints, **options)
+    
+    def _factory_sampler(self, type_name: str, element_name: str, **options) -> ValueSampler:
+        """Create the sampler for a value drawn directly from the type factory."""
+        generator = self.type_factory.create_generator(type_name, {}, element_name)
+        return ValueSampler(element_name, "", generator, None, use_custom=False, **options)
+    
+    def _sample_value(self, sampler: ValueSampler) -> Any:
+        """Generate a site's value now, or keep its sampler while compiling a plan or memoized template."""
+        if self._plan_recorder is not None:
+            return self._plan_recorder.record(sampler)
+        if self._template_walks:
+            return sampler
+        return sampler.sample(self)
+    
+    def _create_repeated_elements(self, element: xmlschema.validators.XsdElement, path: str, depth: int, count: int) -> ElementFrame:
+        """
+        Create the dictionaries for the occurrences of a repeated element.
+        
+        Siblings are generated from identical state, so while a plan is compiled
+        one template item is built and its value slots are reserved once per
+        occurrence instead of walking the schema count times.
+        
+        Args:
+            element: Repeated XSD element
+            path: Path of the element in the XML hierarchy
+            depth: Recursion depth of the occurrences
+            count: Number of occurrences
+            
+        Yields:
+            Child element requests, see _element_frame
+            
+        Returns:
+            List of element dictionaries (the same template object while compiling)
+        """
+        if self._plan_recorder is None:
+            items = []
+            for _ in range(count):
+                items.append((yield (element, path, depth)))
+            return items
+        if count <= 0:
+            return []
+        
+        self._plan_recorder.begin_repeat()
+        try:
+            item = yield (element, path, depth)
+        finally:
+            self._plan_recorder.end_repeat(count)
+        return [item] * count
     
     def _get_custom_value(self, element_name: str, current_path: str = "") -> Any:
         """
@@ -346,8 +479,7 @@ class XMLGenerator:
         """
         # Get and increment instance counter for this element
         clean_element_name = element_name.split(':')[-1] if ':' in element_name else element_name
-        instance_index = self.element_instance_counters.get(clean_element_name, 0)
-        self.element_instance_counters[clean_element_name] = instance_index + 1
+        instance_index = self.context.next_instance_index(clean_element_name)
         
         return self._get_enhanced_value(element_name, instance_index=instance_index)
     
@@ -374,7 +506,7 @@ class XMLGenerator:
         
         # 1. Try smart relationships first
         relationship_value = self.smart_relationships.apply_relationship(
-            clean_element_name, instance_index, context_values
+            clean_element_name, instance_index, context_values, self.context
         )
         if relationship_value is not None:
             return relationship_value
@@ -421,13 +553,10 @@ class XMLGenerator:
             return values[instance_index % len(values)]
         elif strategy == 'seeded':
             # Use deterministic selection based on instance index
-            import random
             seed_value = self.generation_settings.get('deterministic_seed', 12345)
-            random.seed(seed_value + instance_index)
-            return random.choice(values)
+            return random.Random(seed_value + instance_index).choice(values)
         else:  # 'random' or default
-            import random
-            return random.choice(values)
+            return self.context.random.choice(values)
     
     def _get_custom_value_legacy(self, element_name: str, current_path: str = "") -> Any:
         """
@@ -500,6 +629,11 @@ class XMLGenerator:
     
     def _generate_value_for_type_fallback(self, type_name, element_name: str = "") -> Any:
         """Fallback method using original type factory (for compatibility)."""
+        generator, constraints = self._resolve_fallback_generator(type_name, element_name)
+        return generator.generate(element_name, constraints, self.context)
+    
+    def _resolve_fallback_generator(self, type_name, element_name: str = "") -> Tuple[Any, Dict[str, Any]]:
+        """Resolve generator and constraints with the original type factory."""
         # Extract constraints from the type
         constraints = self._extract_type_constraints(type_name)
         
@@ -516,53 +650,12 @@ class XMLGenerator:
                         constraints['enum_values'] = [str(val) for val in facet.enumeration]
                         break
         
-        # Create appropriate type generator and generate value
-        generator = self.type_factory.create_generator(type_name, constraints, element_name)
-        return generator.generate(element_name, constraints)
+        # Create appropriate type generator
+        return self.type_factory.create_generator(type_name, constraints, element_name), constraints
     
     def _create_generator_from_primitive_type(self, primitive_type: str, constraints: Dict[str, Any]):
-        """Create type generator based on resolved primitive type."""
-        from .type_generators import (
-            NumericTypeGenerator, StringTypeGenerator, BooleanTypeGenerator, 
-            DateTimeTypeGenerator, EnumerationTypeGenerator, IDTypeGenerator,
-            Base64BinaryTypeGenerator, IDREFTypeGenerator, IDREFSTypeGenerator
-        )
-        
-        # Handle enumerations first
-        if 'enum_values' in constraints:
-            return EnumerationTypeGenerator(self.config, constraints['enum_values'])
-        
-        # Map primitive types to generators
-        if primitive_type == 'xs:decimal' or primitive_type == 'xs:float' or primitive_type == 'xs:double':
-            return NumericTypeGenerator(self.config, is_decimal=True, is_integer=False)
-        elif (primitive_type == 'xs:integer' or primitive_type == 'xs:int' or primitive_type == 'xs:long' or
-              primitive_type == 'xs:nonNegativeInteger' or primitive_type == 'xs:positiveInteger' or 
-              primitive_type == 'xs:negativeInteger' or primitive_type == 'xs:nonPositiveInteger' or
-              primitive_type == 'xs:unsignedLong' or primitive_type == 'xs:unsignedInt' or 
-              primitive_type == 'xs:unsignedShort' or primitive_type == 'xs:unsignedByte' or
-              primitive_type == 'xs:short' or primitive_type == 'xs:byte'):
-            return NumericTypeGenerator(self.config, is_decimal=False, is_integer=True)
-        elif primitive_type == 'xs:boolean':
-            return BooleanTypeGenerator(self.config)
-        elif primitive_type == 'xs:dateTime':
-            return DateTimeTypeGenerator(self.config, 'datetime')
-        elif primitive_type == 'xs:date':
-            return DateTimeTypeGenerator(self.config, 'date')
-        elif primitive_type == 'xs:time':
-            return DateTimeTypeGenerator(self.config, 'time')
-        elif primitive_type == 'xs:duration':
-            return DateTimeTypeGenerator(self.config, 'duration')
-        elif primitive_type == 'xs:ID':
-            return IDTypeGenerator(self.config)
-        elif primitive_type == 'xs:IDREFS':
-            return IDREFSTypeGenerator(self.config)
-        elif primitive_type == 'xs:IDREF':
-            return IDREFTypeGenerator(self.config)
-        elif primitive_type == 'xs:base64Binary':
-            return Base64BinaryTypeGenerator(self.config)
-        else:
-            # Default to string for unknown types
-            return StringTypeGenerator(self.config)
+        """Create type generator based on resolved primitive type (memoized by the type factory)."""
+        return self.type_factory.create_primitive_generator(primitive_type, constraints)
     
     def _extract_type_constraints(self, type_name) -> Dict[str, Any]:
         """Extract validation constraints using iterative approach (no recursion)."""
@@ -687,43 +780,62 @@ class XMLGenerator:
             # Unknown mode - default to current behavior
             return depth < 2
     
+    def _get_user_count(self, element_name: str) -> Optional[int]:
+        """Get the occurrence count the user requested for an element, if any."""
+        if not (hasattr(self, 'user_unbounded_counts') and self.user_unbounded_counts):
+            return None
+            
+        # Check multiple possible path formats
+        possible_paths = [
+            element_name,
+            f"root.{element_name}",
+            element_name.split(':')[-1] if ':' in element_name else element_name
+        ]
+        
+        # Add schema-specific paths (check all keys for patterns like "SchemaName.ElementName")
+        for key in self.user_unbounded_counts.keys():
+            if key is not None and '.' in key and key.endswith(f".{element_name}"):
+                possible_paths.append(key)
+        
+        for path in possible_paths:
+            if path in self.user_unbounded_counts:
+                return max(1, self.user_unbounded_counts[path])
+        return None
+    
     def _get_element_count(self, element_name: str, element: xmlschema.validators.XsdElement, depth: int = 0) -> int:
         """Get the count for repeating elements with depth-aware limits."""
         if element is None or not element_name:
             return 1
             
         # Check user preferences first
-        if hasattr(self, 'user_unbounded_counts') and self.user_unbounded_counts:
-            # Check multiple possible path formats
-            possible_paths = [
-                element_name,
-                f"root.{element_name}",
-                element_name.split(':')[-1] if ':' in element_name else element_name
-            ]
-            
-            # Add schema-specific paths (check all keys for patterns like "SchemaName.ElementName")
-            for key in self.user_unbounded_counts.keys():
-                if key is not None and '.' in key and key.endswith(f".{element_name}"):
-                    possible_paths.append(key)
-            
-            for path in possible_paths:
-                if path in self.user_unbounded_counts:
-                    user_count = max(1, self.user_unbounded_counts[path])
-                    # Limit based on depth to prevent exponential growth
-                    if depth > self.config.recursion.max_element_depth:
-                        return min(user_count, 1)  # Force single element at deep levels
-                    elif depth > self.config.recursion.max_tree_depth:
-                        return min(user_count, 2)  # Limit to 2 at moderate depth
-                    return user_count
+        user_count = self._get_user_count(element_name)
+        if user_count is not None:
+            # Limit based on depth to prevent exponential growth
+            if depth > self.context.recursion.max_element_depth:
+                return min(user_count, 1)  # Force single element at deep levels
+            elif depth > self.context.recursion.max_tree_depth:
+                return min(user_count, 2)  # Limit to 2 at moderate depth
+            return user_count
         
         # Depth-aware default count to prevent exponential growth
-        if depth > self.config.recursion.max_element_depth:
+        if depth > self.context.recursion.max_element_depth:
             return 1  # Only 1 element at very deep levels
-        elif depth > self.config.recursion.max_tree_depth:
+        elif depth > self.context.recursion.max_tree_depth:
             return 1  # Reduce to 1 at moderate depth
         else:
             return self.config.elements.default_element_count  # Default from config
     
+    def _limit_repeat_count(self, element_name: str, count: int, depth: int) -> int:
+        """
+        Cap repeated siblings by depth so in-memory documents stay small.
+        
+        Streamed documents are written incrementally, so counts the user
+        requested explicitly are kept as they are.
+        """
+        if self._streaming and self._get_user_count(element_name) is not None:
+            return count
+        return min(count, max(1, 5 - depth))
+    
     def _get_sequence_ordered_elements(self, element_type) -> List[xmlschema.validators.XsdElement]:
         """Get elements in their XSD sequence order for proper XML generation."""
         if not hasattr(element_type, 'content') or element_type.content is None:
@@ -766,7 +878,7 @@ class XMLGenerator:
         
         return ordered_elements
     
-    def _ensure_required_elements(self, element, result: Dict[str, Any], current_path: str, depth: int) -> None:
+    def _ensure_required_elements(self, element, result: Dict[str, Any], current_path: str, depth: int) -> ElementFrame:
         """Ensure all required elements with minOccurs > 0 are present."""
         if not hasattr(element.type, 'content') or element.type.content is None:
             return
@@ -781,14 +893,14 @@ class XMLGenerator:
                     # This is a required element that's missing - add it
                     if child.max_occurs is None or child.max_occurs > 1:
                         count = max(min_occurs, self._get_element_count(child_name, child, depth))
-                        safe_count = min(count, max(1, 5 - depth))
-                        result[child_name] = [self._create_element_dict(child, f"{current_path}.{child_name}", depth + 1) for _ in range(safe_count)]
+                        safe_count = self._limit_repeat_count(child_name, count, depth)
+                        result[child_name] = yield from self._create_repeated_elements(child, f"{current_path}.{child_name}", depth + 1, safe_count)
                     else:
-                        result[child_name] = self._create_element_dict(child, f"{current_path}.{child_name}", depth + 1)
+                        result[child_name] = yield (child, f"{current_path}.{child_name}", depth + 1)
         except AttributeError:
             pass
 
-    def _process_sequence_elements(self, element, result: Dict[str, Any], current_path: str, depth: int) -> None:
+    def _process_sequence_elements(self, element, result: Dict[str, Any], current_path: str, depth: int) -> ElementFrame:
         """Process elements in strict sequence order to comply with XSD sequence constraints."""
         if not hasattr(element.type, 'content') or element.type.content is None:
             return
@@ -814,10 +926,10 @@ class XMLGenerator:
                                 # Generate the selected choice element
                                 if selected_choice.max_occurs is None or selected_choice.max_occurs > 1:
                                     count = self._get_element_count(child_name, selected_choice, depth)
-                                    safe_count = min(count, max(1, 5 - depth))
-                                    result[child_name] = [self._create_element_dict(selected_choice, f"{current_path}.{child_name}", depth + 1) for _ in range(safe_count)]
+                                    safe_count = self._limit_repeat_count(child_name, count, depth)
+                                    result[child_name] = yield from self._create_repeated_elements(selected_choice, f"{current_path}.{child_name}", depth + 1, safe_count)
                                 else:
-                                    result[child_name] = self._create_element_dict(selected_choice, f"{current_path}.{child_name}", depth + 1)
+                                    result[child_name] = yield (selected_choice, f"{current_path}.{child_name}", depth + 1)
                     
                     elif 'Any' in type(group_item).__name__:
                         # This is an xs:any element - handle specially
@@ -852,17 +964,17 @@ class XMLGenerator:
                             # Required element - must include
                             if child.max_occurs is None or child.max_occurs > 1:
                                 count = max(min_occurs, self._get_element_count(child_name, child, depth))
-                                safe_count = min(count, max(1, 5 - depth))
-                                result[child_name] = [self._create_element_dict(child, f"{current_path}.{child_name}", depth + 1) for _ in range(safe_count)]
+                                safe_count = self._limit_repeat_count(child_name, count, depth)
+                                result[child_name] = yield from self._create_repeated_elements(child, f"{current_path}.{child_name}", depth + 1, safe_count)
                             else:
-                                result[child_name] = self._create_element_dict(child, f"{current_path}.{child_name}", depth + 1)
+                                result[child_name] = yield (child, f"{current_path}.{child_name}", depth + 1)
                         elif self._should_include_optional_element(child_name, current_path, depth):  # Include based on generation mode
                             if child.max_occurs is None or child.max_occurs > 1:
                                 count = self._get_element_count(child_name, child, depth)
                                 safe_count = min(count, 1)  # Limit to 1 for optional
-                                result[child_name] = [self._create_element_dict(child, f"{current_path}.{child_name}", depth + 1) for _ in range(safe_count)]
+                                result[child_name] = yield from self._create_repeated_elements(child, f"{current_path}.{child_name}", depth + 1, safe_count)
                             else:
-                                result[child_name] = self._create_element_dict(child, f"{current_path}.{child_name}", depth + 1)
+                                result[child_name] = yield (child, f"{current_path}.{child_name}", depth + 1)
                     
                     elif hasattr(group_item, 'iter_elements') and not hasattr(group_item, 'model'):
                         # This is a nested group (not choice) - process its elements
@@ -883,17 +995,17 @@ class XMLGenerator:
                                     # Required element - must include
                                     if nested_child.max_occurs is None or nested_child.max_occurs > 1:
                                         count = max(min_occurs, self._get_element_count(child_name, nested_child, depth))
-                                        safe_count = min(count, max(1, 5 - depth))
-                                        result[child_name] = [self._create_element_dict(nested_child, f"{current_path}.{child_name}", depth + 1) for _ in range(safe_count)]
+                                        safe_count = self._limit_repeat_count(child_name, count, depth)
+                                        result[child_name] = yield from self._create_repeated_elements(nested_child, f"{current_path}.{child_name}", depth + 1, safe_count)
                                     else:
-                                        result[child_name] = self._create_element_dict(nested_child, f"{current_path}.{child_name}", depth + 1)
+                                        result[child_name] = yield (nested_child, f"{current_path}.{child_name}", depth + 1)
                                 elif self._should_include_optional_element(child_name, current_path, depth):  # Include based on generation mode
                                     if nested_child.max_occurs is None or nested_child.max_occurs > 1:
                                         count = self._get_element_count(child_name, nested_child, depth)
                                         safe_count = min(count, 1)  # Limit to 1 for optional
-                                        result[child_name] = [self._create_element_dict(nested_child, f"{current_path}.{child_name}", depth + 1) for _ in range(safe_count)]
+                                        result[child_name] = yield from self._create_repeated_elements(nested_child, f"{current_path}.{child_name}", depth + 1, safe_count)
                                     else:
-                                        result[child_name] = self._create_element_dict(nested_child, f"{current_path}.{child_name}", depth + 1)
+                                        result[child_name] = yield (nested_child, f"{current_path}.{child_name}", depth + 1)
                 return
         
         # Fallback: Process all elements in strict sequence order (NO choice-first processing)
@@ -910,13 +1022,13 @@ class XMLGenerator:
             
             if child.max_occurs is None or child.max_occurs > 1:
                 count = self._get_element_count(child_name, child, depth)
-                safe_count = min(count, max(1, 5 - depth))
-                result[child_name] = [self._create_element_dict(child, f"{current_path}.{child_name}", depth + 1) for _ in range(safe_count)]
+                safe_count = self._limit_repeat_count(child_name, count, depth)
+                result[child_name] = yield from self._create_repeated_elements(child, f"{current_path}.{child_name}", depth + 1, safe_count)
             else:
-                result[child_name] = self._create_element_dict(child, f"{current_path}.{child_name}", depth + 1)
+                result[child_name] = yield (child, f"{current_path}.{child_name}", depth + 1)
         
         # Ensure all required elements are present
-        self._ensure_required_elements(element, result, current_path, depth)
+        yield from self._ensure_required_elements(element, result, current_path, depth)
 
     def _is_complex_type_with_simple_content(self, element) -> bool:
         """Check if element is a complex type with simple content (like MeasureType)."""
@@ -938,30 +1050,28 @@ class XMLGenerator:
         if not self._is_complex_type_with_simple_content(element):
             return result
         
-        # Generate the base value for simple content
-        base_value = self._generate_value_for_type(element.type.content, element.local_name, current_path)
-        
         # CRITICAL: Ensure complex simple content never has empty values
-        if base_value is None or base_value == "":
-            # Use type-aware fallback instead of name-based guessing
-            if element.type and element.type.content and self.type_resolver:
-                primitive_type, _ = self.type_resolver.resolve_to_primitive_type(element.type.content)
-                if primitive_type.startswith('xs:decimal') or primitive_type.startswith('xs:float'):
-                    base_value = "123.45"
-                elif primitive_type.startswith('xs:int'):
-                    base_value = "123"
-                elif primitive_type.startswith('xs:boolean'):
-                    base_value = "true"
-                else:
-                    base_value = "SampleValue"
-            else:
-                base_value = "SampleValue"
+        # Use type-aware fallback instead of name-based guessing
+        fallback = "SampleValue"
+        if element.type and element.type.content and self.type_resolver:
+            primitive_type, _ = self.type_resolver.resolve_to_primitive_type(element.type.content)
+            if primitive_type.startswith('xs:decimal') or primitive_type.startswith('xs:float'):
+                fallback = "123.45"
+            elif primitive_type.startswith('xs:int'):
+                fallback = "123"
+            elif primitive_type.startswith('xs:boolean'):
+                fallback = "true"
+        
+        # Generate the base value for simple content (always a string)
+        base_value = self._sample_value(self._value_sampler(
+            element.type.content, element.local_name, current_path, fallback=fallback, as_text=True
+        ))
         
         if result:  # Has attributes
-            result['_text'] = str(base_value)  # Ensure it's a string
+            result['_text'] = base_value
             return result
         else:  # No attributes, just return the value
-            return str(base_value)
+            return base_value
 
     def _get_namespace_prefix(self, namespace: str) -> Optional[str]:
         """Get the prefix for a given namespace."""
@@ -1074,7 +1184,7 @@ class XMLGenerator:
         # Default: select first element
         return choice_elements[0]
     
-    def _process_content_elements(self, element, result: Dict[str, Any], current_path: str, depth: int) -> None:
+    def _process_content_elements(self, element, result: Dict[str, Any], current_path: str, depth: int) -> ElementFrame:
         """Enhanced content processing that handles all content models with proper choice selection."""
         content = element.type.content
         
@@ -1084,7 +1194,7 @@ class XMLGenerator:
             
             if model_str == 'sequence':
                 # Use existing sequence processing
-                self._process_sequence_elements(element, result, current_path, depth)
+                yield from self._process_sequence_elements(element, result, current_path, depth)
             elif model_str == 'choice':
                 # This entire content is a choice - select only one element
                 choice_elements = []
@@ -1101,18 +1211,18 @@ class XMLGenerator:
                     child_name = self._format_element_name(selected_choice)
                     if selected_choice.max_occurs is None or selected_choice.max_occurs > 1:
                         count = self._get_element_count(child_name, selected_choice, depth)
-                        safe_count = min(count, max(1, 5 - depth))
-                        result[child_name] = [self._create_element_dict(selected_choice, f"{current_path}.{child_name}", depth + 1) for _ in range(safe_count)]
+                        safe_count = self._limit_repeat_count(child_name, count, depth)
+                        result[child_name] = yield from self._create_repeated_elements(selected_choice, f"{current_path}.{child_name}", depth + 1, safe_count)
                     else:
-                        result[child_name] = self._create_element_dict(selected_choice, f"{current_path}.{child_name}", depth + 1)
+                        result[child_name] = yield (selected_choice, f"{current_path}.{child_name}", depth + 1)
             else:
                 # For other content models (all, group, etc.), check for nested choices
-                self._process_content_with_choice_handling(element, result, current_path, depth)
+                yield from self._process_content_with_choice_handling(element, result, current_path, depth)
         else:
             # No specific model - check for choices in the content
-            self._process_content_with_choice_handling(element, result, current_path, depth)
+            yield from self._process_content_with_choice_handling(element, result, current_path, depth)
     
-    def _process_content_with_choice_handling(self, element, result: Dict[str, Any], current_path: str, depth: int) -> None:
+    def _process_content_with_choice_handling(self, element, result: Dict[str, Any], current_path: str, depth: int) -> ElementFrame:
         """Process content with choice detection and handling."""
         content = element.type.content
         
@@ -1162,10 +1272,10 @@ class XMLGenerator:
                 if child_name not in result:
                     if selected_choice.max_occurs is None or selected_choice.max_occurs > 1:
                         count = self._get_element_count(child_name, selected_choice, depth)
-                        safe_count = min(count, max(1, 5 - depth))
-                        result[child_name] = [self._create_element_dict(selected_choice, f"{current_path}.{child_name}", depth + 1) for _ in range(safe_count)]
+                        safe_count = self._limit_repeat_count(child_name, count, depth)
+                        result[child_name] = yield from self._create_repeated_elements(selected_choice, f"{current_path}.{child_name}", depth + 1, safe_count)
                     else:
-                        result[child_name] = self._create_element_dict(selected_choice, f"{current_path}.{child_name}", depth + 1)
+                        result[child_name] = yield (selected_choice, f"{current_path}.{child_name}", depth + 1)
         
         # Process regular elements
         for child in regular_elements:
@@ -1181,15 +1291,19 @@ class XMLGenerator:
             if min_occurs > 0 or self._should_include_optional_element(child_name, current_path, depth):  # Required elements or include based on generation mode
                 if child.max_occurs is None or child.max_occurs > 1:
                     count = self._get_element_count(child_name, child, depth)
-                    safe_count = min(count, max(1, 5 - depth))
-                    result[child_name] = [self._create_element_dict(child, f"{current_path}.{child_name}", depth + 1) for _ in range(safe_count)]
+                    safe_count = self._limit_repeat_count(child_name, count, depth)
+                    result[child_name] = yield from self._create_repeated_elements(child, f"{current_path}.{child_name}", depth + 1, safe_count)
                 else:
-                    result[child_name] = self._create_element_dict(child, f"{current_path}.{child_name}", depth + 1)
+                    result[child_name] = yield (child, f"{current_path}.{child_name}", depth + 1)
     
     def _create_element_dict(self, element: xmlschema.validators.XsdElement, path: str = "", depth: int = 0) -> Dict[str, Any]:
         """
         Universally create a dictionary representation of any XSD element with deep recursive parsing.
         
+        Child elements are built by calling this method again, so every element
+        of the walk passes through it (the profiler relies on this).
+        _create_element_dict_iterative runs the same walk without recursion.
+        
         Args:
             element: XSD element to process
             path: Current path in the schema hierarchy
@@ -1198,8 +1312,188 @@ class XMLGenerator:
         Returns:
             Dictionary with element structure and appropriate values
         """
+        frame = self._element_frame(element, path, depth)
+        try:
+            request = next(frame)
+            while True:
+                try:
+                    child = self._create_element_dict(*request)
+                except Exception as e:
+                    request = frame.throw(e)
+                else:
+                    request = frame.send(child)
+        except StopIteration as done:
+            return done.value
+    
+    def _create_element_dict_iterative(self, root_element: xmlschema.validators.XsdElement, path: str = "") -> Dict[str, Any]:
+        """
+        Create the same dictionary as _create_element_dict with an explicit stack.
+        
+        Element frames are resumed depth-first from a stack instead of nested
+        Python calls, so elements are generated in exactly the recursive order
+        and deep schemas are not limited by the interpreter recursion limit.
+        An exception raised by a child element is delivered to its parent at
+        the point where the parent requested it.
+        
+        Args:
+            root_element: Root XSD element to process
+            path: Initial path in the schema hierarchy
+            
+        Returns:
+            Dictionary with element structure and appropriate values
+        """
+        stack = [self._element_frame(root_element, path, 0)]
+        value = None
+        error = None
+        while True:
+            try:
+                if error is None:
+                    request = stack[-1].send(value)
+                else:
+                    request = stack[-1].throw(error)
+            except StopIteration as done:
+                stack.pop()
+                if not stack:
+                    return done.value
+                value, error = done.value, None
+                continue
+            except Exception as e:
+                stack.pop()
+                if not stack:
+                    raise
+                value, error = None, e
+                continue
+            
+            stack.append(self._element_frame(*request))
+            value, error = None, None
+    
+    def _create_root_element_dict(self, root_element: xmlschema.validators.XsdElement, root_name: str) -> Any:
+        """Create the root element dictionary with the configured generation engine."""
+        if self._use_iterative_engine():
+            return self._create_element_dict_iterative(root_element, root_name)
+        return self._create_element_dict(root_element, root_name)
+    
+    def _use_generation_plan(self) -> bool:
+        """Check whether this generation replays a compiled plan instead of walking the schema."""
+        # Plans re-sample every value slot, so memoized and incremental generations walk the schema
+        return (self.config.performance.enable_generation_plans and self.profiler is None and
+                not self.config.performance.enable_subtree_memoization and self.incremental_cache is None)
+    
+    def _use_iterative_engine(self) -> bool:
+        """Check whether the explicit-stack engine replaces recursion for this generation."""
+        # Profiled generations recurse so every element passes through the wrapped methods
+        return self.config.iterative.enable_iterative_processing and self.profiler is None
+    
+    def _element_frame(self, element: xmlschema.validators.XsdElement, path: str, depth: int) -> ElementFrame:
+        """
+        Generation frame of one element, driven by _create_element_dict or _create_element_dict_iterative.
+        
+        Yields a (element, path, depth) request whenever a child element is
+        needed and receives the child's dictionary or value in return. With
+        subtree memoization, repeated complex types are walked once per depth
+        and later occurrences are instantiated from the stored template. With
+        incremental generation, subtrees of the previous document whose
+        options did not change are returned without walking them. With a
+        progress reporter attached, the element is reported first, and a
+        cancelled reporter raises GenerationCancelled from here.
+        
+        Args:
+            element: XSD element to process
+            path: Current path in the schema hierarchy
+            depth: Current recursion depth
+            
+        Returns:
+            Dictionary with element structure and appropriate values
+        """
+        if self.progress is not None:
+            self.progress.element(path)
+        
+        if self._incremental_active and self._is_memoizable_element(element):
+            return (yield from self._incremental_element_frame(element, path, depth))
+        
+        memo = self._subtree_memo
+        if memo is None or self._plan_recorder is not None or not self._is_memoizable_element(element):
+            return (yield from self._walk_element(element, path, depth))
+        
+        key = memo.key(element, path, depth)
+        template = memo.get(key)
+        if template is None:
+            # Walk into a template: value sites stay samplers until instantiated
+            self._template_walks += 1
+            try:
+                template = yield from self._walk_element(element, path, depth)
+            finally:
+                self._template_walks -= 1
+            memo.put(key, template)
+        
+        if self._template_walks:
+            return template
+        return memo.instantiate(template, self)
+    
+    def _incremental_element_frame(self, element: xmlschema.validators.XsdElement, path: str, depth: int) -> ElementFrame:
+        """Reuse an element's subtree from the previous document, or walk it and cache the result."""
+        cache = self.incremental_cache
+        cached = cache.enter(path)
+        if cached is not None:
+            return cached.value
+        
+        try:
+            value = yield from self._walk_element(element, path, depth)
+        except Exception:
+            cache.abort()
+            raise
+        cache.exit(value)
+        return value
+    
+    def _incremental_signature(self, root_name: str) -> Tuple[Any, ...]:
+        """Options that regenerate the whole document when they change."""
+        return (root_name, getattr(self, 'generation_mode', None), repr(getattr(self, 'custom_values', None)),
+                self.context.seed)
+    
+    def _is_memoizable_element(self, element) -> bool:
+        """Check whether an element's subtree is stored in the subtree memo."""
+        element_type = getattr(element, 'type', None)
+        return (element_type is not None and hasattr(element, 'local_name') and
+                element_type.is_complex() and not self._is_complex_type_with_simple_content(element))
+    
+    def _is_volatile_sampler(self, sampler: ValueSampler) -> bool:
+        """
+        Check whether a value site is sampled again in every memoized occurrence.
+        
+        IDs and references must stay unique and resolvable, enumerations rotate
+        through their values, and configured custom values, templates and
+        relationships select by instance index.
+        """
+        if isinstance(sampler.prototype, VOLATILE_GENERATOR_TYPES):
+            return True
+        if not sampler.use_custom:
+            return False
+        if getattr(self, 'custom_values', None):
+            return True
+        
+        name = sampler.element_name.split(':')[-1]
+        if name in self.element_configs:
+            return True
+        return any(name in relationship.get('fields', [])
+                   for relationship in self.smart_relationships.relationships.values())
+    
+    def _new_subtree_memo(self) -> Optional[SubtreeMemo]:
+        """Create the subtree memo of a new generation, if memoization is enabled."""
+        # Incremental generations must walk every occurrence to record its option lookups
+        if not self.config.performance.enable_subtree_memoization or self.incremental_cache is not None:
+            return None
+        
+        # Path-matched choices and Custom-mode selections make structure depend on the path
+        path_sensitive = getattr(self, 'generation_mode', None) == "Custom" or any(
+            isinstance(choice, dict) and choice.get('path')
+            for choice in (getattr(self, 'user_choices', None) or {}).values()
+        )
+        return SubtreeMemo(self._is_volatile_sampler, path_sensitive)
+    
+    def _walk_element(self, element: xmlschema.validators.XsdElement, path: str, depth: int) -> ElementFrame:
+        """Walk one element's schema definition; see _element_frame."""
         # CRITICAL: Prevent infinite recursion with much lower limit
-        if depth > self.config.recursion.max_element_depth:
+        if depth > self.context.recursion.max_element_depth:
             return {"_recursion_limit": "Maximum depth reached"}
         
         # CRITICAL: Check if this is actually an element and not a group
@@ -1210,52 +1504,44 @@ class XMLGenerator:
         
         # CRITICAL: Aggressive circular reference protection
         # Include path to make type_key unique per instance location
-        type_key = f"{path}_{element.local_name}_{str(element.type)}"
-        if type_key in self.processed_types and depth > self.config.recursion.circular_reference_depth:
+        type_key = (path, element.local_name, id(element.type))
+        if type_key in self.processed_types and depth > self.context.recursion.circular_reference_depth:
             return {"_circular_ref": f"Circular reference detected for {element.local_name}"}
         
         # CRITICAL: Prevent processing same type multiple times at same path
-        if depth > self.config.recursion.max_type_processing_depth and type_key in self.processed_types:
+        if depth > self.context.recursion.max_type_processing_depth and type_key in self.processed_types:
             return {"_type_reuse": f"Type {element.local_name} already processed"}
         
         self.processed_types.add(type_key)
         
         try:
-            # CRITICAL: Use OrderedDict to preserve exact element sequence order
-            from collections import OrderedDict
+            # Children are added in XSD sequence order as they are generated
             result = OrderedDict()
             current_path = f"{path}.{element.local_name}" if path else element.local_name
             
             # Handle null type
             if element.type is None:
                 # Use string generator for unknown types
-                string_gen = self.type_factory.create_generator("string", {}, element.local_name)
-                return string_gen.generate(element.local_name, {})
+                return self._sample_value(self._factory_sampler("string", element.local_name))
             
             # Process simple types
             if element.type.is_simple():
-                value = self._generate_value_for_type(element.type, element.local_name, current_path)
-                # Debug problematic elements
-                if element.local_name in ['CurrencyCode', 'IATA_Number', 'EmailAddress', 'PhoneNumber']:
-                    print(f"DEBUG: Simple type {element.local_name} generated value: {repr(value)}")
-                
                 # Ensure no elements return empty values - use type-aware fallbacks
-                if value is None or value == "":
-                    if self.type_resolver and element.type:
-                        primitive_type, _ = self.type_resolver.resolve_to_primitive_type(element.type)
-                        if primitive_type.startswith('xs:decimal') or primitive_type.startswith('xs:float'):
-                            return 123.45
-                        elif primitive_type.startswith('xs:int'):
-                            return 123
-                        elif primitive_type.startswith('xs:boolean'):
-                            return 'true'
-                        elif primitive_type.startswith('xs:date'):
-                            return '2024-06-08T12:00:00Z'
-                        else:
-                            return f"Sample{element.local_name}"
-                    else:
-                        return f"Sample{element.local_name}"
-                return value
+                fallback = f"Sample{element.local_name}"
+                if self.type_resolver and element.type:
+                    primitive_type, _ = self.type_resolver.resolve_to_primitive_type(element.type)
+                    if primitive_type.startswith('xs:decimal') or primitive_type.startswith('xs:float'):
+                        fallback = 123.45
+                    elif primitive_type.startswith('xs:int'):
+                        fallback = 123
+                    elif primitive_type.startswith('xs:boolean'):
+                        fallback = 'true'
+                    elif primitive_type.startswith('xs:date'):
+                        fallback = '2024-06-08T12:00:00Z'
+                
+                return self._sample_value(self._value_sampler(
+                    element.type, element.local_name, current_path, fallback=fallback
+                ))
             
             # Process complex types
             if element.type.is_complex():
@@ -1269,42 +1555,44 @@ class XMLGenerator:
                         elements = list(element.type.content.iter_elements())
                         if len(elements) == 0:
                             # Empty sequence - should generate text content instead of complex structure
-                            text_gen = self.type_factory.create_generator("string", {}, element.local_name)
-                            generated_value = text_gen.generate(element.local_name, {})
-                            return generated_value
+                            text_sampler = self._factory_sampler("string", element.local_name)
+                            return self._sample_value(text_sampler)
                     except:
                         pass  # Fallback to regular complex type processing
                 # Process attributes
                 if hasattr(element.type, 'attributes') and element.type.attributes:
                     for attr_name, attr in element.type.attributes.items():
                         if attr.type is not None:
-                            result[f'@{attr_name}'] = self._generate_value_for_type(attr.type, attr_name, current_path)
+                            result[f'@{attr_name}'] = self._sample_value(
+                                self._value_sampler(attr.type, attr_name, current_path)
+                            )
                 
                 # CRITICAL: Special handling for complex types with simple content (like Amount)
                 if (hasattr(element.type, 'content') and element.type.content and 
                     hasattr(element.type.content, 'is_simple') and element.type.content.is_simple()):
                     
-                    # Generate value using type resolution for the content
-                    base_value = self._generate_value_for_type(element.type.content, element.local_name, current_path)
-                    
-                    # Apply type-aware fallback if base_value is empty
-                    if base_value is None or base_value == "":
-                        if self.type_resolver:
-                            primitive_type, _ = self.type_resolver.resolve_to_primitive_type(element.type.content)
-                            if primitive_type.startswith('xs:decimal') or primitive_type.startswith('xs:float'):
-                                base_value = "99.99"
-                            elif primitive_type.startswith('xs:int'):
-                                base_value = "123"
-                            else:
-                                base_value = "SampleValue"
+                    # Type-aware fallback used if the generated value is empty
+                    if self.type_resolver:
+                        primitive_type, _ = self.type_resolver.resolve_to_primitive_type(element.type.content)
+                        if primitive_type.startswith('xs:decimal') or primitive_type.startswith('xs:float'):
+                            fallback = "99.99"
+                        elif primitive_type.startswith('xs:int'):
+                            fallback = "123"
                         else:
-                            base_value = "99.99"  # Conservative fallback
+                            fallback = "SampleValue"
+                    else:
+                        fallback = "99.99"  # Conservative fallback
+                    
+                    # Generate value using type resolution for the content
+                    base_value = self._sample_value(self._value_sampler(
+                        element.type.content, element.local_name, current_path, fallback=fallback, as_text=True
+                    ))
                     
                     if result:  # Has attributes
-                        result['_text'] = str(base_value)
+                        result['_text'] = base_value
                         return result
                     else:  # No attributes, just return the value
-                        return str(base_value)
+                        return base_value
                 
                 # Handle complex types with simple content (like MeasureType)
                 # These have attributes AND a simple base type as content
@@ -1317,12 +1605,12 @@ class XMLGenerator:
                 if hasattr(element.type, 'content') and element.type.content is not None:
                     try:
                         # Use enhanced content processing that handles all content models
-                        self._process_content_elements(element, result, current_path, depth)
+                        yield from self._process_content_elements(element, result, current_path, depth)
                     except AttributeError:
                         # Fallback to old method if new method fails
                         try:
                             # CRITICAL: Apply choice logic even in fallback to prevent multiple choice elements
-                            self._process_content_with_choice_handling(element, result, current_path, depth)
+                            yield from self._process_content_with_choice_handling(element, result, current_path, depth)
                         except AttributeError:
                             # Handle cases where content doesn't have iter_elements (simple types)
                             pass
@@ -1333,13 +1621,10 @@ class XMLGenerator:
                 if any(keyword in element.local_name.lower() for keyword in ['amount', 'rate', 'measure', 'percent', 'price', 'cost', 'fee']):
                     # Try to generate a decimal value as fallback
                     try:
-                        decimal_gen = self.type_factory.create_generator("decimal", {}, element.local_name)
-                        return decimal_gen.generate(element.local_name, {})
+                        decimal_sampler = self._factory_sampler("decimal", element.local_name, error_value=0.0)
                     except:
                         return 0.0  # Ultimate fallback
-            
-            # CRITICAL: Ensure result is in correct XSD sequence order before returning
-            result = self._enforce_sequence_order(element, result)
+                    return self._sample_value(decimal_sampler)
             
             return result
             
@@ -1347,350 +1632,7 @@ class XMLGenerator:
             # Remove from processed types when done
             self.processed_types.discard(type_key)
     
-    def _enforce_sequence_order(self, element: xmlschema.validators.XsdElement, result: Dict[str, Any]) -> Dict[str, Any]:
-        """Ensure result dictionary maintains exact XSD sequence order recursively."""
-        if not result or not hasattr(element.type, 'content') or element.type.content is None:
-            return result
-            
-        content = element.type.content
-        
-        # Only enforce ordering for sequence models
-        if not (hasattr(content, 'model') and str(content.model) == 'sequence'):
-            return result
-            
-        # Get the correct sequence order from XSD
-        ordered_elements = self._get_sequence_ordered_elements(element.type)
-        if not ordered_elements:
-            return result
-            
-        # Create new OrderedDict with elements in correct sequence order
-        from collections import OrderedDict
-        ordered_result = OrderedDict()
-        
-        # Add elements in their proper XSD sequence order
-        for xsd_element in ordered_elements:
-            element_name = self._format_element_name(xsd_element)
-            if element_name in result:
-                child_value = result[element_name]
-                
-                # CRITICAL: Recursively apply sequence ordering to nested complex elements
-                if isinstance(child_value, list):
-                    # Handle list of elements
-                    ordered_child_list = []
-                    for item in child_value:
-                        if isinstance(item, dict):
-                            # Apply sequence ordering to each dict in the list
-                            ordered_item = self._enforce_sequence_order(xsd_element, item)
-                            ordered_child_list.append(ordered_item)
-                        else:
-                            ordered_child_list.append(item)
-                    ordered_result[element_name] = ordered_child_list
-                elif isinstance(child_value, dict):
-                    # Apply sequence ordering to nested dict
-                    ordered_result[element_name] = self._enforce_sequence_order(xsd_element, child_value)
-                else:
-                    # Simple value - no ordering needed
-                    ordered_result[element_name] = child_value
-        
-        # Add any remaining elements that weren't in the sequence (shouldn't happen, but safety)
-        for key, value in result.items():
-            if key not in ordered_result:
-                ordered_result[key] = value
-                
-        return ordered_result
-    
-    def _create_element_dict_iterative(self, root_element: xmlschema.validators.XsdElement, path: str = "", max_depth: int = 20) -> Dict[str, Any]:
-        """
-        Create element dictionary using iterative queue-based approach (no recursion).
-        
-        Args:
-            root_element: Root XSD element to process
-            path: Initial path in the schema hierarchy  
-            max_depth: Maximum processing depth for memory safety
-            
-        Returns:
-            Dictionary with element structure and appropriate values
-        """
-        # Use queue for breadth-first processing - (element, path, depth, parent_dict, parent_key)
-        element_queue = deque([(root_element, path, 0, None, None)])
-        processed_elements = set()  # Track processed elements by unique ID and path
-        result = {}
-        element_count = 0
-        max_elements = 10000  # Configurable element limit for memory safety
-        
-        while element_queue and element_count < max_elements:
-            element, current_path, depth, parent_dict, parent_key = element_queue.popleft()
-            element_count += 1
-            
-            # Safety checks for depth and circular references
-            if depth > max_depth or element is None:
-                continue
-                
-            # Create unique identifier for this element at this path
-            element_id = f"{current_path}_{element.local_name}_{id(element.type)}_{depth}"
-            if element_id in processed_elements:
-                continue  # Skip already processed elements
-            processed_elements.add(element_id)
-            
-            # Process current element
-            element_data = self._process_single_element_iterative(element, current_path, depth)
-            
-            # Store result appropriately
-            element_name = self._format_element_name(element)
-            if parent_dict is None:
-                # This is the root element
-                result = element_data
-                current_parent = result
-            else:
-                # This is a child element
-                parent_dict[parent_key] = element_data
-                current_parent = element_data
-            
-            # Queue child elements for processing if this is a complex type
-            if (element.type and element.type.is_complex() and 
-                isinstance(element_data, dict) and 
-                hasattr(element.type, 'content') and element.type.content is not None):
-                
-                self._queue_child_elements_iterative(
-                    element, current_path, depth, current_parent, element_queue
-                )
-        
-        # CRITICAL: Ensure result is in correct XSD sequence order before returning
-        if isinstance(result, dict):
-            result = self._enforce_sequence_order(root_element, result)
-        
-        return result
-    
-    def _process_single_element_iterative(self, element: xmlschema.validators.XsdElement, path: str, depth: int) -> Any:
-        """Process a single element without recursion."""
-        # Handle null type
-        if element.type is None:
-            string_gen = self.type_factory.create_generator("string", {}, element.local_name)
-            return string_gen.generate(element.local_name, {})
-        
-        # Process simple types
-        if element.type.is_simple():
-            value = self._generate_value_for_type(element.type, element.local_name, path)
-            # Ensure no elements return empty values
-            if value is None or value == "":
-                return self._generate_element_fallback(element.local_name)
-            return value
-        
-        # Process complex types
-        if element.type.is_complex():
-            result = {}
-            
-            # Process attributes
-            if hasattr(element.type, 'attributes') and element.type.attributes:
-                for attr_name, attr in element.type.attributes.items():
-                    if attr.type is not None:
-                        result[f'@{attr_name}'] = self._generate_value_for_type(attr.type, attr_name, path)
-            
-            # Handle complex types with simple content
-            if (hasattr(element.type, 'content') and element.type.content and 
-                hasattr(element.type.content, 'is_simple') and element.type.content.is_simple()):
-                base_value = self._generate_value_for_type(element.type.content, element.local_name, path)
-                if result:  # Has attributes
-                    result['_text'] = base_value
-                    return result
-                else:  # No attributes, just return the value
-                    return base_value
-            
-            return result
-        
-        # Fallback
-        return f"Sample{element.local_name}"
-    
-    def _queue_child_elements_iterative(self, element, current_path: str, depth: int, 
-                                       parent_dict: Dict, element_queue: deque):
-        """Queue child elements for iterative processing using sequence order."""
-        try:
-            content = element.type.content
-            
-            # For sequence models, process elements in exact _group order
-            if hasattr(content, 'model') and str(content.model) == 'sequence':
-                if hasattr(content, '_group') and content._group:
-                    # Process elements in their exact schema sequence order
-                    for group_item in content._group:
-                        # CRITICAL: Handle choice groups specially - select only ONE element
-                        if hasattr(group_item, 'model') and str(group_item.model) == 'choice':
-                            # This is a choice group - select only one element
-                            choice_elements = list(group_item.iter_elements()) if hasattr(group_item, 'iter_elements') else []
-                            selected_choice = self._select_choice_element(choice_elements, current_path)
-                            
-                            if selected_choice:
-                                child_name = self._format_element_name(selected_choice)
-                                new_path = f"{current_path}.{child_name}" if current_path else child_name
-                                
-                                # Skip if already processed (avoid duplicates)
-                                if child_name not in parent_dict:
-                                    # Generate the selected choice element
-                                    if selected_choice.max_occurs is None or selected_choice.max_occurs > 1:
-                                        count = self._get_element_count(child_name, selected_choice, depth)
-                                        safe_count = min(count, max(1, 5 - depth))
-                                        parent_dict[child_name] = []
-                                        for i in range(safe_count):
-                                            list_path = f"{new_path}[{i}]"
-                                            element_queue.append((selected_choice, list_path, depth + 1, parent_dict[child_name], len(parent_dict[child_name])))
-                                            parent_dict[child_name].append({})
-                                    else:
-                                        element_queue.append((selected_choice, new_path, depth + 1, parent_dict, child_name))
-                        
-                        elif hasattr(group_item, 'local_name') and hasattr(group_item, 'type'):
-                            child = group_item
-                            child_name = self._format_element_name(child)
-                            new_path = f"{current_path}.{child_name}" if current_path else child_name
-                            
-                            # CRITICAL: For sequence compliance, NEVER skip elements in their proper order
-                            # Only skip if this exact element instance was already processed to prevent infinite loops
-                            if child_name in parent_dict:
-                                continue
-                            
-                            # Check if this is required element
-                            min_occurs = getattr(child, 'min_occurs', 1) or 0
-                            
-                            # CRITICAL: For sequence compliance, include all elements
-                            if min_occurs > 0:
-                                # Required element
-                                if child.max_occurs is None or child.max_occurs > 1:
-                                    count = max(min_occurs, self._get_element_count(child_name, child, depth))
-                                    safe_count = min(count, max(1, 5 - depth))
-                                    parent_dict[child_name] = []
-                                    for i in range(safe_count):
-                                        list_path = f"{new_path}[{i}]"
-                                        element_queue.append((child, list_path, depth + 1, parent_dict[child_name], len(parent_dict[child_name])))
-                                        parent_dict[child_name].append({})
-                                else:
-                                    element_queue.append((child, new_path, depth + 1, parent_dict, child_name))
-                            elif self._should_include_optional_element(child_name, current_path, depth):  # Include based on generation mode
-                                if child.max_occurs is None or child.max_occurs > 1:
-                                    count = self._get_element_count(child_name, child, depth)
-                                    safe_count = min(count, 1)  # Limit to 1 for optional
-                                    parent_dict[child_name] = []
-                                    for i in range(safe_count):
-                                        list_path = f"{new_path}[{i}]"
-                                        element_queue.append((child, list_path, depth + 1, parent_dict[child_name], len(parent_dict[child_name])))
-                                        parent_dict[child_name].append({})
-                                else:
-                                    element_queue.append((child, new_path, depth + 1, parent_dict, child_name))
-                        elif hasattr(group_item, 'iter_elements') and not hasattr(group_item, 'model'):
-                            # This is a nested group (not choice) - process its elements
-                            for nested_child in group_item.iter_elements():
-                                # CRITICAL: Only process actual elements, not groups
-                                if hasattr(nested_child, 'local_name') and hasattr(nested_child, 'type'):
-                                    child_name = self._format_element_name(nested_child)
-                                    new_path = f"{current_path}.{child_name}" if current_path else child_name
-                                    
-                                    # Skip if already processed (avoid duplicates)
-                                    if child_name in parent_dict:
-                                        continue
-                                    
-                                    # Check if this is required element
-                                    min_occurs = getattr(nested_child, 'min_occurs', 1) or 0
-                                    
-                                    # CRITICAL: For sequence compliance, include all elements
-                                    if min_occurs > 0:
-                                        # Required element
-                                        if nested_child.max_occurs is None or nested_child.max_occurs > 1:
-                                            count = max(min_occurs, self._get_element_count(child_name, nested_child, depth))
-                                            safe_count = min(count, max(1, 5 - depth))
-                                            parent_dict[child_name] = []
-                                            for i in range(safe_count):
-                                                list_path = f"{new_path}[{i}]"
-                                                element_queue.append((nested_child, list_path, depth + 1, parent_dict[child_name], len(parent_dict[child_name])))
-                                                parent_dict[child_name].append({})
-                                        else:
-                                            element_queue.append((nested_child, new_path, depth + 1, parent_dict, child_name))
-                                    elif self._should_include_optional_element(child_name, current_path, depth):  # Include based on generation mode
-                                        if nested_child.max_occurs is None or nested_child.max_occurs > 1:
-                                            count = self._get_element_count(child_name, nested_child, depth)
-                                            safe_count = min(count, 1)  # Limit to 1 for optional
-                                            parent_dict[child_name] = []
-                                            for i in range(safe_count):
-                                                list_path = f"{new_path}[{i}]"
-                                                element_queue.append((nested_child, list_path, depth + 1, parent_dict[child_name], len(parent_dict[child_name])))
-                                                parent_dict[child_name].append({})
-                                        else:
-                                            element_queue.append((nested_child, new_path, depth + 1, parent_dict, child_name))
-                    return
-            
-            # Fallback to old method for non-sequence or when _group is not available
-            # Get elements in proper sequence order
-            ordered_elements = self._get_sequence_ordered_elements(element.type)
-            
-            # Handle choice constructs first
-            choice_elements = self._get_choice_elements(element)
-            processed_choice_elements = set()
-            
-            if choice_elements and len(choice_elements) > 1:
-                # This is a choice construct - select one element
-                selected_element = self._select_choice_element(choice_elements, current_path)
-                if selected_element:
-                    child_name = self._format_element_name(selected_element)
-                    new_path = f"{current_path}.{child_name}" if current_path else child_name
-                    
-                    if selected_element.max_occurs is None or selected_element.max_occurs > 1:
-                        count = self._get_element_count(child_name, selected_element, depth)
-                        safe_count = min(count, max(1, 5 - depth))  # Limit count based on depth
-                        parent_dict[child_name] = []  # Initialize list
-                        # Queue multiple instances
-                        for i in range(safe_count):
-                            list_path = f"{new_path}[{i}]"
-                            element_queue.append((selected_element, list_path, depth + 1, parent_dict[child_name], len(parent_dict[child_name])))
-                            parent_dict[child_name].append({})  # Placeholder that will be filled
-                    else:
-                        element_queue.append((selected_element, new_path, depth + 1, parent_dict, child_name))
-                
-                # Mark choice elements as processed
-                processed_choice_elements.update(choice_elements)
-            
-            # Process remaining elements in sequence order
-            for child in ordered_elements:
-                if child in processed_choice_elements:
-                    continue  # Skip already processed choice elements
-                    
-                child_name = self._format_element_name(child)
-                new_path = f"{current_path}.{child_name}" if current_path else child_name
-                
-                # Skip if already processed (avoid duplicates)
-                if child_name in parent_dict:
-                    continue
-                
-                if child.max_occurs is None or child.max_occurs > 1:
-                    count = self._get_element_count(child_name, child, depth)
-                    safe_count = min(count, max(1, 5 - depth))
-                    parent_dict[child_name] = []
-                    for i in range(safe_count):
-                        list_path = f"{new_path}[{i}]"
-                        element_queue.append((child, list_path, depth + 1, parent_dict[child_name], len(parent_dict[child_name])))
-                        parent_dict[child_name].append({})
-                else:
-                    element_queue.append((child, new_path, depth + 1, parent_dict, child_name))
-        except AttributeError:
-            # Handle cases where content doesn't have iter_elements
-            pass
-    
-    def _generate_element_fallback(self, element_name: str) -> Any:
-        """Generate fallback value for empty elements."""
-        element_lower = element_name.lower()
-        
-        # Numeric elements fallback
-        if any(keyword in element_lower for keyword in ['amount', 'rate', 'measure', 'percent', 'price', 'cost', 'fee']):
-            return 0.0
-        # Boolean elements fallback
-        elif any(keyword in element_lower for keyword in ['ind', 'flag', 'enable', 'allow']):
-            return 'true'
-        # Enumeration-like elements fallback
-        elif any(keyword in element_lower for keyword in ['code', 'type', 'status']):
-            return self._generate_fallback_for_empty_element(element_name, None)
-        # Date/time elements fallback
-        elif any(keyword in element_lower for keyword in ['date', 'time']):
-            return '2024-06-08T12:00:00Z'
-        # General string fallback
-        else:
-            return f"Sample{element_name}"
-    
-    def generate_dummy_xml_with_choices(self, selected_choices=None, unbounded_counts=None, output_path=None) -> str:
+    def generate_dummy_xml_with_choices(self, selected_choices=None, unbounded_counts=None, output_path=None, seed=None) -> str:
         """Generate XML with user-selected choices and unbounded counts."""
         if not self.schema:
             return '<?xml version="1.0" encoding="UTF-8"?><error>Failed to load schema</error>'
@@ -1698,8 +1640,8 @@ class XMLGenerator:
         # Reset all stateful variables for clean generation
         self.processed_types = set()
         
-        # Reset instance counters for sequential selection strategy
-        self.element_instance_counters = {}
+        # Fresh per-document state: instance counters, ID registry, enum rotation, RNG
+        self.context = self._new_generation_context(seed)
         
         # Clear any caches that might affect element processing order
         if hasattr(self, 'constraint_extractor') and self.constraint_extractor:
@@ -1708,26 +1650,42 @@ class XMLGenerator:
             if hasattr(self.constraint_extractor, 'type_resolution_cache'):
                 self.constraint_extractor.type_resolution_cache.clear()
         
-        # Reset ID counter to ensure unique IDs for this document
-        from utils.type_generators import IDTypeGenerator
-        IDTypeGenerator.reset_id_counter()
-        
         # Store user preferences
         self.user_choices = selected_choices or {}
         self.user_unbounded_counts = unbounded_counts or {}
         
         return self.generate_dummy_xml(output_path)
     
-    def generate_dummy_xml_with_options(self, selected_choices=None, unbounded_counts=None, generation_mode="Minimalistic", optional_selections=None, output_path=None, custom_values=None) -> str:
+    def generate_dummy_xml_with_options(self, selected_choices=None, unbounded_counts=None, generation_mode="Minimalistic", optional_selections=None, output_path=None, custom_values=None, seed=None) -> str:
         """Generate XML with comprehensive user options including generation mode, optional element selection, and custom values."""
         if not self.schema:
             return '<?xml version="1.0" encoding="UTF-8"?><error>Failed to load schema</error>'
         
+        self._apply_generation_options(selected_choices, unbounded_counts, generation_mode, optional_selections, custom_values, seed)
+        return self.generate_dummy_xml(output_path)
+    
+    def _new_generation_context(self, seed: Optional[int] = None) -> GenerationContext:
+        """
+        Create the per-document state for a new generation.
+
+        Args:
+            seed: Seed of the document's random number generator (defaults to the
+                configured deterministic_seed, if any)
+
+        Returns:
+            GenerationContext starting from the configured recursion limits
+        """
+        if seed is None:
+            seed = self.template_processor.seed
+        return GenerationContext(seed, self.config.recursion)
+
+    def _apply_generation_options(self, selected_choices=None, unbounded_counts=None, generation_mode="Minimalistic", optional_selections=None, custom_values=None, seed=None) -> None:
+        """Reset per-document state and store the user's generation options."""
         # Reset all stateful variables for clean generation
         self.processed_types = set()
         
-        # Reset instance counters for sequential selection strategy
-        self.element_instance_counters = {}
+        # Fresh per-document state: instance counters, ID registry, enum rotation, RNG
+        self.context = self._new_generation_context(seed)
         
         # Clear any caches that might affect element processing order
         if hasattr(self, 'constraint_extractor') and self.constraint_extractor:
@@ -1736,10 +1694,6 @@ class XMLGenerator:
             if hasattr(self.constraint_extractor, 'type_resolution_cache'):
                 self.constraint_extractor.type_resolution_cache.clear()
         
-        # Reset ID counter to ensure unique IDs for this document
-        from utils.type_generators import IDTypeGenerator
-        IDTypeGenerator.reset_id_counter()
-        
         # Store user preferences
         self.user_choices = selected_choices or {}
         self.user_unbounded_counts = unbounded_counts or {}
@@ -1750,25 +1704,259 @@ class XMLGenerator:
         # Configure depth limits based on generation mode
         if generation_mode == "Complete":
             self.optional_depth_limit = 6  # Include optional elements up to depth 6 (deeper than 5)
-            # Ensure config limits are sufficient for Complete mode
-            if self.config.recursion.max_tree_depth < 6:
-                self.config.recursion.max_tree_depth = 6
-            if self.config.recursion.max_element_depth < 10:
-                self.config.recursion.max_element_depth = 10
+            # Ensure this document's limits are sufficient for Complete mode
+            self.context.ensure_recursion_limits(max_tree_depth=6, max_element_depth=10)
         elif generation_mode == "Custom":
             self.optional_depth_limit = 10  # Allow deep selection in custom mode
-            # Ensure config limits are sufficient for Custom mode
-            if self.config.recursion.max_tree_depth < 10:
-                self.config.recursion.max_tree_depth = 10
-            if self.config.recursion.max_element_depth < 12:
-                self.config.recursion.max_element_depth = 12
+            # Ensure this document's limits are sufficient for Custom mode
+            self.context.ensure_recursion_limits(max_tree_depth=10, max_element_depth=12)
         else:  # Minimalistic
             self.optional_depth_limit = 2  # Current behavior
+    
+    def stream_dummy_xml(self, output, selected_choices=None, unbounded_counts=None, generation_mode="Minimalistic",
+                         optional_selections=None, custom_values=None, seed=None) -> Dict[str, Any]:
+        """
+        Generate XML and write it incrementally to a file or binary stream.
         
-        return self.generate_dummy_xml(output_path)
+        Elements are written as they are generated from the compiled plan, so
+        memory stays bounded by the schema rather than the document. Counts
+        requested in unbounded_counts are therefore not capped by depth.
+        
+        Args:
+            output: File path, or binary file-like object such as socket.makefile('wb')
+            selected_choices: User-selected choice elements
+            unbounded_counts: Occurrence counts for unbounded elements
+            generation_mode: "Minimalistic", "Complete" or "Custom"
+            optional_selections: Optional elements to include in Custom mode
+            custom_values: Custom values for specific elements
+            seed: Seed of the document's random number generator
+            
+        Returns:
+            Dictionary with success flag, element count and timing, or an error message
+        """
+        if not self.schema:
+            return {'success': False, 'error': "Schema not loaded or is None"}
+        if not getattr(self.schema, 'elements', None):
+            return {'success': False, 'error': "Schema has no elements defined"}
+        
+        self._apply_generation_options(selected_choices, unbounded_counts, generation_mode, optional_selections, custom_values, seed)
+        root_name = list(self.schema.elements.keys())[0]
+        root_element = self.schema.elements.get(root_name)
+        start_time = time.time()
+        
+        try:
+            self._streaming = True
+            try:
+                plan = get_plan_cache().get_plan(self, root_element, root_name)
+            finally:
+                self._streaming = False
+            self._qname_cache.update(plan.qnames)
+            
+            if isinstance(output, str):
+                with open(output, 'wb') as stream:
+                    elements = self._write_plan_stream(plan, stream)
+            else:
+                elements = self._write_plan_stream(plan, output)
+        except Exception as e:
+            return {'success': False, 'error': f"Error streaming XML: {str(e)}"}
+        
+        seconds = time.time() - start_time
+        print(f"Streamed {elements} elements in {seconds:.2f} seconds")
+        result = {
+            'success': True,
+            'root_element': root_name,
+            'elements': elements,
+            'value_slots': plan.slot_count,
+            'seconds': seconds
+        }
+        if isinstance(output, str):
+            result['output_path'] = output
+        return result
+    
+    def _write_plan_stream(self, plan, stream) -> int:
+        """Write a plan's document to a binary stream and return the element count."""
+        stream.write(b'<?xml version="1.0" encoding="UTF-8"?>\n')
+        with etree.xmlfile(stream, encoding='utf-8') as xml_file:
+            writer = StreamingXMLWriter(xml_file, nsmap=self._build_namespace_map())
+            plan.stream(self, writer)
+        stream.write(b'\n')
+        return writer.elements_written
+    
+    def generate_document(self, index: int, seed: int = 0, options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Generate one document of a batch from its derived seed.
+        
+        Each document gets a fresh generation context (ID registry, enumeration
+        rotation, relationship state, random number generator seeded from the
+        derived seed), so its content depends only on the batch seed, its index
+        and the options - not on documents generated before it or on the
+        process that generates it.
+        
+        Args:
+            index: Zero-based document index within the batch
+            seed: Batch seed
+            options: Keyword arguments for generate_dummy_xml_with_options
+            
+        Returns:
+            Generated XML content (or error XML)
+        """
+        options = options or {}
+        self._check_batch_options(options)
+        
+        self.template_processor.clear_cache()
+        return self.generate_dummy_xml_with_options(**options, seed=derive_document_seed(seed, index))
+    
+    def generate_batch(self, n: int, seed: int = 0, options: Optional[Dict[str, Any]] = None,
+                       workers: Optional[int] = None) -> Iterator[str]:
+        """
+        Generate a batch of documents from the loaded schema.
+        
+        The schema, type resolution caches and compiled generation plan are
+        reused across documents. With more than one worker the batch is split
+        into contiguous index ranges generated by forked processes that inherit
+        the loaded schema; output is identical to serial generation. Forking is
+        only safe in a single-threaded process, so the batch is generated
+        serially whenever other threads are running, which is always the case
+        inside the Streamlit app and GenerationJobRunner jobs; parallel batches
+        are for scripts and the command line. Throughput is printed and stored
+        in last_batch_stats once the batch is exhausted.
+        
+        Args:
+            n: Number of documents to generate
+            seed: Batch seed; document i uses derive_document_seed(seed, i)
+            options: Keyword arguments for generate_dummy_xml_with_options
+            workers: Worker processes (defaults to config performance.generation_workers)
+            
+        Yields:
+            Generated XML content for each document, in index order
+        """
+        if n < 0:
+            raise ValueError("Batch size cannot be negative")
+        self._check_batch_options(options or {})
+        if workers is None:
+            workers = self.config.performance.generation_workers
+        
+        start_time = time.time()
+        if workers > 1 and n > 1:
+            documents = self._generate_batch_parallel(n, seed, options, workers)
+        else:
+            documents = (self.generate_document(index, seed, options) for index in range(n))
+        
+        failed = 0
+        for xml_content in documents:
+            if self._is_error_xml(xml_content):
+                failed += 1
+            yield xml_content
+        
+        self.last_batch_stats = self._batch_stats(n, failed, seed, time.time() - start_time)
+        self.last_batch_stats['workers'] = max(1, workers)
+        print(f"Generated {n} documents in {self.last_batch_stats['seconds']:.2f} seconds "
+              f"({self.last_batch_stats['docs_per_second']:.1f} docs/sec)")
+    
+    def _generate_batch_parallel(self, n: int, seed: int, options: Optional[Dict[str, Any]], workers: int) -> Iterator[str]:
+        """Generate batch documents in forked worker processes, in index order."""
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            print("Warning: fork start method not available, generating batch serially")
+            for index in range(n):
+                yield self.generate_document(index, seed, options)
+            return
+        if threading.active_count() > 1:
+            # Forking while other threads hold locks (e.g. background generation
+            # jobs in the Streamlit server) can deadlock the workers
+            print("Warning: other threads are running, generating batch serially")
+            for index in range(n):
+                yield self.generate_document(index, seed, options)
+            return
+        
+        # The first document compiles the generation plan in the parent, so
+        # every worker inherits it along with the schema
+        yield self.generate_document(0, seed, options)
+        
+        chunk_size = max(1, min(BATCH_MAX_CHUNK, (n - 1) // (workers * 4)))
+        ranges = [(start, min(start + chunk_size, n)) for start in range(1, n, chunk_size)]
+        
+        # Each worker, including replacements forked later, gets the batch state
+        # from the pool initializer, so concurrent batches do not share it
+        with multiprocessing.get_context('fork').Pool(processes=min(workers, len(ranges)),
+                                                      initializer=_init_fork_batch,
+                                                      initargs=(self, seed, options)) as pool:
+            for documents in pool.imap(_generate_document_range, ranges):
+                yield from documents
+    
+    def write_batch(self, n: int, output_path: str, seed: int = 0, options: Optional[Dict[str, Any]] = None,
+                    workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Generate a batch of documents into a directory or a .zip archive.
+        
+        Args:
+            n: Number of documents to generate
+            output_path: Target directory, or archive path ending in .zip
+            seed: Batch seed
+            options: Keyword arguments for generate_dummy_xml_with_options
+            workers: Worker processes (defaults to config performance.generation_workers)
+            
+        Returns:
+            Dictionary with success flag, document/failure counts, output path,
+            elapsed seconds and docs_per_second
+        """
+        prefix = os.path.splitext(os.path.basename(self.xsd_path))[0]
+        documents = self.generate_batch(n, seed, options, workers)
+        
+        try:
+            if output_path.lower().endswith('.zip'):
+                with zipfile.ZipFile(output_path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+                    for index, xml_content in enumerate(documents):
+                        archive.writestr(f"{prefix}_{index:06d}.xml", xml_content)
+            else:
+                os.makedirs(output_path, exist_ok=True)
+                for index, xml_content in enumerate(documents):
+                    with open(os.path.join(output_path, f"{prefix}_{index:06d}.xml"), 'w', encoding='utf-8') as f:
+                        f.write(xml_content)
+        except OSError as e:
+            return {'success': False, 'error': f"Could not write batch to {output_path}: {e}"}
+        
+        stats = dict(self.last_batch_stats)
+        stats['output_path'] = output_path
+        return stats
+    
+    def _check_batch_options(self, options: Dict[str, Any]) -> None:
+        """Reject option names generate_dummy_xml_with_options does not accept."""
+        unknown = set(options) - set(BATCH_OPTION_NAMES)
+        if unknown:
+            raise ValueError(f"Unknown generation options: {', '.join(sorted(unknown))}")
+    
+    def _batch_stats(self, documents: int, failed: int, seed: int, seconds: float) -> Dict[str, Any]:
+        """Build the throughput summary of a generated batch."""
+        return {
+            'success': failed == 0,
+            'documents': documents,
+            'failed': failed,
+            'seed': seed,
+            'seconds': seconds,
+            'docs_per_second': documents / seconds if seconds > 0 else 0.0
+        }
+    
+    def _is_error_xml(self, xml_content: str) -> bool:
+        """Check whether generated content is an error document."""
+        return xml_content.startswith('<?xml version="1.0" encoding="UTF-8"?>\n<error>') or \
+            xml_content.startswith('<?xml version="1.0" encoding="UTF-8"?><error>')
     
     def generate_dummy_xml(self, output_path: Optional[str] = None) -> str:
         """Generate a dummy XML file based on the XSD schema."""
+        if self.profiler is None:
+            return self._generate_dummy_xml(output_path)
+        
+        # Profiled generations take the recursive path so time is attributed to schema paths
+        self.profiler.start(self)
+        try:
+            return self._generate_dummy_xml(output_path)
+        finally:
+            self.profiler.stop(self)
+            print(f"Profiled generation: {len(self.profiler.paths)} schema paths, "
+                  f"{self.profiler.total_time:.2f} seconds")
+    
+    def _generate_dummy_xml(self, output_path: Optional[str] = None) -> str:
+        """Generate the document; generate_dummy_xml adds profiling around this."""
         if not self.schema:
             return self._create_error_xml("Schema not loaded or is None")
         
@@ -1796,17 +1984,23 @@ class XMLGenerator:
             self.processed_types = set()
             
             try:
-                # Create a dictionary representation of the XML using iterative or recursive approach
-                if self.config.iterative.enable_iterative_processing:
-                    xml_dict = self._create_element_dict_iterative(
-                        root_element, 
-                        root_name, 
-                        max_depth=self.config.iterative.max_processing_depth
-                    )
-                    print(f"Generated XML using iterative approach (depth limit: {self.config.iterative.max_processing_depth})")
+                # Create a dictionary representation of the XML from a compiled plan or a schema walk
+                if self._use_generation_plan():
+                    xml_dict = self._create_element_dict_from_plan(root_element, root_name)
+                    print(f"Generated XML using compiled generation plan")
+                elif self._use_incremental_cache():
+                    xml_dict = self._create_root_element_dict_incremental(root_element, root_name)
                 else:
-                    xml_dict = self._create_element_dict(root_element, root_name)
-                    print(f"Generated XML using recursive approach")
+                    self._subtree_memo = self._new_subtree_memo()
+                    try:
+                        xml_dict = self._create_root_element_dict(root_element, root_name)
+                    finally:
+                        memo, self._subtree_memo = self._subtree_memo, None
+                    engine = "iterative" if self._use_iterative_engine() else "recursive"
+                    print(f"Generated XML using {engine} approach")
+                    if memo is not None:
+                        stats = memo.get_stats()
+                        print(f"Subtree memo: {stats['templates']} templates, {stats['hits']} reused occurrences")
                 
                 if not xml_dict:
                     return self._create_error_xml("Generated XML dictionary is empty")
@@ -1821,28 +2015,15 @@ class XMLGenerator:
                 return self._create_error_xml(f"Error creating element dictionary: {str(e)}")
             
             # Build namespace map safely
-            nsmap = {}
-            try:
-                if hasattr(self.schema, 'namespaces') and self.schema.namespaces:
-                    for prefix, uri in self.schema.namespaces.items():
-                        if prefix and uri and prefix != 'xml':
-                            nsmap[prefix] = uri
-                
-                if hasattr(self.schema, 'target_namespace') and self.schema.target_namespace:
-                    nsmap[None] = self.schema.target_namespace
-            except Exception as e:
-                print(f"Warning: Error building namespace map: {e}")
+            nsmap = self._build_namespace_map()
             
             # Build XML tree with fallback
             xml_string = ""
             try:
-                if self.schema.target_namespace:
-                    root = etree.Element(etree.QName(self.schema.target_namespace, root_name), nsmap=nsmap)
-                else:
-                    root = etree.Element(root_name, nsmap=nsmap)
+                root = etree.Element(self._root_qname(root_name), nsmap=nsmap)
                     
                 # Build XML tree using iterative or recursive approach
-                if self.config.iterative.enable_iterative_processing:
+                if self._use_iterative_engine():
                     self._build_xml_tree_iterative(root, xml_dict)
                 else:
                     self._build_xml_tree(root, xml_dict)
@@ -1884,6 +2065,88 @@ class XMLGenerator:
         except Exception as e:
             return self._create_error_xml(f"Unexpected error during XML generation: {str(e)}")
     
+    def _use_incremental_cache(self) -> bool:
+        """Check whether this generation reuses and records subtrees of the previous document."""
+        # Profiled generations walk every element
+        return self.incremental_cache is not None and self.profiler is None
+    
+    def _create_root_element_dict_incremental(self, root_element: xmlschema.validators.XsdElement, root_name: str) -> Any:
+        """
+        Create the root element dictionary, reusing unchanged subtrees of the previous document.
+        
+        Subtrees whose choice, count and optional-inclusion lookups give the
+        same answers with the new options are spliced in unchanged, keeping
+        their values and IDs; the others are walked again and cached for the
+        next generation.
+        
+        Args:
+            root_element: Root XSD element to process
+            root_name: Name of the root element
+            
+        Returns:
+            Dictionary with element structure and generated values
+        """
+        cache = self.incremental_cache
+        incremental = cache.begin(self, self._incremental_signature(root_name))
+        self._incremental_active = True
+        xml_dict = None
+        try:
+            xml_dict = self._create_root_element_dict(root_element, root_name)
+        finally:
+            self._incremental_active = False
+            cache.end(self, completed=bool(xml_dict))
+        
+        stats = cache.get_stats()
+        if incremental:
+            print(f"Generated XML incrementally: {stats['reused']} subtrees reused, {stats['regenerated']} regenerated")
+        else:
+            print(f"Generated XML using {'iterative' if self._use_iterative_engine() else 'recursive'} approach "
+                  f"({stats['regenerated']} subtrees cached)")
+        return xml_dict
+    
+    def _build_namespace_map(self) -> Dict[Optional[str], str]:
+        """Build the namespace map declared on the root element."""
+        nsmap = {}
+        try:
+            if hasattr(self.schema, 'namespaces') and self.schema.namespaces:
+                for prefix, uri in self.schema.namespaces.items():
+                    if prefix and uri and prefix != 'xml':
+                        nsmap[prefix] = uri
+            
+            if hasattr(self.schema, 'target_namespace') and self.schema.target_namespace:
+                nsmap[None] = self.schema.target_namespace
+        except Exception as e:
+            print(f"Warning: Error building namespace map: {e}")
+        return nsmap
+    
+    def _root_qname(self, root_name: str):
+        """Determine the qualified name of the root element."""
+        if self.schema.target_namespace:
+            return etree.QName(self.schema.target_namespace, root_name)
+        return root_name
+    
+    def _create_element_dict_from_plan(self, root_element: xmlschema.validators.XsdElement, root_name: str) -> Any:
+        """
+        Create the root element dictionary by executing a compiled generation plan.
+        
+        The plan is compiled from the recursive walk on first use and cached per
+        schema hash, root element and generation options, so repeat generations
+        skip schema introspection.
+        
+        Args:
+            root_element: Root XSD element to process
+            root_name: Name of the root element
+            
+        Returns:
+            Dictionary with element structure and generated values
+        """
+        plan = get_plan_cache().get_plan(self, root_element, root_name)
+        if self.progress is not None:
+            # Replays visit no element frames; report the root so cancellation still applies
+            self.progress.element(root_name)
+        self._qname_cache.update(plan.qnames)
+        return plan.execute(self)
+    
     def _create_error_xml(self, message: str) -> str:
         """Create a standardized error XML response."""
         return (
@@ -1898,7 +2161,30 @@ class XMLGenerator:
         """Recursively build an XML tree from a dictionary."""
         if data is None:
             return
-            
+        
+        for child_element, child_data in self._fill_xml_element(parent_element, data):
+            self._build_xml_tree(child_element, child_data)
+    
+    def _build_xml_tree_iterative(self, root_element: etree.Element, root_data: Union[Dict[str, Any], str, int, float, bool, None]) -> None:
+        """Build the same XML tree as _build_xml_tree depth-first with an explicit stack (no recursion)."""
+        if root_data is None:
+            return
+        
+        stack = [self._fill_xml_element(root_element, root_data)]
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+            else:
+                stack.append(self._fill_xml_element(*child))
+    
+    def _fill_xml_element(self, parent_element: etree.Element, data: Union[Dict[str, Any], str, int, float, bool]) -> Iterator[Tuple[etree.Element, Dict[str, Any]]]:
+        """
+        Set an element's attributes, text and simple children from its dictionary.
+        
+        Yields:
+            (child element, child dictionary) for each complex child, in document order
+        """
         if isinstance(data, dict):
             # Process attributes first
             for k, v in data.items():
@@ -1916,20 +2202,14 @@ class XMLGenerator:
                 if isinstance(k, str) and not k.startswith('@') and not k.startswith('_'):
                     
                     # Determine qualified name
-                    if ':' in k:
-                        ns_prefix, local_name = k.split(':', 1)
-                        ns_uri = self.schema.namespaces.get(ns_prefix)
-                        qname = etree.QName(ns_uri, local_name) if ns_uri else k
-                    else:
-                        ns_uri = self.schema.target_namespace
-                        qname = etree.QName(ns_uri, k) if ns_uri else k
+                    qname = self._determine_qname(k)
                     
                     # Create elements
                     if isinstance(v, list):
                         for item in v:
                             child_element = etree.SubElement(parent_element, qname)
                             if isinstance(item, dict):
-                                self._build_xml_tree(child_element, item)
+                                yield child_element, item
                             else:
                                 # Prevent empty list items
                                 if item is not None and self._is_valid_content(item):
@@ -1940,7 +2220,7 @@ class XMLGenerator:
                     else:
                         child_element = etree.SubElement(parent_element, qname)
                         if isinstance(v, dict):
-                            self._build_xml_tree(child_element, v)
+                            yield child_element, v
                         else:
                             # Prevent empty elements - ensure we have valid content
                             if v is not None and self._is_valid_content(v):
@@ -1952,80 +2232,21 @@ class XMLGenerator:
         else:
             parent_element.text = str(data)
     
-    def _build_xml_tree_iterative(self, root_element: etree.Element, root_data: Union[Dict[str, Any], str, int, float, bool, None]) -> None:
-        """Build XML tree using iterative approach with queue-based processing (no recursion)."""
-        if root_data is None:
-            return
-        
-        # Use queue for iterative processing - (parent_element, data)
-        build_queue = deque([(root_element, root_data)])
-        element_count = 0
-        max_elements = 10000  # Configurable limit for memory safety
-        
-        while build_queue and element_count < max_elements:
-            parent_element, data = build_queue.popleft()
-            element_count += 1
-            
-            if data is None:
-                continue
-            
-            if isinstance(data, dict):
-                # Process attributes first
-                for k, v in data.items():
-                    if isinstance(k, str) and k.startswith('@'):
-                        attr_name = k[1:]
-                        if v is not None:
-                            parent_element.set(attr_name, str(v))
-                
-                # Handle text content for complex types with simple content
-                if '_text' in data:
-                    parent_element.text = str(data['_text'])
-                
-                # Process elements - queue them for processing instead of recursing
-                for k, v in data.items():
-                    if isinstance(k, str) and not k.startswith('@') and not k.startswith('_'):
-                        
-                        # Determine qualified name
-                        qname = self._determine_qname(k)
-                        
-                        # Create elements and queue their processing
-                        if isinstance(v, list):
-                            for item in v:
-                                child_element = etree.SubElement(parent_element, qname)
-                                if isinstance(item, dict):
-                                    # Queue for iterative processing
-                                    build_queue.append((child_element, item))
-                                else:
-                                    # Handle non-dict items directly
-                                    if item is not None and self._is_valid_content(item):
-                                        child_element.text = str(item)
-                                    else:
-                                        fallback_value = self._generate_fallback_for_empty_element(k, qname)
-                                        child_element.text = fallback_value
-                        else:
-                            child_element = etree.SubElement(parent_element, qname)
-                            if isinstance(v, dict):
-                                # Queue for iterative processing
-                                build_queue.append((child_element, v))
-                            else:
-                                # Handle non-dict values directly
-                                if v is not None and self._is_valid_content(v):
-                                    child_element.text = str(v)
-                                else:
-                                    fallback_value = self._generate_fallback_for_empty_element(k, qname)
-                                    child_element.text = fallback_value
-            else:
-                parent_element.text = str(data)
-    
     def _determine_qname(self, element_name: str):
-        """Determine qualified name for an element."""
+        """Determine qualified name for an element (memoized per generator)."""
+        qname = self._qname_cache.get(element_name)
+        if qname is not None:
+            return qname
+        
         if ':' in element_name:
             ns_prefix, local_name = element_name.split(':', 1)
             ns_uri = self.schema.namespaces.get(ns_prefix)
-            return etree.QName(ns_uri, local_name) if ns_uri else element_name
+            qname = etree.QName(ns_uri, local_name) if ns_uri else element_name
         else:
             ns_uri = self.schema.target_namespace
-            return etree.QName(ns_uri, element_name) if ns_uri else element_name
+            qname = etree.QName(ns_uri, element_name) if ns_uri else element_name
+        self._qname_cache[element_name] = qname
+        return qname
     
     def _is_valid_content(self, value: Any) -> bool:
         """Check if a value is valid content for XML elements (including numeric zeros)."""
@@ -0,0 +1,92 @@
+"""
+Streaming XML writer module for XML Wizard.
+
+This module provides an incremental, pretty-printing XML writer on top of
+lxml's etree.xmlfile. Elements are written as they are produced, so only the
+chain of currently open elements is held in memory, and the output matches
+etree.tostring(..., pretty_print=True) except that empty elements are written
+with an explicit end tag.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from lxml import etree
+
+
+class _OpenElement:
+    """Element whose start tag may still be waiting for attributes."""
+
+    __slots__ = ('qname', 'attributes', 'text', 'context', 'has_children')
+
+    def __init__(self, qname: Any):
+        self.qname = qname
+        self.attributes: Dict[str, str] = {}
+        self.text: Optional[str] = None
+        self.context = None
+        self.has_children = False
+
+
+class StreamingXMLWriter:
+    """Writes element events to an lxml xmlfile with pretty-print indentation."""
+
+    def __init__(self, xml_file, nsmap: Optional[Dict[Optional[str], str]] = None, indent: str = '  '):
+        """
+        Initialize the writer.
+
+        Args:
+            xml_file: Open etree.xmlfile context
+            nsmap: Namespace map declared on the root element
+            indent: Indentation added per nesting level
+        """
+        self.xml_file = xml_file
+        self.nsmap = nsmap or {}
+        self.indent = indent
+        self.elements_written = 0
+        self._open: List[_OpenElement] = []
+
+    def start(self, qname: Any) -> None:
+        """Open an element; its start tag is written once its content begins."""
+        if self._open:
+            self._begin_child()
+        self._open.append(_OpenElement(qname))
+
+    def attribute(self, name: str, value: str) -> None:
+        """Set an attribute on the most recently opened element."""
+        self._open[-1].attributes[name] = value
+
+    def text(self, value: str) -> None:
+        """Set the text of the most recently opened element."""
+        self._open[-1].text = value
+
+    def leaf(self, qname: Any, text: Optional[str]) -> None:
+        """Write a complete text-only child element."""
+        self._begin_child()
+        with self.xml_file.element(qname):
+            if text:
+                self.xml_file.write(text)
+        self.elements_written += 1
+
+    def end(self) -> None:
+        """Close the most recently opened element."""
+        element = self._open[-1]
+        if element.context is None:
+            self._write_start_tag(element)
+        elif element.has_children:
+            self.xml_file.write('\n' + self.indent * (len(self._open) - 1))
+        element.context.__exit__(None, None, None)
+        self._open.pop()
+        self.elements_written += 1
+
+    def _write_start_tag(self, element: _OpenElement) -> None:
+        nsmap = self.nsmap if len(self._open) == 1 else None
+        element.context = self.xml_file.element(element.qname, element.attributes, nsmap=nsmap)
+        element.context.__enter__()
+        if element.text:
+            self.xml_file.write(element.text)
+
+    def _begin_child(self) -> None:
+        parent = self._open[-1]
+        if parent.context is None:
+            self._write_start_tag(parent)
+        parent.has_children = True
+        self.xml_file.write('\n' + self.indent * len(self._open))
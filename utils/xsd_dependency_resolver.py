@@ -0,0 +1,200 @@
+"""
+XSD dependency resolver module for XML Wizard.
+
+This module computes the exact transitive closure of an XSD schema's
+xs:import/xs:include/xs:redefine/xs:override references. Only the header of
+each file is read: parsing stops at the first top-level child that is not a
+dependency declaration, so large type libraries are never parsed in full.
+"""
+
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, unquote
+
+from lxml import etree
+
+
+XSD_NAMESPACE = 'http://www.w3.org/2001/XMLSchema'
+SCHEMA_TAG = f'{{{XSD_NAMESPACE}}}schema'
+ANNOTATION_TAG = f'{{{XSD_NAMESPACE}}}annotation'
+DEPENDENCY_TAGS = {
+    f'{{{XSD_NAMESPACE}}}import': 'import',
+    f'{{{XSD_NAMESPACE}}}include': 'include',
+    f'{{{XSD_NAMESPACE}}}redefine': 'redefine',
+    f'{{{XSD_NAMESPACE}}}override': 'override',
+}
+
+
+@dataclass
+class SchemaHeader:
+    """Dependency declarations read from the top of an XSD file."""
+    path: str
+    is_schema: bool
+    target_namespace: Optional[str] = None
+    # (kind, namespace, schemaLocation) for each declaration, in document order
+    dependencies: List[Tuple[str, Optional[str], Optional[str]]] = field(default_factory=list)
+
+
+@dataclass
+class DependencyClosure:
+    """Transitive closure of the files an XSD schema depends on."""
+    root_path: str
+    files: List[str] = field(default_factory=list)
+    namespace_locations: Dict[str, List[str]] = field(default_factory=dict)
+    unresolved: List[str] = field(default_factory=list)
+    is_schema: bool = True
+
+    @property
+    def dependencies(self) -> List[str]:
+        """Files in the closure other than the root schema."""
+        return [path for path in self.files if path != self.root_path]
+
+
+class XSDDependencyResolver:
+    """Resolves the import graph of XSD schemas from their headers only."""
+
+    def __init__(self):
+        """Initialize the dependency resolver with an empty header cache."""
+        self._header_cache: Dict[str, Tuple[Tuple[int, int], SchemaHeader]] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, xsd_path: str, search_dirs: Optional[List[str]] = None) -> DependencyClosure:
+        """
+        Compute the transitive dependency closure of a schema.
+
+        Args:
+            xsd_path: Path to the root XSD file
+            search_dirs: Extra directories searched for locations that do not
+                resolve relative to the importing file (e.g. the original
+                directory of an uploaded schema)
+
+        Returns:
+            DependencyClosure with the root first and dependencies in
+            breadth-first discovery order
+        """
+        root_path = os.path.abspath(xsd_path)
+        search_dirs = [os.path.abspath(d) for d in (search_dirs or [])]
+        closure = DependencyClosure(root_path=root_path)
+
+        root_header = self.read_header(root_path)
+        closure.is_schema = root_header.is_schema
+
+        pending = [root_path]
+        seen = {root_path}
+        while pending:
+            current = pending.pop(0)
+            closure.files.append(current)
+            header = root_header if current == root_path else self.read_header(current)
+
+            base_dir = os.path.dirname(current)
+            for kind, namespace, location in header.dependencies:
+                if not location:
+                    continue
+                resolved = self._resolve_location(base_dir, location, search_dirs)
+                if resolved is None:
+                    if location not in closure.unresolved:
+                        closure.unresolved.append(location)
+                    continue
+
+                if kind == 'import' and namespace:
+                    locations = closure.namespace_locations.setdefault(namespace, [])
+                    if resolved not in locations:
+                        locations.append(resolved)
+
+                if resolved not in seen:
+                    seen.add(resolved)
+                    pending.append(resolved)
+
+        return closure
+
+    def read_header(self, xsd_path: str) -> SchemaHeader:
+        """
+        Read the dependency declarations at the top of an XSD file.
+
+        Headers are cached per file and re-read when the file's size or
+        modification time changes.
+
+        Args:
+            xsd_path: Path to the XSD file
+
+        Returns:
+            SchemaHeader for the file (is_schema is False when the file is
+            missing, unparseable or not an xs:schema document)
+        """
+        xsd_path = os.path.abspath(xsd_path)
+        try:
+            stat = os.stat(xsd_path)
+            signature = (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            return SchemaHeader(path=xsd_path, is_schema=False)
+
+        with self._lock:
+            cached = self._header_cache.get(xsd_path)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        header = self._parse_header(xsd_path)
+        with self._lock:
+            self._header_cache[xsd_path] = (signature, header)
+        return header
+
+    def _parse_header(self, xsd_path: str) -> SchemaHeader:
+        """Stream the start of a file, stopping at the first non-dependency child."""
+        header = SchemaHeader(path=xsd_path, is_schema=False)
+        depth = 0
+        try:
+            with open(xsd_path, 'rb') as f:
+                for event, elem in etree.iterparse(f, events=('start', 'end'), remove_comments=True):
+                    if event == 'end':
+                        depth -= 1
+                        continue
+
+                    depth += 1
+                    if depth == 1:
+                        if elem.tag != SCHEMA_TAG:
+                            break
+                        header.is_schema = True
+                        header.target_namespace = elem.get('targetNamespace')
+                    elif depth == 2:
+                        kind = DEPENDENCY_TAGS.get(elem.tag)
+                        if kind:
+                            header.dependencies.append(
+                                (kind, elem.get('namespace'), elem.get('schemaLocation'))
+                            )
+                        elif elem.tag != ANNOTATION_TAG:
+                            break
+        except (etree.XMLSyntaxError, OSError) as e:
+            print(f"Warning: Could not read dependencies of {xsd_path}: {e}")
+        return header
+
+    def _resolve_location(self, base_dir: str, location: str, search_dirs: List[str]) -> Optional[str]:
+        """Resolve a schemaLocation to a local file path, or None if not found."""
+        parts = urlsplit(location)
+        if parts.scheme not in ('', 'file'):
+            # Remote locations are left to xmlschema's own URL handling
+            return None
+        relative = unquote(parts.path) if parts.scheme == 'file' else location
+
+        candidate = os.path.normpath(os.path.join(base_dir, relative))
+        if os.path.isfile(candidate):
+            return candidate
+
+        for search_dir in search_dirs:
+            for name in (relative, os.path.basename(relative)):
+                candidate = os.path.normpath(os.path.join(search_dir, name))
+                if os.path.isfile(candidate):
+                    return candidate
+        return None
+
+
+_dependency_resolver: Optional[XSDDependencyResolver] = None
+
+
+def get_dependency_resolver() -> XSDDependencyResolver:
+    """Get the process-wide dependency resolver (shares the header cache)."""
+    global _dependency_resolver
+    if _dependency_resolver is None:
+        _dependency_resolver = XSDDependencyResolver()
+    return _dependency_resolver
@@ -7,6 +7,7 @@ This module provides utilities for parsing XSD schema files.
 import os
 import xmlschema
 from typing import Dict, Any, Optional
+from .schema_registry import get_schema_registry
 
 
 class XSDParser:
@@ -26,7 +27,7 @@ class XSDParser:
     def _load_schema(self) -> None:
         """Load the XSD schema from the file."""
         try:
-            self.schema = xmlschema.XMLSchema(self.xsd_path)
+            self.schema = get_schema_registry().get_schema(self.xsd_path)
         except Exception as e:
             raise ValueError(f"Failed to load XSD schema: {e}")
     
@@ -0,0 +1,561 @@
+"""
+XSD regular expression sampling module for XML Wizard.
+
+This module parses XML Schema regular expressions (XSD Part 2, Appendix F)
+into a small automaton of sampling nodes: character classes, sequences,
+alternations and bounded or unbounded repeats. Sampling walks the automaton
+with a seeded random generator, so the same pattern and seed always produce
+the same conforming string, optionally steered towards a target length.
+Compiled patterns are cached per pattern string.
+"""
+
+import random
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+
+# Extra repetitions sampled above a quantifier's minimum when no length is requested
+MAX_EXTRA_REPEATS = 3
+
+# Compiled patterns kept per process
+PATTERN_CACHE_SIZE = 512
+
+# Candidate characters, tried in order when sampling a character class
+_PREFERRED_CHARS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789abcdefghijklmnopqrstuvwxyz'
+_PRINTABLE_CHARS = ''.join(chr(cp) for cp in range(0x20, 0x7F) if chr(cp) not in _PREFERRED_CHARS)
+_MAX_EXTENDED_CANDIDATES = 32
+
+# Characters with special meaning outside character class expressions
+_META_CHARS = '.\\?*+{}()|[]'
+
+_SINGLE_CHAR_ESCAPES = {
+    'n': '\n', 'r': '\r', 't': '\t', '\\': '\\', '|': '|', '.': '.', '?': '?', '*': '*',
+    '+': '+', '(': '(', ')': ')', '{': '{', '}': '}', '-': '-', '[': '[', ']': ']', '^': '^'
+}
+
+# XML 1.1 NameStartChar ranges used for \i; \c adds the NameChar extras
+_NAME_START_RANGES = (
+    (0x3A, 0x3A), (0x41, 0x5A), (0x5F, 0x5F), (0x61, 0x7A), (0xC0, 0xD6), (0xD8, 0xF6),
+    (0xF8, 0x2FF), (0x370, 0x37D), (0x37F, 0x1FFF), (0x200C, 0x200D), (0x2070, 0x218F),
+    (0x2C00, 0x2FEF), (0x3001, 0xD7FF), (0xF900, 0xFDCF), (0xFDF0, 0xFFFD), (0x10000, 0xEFFFF)
+)
+_NAME_EXTRA_RANGES = ((0x2D, 0x2E), (0x30, 0x39), (0xB7, 0xB7), (0x300, 0x36F), (0x203F, 0x2040))
+
+_UNICODE_BLOCKS = {
+    'BasicLatin': (0x0000, 0x007F),
+    'Latin-1Supplement': (0x0080, 0x00FF),
+    'LatinExtended-A': (0x0100, 0x017F),
+    'LatinExtended-B': (0x0180, 0x024F),
+    'IPAExtensions': (0x0250, 0x02AF),
+    'Greek': (0x0370, 0x03FF),
+    'GreekandCoptic': (0x0370, 0x03FF),
+    'Cyrillic': (0x0400, 0x04FF),
+    'Hebrew': (0x0590, 0x05FF),
+    'Arabic': (0x0600, 0x06FF),
+    'GeneralPunctuation': (0x2000, 0x206F),
+    'CurrencySymbols': (0x20A0, 0x20CF),
+    'Hiragana': (0x3040, 0x309F),
+    'Katakana': (0x30A0, 0x30FF),
+    'CJKUnifiedIdeographs': (0x4E00, 0x9FFF),
+}
+
+
+class XSDPatternError(ValueError):
+    """Raised for patterns that are malformed or use unsupported syntax."""
+
+
+def _in_ranges(ranges: Tuple[Tuple[int, int], ...]) -> Callable[[str], bool]:
+    def contains(char: str) -> bool:
+        code = ord(char)
+        return any(start <= code <= end for start, end in ranges)
+    return contains
+
+
+def _category(name: str) -> Callable[[str], bool]:
+    if name.startswith('Is'):
+        block = _UNICODE_BLOCKS.get(name[2:])
+        if block is None:
+            raise XSDPatternError(f"Unsupported Unicode block: {name}")
+        return _in_ranges((block,))
+    if len(name) not in (1, 2) or not name[0].isupper():
+        raise XSDPatternError(f"Unsupported Unicode category: {name}")
+    return lambda char: unicodedata.category(char).startswith(name)
+
+
+class CharClass:
+    """Set of characters described by a membership predicate."""
+
+    __slots__ = ('contains', '_alphabet')
+
+    def __init__(self, contains: Callable[[str], bool]):
+        self.contains = contains
+        self._alphabet: Optional[str] = None
+
+    @classmethod
+    def literal(cls, chars: str) -> 'CharClass':
+        return cls(lambda char: char in chars)
+
+    @classmethod
+    def union(cls, classes: List['CharClass']) -> 'CharClass':
+        predicates = [char_class.contains for char_class in classes]
+        return cls(lambda char: any(contains(char) for contains in predicates))
+
+    def negate(self) -> 'CharClass':
+        contains = self.contains
+        return CharClass(lambda char: not contains(char))
+
+    def subtract(self, other: 'CharClass') -> 'CharClass':
+        contains, excluded = self.contains, other.contains
+        return CharClass(lambda char: contains(char) and not excluded(char))
+
+    @property
+    def alphabet(self) -> str:
+        """Characters sampled for this class, preferring readable ASCII."""
+        if self._alphabet is None:
+            alphabet = ''.join(char for char in _PREFERRED_CHARS if self.contains(char))
+            if not alphabet:
+                alphabet = ''.join(char for char in _PRINTABLE_CHARS if self.contains(char))
+            if not alphabet:
+                alphabet = self._scan_extended()
+            if not alphabet:
+                raise XSDPatternError("Character class matches no character")
+            self._alphabet = alphabet
+        return self._alphabet
+
+    def _scan_extended(self) -> str:
+        found = []
+        for code in range(0xA0, 0x10000):
+            if 0xD800 <= code <= 0xDFFF:
+                continue
+            char = chr(code)
+            if self.contains(char):
+                found.append(char)
+                if len(found) >= _MAX_EXTENDED_CANDIDATES:
+                    break
+        return ''.join(found)
+
+
+_MULTI_CHAR_ESCAPES: Dict[str, CharClass] = {
+    's': CharClass.literal(' \t\n\r'),
+    'i': CharClass(_in_ranges(_NAME_START_RANGES)),
+    'c': CharClass(_in_ranges(_NAME_START_RANGES + _NAME_EXTRA_RANGES)),
+    'd': CharClass(_category('Nd')),
+    'w': CharClass(lambda char: unicodedata.category(char)[0] not in 'PZC'),
+}
+_WILDCARD = CharClass.literal('\n\r').negate()
+
+
+class _Node:
+    """Automaton node; min_length/max_length bound the strings it produces."""
+
+    __slots__ = ('min_length', 'max_length')
+
+    def sample(self, rng: random.Random, out: List[str], target: Optional[int]) -> None:
+        raise NotImplementedError
+
+    def fits(self, target: int) -> bool:
+        return self.min_length <= target and (self.max_length is None or target <= self.max_length)
+
+
+class _Chars(_Node):
+    __slots__ = ('char_class',)
+
+    def __init__(self, char_class: CharClass):
+        self.char_class = char_class
+        self.min_length = self.max_length = 1
+        char_class.alphabet  # fail at compile time for empty classes
+
+    def sample(self, rng: random.Random, out: List[str], target: Optional[int]) -> None:
+        out.append(rng.choice(self.char_class.alphabet))
+
+
+class _Sequence(_Node):
+    __slots__ = ('items',)
+
+    def __init__(self, items: List[_Node]):
+        self.items = items
+        self.min_length = sum(item.min_length for item in items)
+        maxima = [item.max_length for item in items]
+        self.max_length = None if None in maxima else sum(maxima)
+
+    def sample(self, rng: random.Random, out: List[str], target: Optional[int]) -> None:
+        if target is None:
+            for item in self.items:
+                item.sample(rng, out, None)
+            return
+        # Give every item its minimum, then hand out the rest front to back
+        remaining = max(0, target - self.min_length)
+        for item in self.items:
+            extra = remaining if item.max_length is None else min(remaining, item.max_length - item.min_length)
+            remaining -= extra
+            item.sample(rng, out, item.min_length + extra)
+
+
+class _Choice(_Node):
+    __slots__ = ('branches',)
+
+    def __init__(self, branches: List[_Node]):
+        self.branches = branches
+        self.min_length = min(branch.min_length for branch in branches)
+        maxima = [branch.max_length for branch in branches]
+        self.max_length = None if None in maxima else max(maxima)
+
+    def sample(self, rng: random.Random, out: List[str], target: Optional[int]) -> None:
+        branches = self.branches
+        if target is not None:
+            branches = [branch for branch in branches if branch.fits(target)] or branches
+        rng.choice(branches).sample(rng, out, target)
+
+
+class _Repeat(_Node):
+    __slots__ = ('item', 'min_count', 'max_count')
+
+    def __init__(self, item: _Node, min_count: int, max_count: Optional[int]):
+        self.item = item
+        self.min_count = min_count
+        self.max_count = max_count
+        self.min_length = item.min_length * min_count
+        if max_count is None:
+            self.max_length = 0 if item.max_length == 0 else None
+        else:
+            self.max_length = None if item.max_length is None else item.max_length * max_count
+
+    def _count_for(self, target: int) -> Optional[int]:
+        item_min, item_max = self.item.min_length, self.item.max_length
+        count = self.min_count
+        if item_max is not None and item_max > 0:
+            count = max(count, -(-target // item_max))
+        elif item_max == 0:
+            return count if target == 0 else None
+        elif target > 0:
+            count = max(count, 1)
+        if self.max_count is not None and count > self.max_count:
+            return None
+        if count * item_min > target:
+            return None
+        return count
+
+    def sample(self, rng: random.Random, out: List[str], target: Optional[int]) -> None:
+        count = self._count_for(target) if target is not None else None
+        if count is None:
+            span = MAX_EXTRA_REPEATS if self.max_count is None else min(self.max_count - self.min_count, MAX_EXTRA_REPEATS)
+            count = self.min_count + rng.randint(0, span)
+            target = None
+        remaining = 0 if target is None else target - count * self.item.min_length
+        item_max = self.item.max_length
+        for _ in range(count):
+            if target is None:
+                self.item.sample(rng, out, None)
+                continue
+            extra = remaining if item_max is None else min(remaining, item_max - self.item.min_length)
+            remaining -= extra
+            self.item.sample(rng, out, self.item.min_length + extra)
+
+
+class _PatternParser:
+    """Recursive-descent parser for XSD regular expressions."""
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self.pos = 0
+
+    def parse(self) -> _Node:
+        node = self._parse_choice()
+        if self.pos != len(self.pattern):
+            raise self._error("unbalanced ')'")
+        return node
+
+    def _error(self, message: str) -> XSDPatternError:
+        return XSDPatternError(f"Invalid pattern {self.pattern!r} at {self.pos}: {message}")
+
+    def _peek(self) -> Optional[str]:
+        return self.pattern[self.pos] if self.pos < len(self.pattern) else None
+
+    def _next(self) -> str:
+        if self.pos >= len(self.pattern):
+            raise self._error("unexpected end of pattern")
+        char = self.pattern[self.pos]
+        self.pos += 1
+        return char
+
+    def _parse_choice(self) -> _Node:
+        branches = [self._parse_branch()]
+        while self._peek() == '|':
+            self.pos += 1
+            branches.append(self._parse_branch())
+        return branches[0] if len(branches) == 1 else _Choice(branches)
+
+    def _parse_branch(self) -> _Node:
+        pieces = []
+        while self._peek() not in (None, '|', ')'):
+            pieces.append(self._parse_piece())
+        return pieces[0] if len(pieces) == 1 else _Sequence(pieces)
+
+    def _parse_piece(self) -> _Node:
+        atom = self._parse_atom()
+        char = self._peek()
+        if char == '?':
+            self.pos += 1
+            return _Repeat(atom, 0, 1)
+        if char == '*':
+            self.pos += 1
+            return _Repeat(atom, 0, None)
+        if char == '+':
+            self.pos += 1
+            return _Repeat(atom, 1, None)
+        if char == '{':
+            self.pos += 1
+            min_count, max_count = self._parse_quantity()
+            return _Repeat(atom, min_count, max_count)
+        return atom
+
+    def _parse_quantity(self) -> Tuple[int, Optional[int]]:
+        end = self.pattern.find('}', self.pos)
+        if end < 0:
+            raise self._error("unterminated quantifier")
+        quantity = self.pattern[self.pos:end]
+        self.pos = end + 1
+        low, comma, high = quantity.partition(',')
+        try:
+            min_count = int(low) if low else 0
+            max_count = int(high) if high else (None if comma else min_count)
+        except ValueError:
+            raise self._error(f"invalid quantifier {{{quantity}}}") from None
+        if max_count is not None and max_count < min_count:
+            raise self._error(f"invalid quantifier {{{quantity}}}")
+        return min_count, max_count
+
+    def _parse_atom(self) -> _Node:
+        char = self._next()
+        if char == '(':
+            if self.pattern.startswith('?:', self.pos):
+                self.pos += 2  # tolerate non-capturing groups from Perl-style patterns
+            node = self._parse_choice() if self._peek() != ')' else _Sequence([])
+            if self._next() != ')':
+                raise self._error("expected ')'")
+            return node
+        if char == '[':
+            return _Chars(self._parse_class_expression())
+        if char == '.':
+            return _Chars(_WILDCARD)
+        if char == '\\':
+            return _Chars(self._parse_escape())
+        if char in _META_CHARS:
+            raise self._error(f"unexpected {char!r}")
+        return _Chars(CharClass.literal(char))
+
+    def _parse_escape(self) -> CharClass:
+        char = self._next()
+        if char in _SINGLE_CHAR_ESCAPES:
+            return CharClass.literal(_SINGLE_CHAR_ESCAPES[char])
+        if char.lower() in _MULTI_CHAR_ESCAPES:
+            char_class = _MULTI_CHAR_ESCAPES[char.lower()]
+            return char_class.negate() if char.isupper() else char_class
+        if char in 'pP':
+            if self._next() != '{':
+                raise self._error("expected '{' after \\p")
+            end = self.pattern.find('}', self.pos)
+            if end < 0:
+                raise self._error("unterminated category escape")
+            char_class = CharClass(_category(self.pattern[self.pos:end]))
+            self.pos = end + 1
+            return char_class.negate() if char == 'P' else char_class
+        raise self._error(f"unsupported escape \\{char}")
+
+    def _parse_class_expression(self) -> CharClass:
+        negated = self._peek() == '^'
+        if negated:
+            self.pos += 1
+        parts: List[CharClass] = []
+        subtracted = None
+        first = True
+        while True:
+            char = self._next()
+            if char == ']' and not first:
+                break
+            if char == '-' and self._peek() == '[' and not first:
+                self.pos += 1
+                subtracted = self._parse_class_expression()
+                if self._next() != ']':
+                    raise self._error("class subtraction must end the character group")
+                break
+            first = False
+            if char == '\\':
+                escape_start = self.pos
+                escaped = self._parse_escape()
+                escape = self.pattern[escape_start]
+                if escape not in _SINGLE_CHAR_ESCAPES:
+                    parts.append(escaped)
+                    continue
+                char = _SINGLE_CHAR_ESCAPES[escape]
+            elif char == '[':
+                raise self._error("unescaped '[' in character class")
+            parts.append(self._parse_range(char))
+
+        char_class = CharClass.union(parts) if len(parts) != 1 else parts[0]
+        if negated:
+            char_class = char_class.negate()
+        if subtracted is not None:
+            char_class = char_class.subtract(subtracted)
+        return char_class
+
+    def _parse_range(self, start: str) -> CharClass:
+        if self._peek() != '-' or self.pattern.startswith('-[', self.pos) or self.pattern.startswith('-]', self.pos):
+            return CharClass.literal(start)
+        self.pos += 1
+        end = self._next()
+        if end == '\\':
+            escape = self._next()
+            if escape not in _SINGLE_CHAR_ESCAPES:
+                raise self._error("range must end with a single character")
+            end = _SINGLE_CHAR_ESCAPES[escape]
+        if ord(end) < ord(start):
+            raise self._error(f"invalid range {start}-{end}")
+        low, high = ord(start), ord(end)
+        return CharClass(lambda char: low <= ord(char) <= high)
+
+
+class XSDPattern:
+    """Compiled XSD pattern that samples conforming strings."""
+
+    def __init__(self, pattern: str):
+        """
+        Compile a pattern.
+
+        Args:
+            pattern: XSD regular expression (implicitly anchored at both ends)
+
+        Raises:
+            XSDPatternError: If the pattern is malformed or unsupported
+        """
+        self.pattern = pattern
+        self._root = _PatternParser(pattern).parse()
+        self.min_length = self._root.min_length
+        self.max_length = self._root.max_length
+
+    def sample(self, seed: Union[int, str], min_length: int = 0, max_length: Optional[int] = None) -> str:
+        """
+        Generate a string matching the pattern.
+
+        Args:
+            seed: Seed making the result deterministic
+            min_length: Preferred minimum length of the result
+            max_length: Preferred maximum length of the result
+
+        Returns:
+            Conforming string; lengths are honoured where the pattern allows them
+        """
+        value = self._sample(random.Random(seed), None)
+        if len(value) >= min_length and (max_length is None or len(value) <= max_length):
+            return value
+
+        low = max(min_length, self.min_length)
+        highs = [high for high in (max_length, self.max_length) if high is not None]
+        high = min(highs) if highs else None
+        if high is not None and low > high:
+            return value  # the length facets cannot be met by this pattern
+        target = max(low, len(value))
+        if high is not None:
+            target = min(target, high)
+        return self._sample(random.Random(seed), target)
+
+    def _sample(self, rng: random.Random, target: Optional[int]) -> str:
+        out: List[str] = []
+        self._root.sample(rng, out, target)
+        return ''.join(out)
+
+
+class XSDPatternCache:
+    """Thread-safe LRU cache of compiled patterns, including parse failures."""
+
+    def __init__(self, max_entries: int = PATTERN_CACHE_SIZE):
+        """
+        Initialize the pattern cache.
+
+        Args:
+            max_entries: Maximum number of compiled patterns kept in memory
+        """
+        self.max_entries = max_entries
+        self._patterns: "OrderedDict[str, Union[XSDPattern, XSDPatternError]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_pattern(self, pattern: str) -> XSDPattern:
+        """
+        Get the compiled pattern, compiling it on a miss.
+
+        Args:
+            pattern: XSD regular expression
+
+        Returns:
+            Compiled XSDPattern
+
+        Raises:
+            XSDPatternError: If the pattern is malformed or unsupported
+        """
+        with self._lock:
+            compiled = self._patterns.get(pattern)
+            if compiled is not None:
+                self._patterns.move_to_end(pattern)
+                self.hits += 1
+        if compiled is None:
+            try:
+                compiled = XSDPattern(pattern)
+            except XSDPatternError as e:
+                compiled = e
+            with self._lock:
+                self.misses += 1
+                self._patterns[pattern] = compiled
+                while len(self._patterns) > max(1, self.max_entries):
+                    self._patterns.popitem(last=False)
+        if isinstance(compiled, XSDPatternError):
+            raise XSDPatternError(str(compiled))
+        return compiled
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get pattern cache usage statistics.
+
+        Returns:
+            Dictionary with entry count and hit/miss counters
+        """
+        with self._lock:
+            return {'entries': len(self._patterns), 'hits': self.hits, 'misses': self.misses}
+
+    def clear(self) -> None:
+        """Drop all compiled patterns and reset the counters."""
+        with self._lock:
+            self._patterns.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_pattern_cache = XSDPatternCache()
+
+
+def get_pattern_cache() -> XSDPatternCache:
+    """Get the process-wide compiled pattern cache."""
+    return _pattern_cache
+
+
+def sample_pattern(pattern: str, seed: Union[int, str], min_length: int = 0,
+                   max_length: Optional[int] = None) -> str:
+    """
+    Generate a string matching an XSD pattern using the shared cache.
+
+    Args:
+        pattern: XSD regular expression
+        seed: Seed making the result deterministic
+        min_length: Preferred minimum length of the result
+        max_length: Preferred maximum length of the result
+
+    Returns:
+        Conforming string
+
+    Raises:
+        XSDPatternError: If the pattern is malformed or unsupported
+    """
+    return _pattern_cache.get_pattern(pattern).sample(seed, min_length, max_length)
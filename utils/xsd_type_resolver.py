@@ -5,11 +5,78 @@ This module provides utilities for resolving XSD types to their primitive base t
 without relying on element names or heuristics. Works universally with any XSD schema.
 """
 
+from collections import defaultdict
 from typing import Any, Optional, Dict, Tuple, Set, List
 import xmlschema
 from xmlschema.validators import XsdType, XsdAtomicBuiltin, XsdAtomicRestriction, XsdComplexType
 
 
+# Length of the character n-grams used by the partial-match index
+NGRAM_SIZE = 3
+
+
+class ComponentIndex:
+    """Hash indexes over the global elements or types of one schema."""
+    
+    def __init__(self, components):
+        """
+        Build the indexes.
+        
+        Args:
+            components: Mapping of component names to components, in declaration order
+        """
+        self.components = []
+        self.names = []
+        self.local_names = []
+        self.by_local_name = {}
+        self._ngrams = {'name': defaultdict(list), 'local': defaultdict(list)}
+        self._partial_matches = {}
+        
+        for position, (key, component) in enumerate(components.items()):
+            name = str(key)
+            local_name = name.split('}')[-1] if '}' in name else name
+            self.components.append(component)
+            self.names.append(name)
+            self.local_names.append(local_name)
+            self.by_local_name.setdefault(local_name, component)
+            for field, text in (('name', name), ('local', local_name)):
+                for gram in {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}:
+                    self._ngrams[field][gram].append(position)
+    
+    def find_local_name(self, local_name: str):
+        """Return the first component with exactly this local name, or None."""
+        return self.by_local_name.get(local_name)
+    
+    def find_partial(self, text: str, field: str = 'name'):
+        """
+        Return the first component whose name contains text, or None.
+        
+        Args:
+            text: Substring to look for
+            field: 'name' to match full component names, 'local' for local names
+        """
+        cache_key = (field, text)
+        if cache_key in self._partial_matches:
+            return self._partial_matches[cache_key]
+        
+        texts = self.names if field == 'name' else self.local_names
+        if len(text) < NGRAM_SIZE:
+            candidates = range(len(texts))
+        else:
+            # Only names sharing the rarest n-gram of the text can contain it
+            index = self._ngrams[field]
+            postings = [index.get(text[i:i + NGRAM_SIZE]) for i in range(len(text) - NGRAM_SIZE + 1)]
+            candidates = [] if not all(postings) else min(postings, key=len)
+        
+        match = None
+        for position in candidates:
+            if text in texts[position]:
+                match = self.components[position]
+                break
+        self._partial_matches[cache_key] = match
+        return match
+
+
 class UniversalXSDTypeResolver:
     """Resolves XSD types to primitive types without name-based heuristics."""
     
@@ -18,6 +85,9 @@ class UniversalXSDTypeResolver:
         self.schema = schema
         self._resolution_cache = {}  # Cache resolved types for performance
         self._visiting = set()  # Track types being resolved to prevent infinite recursion
+        self._component_indexes = {}  # (schema id, kind) -> (schema, ComponentIndex)
+        self._element_lookups = {}  # element name -> element found across imports
+        self._type_lookups = {}  # type name -> type found across imports
     
     def resolve_to_primitive_type(self, xsd_type: Any) -> Tuple[str, Dict[str, Any]]:
         """
@@ -480,67 +550,73 @@ class UniversalXSDTypeResolver:
         
         return 'xs:string', {}
     
+    def _searched_schemas(self) -> List[Any]:
+        """Main schema followed by all imported schemas, in lookup order."""
+        schemas = [self.schema]
+        if hasattr(self.schema, 'imports') and self.schema.imports:
+            schemas.extend(self.schema.imports.values())
+        return schemas
+    
+    def _get_component_index(self, schema, kind: str) -> Optional[ComponentIndex]:
+        """Get the index over a schema's 'elements' or 'types', building it on first use."""
+        if not hasattr(schema, kind):
+            return None
+        
+        key = (id(schema), kind)
+        cached = self._component_indexes.get(key)
+        if cached is None or cached[0] is not schema:
+            cached = (schema, ComponentIndex(getattr(schema, kind)))
+            self._component_indexes[key] = cached
+        return cached[1]
+    
     def _find_element_direct(self, element_name: str):
         """Find element directly in main schema and all imported schemas."""
-        # Search in main schema first
-        element = self._search_elements_in_schema(self.schema, element_name)
-        if element:
-            return element
+        if element_name in self._element_lookups:
+            return self._element_lookups[element_name]
         
-        # Search in all imported schemas
-        if hasattr(self.schema, 'imports') and self.schema.imports:
-            for imported_schema in self.schema.imports.values():
-                element = self._search_elements_in_schema(imported_schema, element_name)
-                if element:
-                    return element
+        element = None
+        for schema in self._searched_schemas():
+            element = self._search_elements_in_schema(schema, element_name)
+            if element:
+                break
         
-        return None
+        self._element_lookups[element_name] = element
+        return element
     
     def _search_elements_in_schema(self, schema, element_name: str):
         """Search for element in a specific schema."""
-        if not hasattr(schema, 'elements'):
+        index = self._get_component_index(schema, 'elements')
+        if index is None:
             return None
-            
-        # Direct name match
-        for elem_name, elem_obj in schema.elements.items():
-            local_name = str(elem_name).split('}')[-1] if '}' in str(elem_name) else str(elem_name)
-            if local_name == element_name:
-                return elem_obj
-        
-        # Partial match
-        for elem_name, elem_obj in schema.elements.items():
-            if element_name in str(elem_name):
-                return elem_obj
-        
-        return None
+        
+        # Direct name match, then partial match
+        element = index.find_local_name(element_name)
+        if element is None:
+            element = index.find_partial(element_name, 'name')
+        return element
     
     def _find_type_by_name(self, type_name: str):
         """Find type definition by name in main schema and all imported schemas."""
-        # Search in main schema first
-        type_obj = self._search_types_in_schema(self.schema, type_name)
-        if type_obj:
-            return type_obj
+        if type_name in self._type_lookups:
+            return self._type_lookups[type_name]
         
-        # Search in all imported schemas
-        if hasattr(self.schema, 'imports') and self.schema.imports:
-            for imported_schema in self.schema.imports.values():
-                type_obj = self._search_types_in_schema(imported_schema, type_name)
-                if type_obj:
-                    return type_obj
+        type_obj = None
+        for schema in self._searched_schemas():
+            type_obj = self._search_types_in_schema(schema, type_name)
+            if type_obj:
+                break
         
-        return None
+        self._type_lookups[type_name] = type_obj
+        return type_obj
     
     def _search_types_in_schema(self, schema, type_name: str):
         """Search for type definition in a specific schema."""
-        if not hasattr(schema, 'types'):
+        index = self._get_component_index(schema, 'types')
+        if index is None:
             return None
-            
-        for type_name_key, type_obj in schema.types.items():
-            local_name = str(type_name_key).split('}')[-1] if '}' in str(type_name_key) else str(type_name_key)
-            if local_name == type_name or type_name in local_name:
-                return type_obj
         
-        return None
+        # The first type whose local name equals or contains the name wins
+        return index.find_partial(type_name, 'local')
     
     
     def get_type_primitive_type(self, type_name: str) -> Tuple[str, Dict[str, Any]]: